@@ -2,26 +2,106 @@
 # distutils: language = c++
 # Moteur de backtest STANDARD pour MULTI_SYMBOLS.py (sans HV filter)
 # P4-CYTHON: risk sizing + partial sells support
+# PERF-02: boucle par bar sans objet Python (memoryviews + buffer C), exécutée en nogil
+# PERF-03: journal de trades renvoyé en tableau numpy structuré (TRADE_LOG_DTYPE)
+# PERF-04: equity bar-à-bar (mark-to-market au close) écrite dans un buffer appelant
+# PERF-05: arrêt anticipé (critères backtest_abort.AbortCriteria) évalué en fin de bar
+# PERF-06: grille de seuils StochRSI évaluée en un appel (masques de signaux partagés)
+# PERF-08: reprise depuis un état sauvegardé (checkpoint) à un bar donné
+# PERF-22: sizing fixed_notional / volatility_parity (formules de position_sizing)
+# PERF-23: coûts d'exécution cost_model.CostModel évalués dans la boucle (RNG counter-based)
 
 import numpy as np
 cimport numpy as np
 cimport cython
-import pandas as pd
-from libc.math cimport abs, fmax, fmin, isnan
-from libc.stdlib cimport malloc, free
+from libc.math cimport fmax, fmin, isnan, NAN
+from libc.stdint cimport uint32_t
+from libc.stdlib cimport malloc, realloc, free
 
 DTYPE = np.float64
 ctypedef np.float64_t DTYPE_t
 
+# Types d'enregistrements du buffer de trades (identiques à trade_log.KIND_*)
+cdef enum:
+    TRADE_BUY = 0
+    TRADE_SELL = 1
+    TRADE_PARTIAL_1 = 2
+    TRADE_PARTIAL_2 = 3
+
+# Motifs de sortie (identiques à trade_log.REASON_*)
+cdef enum:
+    REASON_NONE = 0
+    REASON_SIGNAL = 1
+    REASON_STOP_LOSS = 2
+    REASON_TRAILING_STOP = 3
+    REASON_TAKE_PROFIT = 4
+
+# Motifs d'arrêt anticipé (identiques à backtest_abort.ABORT_*)
+cdef enum:
+    ABORT_NONE = 0
+    ABORT_MAX_DRAWDOWN = 1
+    ABORT_EQUITY_FLOOR = 2
+    ABORT_MIN_TRADES = 3
+    ABORT_UNREACHABLE = 4
+
+# Modes de sizing (identiques à backtest_kernel.SIZING_MODES)
+cdef enum:
+    SIZING_BASELINE = 0
+    SIZING_RISK = 1
+    SIZING_FIXED_NOTIONAL = 2
+    SIZING_VOLATILITY_PARITY = 3
+
+# Sens du fill pour le tirage aléatoire (identiques à cost_model.FILL_*)
+cdef enum:
+    FILL_BUY = 0
+    FILL_SELL = 1
+
+SIZING_MODES = {
+    'baseline': SIZING_BASELINE,
+    'risk': SIZING_RISK,
+    'fixed_notional': SIZING_FIXED_NOTIONAL,
+    'volatility_parity': SIZING_VOLATILITY_PARITY,
+}
+
+# Niveau d'API lu par backtest_runner : 1 = trade_log (PERF-03), 2 = equity_out (PERF-04),
+# 3 = critères d'arrêt anticipé (PERF-05), 4 = stoch_grid / backtest_threshold_batch (PERF-06),
+# 5 = resume_state / checkpoint_bar (PERF-08), 6 = sizing fixed_notional / volatility_parity (PERF-22),
+# 7 = coûts d'exécution cost_* (PERF-23)
+ENGINE_API_LEVEL = 7
+
+# Doit rester identique à trade_log.TRADE_LOG_DTYPE
+TRADE_LOG_DTYPE = np.dtype([
+    ('entry_bar', np.int64),
+    ('exit_bar', np.int64),
+    ('kind', np.int8),
+    ('reason', np.int8),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('qty', np.float64),
+    ('pnl', np.float64),
+    ('fees', np.float64),
+])
+
 cdef struct TradeRecord:
-    double timestamp
+    Py_ssize_t entry_bar
+    Py_ssize_t exit_bar
     int trade_type
-    double price
+    int reason
+    double entry_price
+    double exit_price     # prix d'exécution (NaN pour un achat)
     double quantity
-    double profit
+    double pnl            # SELL: P&L net aller-retour ; partiel : P&L de la tranche
+    double fees
+    double proceeds       # partiels : produit net (format dict historique)
+
+cdef struct TradeBuffer:
+    TradeRecord* records
+    Py_ssize_t size
+    Py_ssize_t capacity
 
 cdef struct PositionState:
     bint in_position
+    Py_ssize_t entry_bar
     double entry_price
     double entry_usd_invested
     double max_price
@@ -33,115 +113,164 @@ cdef struct PositionState:
     double atr_at_entry
     bint breakeven_triggered
 
+cdef struct EngineState:
+    PositionState position
+    double usd
+    double coin
+    double peak_wallet
+    double max_drawdown
+    Py_ssize_t total_trades
+    Py_ssize_t winning_trades
+    int cooldown_remaining
+    Py_ssize_t last_bar       # dernier bar simulé
+    int abort_reason          # ABORT_* (ABORT_NONE si simulé jusqu'au bout)
+
+cdef struct EngineParams:
+    double taker_fee
+    double slippage_buy
+    double slippage_sell
+    double atr_multiplier
+    double atr_stop_multiplier
+    double stoch_threshold_buy
+    double stoch_threshold_sell
+    double stoch_threshold_buy_min
+    double adx_threshold
+    double risk_per_trade
+    double target_volatility_pct
+    double partial_threshold_1
+    double partial_threshold_2
+    double partial_pct_1
+    double partial_pct_2
+    double min_notional
+    double breakeven_trigger_pct
+    int cooldown_candles
+    int sizing_mode           # SIZING_*
+    bint partial_enabled
+    bint breakeven_enabled
+    bint use_sma
+    bint use_adx
+    bint use_trix
+    bint use_vol_filter
+    bint use_mtf_filter
+    bint has_open
+    bint write_equity
+    bint use_masks            # PERF-06: filtres indépendants des seuils pré-calculés
+    # PERF-05: arrêt anticipé
+    bint abort_enabled
+    bint abort_use_score
+    double initial_wallet
+    double abort_max_drawdown
+    double abort_equity_floor
+    double abort_min_score
+    int abort_min_trades
+    Py_ssize_t abort_min_trades_bar
+    # PERF-23: coûts d'exécution (cost_model.CostModel)
+    bint use_cost_model
+    double cost_fixed
+    double cost_atr
+    double cost_participation
+    double cost_random_min
+    double cost_random_max
+    uint32_t cost_seed
+
 # P2-02: Constantes migrées vers paramètres runtime (plus de DEF hardcodés)
 # Valeurs par défaut conservées pour rétrocompatibilité
 
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
-@cython.cdivision(True)
-def backtest_from_dataframe_fast(
-    np.ndarray[DTYPE_t, ndim=1] close_prices,
-    np.ndarray[DTYPE_t, ndim=1] high_prices,
-    np.ndarray[DTYPE_t, ndim=1] low_prices,
-    np.ndarray[DTYPE_t, ndim=1] ema1_values,
-    np.ndarray[DTYPE_t, ndim=1] ema2_values,
-    np.ndarray[DTYPE_t, ndim=1] stoch_rsi_values,
-    np.ndarray[DTYPE_t, ndim=1] atr_values,
-    np.ndarray[DTYPE_t, ndim=1] sma_long_values=None,
-    np.ndarray[DTYPE_t, ndim=1] adx_values=None,
-    np.ndarray[DTYPE_t, ndim=1] trix_histo_values=None,
-    np.ndarray[DTYPE_t, ndim=1] open_prices=None,
-    np.ndarray[DTYPE_t, ndim=1] volume_values=None,
-    np.ndarray[DTYPE_t, ndim=1] vol_sma_values=None,
-    double initial_wallet=10000.0,
-    str scenario='StochRSI',
-    bint use_sma=False,
-    bint use_adx=False,
-    bint use_trix=False,
-    bint use_vol_filter=False,
-    double taker_fee=0.0007,
-    double slippage_buy=0.0001,
-    double slippage_sell=0.0001,
-    double atr_multiplier=8.0,  # E-1: trailing activation optimisé
-    double atr_stop_multiplier=3.0,
-    double stoch_threshold_buy=0.8,
-    double stoch_threshold_sell=0.2,
-    double adx_threshold=25.0,
-    str sizing_mode='risk',  # B-2: risk-based sizing
-    double risk_per_trade=0.055,  # B-2: optimisé 5%→5.5% (Calmar max 2.004)
-    bint partial_enabled=False,
-    double partial_threshold_1=0.02,
-    double partial_threshold_2=0.04,
-    double partial_pct_1=0.50,
-    double partial_pct_2=0.30,
-    double min_notional=5.0,
-    double stoch_threshold_buy_min=0.05,
-    bint breakeven_enabled=True,
-    double breakeven_trigger_pct=0.015,
-    int cooldown_candles=0,
-    np.ndarray[DTYPE_t, ndim=1] mtf_bullish=None,
-    bint use_mtf_filter=False
-) -> dict:
-    """
-    Moteur de backtest standard pour MULTI_SYMBOLS.py
+cdef inline int _push_trade(
+    TradeBuffer* buf, Py_ssize_t entry_bar, Py_ssize_t exit_bar, int trade_type,
+    int reason, double entry_price, double exit_price, double quantity,
+    double pnl, double fees, double proceeds,
+) noexcept nogil:
+    """Ajoute un enregistrement ; croissance géométrique. Retourne -1 si OOM."""
+    cdef TradeRecord* grown
+    cdef Py_ssize_t new_capacity
+    if buf.size >= buf.capacity:
+        new_capacity = buf.capacity * 2 if buf.capacity > 0 else 64
+        grown = <TradeRecord*>realloc(buf.records, new_capacity * sizeof(TradeRecord))
+        if grown == NULL:
+            return -1
+        buf.records = grown
+        buf.capacity = new_capacity
+    buf.records[buf.size].entry_bar = entry_bar
+    buf.records[buf.size].exit_bar = exit_bar
+    buf.records[buf.size].trade_type = trade_type
+    buf.records[buf.size].reason = reason
+    buf.records[buf.size].entry_price = entry_price
+    buf.records[buf.size].exit_price = exit_price
+    buf.records[buf.size].quantity = quantity
+    buf.records[buf.size].pnl = pnl
+    buf.records[buf.size].fees = fees
+    buf.records[buf.size].proceeds = proceeds
+    buf.size += 1
+    return 0
 
-    DIFFERENCES avec la version OPTIMIZED:
-    - fills au open[i+1] avec slippage (P1-02 + P1-03)
-    - Pas de hv_values (pas de filtre HV)
-    - Constantes ATR/Stoch/ADX passées en paramètres runtime (P2-02)
-    - Risk sizing mode + partial profit taking (P4-CYTHON)
-    """
 
-    cdef Py_ssize_t n = len(close_prices)
-    cdef Py_ssize_t i
-    cdef double wallet = initial_wallet
-    cdef double usd = initial_wallet
-    cdef double coin = 0.0
-    cdef double current_price
-    cdef double max_drawdown = 0.0
-    cdef double peak_wallet = initial_wallet
-    cdef double current_wallet
-    cdef double drawdown
-    cdef Py_ssize_t winning_trades = 0
-    cdef Py_ssize_t total_trades = 0
-    cdef double trade_profit
-    cdef bint buy_condition, sell_condition
-    cdef double fee, gross_proceeds
-    cdef PositionState position
-    cdef list trades = []
-    cdef bint stop_loss_hit, trailing_stop_hit, ema_cross_down, ema_cross_up, stoch_low, stoch_high
-    cdef double net_coin, fee_in_coin
-    cdef int is_winning
-    cdef double atr_baseline = 100.0
-    cdef double atr_sum = 0.0
-    cdef double fill_price
-    # P4-CYTHON: risk sizing variables
-    cdef bint is_risk_mode = (sizing_mode == 'risk')
-    cdef double actual_cost, stop_distance, risk_amount, qty_by_risk, max_affordable, gross_coin
-    # P4-CYTHON: partial sell variables
-    cdef double profit_pct, partial_qty, partial_proceeds, position_value
-    # B-1: trailing stop alignment variables
-    cdef double trailing_distance, new_trailing
-    # A-3: cooldown post-stop-loss
-    cdef int cooldown_remaining = 0
-    cdef bint was_stop_loss_exit = False
+cdef inline double _counter_uniform(
+    uint32_t seed, Py_ssize_t bar, Py_ssize_t trade, int side,
+) noexcept nogil:
+    """Tirage uniforme [0, 1) de (seed, bar, trade, side) — cost_model.counter_uniform."""
+    cdef uint32_t h = seed
+    cdef uint32_t keys[3]
+    cdef int k
+    keys[0] = <uint32_t>bar
+    keys[1] = <uint32_t>trade
+    keys[2] = <uint32_t>side
+    for k in range(3):
+        h ^= keys[k]
+        h ^= h >> 16
+        h *= 0x85EBCA6BU
+        h ^= h >> 13
+        h *= 0xC2B2AE35U
+        h ^= h >> 16
+    return h / 4294967296.0
 
-    if n == 0:
-        return {
-            'final_wallet': 0.0,
-            'trades': [],
-            'max_drawdown': 0.0,
-            'win_rate': 0.0
-        }
 
-    # Calculer ATR baseline
-    if n > 0:
-        for i in range(n):
-            atr_sum += atr_values[i]
-        atr_baseline = atr_sum / n
+@cython.cdivision(True)
+cdef inline double _entry_coin(
+    const EngineParams* p, double usd, double price, double atr,
+) noexcept nogil:
+    """Quantité brute achetée au prix ``price`` (P4-CYTHON, PERF-22)."""
+    cdef double stop_distance
+    if price <= 0:
+        return 0.0
+    if p.sizing_mode == SIZING_RISK and atr > 0:
+        # Risk-based: risk_per_trade of equity per stop_distance
+        stop_distance = p.atr_stop_multiplier * atr
+        if stop_distance > 0:
+            return fmin((usd * 0.98) / price, usd * p.risk_per_trade / stop_distance)
+        return (usd * 0.98) / price
+    if p.sizing_mode == SIZING_FIXED_NOTIONAL:
+        # compute_position_size_fixed_notional : 10 % du cash, 100 USDC minimum
+        return fmin((usd * 0.98) / price, fmax(100.0, usd * 0.1) / price)
+    if p.sizing_mode == SIZING_VOLATILITY_PARITY and atr > 0:
+        # compute_position_size_volatility_parity : cash × cible / (ATR × prix)
+        return fmin((usd * 0.98) / price, usd * p.target_volatility_pct / (atr * price))
+    # Baseline: invest 98% of wallet
+    return (usd * 0.98) / price
+
+
+@cython.cdivision(True)
+cdef inline double _fill_cost(
+    const EngineParams* p, Py_ssize_t bar, Py_ssize_t trade, int side,
+    double close, double atr, double qty, double bar_volume,
+) noexcept nogil:
+    """Surcoût d'un fill en fraction du prix (PERF-23, cf. backtest_kernel._fill_cost)."""
+    cdef double cost = p.cost_fixed
+    cdef double u
+    if p.cost_atr > 0 and atr > 0 and close > 0:
+        cost += p.cost_atr * atr / close
+    if p.cost_participation > 0:
+        cost += p.cost_participation * (fmin(1.0, qty / bar_volume) if bar_volume > 0 else 1.0)
+    if p.cost_random_max > 0:
+        u = _counter_uniform(p.cost_seed, bar, trade, side)
+        cost += p.cost_random_min + (p.cost_random_max - p.cost_random_min) * u
+    return cost
+
 
+cdef inline void _reset_position(PositionState* position) noexcept nogil:
     position.in_position = False
+    position.entry_bar = -1
     position.entry_price = 0.0
     position.entry_usd_invested = 0.0
     position.max_price = 0.0
@@ -153,14 +282,161 @@ def backtest_from_dataframe_fast(
     position.atr_at_entry = 0.0
     position.breakeven_triggered = False
 
-    # Boucle principale
-    for i in range(n):
+
+@cython.cdivision(True)
+cdef inline int _abort_check(
+    const EngineParams* p, const EngineState* st, Py_ssize_t i, double equity, double growth,
+) noexcept nogil:
+    """Miroir de ``backtest_abort.check_abort`` ; retourne un code ABORT_*."""
+    cdef double roi_max, score
+    cdef Py_ssize_t opened
+    if p.abort_max_drawdown > 0 and st.max_drawdown >= p.abort_max_drawdown:
+        return ABORT_MAX_DRAWDOWN
+    if p.abort_equity_floor > 0 and equity < p.abort_equity_floor:
+        return ABORT_EQUITY_FLOOR
+    if p.abort_min_trades > 0 and i == p.abort_min_trades_bar:
+        opened = st.total_trades + (1 if st.position.in_position else 0)
+        if opened < p.abort_min_trades:
+            return ABORT_MIN_TRADES
+    # Borne de score évaluée hors position uniquement : l'equity coïncide alors
+    # avec l'equity trade-level (clôturée) utilisée par calmar_ratio.
+    if p.abort_use_score and not st.position.in_position:
+        roi_max = (equity * growth - p.initial_wallet) / fmax(p.initial_wallet, 1.0)
+        if roi_max < 0:
+            score = roi_max
+        else:
+            score = roi_max / fmax(st.max_drawdown, 0.001)
+        if score < p.abort_min_score:
+            return ABORT_UNREACHABLE
+    return ABORT_NONE
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline bint _end_bar(
+    const EngineParams* p, EngineState* st, Py_ssize_t i, double equity,
+    double[:] equity_out, const double[:] abort_growth,
+) noexcept nogil:
+    """Fin de bar : equity_out (PERF-04) puis critères d'arrêt (PERF-05).
+
+    Retourne True si la simulation doit s'arrêter.
+    """
+    cdef int reason
+    st.last_bar = i
+    if p.write_equity:
+        equity_out[i] = equity
+    if p.abort_enabled:
+        reason = _abort_check(
+            p, st, i, equity, abort_growth[i] if p.abort_use_score else 1.0
+        )
+        if reason != ABORT_NONE:
+            st.abort_reason = reason
+            return True
+    return False
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _signal_masks(
+    const double[:] close_prices,
+    const double[:] ema1_values,
+    const double[:] ema2_values,
+    const double[:] atr_values,
+    const double[:] sma_long_values,
+    const double[:] adx_values,
+    const double[:] trix_histo_values,
+    const double[:] volume_values,
+    const double[:] vol_sma_values,
+    const double[:] mtf_bullish,
+    const EngineParams* p,
+    unsigned char[:] entry_mask,
+    unsigned char[:] exit_mask,
+) noexcept nogil:
+    """PERF-06: conditions d'entrée / sortie indépendantes des seuils StochRSI.
+
+    ``entry_mask[i]`` : croisement EMA haussier, ATR valide et filtres
+    SMA / ADX / TRIX / volume / MTF actifs ; ``exit_mask[i]`` : croisement
+    EMA baissier.  Calculés une fois pour toute une grille de seuils.
+    """
+    cdef Py_ssize_t i
+    cdef bint ok
+    for i in range(close_prices.shape[0]):
+        exit_mask[i] = ema2_values[i] > ema1_values[i]
+        ok = ema1_values[i] > ema2_values[i]
+        if ok and (isnan(atr_values[i]) or atr_values[i] <= 0):
+            ok = False
+        if ok and p.use_sma:
+            ok = close_prices[i] > sma_long_values[i]
+        if ok and p.use_adx:
+            ok = adx_values[i] > p.adx_threshold
+        if ok and p.use_trix:
+            ok = trix_histo_values[i] > 0.0
+        if ok and p.use_vol_filter:
+            if isnan(volume_values[i]) or isnan(vol_sma_values[i]) or vol_sma_values[i] <= 0:
+                ok = False
+            else:
+                ok = volume_values[i] > vol_sma_values[i]
+        if ok and p.use_mtf_filter:
+            ok = mtf_bullish[i] > 0.5
+        entry_mask[i] = ok
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef int _run_bars(
+    const double[:] close_prices,
+    const double[:] ema1_values,
+    const double[:] ema2_values,
+    const double[:] stoch_rsi_values,
+    const double[:] atr_values,
+    const double[:] sma_long_values,
+    const double[:] adx_values,
+    const double[:] trix_histo_values,
+    const double[:] open_prices,
+    const double[:] volume_values,
+    const double[:] vol_sma_values,
+    const double[:] mtf_bullish,
+    double[:] equity_out,
+    const double[:] abort_growth,
+    const unsigned char[:] entry_mask,
+    const unsigned char[:] exit_mask,
+    Py_ssize_t start,
+    Py_ssize_t stop,
+    const EngineParams* p,
+    EngineState* st,
+    TradeBuffer* buf,
+) noexcept nogil:
+    """Boucle principale par bar sur ``[start, stop)``.
+
+    Retourne -1 si OOM, 1 si un critère d'arrêt anticipé est atteint
+    (``st.abort_reason``), 0 sinon.
+
+    Les memoryviews optionnelles ne sont lues que si le flag ``use_*`` /
+    ``has_open`` / ``write_equity`` correspondant est vrai.  ``equity_out[i]``
+    reçoit l'equity en fin de bar (cash + coin × close[i]), fills du bar
+    inclus.  Si ``use_masks``, ``entry_mask`` / ``exit_mask`` remplacent les
+    conditions qui ne dépendent pas des seuils StochRSI (``_signal_masks``).
+    """
+    cdef Py_ssize_t n = close_prices.shape[0]
+    cdef Py_ssize_t i
+    cdef double current_price, current_wallet, drawdown, trade_profit
+    cdef double fee, gross_proceeds, fee_in_coin, fill_price, sold_qty
+    cdef int exit_reason
+    cdef double actual_cost, gross_coin
+    cdef double profit_pct, partial_qty, partial_proceeds, position_value
+    cdef double trailing_distance, new_trailing, be_profit_pct, be_new_stop
+    cdef bint buy_condition, sell_condition, stop_loss_hit, trailing_stop_hit
+    cdef bint ema_cross_down, ema_cross_up, stoch_low, stoch_high
+    cdef PositionState* position = &st.position
+
+    for i in range(start, stop):
         current_price = close_prices[i]
 
         # === GESTION POSITION ACTIVE ===
         if position.in_position:
             # Mise à jour trailing stop (B-1: delayed activation, ATR figé)
-            trailing_distance = atr_multiplier * position.atr_at_entry
+            trailing_distance = p.atr_multiplier * position.atr_at_entry
             if current_price > position.max_price:
                 position.max_price = current_price
             if (not position.trailing_activated
@@ -173,226 +449,687 @@ def backtest_from_dataframe_fast(
                     position.trailing_stop = new_trailing
 
             # === B-3: BREAK-EVEN STOP ===
-            if breakeven_enabled and not position.breakeven_triggered and position.entry_price > 0:
+            if p.breakeven_enabled and not position.breakeven_triggered and position.entry_price > 0:
                 be_profit_pct = (current_price - position.entry_price) / position.entry_price
-                if be_profit_pct >= breakeven_trigger_pct:
+                if be_profit_pct >= p.breakeven_trigger_pct:
                     # Remonter le stop loss au prix d'entrée + slippage
-                    be_new_stop = position.entry_price * (1.0 + slippage_buy)
+                    be_new_stop = position.entry_price * (1.0 + p.slippage_buy)
                     if be_new_stop > position.stop_loss:
                         position.stop_loss = be_new_stop
                     position.breakeven_triggered = True
 
             # === PARTIAL PROFIT TAKING (P4-CYTHON) ===
-            if partial_enabled and coin > 0 and position.entry_price > 0:
-                position_value = coin * current_price
+            if p.partial_enabled and st.coin > 0 and position.entry_price > 0:
+                position_value = st.coin * current_price
                 # Guard: position assez grosse (3× min_notional)
-                if position_value >= min_notional * 3.0:
+                if position_value >= p.min_notional * 3.0:
                     profit_pct = (current_price - position.entry_price) / position.entry_price
 
                     # Partial take 1
-                    if not position.partial_taken_1 and profit_pct >= partial_threshold_1:
-                        partial_qty = coin * partial_pct_1
-                        if partial_qty * current_price >= min_notional:
-                            partial_proceeds = partial_qty * current_price * (1.0 - taker_fee)
-                            usd = usd + partial_proceeds
-                            coin = coin - partial_qty
-                            trades.append({
-                                'type': 'partial_sell_1',
-                                'price': current_price,
-                                'qty': partial_qty,
-                                'proceeds': partial_proceeds,
-                                'profit_pct': profit_pct,
-                            })
+                    if not position.partial_taken_1 and profit_pct >= p.partial_threshold_1:
+                        partial_qty = st.coin * p.partial_pct_1
+                        if partial_qty * current_price >= p.min_notional:
+                            partial_proceeds = partial_qty * current_price * (1.0 - p.taker_fee)
+                            st.usd = st.usd + partial_proceeds
+                            st.coin = st.coin - partial_qty
+                            if _push_trade(buf, position.entry_bar, i, TRADE_PARTIAL_1,
+                                           REASON_TAKE_PROFIT, position.entry_price,
+                                           current_price, partial_qty,
+                                           partial_proceeds - partial_qty * position.entry_price,
+                                           partial_qty * current_price * p.taker_fee,
+                                           partial_proceeds) < 0:
+                                return -1
                         position.partial_taken_1 = True  # flag True even if blocked
 
                     # Partial take 2
-                    if not position.partial_taken_2 and profit_pct >= partial_threshold_2 and coin > 0:
-                        partial_qty = coin * partial_pct_2
-                        if partial_qty * current_price >= min_notional:
-                            partial_proceeds = partial_qty * current_price * (1.0 - taker_fee)
-                            usd = usd + partial_proceeds
-                            coin = coin - partial_qty
-                            trades.append({
-                                'type': 'partial_sell_2',
-                                'price': current_price,
-                                'qty': partial_qty,
-                                'proceeds': partial_proceeds,
-                                'profit_pct': profit_pct,
-                            })
+                    if not position.partial_taken_2 and profit_pct >= p.partial_threshold_2 and st.coin > 0:
+                        partial_qty = st.coin * p.partial_pct_2
+                        if partial_qty * current_price >= p.min_notional:
+                            partial_proceeds = partial_qty * current_price * (1.0 - p.taker_fee)
+                            st.usd = st.usd + partial_proceeds
+                            st.coin = st.coin - partial_qty
+                            if _push_trade(buf, position.entry_bar, i, TRADE_PARTIAL_2,
+                                           REASON_TAKE_PROFIT, position.entry_price,
+                                           current_price, partial_qty,
+                                           partial_proceeds - partial_qty * position.entry_price,
+                                           partial_qty * current_price * p.taker_fee,
+                                           partial_proceeds) < 0:
+                                return -1
                         position.partial_taken_2 = True  # flag True even if blocked
 
             # Calcul drawdown
-            current_wallet = usd + (coin * current_price)
+            current_wallet = st.usd + (st.coin * current_price)
 
-            if current_wallet > peak_wallet:
-                peak_wallet = current_wallet
+            if current_wallet > st.peak_wallet:
+                st.peak_wallet = current_wallet
 
-            drawdown = (peak_wallet - current_wallet) / peak_wallet if peak_wallet > 0 else 0.0
-            max_drawdown = fmax(max_drawdown, drawdown)
+            drawdown = (st.peak_wallet - current_wallet) / st.peak_wallet if st.peak_wallet > 0 else 0.0
+            st.max_drawdown = fmax(st.max_drawdown, drawdown)
 
             # === CONDITIONS DE VENTE ===
             stop_loss_hit = current_price < position.stop_loss
             trailing_stop_hit = current_price < position.trailing_stop
-            ema_cross_down = ema2_values[i] > ema1_values[i]
-            stoch_high = stoch_rsi_values[i] > stoch_threshold_sell
+            if p.use_masks:
+                ema_cross_down = exit_mask[i] != 0
+            else:
+                ema_cross_down = ema2_values[i] > ema1_values[i]
+            stoch_high = stoch_rsi_values[i] > p.stoch_threshold_sell
 
             sell_condition = (stop_loss_hit or trailing_stop_hit or
-                            (ema_cross_down and stoch_high))
+                              (ema_cross_down and stoch_high))
 
             if sell_condition:
                 # VENTE au open[i+1] avec slippage (P1-02 + P1-03)
-                if open_prices is not None and i + 1 < n:
-                    fill_price = open_prices[i + 1] * (1.0 - slippage_sell)
+                if p.has_open and i + 1 < n:
+                    fill_price = open_prices[i + 1] * (1.0 - p.slippage_sell)
                 else:
-                    fill_price = current_price * (1.0 - slippage_sell)
-                gross_proceeds = coin * fill_price
-                fee = gross_proceeds * taker_fee
-                usd = usd + (gross_proceeds - fee)
-                coin = 0.0
+                    fill_price = current_price * (1.0 - p.slippage_sell)
+                if p.use_cost_model:
+                    fill_price = fill_price * (1.0 - _fill_cost(
+                        p, i, st.total_trades, FILL_SELL, current_price, atr_values[i], st.coin,
+                        volume_values[i] if p.cost_participation > 0 else 0.0,
+                    ))
+                sold_qty = st.coin
+                gross_proceeds = st.coin * fill_price
+                fee = gross_proceeds * p.taker_fee
+                st.usd = st.usd + (gross_proceeds - fee)
+                st.coin = 0.0
 
-                trade_profit = usd - position.entry_usd_invested
+                trade_profit = st.usd - position.entry_usd_invested
 
-                total_trades += 1
+                st.total_trades += 1
+                if trade_profit > 0.0:
+                    st.winning_trades += 1
 
-                is_winning = 1 if trade_profit > 0.0 else 0
-                winning_trades += is_winning
-
-                trades.append({
-                    'type': 'SELL',
-                    'price': fill_price,
-                    'profit': trade_profit
-                })
+                if stop_loss_hit:
+                    exit_reason = REASON_STOP_LOSS
+                elif trailing_stop_hit:
+                    exit_reason = REASON_TRAILING_STOP
+                else:
+                    exit_reason = REASON_SIGNAL
+                if _push_trade(buf, position.entry_bar, i, TRADE_SELL, exit_reason,
+                               position.entry_price, fill_price, sold_qty,
+                               trade_profit, fee, 0.0) < 0:
+                    return -1
 
                 # A-3: set cooldown after stop-loss or breakeven exit
-                was_stop_loss_exit = stop_loss_hit
-                if was_stop_loss_exit and cooldown_candles > 0:
-                    cooldown_remaining = cooldown_candles
+                if stop_loss_hit and p.cooldown_candles > 0:
+                    st.cooldown_remaining = p.cooldown_candles
 
                 # Reset position
-                position.in_position = False
-                position.entry_price = 0.0
-                position.entry_usd_invested = 0.0
-                position.max_price = 0.0
-                position.trailing_stop = 0.0
-                position.stop_loss = 0.0
-                position.partial_taken_1 = False
-                position.partial_taken_2 = False
-                position.trailing_activated = False
-                position.atr_at_entry = 0.0
-                position.breakeven_triggered = False
+                _reset_position(position)
+                if _end_bar(p, st, i, st.usd, equity_out, abort_growth):
+                    return 1
                 continue
 
         # === A-3: COOLDOWN DECREMENT ===
-        if not position.in_position and cooldown_remaining > 0:
-            cooldown_remaining -= 1
+        if not position.in_position and st.cooldown_remaining > 0:
+            st.cooldown_remaining -= 1
 
         # === CONDITION D'ACHAT ===
-        if not position.in_position and usd > 0:
-            ema_cross_up = ema1_values[i] > ema2_values[i]
-            stoch_low = stoch_rsi_values[i] < stoch_threshold_buy
+        if not position.in_position and st.usd > 0:
+            if p.use_masks:
+                # PERF-06: mêmes conditions que ci-dessous, filtres pré-calculés
+                buy_condition = (
+                    entry_mask[i] != 0
+                    and st.cooldown_remaining == 0
+                    and stoch_rsi_values[i] < p.stoch_threshold_buy
+                    and stoch_rsi_values[i] > p.stoch_threshold_buy_min
+                )
+            else:
+                ema_cross_up = ema1_values[i] > ema2_values[i]
+                stoch_low = stoch_rsi_values[i] < p.stoch_threshold_buy
 
-            buy_condition = ema_cross_up and stoch_low
+                buy_condition = ema_cross_up and stoch_low
 
-            # A-3: block buy during cooldown after stop-loss/breakeven exit
-            if buy_condition and cooldown_remaining > 0:
-                buy_condition = False
+                # A-3: block buy during cooldown after stop-loss/breakeven exit
+                if buy_condition and st.cooldown_remaining > 0:
+                    buy_condition = False
 
-            # P2-08: Stoch RSI buy min guard
-            if buy_condition:
-                buy_condition = stoch_rsi_values[i] > stoch_threshold_buy_min
+                # P2-08: Stoch RSI buy min guard
+                if buy_condition:
+                    buy_condition = stoch_rsi_values[i] > p.stoch_threshold_buy_min
 
-            # P0-SL-GUARD: block buy if ATR invalid (NaN or <= 0)
-            if buy_condition:
-                if isnan(atr_values[i]) or atr_values[i] <= 0:
-                    buy_condition = False
+                # P0-SL-GUARD: block buy if ATR invalid (NaN or <= 0)
+                if buy_condition:
+                    if isnan(atr_values[i]) or atr_values[i] <= 0:
+                        buy_condition = False
 
-            # Filtres additionnels
-            if buy_condition and use_sma and sma_long_values is not None:
-                buy_condition = current_price > sma_long_values[i]
+                # Filtres additionnels
+                if buy_condition and p.use_sma:
+                    buy_condition = current_price > sma_long_values[i]
 
-            if buy_condition and use_adx and adx_values is not None:
-                buy_condition = adx_values[i] > adx_threshold
+                if buy_condition and p.use_adx:
+                    buy_condition = adx_values[i] > p.adx_threshold
 
-            if buy_condition and use_trix and trix_histo_values is not None:
-                buy_condition = trix_histo_values[i] > 0.0
+                if buy_condition and p.use_trix:
+                    buy_condition = trix_histo_values[i] > 0.0
 
-            # A-1: Volume filter — volume > SMA(volume)
-            if buy_condition and use_vol_filter and volume_values is not None and vol_sma_values is not None:
-                if isnan(volume_values[i]) or isnan(vol_sma_values[i]) or vol_sma_values[i] <= 0:
-                    buy_condition = False
-                else:
-                    buy_condition = volume_values[i] > vol_sma_values[i]
+                # A-1: Volume filter — volume > SMA(volume)
+                if buy_condition and p.use_vol_filter:
+                    if isnan(volume_values[i]) or isnan(vol_sma_values[i]) or vol_sma_values[i] <= 0:
+                        buy_condition = False
+                    else:
+                        buy_condition = volume_values[i] > vol_sma_values[i]
 
-            # A-2: Multi-timeframe filter — 4h trend must be bullish
-            if buy_condition and use_mtf_filter and mtf_bullish is not None:
-                buy_condition = mtf_bullish[i] > 0.5
+                # A-2: Multi-timeframe filter — 4h trend must be bullish
+                if buy_condition and p.use_mtf_filter:
+                    buy_condition = mtf_bullish[i] > 0.5
 
             if buy_condition:
                 # ACHAT au open[i+1] avec slippage (P1-02 + P1-03)
-                if open_prices is not None and i + 1 < n:
-                    fill_price = open_prices[i + 1] * (1.0 + slippage_buy)
-                else:
-                    fill_price = current_price * (1.0 + slippage_buy)
-
-                # === POSITION SIZING (P4-CYTHON) ===
-                if is_risk_mode and atr_values[i] > 0 and fill_price > 0:
-                    # Risk-based: risk_per_trade of equity per stop_distance
-                    stop_distance = atr_stop_multiplier * atr_values[i]
-                    if stop_distance > 0:
-                        risk_amount = usd * risk_per_trade
-                        qty_by_risk = risk_amount / stop_distance
-                        max_affordable = (usd * 0.98) / fill_price
-                        gross_coin = fmin(max_affordable, qty_by_risk)
-                    else:
-                        gross_coin = (usd * 0.98) / fill_price
+                if p.has_open and i + 1 < n:
+                    fill_price = open_prices[i + 1] * (1.0 + p.slippage_buy)
                 else:
-                    # Baseline: invest 98% of wallet
-                    gross_coin = (usd * 0.98) / fill_price if fill_price > 0 else 0.0
+                    fill_price = current_price * (1.0 + p.slippage_buy)
+                if p.use_cost_model and fill_price > 0:
+                    # PERF-23: participation mesurée sur la quantité au prix avant coût
+                    fill_price = fill_price * (1.0 + _fill_cost(
+                        p, i, st.total_trades, FILL_BUY, current_price, atr_values[i],
+                        _entry_coin(p, st.usd, fill_price, atr_values[i])
+                        if p.cost_participation > 0 else 0.0,
+                        volume_values[i] if p.cost_participation > 0 else 0.0,
+                    ))
+
+                # === POSITION SIZING (P4-CYTHON, PERF-22) ===
+                gross_coin = _entry_coin(p, st.usd, fill_price, atr_values[i])
 
                 if gross_coin > 0:
-                    fee_in_coin = gross_coin * taker_fee
-                    coin = gross_coin - fee_in_coin
+                    fee_in_coin = gross_coin * p.taker_fee
+                    st.coin = gross_coin - fee_in_coin
 
                     # Deduct only actual cost — preserves uninvested cash (P1-07-FIX)
                     actual_cost = gross_coin * fill_price
-                    if actual_cost > usd:
-                        actual_cost = usd
-                    position.entry_usd_invested = usd
-                    usd = usd - actual_cost
+                    if actual_cost > st.usd:
+                        actual_cost = st.usd
+                    position.entry_usd_invested = st.usd
+                    st.usd = st.usd - actual_cost
 
-                    if coin > 0:
+                    if st.coin > 0:
                         position.in_position = True
+                        position.entry_bar = i
                         position.entry_price = fill_price
                         position.max_price = fill_price
                         position.trailing_stop = 0.0
                         position.trailing_activated = False
                         position.atr_at_entry = atr_values[i]
-                        position.stop_loss = fill_price - (atr_stop_multiplier * atr_values[i])
+                        position.stop_loss = fill_price - (p.atr_stop_multiplier * atr_values[i])
                         position.partial_taken_1 = False
                         position.partial_taken_2 = False
                         position.breakeven_triggered = False
 
-                        trades.append({
-                            'type': 'BUY',
-                            'price': fill_price
-                        })
+                        if _push_trade(buf, i, -1, TRADE_BUY, REASON_NONE, fill_price, NAN,
+                                       st.coin, 0.0, fee_in_coin * fill_price, 0.0) < 0:
+                            return -1
+
+        if _end_bar(p, st, i, st.usd + (st.coin * current_price), equity_out, abort_growth):
+            return 1
+    return 0
+
+
+cdef list _trades_to_dicts(const TradeBuffer* buf):
+    """Construit la liste de dicts historique (après la boucle, GIL tenu)."""
+    cdef list trades = []
+    cdef Py_ssize_t k
+    cdef TradeRecord rec
+    for k in range(buf.size):
+        rec = buf.records[k]
+        if rec.trade_type == TRADE_BUY:
+            trades.append({'type': 'BUY', 'price': rec.entry_price})
+        elif rec.trade_type == TRADE_SELL:
+            trades.append({'type': 'SELL', 'price': rec.exit_price, 'profit': rec.pnl})
+        else:
+            trades.append({
+                'type': 'partial_sell_1' if rec.trade_type == TRADE_PARTIAL_1 else 'partial_sell_2',
+                'price': rec.exit_price,
+                'qty': rec.quantity,
+                'proceeds': rec.proceeds,
+                'profit_pct': (rec.exit_price - rec.entry_price) / rec.entry_price,
+            })
+    return trades
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef object _trades_to_log(const TradeBuffer* buf):
+    """Copie le buffer C dans un tableau numpy ``TRADE_LOG_DTYPE``."""
+    cdef Py_ssize_t k, m = buf.size
+    cdef np.ndarray[np.int64_t, ndim=1] entry_bar = np.empty(m, dtype=np.int64)
+    cdef np.ndarray[np.int64_t, ndim=1] exit_bar = np.empty(m, dtype=np.int64)
+    cdef np.ndarray[np.int8_t, ndim=1] kind = np.empty(m, dtype=np.int8)
+    cdef np.ndarray[np.int8_t, ndim=1] reason = np.empty(m, dtype=np.int8)
+    cdef np.ndarray[DTYPE_t, ndim=1] entry_price = np.empty(m, dtype=DTYPE)
+    cdef np.ndarray[DTYPE_t, ndim=1] exit_price = np.empty(m, dtype=DTYPE)
+    cdef np.ndarray[DTYPE_t, ndim=1] qty = np.empty(m, dtype=DTYPE)
+    cdef np.ndarray[DTYPE_t, ndim=1] pnl = np.empty(m, dtype=DTYPE)
+    cdef np.ndarray[DTYPE_t, ndim=1] fees = np.empty(m, dtype=DTYPE)
+    for k in range(m):
+        entry_bar[k] = buf.records[k].entry_bar
+        exit_bar[k] = buf.records[k].exit_bar
+        kind[k] = <np.int8_t>buf.records[k].trade_type
+        reason[k] = <np.int8_t>buf.records[k].reason
+        entry_price[k] = buf.records[k].entry_price
+        exit_price[k] = buf.records[k].exit_price
+        qty[k] = buf.records[k].quantity
+        pnl[k] = buf.records[k].pnl
+        fees[k] = buf.records[k].fees
+    log = np.empty(m, dtype=TRADE_LOG_DTYPE)
+    log['entry_bar'] = entry_bar
+    log['exit_bar'] = exit_bar
+    log['kind'] = kind
+    log['reason'] = reason
+    log['entry_price'] = entry_price
+    log['exit_price'] = exit_price
+    log['qty'] = qty
+    log['pnl'] = pnl
+    log['fees'] = fees
+    return log
+
+
+# Champs d'EngineState exportés dans un checkpoint (PERF-08)
+_STATE_FIELDS = (
+    'usd', 'coin', 'peak_wallet', 'max_drawdown', 'total_trades', 'winning_trades',
+    'cooldown_remaining', 'in_position', 'entry_bar', 'entry_price', 'entry_usd_invested',
+    'max_price', 'trailing_stop', 'stop_loss', 'partial_taken_1', 'partial_taken_2',
+    'trailing_activated', 'atr_at_entry', 'breakeven_triggered',
+)
+
+
+cdef dict _state_to_dict(const EngineState* st):
+    """PERF-08: état du moteur avant le bar suivant (types Python natifs)."""
+    return {
+        'usd': st.usd,
+        'coin': st.coin,
+        'peak_wallet': st.peak_wallet,
+        'max_drawdown': st.max_drawdown,
+        'total_trades': st.total_trades,
+        'winning_trades': st.winning_trades,
+        'cooldown_remaining': st.cooldown_remaining,
+        'in_position': bool(st.position.in_position),
+        'entry_bar': st.position.entry_bar,
+        'entry_price': st.position.entry_price,
+        'entry_usd_invested': st.position.entry_usd_invested,
+        'max_price': st.position.max_price,
+        'trailing_stop': st.position.trailing_stop,
+        'stop_loss': st.position.stop_loss,
+        'partial_taken_1': bool(st.position.partial_taken_1),
+        'partial_taken_2': bool(st.position.partial_taken_2),
+        'trailing_activated': bool(st.position.trailing_activated),
+        'atr_at_entry': st.position.atr_at_entry,
+        'breakeven_triggered': bool(st.position.breakeven_triggered),
+    }
+
+
+cdef void _state_from_dict(EngineState* st, dict d) except *:
+    """PERF-08: restaure un état exporté par ``_state_to_dict``."""
+    missing = [name for name in _STATE_FIELDS if name not in d]
+    if missing:
+        raise ValueError(f"resume_state: champs manquants {missing}")
+    st.usd = d['usd']
+    st.coin = d['coin']
+    st.peak_wallet = d['peak_wallet']
+    st.max_drawdown = d['max_drawdown']
+    st.total_trades = d['total_trades']
+    st.winning_trades = d['winning_trades']
+    st.cooldown_remaining = d['cooldown_remaining']
+    st.position.in_position = d['in_position']
+    st.position.entry_bar = d['entry_bar']
+    st.position.entry_price = d['entry_price']
+    st.position.entry_usd_invested = d['entry_usd_invested']
+    st.position.max_price = d['max_price']
+    st.position.trailing_stop = d['trailing_stop']
+    st.position.stop_loss = d['stop_loss']
+    st.position.partial_taken_1 = d['partial_taken_1']
+    st.position.partial_taken_2 = d['partial_taken_2']
+    st.position.trailing_activated = d['trailing_activated']
+    st.position.atr_at_entry = d['atr_at_entry']
+    st.position.breakeven_triggered = d['breakeven_triggered']
+
+
+cdef dict _simulate(
+    const double[:] close_prices,
+    const double[:] ema1_values,
+    const double[:] ema2_values,
+    const double[:] stoch_rsi_values,
+    const double[:] atr_values,
+    const double[:] sma_long_values,
+    const double[:] adx_values,
+    const double[:] trix_histo_values,
+    const double[:] open_prices,
+    const double[:] volume_values,
+    const double[:] vol_sma_values,
+    const double[:] mtf_bullish,
+    double[:] equity_out,
+    const double[:] abort_growth,
+    const unsigned char[:] entry_mask,
+    const unsigned char[:] exit_mask,
+    const EngineParams* p,
+    bint build_trade_dicts,
+    dict resume_state=None,
+    Py_ssize_t start_bar=0,
+    Py_ssize_t checkpoint_bar=-1,
+):
+    """Une simulation (état initial ou repris, boucle nogil, résultat).
+
+    PERF-08 : la boucle démarre à ``start_bar`` depuis ``resume_state`` ;
+    si ``0 <= checkpoint_bar``, l'état avant ce bar est exporté
+    (``'checkpoint'`` : ``{'bar', 'state', 'n_trades'}``, ``n_trades`` =
+    enregistrements du journal de ce run antérieurs au bar).
+    """
+    cdef Py_ssize_t n = close_prices.shape[0]
+    cdef Py_ssize_t split
+    cdef EngineState st
+    cdef TradeBuffer buf
+    cdef int status = 0
+    cdef dict checkpoint = None
+
+    _reset_position(&st.position)
+    st.usd = p.initial_wallet
+    st.coin = 0.0
+    st.peak_wallet = p.initial_wallet
+    st.max_drawdown = 0.0
+    st.total_trades = 0
+    st.winning_trades = 0
+    st.cooldown_remaining = 0
+    st.last_bar = -1
+    st.abort_reason = ABORT_NONE
+    if resume_state is not None:
+        _state_from_dict(&st, resume_state)
+        st.last_bar = start_bar - 1
+    split = checkpoint_bar if start_bar <= checkpoint_bar < n else start_bar
+
+    buf.size = 0
+    buf.capacity = 64
+    buf.records = <TradeRecord*>malloc(buf.capacity * sizeof(TradeRecord))
+    if buf.records == NULL:
+        raise MemoryError("backtest_engine_standard: allocation du buffer de trades")
+
+    try:
+        if split > start_bar:
+            with nogil:
+                status = _run_bars(
+                    close_prices, ema1_values, ema2_values, stoch_rsi_values, atr_values,
+                    sma_long_values, adx_values, trix_histo_values, open_prices,
+                    volume_values, vol_sma_values, mtf_bullish, equity_out, abort_growth,
+                    entry_mask, exit_mask, start_bar, split, p, &st, &buf,
+                )
+        if status == 0 and split == checkpoint_bar:
+            checkpoint = {'bar': split, 'state': _state_to_dict(&st), 'n_trades': buf.size}
+        if status == 0:
+            with nogil:
+                status = _run_bars(
+                    close_prices, ema1_values, ema2_values, stoch_rsi_values, atr_values,
+                    sma_long_values, adx_values, trix_histo_values, open_prices,
+                    volume_values, vol_sma_values, mtf_bullish, equity_out, abort_growth,
+                    entry_mask, exit_mask, split, n, p, &st, &buf,
+                )
+        if status < 0:
+            raise MemoryError("backtest_engine_standard: buffer de trades saturé")
+        trade_log = _trades_to_log(&buf)
+        trades = _trades_to_dicts(&buf) if build_trade_dicts else []
+    finally:
+        free(buf.records)
 
     # === CALCUL FINAL ===
     cdef double final_wallet
-    if position.in_position:
-        final_wallet = usd + (coin * close_prices[n-1])
+    if st.position.in_position:
+        final_wallet = st.usd + (st.coin * close_prices[st.last_bar])
     else:
-        final_wallet = usd
+        final_wallet = st.usd
 
     cdef double win_rate = 0.0
-    if total_trades > 0:
-        win_rate = (<double>winning_trades / <double>total_trades) * 100.0
+    if st.total_trades > 0:
+        win_rate = (<double>st.winning_trades / <double>st.total_trades) * 100.0
 
     return {
         'final_wallet': final_wallet,
         'trades': trades,
-        'max_drawdown': max_drawdown,
+        'trade_log': trade_log,
+        'max_drawdown': st.max_drawdown,
         'win_rate': win_rate,
-        'total_trades': total_trades,
-        'winning_trades': winning_trades
+        'total_trades': st.total_trades,
+        'winning_trades': st.winning_trades,
+        'status': 'pruned' if st.abort_reason != ABORT_NONE else 'completed',
+        'abort_reason': st.abort_reason,
+        'last_bar': st.last_bar,
+        'checkpoint': checkpoint,
     }
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def backtest_from_dataframe_fast(
+    const double[:] close_prices,
+    const double[:] high_prices,
+    const double[:] low_prices,
+    const double[:] ema1_values,
+    const double[:] ema2_values,
+    const double[:] stoch_rsi_values,
+    const double[:] atr_values,
+    const double[:] sma_long_values=None,
+    const double[:] adx_values=None,
+    const double[:] trix_histo_values=None,
+    const double[:] open_prices=None,
+    const double[:] volume_values=None,
+    const double[:] vol_sma_values=None,
+    double initial_wallet=10000.0,
+    str scenario='StochRSI',
+    bint use_sma=False,
+    bint use_adx=False,
+    bint use_trix=False,
+    bint use_vol_filter=False,
+    double taker_fee=0.0007,
+    double slippage_buy=0.0001,
+    double slippage_sell=0.0001,
+    double atr_multiplier=8.0,  # E-1: trailing activation optimisé
+    double atr_stop_multiplier=3.0,
+    double stoch_threshold_buy=0.8,
+    double stoch_threshold_sell=0.2,
+    double adx_threshold=25.0,
+    str sizing_mode='risk',  # B-2: risk-based sizing
+    double risk_per_trade=0.055,  # B-2: optimisé 5%→5.5% (Calmar max 2.004)
+    bint partial_enabled=False,
+    double partial_threshold_1=0.02,
+    double partial_threshold_2=0.04,
+    double partial_pct_1=0.50,
+    double partial_pct_2=0.30,
+    double min_notional=5.0,
+    double stoch_threshold_buy_min=0.05,
+    bint breakeven_enabled=True,
+    double breakeven_trigger_pct=0.015,
+    int cooldown_candles=0,
+    const double[:] mtf_bullish=None,
+    bint use_mtf_filter=False,
+    bint build_trade_dicts=True,
+    double[:] equity_out=None,
+    double abort_max_drawdown=0.0,
+    double abort_equity_floor=0.0,
+    int abort_min_trades=0,
+    Py_ssize_t abort_min_trades_bar=0,
+    object abort_min_score=None,
+    const double[:] abort_growth=None,
+    const double[:, :] stoch_grid=None,
+    dict resume_state=None,
+    Py_ssize_t start_bar=0,
+    Py_ssize_t checkpoint_bar=-1,
+    double target_volatility_pct=0.02,
+    double cost_fixed=0.0,
+    double cost_atr=0.0,
+    double cost_participation=0.0,
+    double cost_random_min=0.0,
+    double cost_random_max=0.0,
+    long long cost_seed=0
+) -> dict:
+    """
+    Moteur de backtest standard pour MULTI_SYMBOLS.py
+
+    DIFFERENCES avec la version OPTIMIZED:
+    - fills au open[i+1] avec slippage (P1-02 + P1-03)
+    - Pas de hv_values (pas de filtre HV)
+    - Constantes ATR/Stoch/ADX passées en paramètres runtime (P2-02)
+    - Risk sizing mode + partial profit taking (P4-CYTHON)
+    - ``sizing_mode`` : ``'baseline'`` (98 % du cash), ``'risk'``,
+      ``'fixed_notional'`` ou ``'volatility_parity'`` (PERF-22, formules de
+      ``position_sizing`` plafonnées à 98 % du cash, ATR du bar de signal,
+      ``target_volatility_pct``) ; un mode inconnu vaut ``'baseline'``
+    - Boucle par bar exécutée sans le GIL (PERF-02) : les threads appelants
+      s'exécutent réellement en parallèle
+    - ``trade_log`` : journal numpy structuré (PERF-03) ; la liste de dicts
+      ``trades`` n'est construite que si ``build_trade_dicts``
+    - ``equity_out`` (float64, même longueur que ``close_prices``) : reçoit
+      l'equity bar-à-bar marquée au close (PERF-04)
+    - ``abort_*`` : critères d'arrêt anticipé (PERF-05, cf. backtest_abort) ;
+      ``abort_min_score`` exige ``abort_growth`` (``growth_upper_bound``).
+      Le résultat porte ``status`` ('completed' / 'pruned'), ``abort_reason``
+      et ``last_bar``
+    - ``stoch_grid`` (k × 3 : buy_min, buy_max, sell_exit) : simule les k jeux
+      de seuils StochRSI sur les mêmes entrées (PERF-06, masques de signaux
+      calculés une fois) ; retourne ``{'batch': [résultat, ...]}`` dans
+      l'ordre des lignes.  Incompatible avec ``equity_out``
+    - ``resume_state`` / ``start_bar`` : reprend la simulation au bar
+      ``start_bar`` depuis un état exporté (PERF-08) ; ``trade_log`` ne
+      contient alors que les enregistrements de ce run et les bars antérieurs
+      ne sont pas relus.  ``checkpoint_bar`` (>= ``start_bar``) : le résultat
+      porte ``'checkpoint'`` = ``{'bar', 'state', 'n_trades'}``, état avant ce
+      bar (None si le run s'est arrêté avant)
+    - ``cost_*`` : coûts d'exécution de ``cost_model.CostModel.engine_kwargs``
+      (PERF-23), appliqués à chaque entrée et sortie complète en plus de
+      ``slippage_buy`` / ``slippage_sell`` ; ``cost_participation`` exige
+      ``volume_values``.  Tirage aléatoire counter-based (seed, bar, trade, sens)
+    """
+
+    cdef Py_ssize_t n = close_prices.shape[0]
+    cdef Py_ssize_t k
+    cdef EngineParams params
+    cdef unsigned char[:] entry_mask = None
+    cdef unsigned char[:] exit_mask = None
+
+    if stoch_grid is not None and (stoch_grid.shape[1] != 3 or equity_out is not None):
+        raise ValueError("stoch_grid: k × 3 attendu (buy_min, buy_max, sell_exit), sans equity_out")
+    if equity_out is not None and equity_out.shape[0] != n:
+        raise ValueError(
+            f"equity_out: longueur {equity_out.shape[0]} != {n} bars"
+        )
+    if abort_min_score is not None and (abort_growth is None or abort_growth.shape[0] != n):
+        raise ValueError("abort_min_score exige abort_growth de même longueur")
+    if (resume_state is not None or checkpoint_bar >= 0) and stoch_grid is not None:
+        raise ValueError("resume_state / checkpoint_bar incompatibles avec stoch_grid")
+    if resume_state is not None and not 0 <= start_bar < n:
+        raise ValueError(f"start_bar={start_bar} hors de [0, {n}[")
+    if resume_state is None and start_bar != 0:
+        raise ValueError("start_bar exige resume_state")
+    if cost_participation > 0 and (volume_values is None or volume_values.shape[0] != n):
+        raise ValueError("cost_participation exige volume_values de même longueur")
+
+    if n == 0:
+        empty = {
+            'final_wallet': 0.0,
+            'trades': [],
+            'trade_log': np.empty(0, dtype=TRADE_LOG_DTYPE),
+            'max_drawdown': 0.0,
+            'win_rate': 0.0,
+            'status': 'completed',
+            'abort_reason': ABORT_NONE,
+            'last_bar': -1,
+            'checkpoint': None,
+        }
+        if stoch_grid is not None:
+            return {'batch': [dict(empty) for k in range(stoch_grid.shape[0])]}
+        return empty
+
+    # Paramètres et flags résolus avant la boucle (aucun objet Python en nogil)
+    params.taker_fee = taker_fee
+    params.slippage_buy = slippage_buy
+    params.slippage_sell = slippage_sell
+    params.atr_multiplier = atr_multiplier
+    params.atr_stop_multiplier = atr_stop_multiplier
+    params.stoch_threshold_buy = stoch_threshold_buy
+    params.stoch_threshold_sell = stoch_threshold_sell
+    params.stoch_threshold_buy_min = stoch_threshold_buy_min
+    params.adx_threshold = adx_threshold
+    params.risk_per_trade = risk_per_trade
+    params.partial_threshold_1 = partial_threshold_1
+    params.partial_threshold_2 = partial_threshold_2
+    params.partial_pct_1 = partial_pct_1
+    params.partial_pct_2 = partial_pct_2
+    params.min_notional = min_notional
+    params.breakeven_trigger_pct = breakeven_trigger_pct
+    params.cooldown_candles = cooldown_candles
+    params.sizing_mode = SIZING_MODES.get(sizing_mode, SIZING_BASELINE)
+    params.target_volatility_pct = target_volatility_pct
+    params.partial_enabled = partial_enabled
+    params.breakeven_enabled = breakeven_enabled
+    params.use_sma = use_sma and sma_long_values is not None
+    params.use_adx = use_adx and adx_values is not None
+    params.use_trix = use_trix and trix_histo_values is not None
+    params.use_vol_filter = (
+        use_vol_filter and volume_values is not None and vol_sma_values is not None
+    )
+    params.use_mtf_filter = use_mtf_filter and mtf_bullish is not None
+    params.use_masks = False
+    params.has_open = open_prices is not None
+    params.write_equity = equity_out is not None
+    params.initial_wallet = initial_wallet
+    params.abort_max_drawdown = abort_max_drawdown
+    params.abort_equity_floor = abort_equity_floor
+    params.abort_min_trades = abort_min_trades
+    params.abort_min_trades_bar = abort_min_trades_bar
+    params.abort_use_score = abort_min_score is not None
+    params.abort_min_score = <double>abort_min_score if abort_min_score is not None else 0.0
+    params.abort_enabled = (
+        abort_max_drawdown > 0 or abort_equity_floor > 0
+        or abort_min_trades > 0 or params.abort_use_score
+    )
+    params.cost_fixed = cost_fixed
+    params.cost_atr = cost_atr
+    params.cost_participation = cost_participation
+    params.cost_random_min = cost_random_min
+    params.cost_random_max = cost_random_max
+    params.cost_seed = <uint32_t>(cost_seed & 0xFFFFFFFF)
+    params.use_cost_model = (
+        cost_fixed > 0 or cost_atr > 0 or cost_participation > 0 or cost_random_max > 0
+    )
+
+    if stoch_grid is None:
+        return _simulate(
+            close_prices, ema1_values, ema2_values, stoch_rsi_values, atr_values,
+            sma_long_values, adx_values, trix_histo_values, open_prices,
+            volume_values, vol_sma_values, mtf_bullish, equity_out, abort_growth,
+            entry_mask, exit_mask, &params, build_trade_dicts,
+            resume_state, start_bar, checkpoint_bar,
+        )
+
+    # PERF-06: masques partagés puis une simulation par ligne de la grille
+    entry_mask = np.empty(n, dtype=np.uint8)
+    exit_mask = np.empty(n, dtype=np.uint8)
+    with nogil:
+        _signal_masks(
+            close_prices, ema1_values, ema2_values, atr_values, sma_long_values,
+            adx_values, trix_histo_values, volume_values, vol_sma_values, mtf_bullish,
+            &params, entry_mask, exit_mask,
+        )
+    params.use_masks = True
+    batch = []
+    for k in range(stoch_grid.shape[0]):
+        params.stoch_threshold_buy_min = stoch_grid[k, 0]
+        params.stoch_threshold_buy = stoch_grid[k, 1]
+        params.stoch_threshold_sell = stoch_grid[k, 2]
+        batch.append(_simulate(
+            close_prices, ema1_values, ema2_values, stoch_rsi_values, atr_values,
+            sma_long_values, adx_values, trix_histo_values, open_prices,
+            volume_values, vol_sma_values, mtf_bullish, None, abort_growth,
+            entry_mask, exit_mask, &params, build_trade_dicts,
+        ))
+    return {'batch': batch}
+
+
+def backtest_threshold_batch(stoch_grid, *args, **kwargs):
+    """Grille de seuils StochRSI (PERF-06) : liste de résultats, un par ligne.
+
+    ``stoch_grid`` : tableau k × 3 (buy_min, buy_max, sell_exit) ; les autres
+    arguments sont ceux de ``backtest_from_dataframe_fast``.
+    """
+    grid = np.ascontiguousarray(stoch_grid, dtype=np.float64).reshape(-1, 3)
+    return backtest_from_dataframe_fast(*args, stoch_grid=grid, **kwargs)['batch']
+
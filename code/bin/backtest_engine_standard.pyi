@@ -6,6 +6,11 @@ import numpy as np
 import numpy.typing as npt
 
 
+ENGINE_API_LEVEL: int
+SIZING_MODES: Dict[str, int]
+TRADE_LOG_DTYPE: np.dtype[Any]
+
+
 def backtest_from_dataframe_fast(
     close_prices: npt.NDArray[np.float64],
     high_prices: npt.NDArray[np.float64],
@@ -48,4 +53,29 @@ def backtest_from_dataframe_fast(
     cooldown_candles: int = 0,
     mtf_bullish: Optional[npt.NDArray[np.float64]] = None,
     use_mtf_filter: bool = False,
+    build_trade_dicts: bool = True,
+    equity_out: Optional[np.ndarray] = None,
+    abort_max_drawdown: float = 0.0,
+    abort_equity_floor: float = 0.0,
+    abort_min_trades: int = 0,
+    abort_min_trades_bar: int = 0,
+    abort_min_score: Optional[float] = None,
+    abort_growth: Optional[np.ndarray] = None,
+    stoch_grid: Optional[np.ndarray] = None,
+    resume_state: Optional[Dict[str, Any]] = None,
+    start_bar: int = 0,
+    checkpoint_bar: int = -1,
+    target_volatility_pct: float = 0.02,
+    cost_fixed: float = 0.0,
+    cost_atr: float = 0.0,
+    cost_participation: float = 0.0,
+    cost_random_min: float = 0.0,
+    cost_random_max: float = 0.0,
+    cost_seed: int = 0,
 ) -> Dict[str, Any]: ...
+
+def backtest_threshold_batch(
+    stoch_grid: npt.ArrayLike,
+    *args: Any,
+    **kwargs: Any,
+) -> List[Dict[str, Any]]: ...
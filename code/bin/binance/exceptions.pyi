@@ -1,9 +1,12 @@
 """Minimal type stub for binance.exceptions (python-binance 1.0.35).
 
-Covers only BinanceAPIException, which is:
+Covers BinanceAPIException, which is:
   - caught as ``except BinanceAPIException as e`` in exchange_client.py
-  - its .code (int) and .message (str) attributes accessed directly
+  - its .code (int), .message (str) and .status_code (int) attributes accessed directly
   - raised manually as BinanceAPIException(response, error_code, error_msg)
+
+and BinanceRequestException, raised by async_exchange_client.py on a
+non-JSON response body.
 """
 
 from typing import Any
@@ -12,6 +15,7 @@ from typing import Any
 class BinanceAPIException(Exception):
     code: int
     message: str
+    status_code: int
 
     def __init__(
         self,
@@ -19,3 +23,9 @@ class BinanceAPIException(Exception):
         status_code: int | str,
         error_msg: str,
     ) -> None: ...
+
+
+class BinanceRequestException(Exception):
+    message: str
+
+    def __init__(self, message: str) -> None: ...
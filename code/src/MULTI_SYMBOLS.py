@@ -1,12 +1,11 @@
 # ─── Standard-library & third-party imports ─────────────────────────────────
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 import json
 import locale
 import logging
 import os
 import random  # noqa: F401 — re-export requis (tests patchent ms.random.random)
-import schedule
 import shutil
 import signal
 import sys
@@ -69,6 +68,7 @@ from indicators_engine import (                        # P3-SRP
 )
 from backtest_runner import (                          # P3-SRP
     backtest_from_dataframe,
+    backtest_threshold_grid,                           # PERF-06
     run_all_backtests as _run_all_backtests,
     run_parallel_backtests as _run_parallel_backtests,
     CYTHON_BACKTEST_AVAILABLE,
@@ -152,11 +152,21 @@ from backtest_orchestrator import (
 from constants import (                        # P1-03
     SAVE_THROTTLE_SECONDS,
     MAX_SAVE_FAILURES,
+    WF_SCENARIOS,
 )
 from cython_integrity import (                 # P1-01
     verify_cython_integrity as _verify_cython_integrity,
 )
 from metrics import write_metrics as _write_metrics  # P2-04: observabilité métriques
+from spans import (                            # PERF-18: durées des étapes
+    bind as _bind_span,
+    cycle_span as _cycle_span,
+    span as _span,
+    stage_timings as _stage_timings,
+)
+from task_scheduler import (                   # PERF-20: planificateur à priorités
+    Priority, TaskScheduler, current_scheduler,
+)
 
 try:
     # Forcer la console Windows en UTF-8 (code page 65001)
@@ -313,6 +323,8 @@ class PairState(TypedDict, total=False):
     oos_blocked_since: float               # time.time()
     # --- Drawdown kill-switch (ST-P2-02) ---
     drawdown_halted: Optional[bool]        # True si drawdown > max_drawdown_pct enété détecté
+    # --- Ré-optimisation sur dérive (PERF-21) ---
+    drift_baseline: Optional[Dict[str, Any]]  # drift_monitor.make_baseline
     # --- Display / info (écriture externe) ---
     quote_currency: str
     ticker_spot_price: float
@@ -375,13 +387,7 @@ SCENARIO_DEFAULT_PARAMS: Dict[str, Dict[str, Any]] = {
     'StochRSI_TRIX': {'stoch_period': 14, 'trix_length': 7, 'trix_signal': 15}
 }
 
-# P6-C: liste de scénarios Walk-Forward — source unique de vérité (remplaçait 3 définitions inline identiques)
-WF_SCENARIOS: List[Dict[str, Any]] = [
-    {'name': 'StochRSI',      'params': {'stoch_period': 14}},
-    {'name': 'StochRSI_SMA',  'params': {'stoch_period': 14, 'sma_long': 200}},
-    {'name': 'StochRSI_ADX',  'params': {'stoch_period': 14, 'adx_period': 14}},
-    {'name': 'StochRSI_TRIX', 'params': {'stoch_period': 14, 'trix_length': 7, 'trix_signal': 15}},
-]
+# P6-C: WF_SCENARIOS (liste de scénarios Walk-Forward) importé depuis constants.py
 
 # _cache_dir_initialized remplace par ensure_cache_dir() de cache_manager.py (Phase 4)
 
@@ -769,7 +775,7 @@ def _make_backtest_deps() -> _BacktestDeps:
         client=cast(ExchangePort, client),
         console=console,
         timeframes=timeframes,
-        schedule=schedule,
+        scheduler=current_scheduler(),
         save_fn=save_bot_state,
         send_alert_fn=send_trading_alert_email,
         send_email_alert_fn=send_email_alert,
@@ -792,6 +798,7 @@ def _make_backtest_deps() -> _BacktestDeps:
         oos_alert_lock=_oos_alert_lock,
         wf_scenarios=WF_SCENARIOS,
         scenario_default_params=SCENARIO_DEFAULT_PARAMS,
+        backtest_threshold_grid_fn=backtest_threshold_grid,
     )
 
 
@@ -855,19 +862,21 @@ def universal_calculate_indicators(df: pd.DataFrame, ema1_period: int, ema2_peri
             send_trading_alert_email(subject=subj, body_main=body, client=client)
         except Exception as _e:
             logger.warning("[INDICATORS] Email alerte impossible: %s", _e)
-    return _universal_calculate_indicators(
-        df, ema1_period, ema2_period, stoch_period=stoch_period,
-        sma_long=sma_long, adx_period=adx_period,
-        trix_length=trix_length, trix_signal=trix_signal,
-        on_error=_on_error,
-    )
+    with _span('indicators'):
+        return _universal_calculate_indicators(
+            df, ema1_period, ema2_period, stoch_period=stoch_period,
+            sma_long=sma_long, adx_period=adx_period,
+            trix_length=trix_length, trix_signal=trix_signal,
+            on_error=_on_error,
+        )
 
 # --- Backtest Functions ---
 def prepare_base_dataframe(pair: str, timeframe: str, start_date: str, stoch_period: int = 14) -> Optional[pd.DataFrame]:
-    return _prepare_base_dataframe(
-        pair, timeframe, start_date, stoch_period=stoch_period,
-        fetch_data_fn=fetch_historical_data,
-    )
+    with _span('prepare'):
+        return _prepare_base_dataframe(
+            pair, timeframe, start_date, stoch_period=stoch_period,
+            fetch_data_fn=fetch_historical_data,
+        )
 
 def get_binance_trading_fees(client: Any, symbol: str = 'TRXUSDC') -> Tuple[float, float]:
     """Thin wrapper — delegates to data_fetcher with config fallbacks."""
@@ -1138,7 +1147,7 @@ def _sync_order_history(real_trading_pair: str, pair_state: 'PairState') -> Tupl
     return orders, last_side
 
 
-def execute_real_trades(real_trading_pair: str, time_interval: str, best_params: Dict[str, Any], backtest_pair: str, sizing_mode: str = 'risk') -> None:
+def execute_real_trades(real_trading_pair: str, time_interval: str, best_params: Dict[str, Any], backtest_pair: str, sizing_mode: str = 'risk', lock_wait: float = 0.0) -> None:
     """
     Exécution complète des trades réels avec gestion totale du cycle achat/vente,
     stop-loss, trailing-stop, sniper entry, envoi d'emails d'alerte et affichage console.
@@ -1147,16 +1156,19 @@ def execute_real_trades(real_trading_pair: str, time_interval: str, best_params:
     Args:
         sizing_mode: Position sizing strategy ('baseline', 'risk', 'fixed_notional', 'volatility_parity')
                     DEFAULT='risk' (P1-07: risk-based ATR stop au lieu de 95% capital)
+        lock_wait: Attente max. (s) du verrou de la paire ; 0 = cycle ignoré si la
+                   paire est occupée (PERF-20: le cycle live attend la fin de
+                   l'exécution horaire pour ne pas sauter la gestion des stops)
     """
     # === PROTECTION CONTRE LES EXÉCUTIONS CONCURRENTES PAR PAIRE (C-01 / C-02) ===
-    # Non-blocking acquire : si une exécution est déjà en cours pour cette paire,
-    # on ignore silencieusement ce cycle pour éviter les double-partiels et les
+    # Acquire borné par lock_wait : si une exécution est encore en cours pour
+    # cette paire, on ignore ce cycle pour éviter les double-partiels et les
     # race conditions sur bot_state / pair_state.
     with _pair_locks_mutex:
         if backtest_pair not in _pair_execution_locks:
             _pair_execution_locks[backtest_pair] = threading.Lock()
     _pair_lock = _pair_execution_locks[backtest_pair]
-    if not _pair_lock.acquire(blocking=False):
+    if not _pair_lock.acquire(timeout=max(0.0, lock_wait)):
         logger.warning(f"[CONCURRENCE] Exécution concurrente détectée pour {backtest_pair} — cycle ignoré (C-02)")
         return
     try:
@@ -1511,14 +1523,16 @@ def _execute_real_trades_inner(real_trading_pair: str, time_interval: str, best_
 
 def detect_market_changes(pair: str, timeframes: List[str], start_date: str) -> Dict[str, Any]:
     # P3-SRP: delegated to market_analysis.py
-    return _detect_market_changes(pair, timeframes, start_date, prepare_base_dataframe)
+    # PERF-16: indicateurs calculés sur la fenêtre de warm-up seulement
+    return _detect_market_changes(pair, timeframes, start_date, fetch_data_fn=fetch_historical_data)
 
 # display_market_changes extraite dans display_ui.py (Phase 5)
 
 def backtest_and_display_results(backtest_pair: str, real_trading_pair: str, start_date: str, timeframes: List[str], sizing_mode: str = 'risk') -> None:
     """C-03 Phase 3 wrapper ? delegue a backtest_orchestrator._backtest_and_display_results."""
     deps = _make_backtest_deps()
-    _backtest_and_display_results(backtest_pair, real_trading_pair, start_date, timeframes, sizing_mode, deps)
+    with _cycle_span('backtest_cycle'):
+        _backtest_and_display_results(backtest_pair, real_trading_pair, start_date, timeframes, sizing_mode, deps)
 
     # OOS-STREAK (scheduled): suit les cycles consécutifs avec oos_blocked=True.
     # Renforce la persistance du blocage (prévient un unblock par gate IS seule).
@@ -1551,6 +1565,15 @@ if __name__ == "__main__":
     full_timestamp_resync()
     logger.info("Synchronisation complète exécutée au démarrage.")
 
+    # PERF-01: créer le pool de processus avant le démarrage des threads
+    # (workers forkés ici, pré-chauffés dès le premier cycle de backtests)
+    if config.backtest_executor == 'process':
+        try:
+            from backtest_executor import get_process_pool
+            get_process_pool()
+        except Exception as _pool_err:
+            logger.warning("[PERF-01] Pool de processus indisponible: %s", _pool_err)
+
     # MODE ULTRA-ROBUSTE SANS POPUP - COMPENSATION BINANCE PURE
     logger.info("Bot crypto H24/7 - Mode ultra-robuste avec privileges admin")
 
@@ -1739,16 +1762,23 @@ if __name__ == "__main__":
                 logger.warning("[RECONCILE] Email alerte impossible: %s", _mail_err)
 
         logger.info("Script demarre. Planification initiale en cours...")
-        # Purge préventive: supprimer toute planification résiduelle
-        # Nettoyage renforcé de la planification
-        try:
-            schedule.clear()
-            logger.info("Planification nettoyee au demarrage (schedule.clear())")
-        except Exception as _clear_ex:
-            logger.debug(f"Echec nettoyage planification au demarrage: {_clear_ex}")
+
+        # PERF-20: planificateur à priorités (remplace schedule dans la boucle principale).
+        # Files persistantes : la ré-optimisation horaire tourne en arrière-plan
+        # et ne retarde plus le cycle live ni la gestion des stops.
+        def _on_job_error(exc: Exception, job_name: str) -> None:
+            # error_handler est initialisé avant la première exécution planifiée
+            error_handler.handle_error(error=exc, context=f"scheduler:{job_name}", critical=False)
+
+        _scheduler = TaskScheduler(
+            foreground_workers=config.scheduler_foreground_workers,
+            background_workers=config.scheduler_background_workers,
+            on_error=_on_job_error,
+            max_pause=config.scheduler_max_pause,
+        ).install()
 
         # Planification du nettoyage du cache tous les 30 jours
-        schedule.every(30).days.do(cleanup_expired_cache)
+        _scheduler.every(30 * 86400, cleanup_expired_cache, priority=Priority.REOPTIMIZATION)
         logger.info("Nettoyage automatique du cache planifié: tous les 30 jours")
 
         # P1-08: Resynchronisation timestamp périodique (toutes les 30 min)
@@ -1760,7 +1790,7 @@ if __name__ == "__main__":
                 logger.info("[TIMESTAMP P1-08] Resync périodique OK")
             except Exception as _ts_err:
                 logger.warning("[TIMESTAMP P1-08] Resync échouée: %s", _ts_err)
-        schedule.every(30).minutes.do(_periodic_timestamp_resync)
+        _scheduler.every(30 * 60, _periodic_timestamp_resync, priority=Priority.LIVE)
         logger.info("[TIMESTAMP P1-08] Resync timestamp planifiée: toutes les 30 min")
 
         # P2-04: Export métriques toutes les 5 minutes
@@ -1772,10 +1802,12 @@ if __name__ == "__main__":
                     runtime=_runtime,
                     circuit_breaker=cb,
                     pairs=[p['backtest_pair'] for p in crypto_pairs],
+                    stage_timings=_stage_timings(),
+                    scheduler=_scheduler.stats(),
                 )
             except Exception as _m_err:
                 logger.debug("[METRICS P2-04] Échec export: %s", _m_err)
-        schedule.every(5).minutes.do(_periodic_metrics_write)
+        _scheduler.every(5 * 60, _periodic_metrics_write, priority=Priority.METRICS)
         logger.info("[METRICS P2-04] Export métriques planifié: toutes les 5 min")
 
         # D-10: écriture initiale immédiate pour que le dashboard ait les fees dès le démarrage
@@ -1839,6 +1871,7 @@ if __name__ == "__main__":
                             backtest_fn=backtest_from_dataframe,
                             scenario_default_params=SCENARIO_DEFAULT_PARAMS,
                             sizing_mode=args.sizing_mode,
+                            batch_fn=backtest_threshold_grid,
                         )
                         if _stoch_opt_startup:
                             config.update_stoch_thresholds(
@@ -1876,6 +1909,7 @@ if __name__ == "__main__":
                     initial_capital=config.initial_wallet,
                     sizing_mode=args.sizing_mode,
                     n_trials=100,
+                    pair=backtest_pair,  # PERF-12: étude persistée par paire
                 )
                 # Fallback grid WF si Optuna ne passe pas les OOS gates
                 if not _wf_res_startup.get('any_passed'):
@@ -2013,6 +2047,7 @@ if __name__ == "__main__":
             })
         _sizing_mode = args.sizing_mode
 
+        @_cycle_span('live_cycle')
         def _dispatch_live_parallel() -> None:
             """Dispatch le live trading de toutes les paires en parallèle (toutes les 2 min)."""
             n_pairs = len(_pair_configs)
@@ -2023,20 +2058,22 @@ if __name__ == "__main__":
                 pc = _pair_configs[0]
                 execute_live_trading_only(pc['real_pair'], pc['backtest_pair'], _sizing_mode)
                 return
-            with ThreadPoolExecutor(max_workers=n_pairs, thread_name_prefix='live') as pool:
-                futures = {}
-                for pc in _pair_configs:
-                    f = pool.submit(
-                        execute_live_trading_only,
-                        pc['real_pair'], pc['backtest_pair'], _sizing_mode,
-                    )
-                    futures[f] = pc['backtest_pair']
-                for f in as_completed(futures):
-                    try:
-                        f.result()
-                    except Exception as _e:
-                        logger.error("[PARALLEL] %s live error: %s", futures[f], _e)
+            # PERF-20: pool persistant (plus de ThreadPoolExecutor recréé à chaque cycle)
+            pool = _scheduler.executor('live', n_pairs, foreground=True)
+            futures = {}
+            for pc in _pair_configs:
+                f = pool.submit(
+                    _bind_span(execute_live_trading_only),
+                    pc['real_pair'], pc['backtest_pair'], _sizing_mode,
+                )
+                futures[f] = pc['backtest_pair']
+            for f in as_completed(futures):
+                try:
+                    f.result()
+                except Exception as _e:
+                    logger.error("[PARALLEL] %s live error: %s", futures[f], _e)
 
+        @_cycle_span('scheduled_cycle')
         def _dispatch_scheduled_parallel() -> None:
             """Dispatch le backtest + WF + trading de toutes les paires en parallèle (toutes les 60 min)."""
             n_pairs = len(_pair_configs)
@@ -2049,33 +2086,33 @@ if __name__ == "__main__":
                 tf = p0.get('timeframe', '4h')
                 execute_scheduled_trading(pc['real_pair'], tf, p0, bp, _sizing_mode)
                 return
-            with ThreadPoolExecutor(max_workers=n_pairs, thread_name_prefix='sched') as pool:
-                futures = {}
-                for pc in _pair_configs:
-                    bp = pc['backtest_pair']
-                    p0 = _read_live_params(bp, {})
-                    tf = p0.get('timeframe', '4h')
-                    f = pool.submit(
-                        execute_scheduled_trading,
-                        pc['real_pair'], tf, p0, bp, _sizing_mode,
-                    )
-                    futures[f] = bp
-                for f in as_completed(futures):
-                    try:
-                        f.result()
-                    except Exception as _e:
-                        logger.error("[PARALLEL] %s scheduled error: %s", futures[f], _e)
+            pool = _scheduler.executor('sched', n_pairs)  # PERF-20: pool persistant
+            futures = {}
+            for pc in _pair_configs:
+                bp = pc['backtest_pair']
+                p0 = _read_live_params(bp, {})
+                tf = p0.get('timeframe', '4h')
+                f = pool.submit(
+                    _bind_span(execute_scheduled_trading),
+                    pc['real_pair'], tf, p0, bp, _sizing_mode,
+                )
+                futures[f] = bp
+            for f in as_completed(futures):
+                try:
+                    f.result()
+                except Exception as _e:
+                    logger.error("[PARALLEL] %s scheduled error: %s", futures[f], _e)
 
-        # ── Tâche groupée 1 : backtest + WF + trading → toutes les heures ──
-        schedule.every(60).minutes.do(_dispatch_scheduled_parallel)
-        # ── Tâche groupée 2 : live trading → toutes les 2 minutes ──
-        schedule.every(2).minutes.do(_dispatch_live_parallel).tag('live')
+        # ── Tâche groupée 1 : backtest + WF + trading → toutes les heures (arrière-plan) ──
+        _scheduler.every(60 * 60, _dispatch_scheduled_parallel, priority=Priority.REOPTIMIZATION)
+        # ── Tâche groupée 2 : live trading (signaux + stops) → toutes les 2 minutes ──
+        _scheduler.every(2 * 60, _dispatch_live_parallel, priority=Priority.LIVE)
 
         logger.info(
             "[PARALLEL] %d paire(s) configurée(s) — exécution parallèle activée",
             len(_pair_configs),
         )
-        logger.info(f"Tâches planifiées actives: {len(schedule.jobs)}")
+        logger.info(f"Tâches planifiées actives: {len(_scheduler.jobs)}")
 
         # === BOUCLE PRINCIPALE ===
         # C-04: Handler SIGTERM/SIGINT pour graceful shutdown (PM2, taskkill, systemd, Ctrl+C)
@@ -2128,7 +2165,7 @@ if __name__ == "__main__":
             )
         atexit.register(_atexit_verify)
 
-        display_bot_active_banner(len(schedule.jobs), schedule.next_run(), console)
+        display_bot_active_banner(len(_scheduler.jobs), _scheduler.next_run(), console)
 
         logger.info("Bot actif - Surveillance des signaux de trading...")
         logger.info("Initialisation du gestionnaire d'erreurs...")
@@ -2154,12 +2191,13 @@ if __name__ == "__main__":
                         continue
 
                     # Execute scheduled tasks with error handling
+                    # PERF-20: non bloquant — les tâches dues partent dans leur file
                     try:
-                        schedule.run_pending()
+                        _scheduler.run_pending()
                     except Exception as e:
                         should_continue, _ = error_handler.handle_error(
                             error=e,
-                            context="schedule.run_pending()",
+                            context="scheduler.run_pending()",
                             critical=False
                         )
                         if not should_continue:
@@ -2178,9 +2216,7 @@ if __name__ == "__main__":
 
                     # Affichage du temps restant avant la prochaine exécution
                     now = datetime.now()
-                    _live_jobs = schedule.get_jobs('live')
-                    _live_runs = [_j.next_run for _j in _live_jobs if _j.next_run is not None]
-                    next_run = min(_live_runs) if _live_runs else schedule.next_run()
+                    next_run = _scheduler.next_run(Priority.LIVE) or _scheduler.next_run()
                     if next_run:
                         delta = next_run - now
                         seconds_left = max(0, int(delta.total_seconds()))
@@ -2222,8 +2258,11 @@ if __name__ == "__main__":
 
                     # Attente réactive en tranches de 1s — CTRL+C répond dans la seconde
                     # sur Windows (Event.wait(120) bloque jusqu'à 2 min avant de vérifier)
+                    # PERF-20: réveil à la prochaine échéance (run_pending ne bloque plus)
+                    _idle = _scheduler.idle_seconds()
+                    _wait_s = min(120.0, _idle if _idle is not None else 120.0)
                     _t0 = time.monotonic()
-                    while not _shutdown_event.wait(1) and time.monotonic() - _t0 < 120:
+                    while not _shutdown_event.wait(1) and time.monotonic() - _t0 < _wait_s:
                         pass
 
                 except Exception as e:
@@ -2242,6 +2281,7 @@ if __name__ == "__main__":
                         _shutdown_event.wait(30)
             # P3-01: boucle terminée → nettoyage unique
             logger.info("[SHUTDOWN] Boucle principale terminée — nettoyage")
+            _scheduler.shutdown(timeout=30.0)  # PERF-20: laisser finir les cycles en cours
             save_bot_state(force=True)
             if not _shutdown_verified.is_set():
                 _shutdown_verified.set()
@@ -0,0 +1,434 @@
+"""
+async_exchange_client.py — Client Binance asynchrone (aiohttp) et pont ``ExchangePort``.
+
+``BinanceFinalClient._request`` passe par le ``Client`` synchrone de
+python-binance : chaque thread de paire bloque sur sa propre requête et les
+attentes de backoff (10 s, 20 s, 30 s) immobilisent le thread qui les subit.
+
+``AsyncBinanceClient`` expose les méthodes de ``ExchangePort`` sous forme de
+coroutines, sur une session aiohttp unique :
+
+- pool de connexions keep-alive (``config.exchange_pool_size``,
+  ``config.exchange_keepalive_seconds``) partagé par toutes les paires ;
+- signature HMAC-SHA256 de la query string (``timestamp`` + ``recvWindow``),
+  clé dans l'en-tête ``X-MBX-APIKEY`` ;
+- mêmes règles que ``BinanceFinalClient._request`` : jeton du rate limiter
+  partagé (C-05), circuit breaker partagé (TS-P2-01), resynchronisation de
+  l'horloge sur l'erreur -1021, retries avec backoff sur erreur réseau
+  (``asyncio.sleep`` : aucun thread bloqué) ;
+- même correspondance d'erreurs : réponse HTTP hors 2xx →
+  ``BinanceAPIException`` (``code``, ``message``, ``status_code``), corps
+  non JSON → ``BinanceRequestException``, quarantaine → ``CircuitOpenError``.
+
+``SyncExchangeBridge`` fait tourner une boucle asyncio dans un thread dédié
+et présente l'interface synchrone de ``ExchangePort`` : les appelants
+existants (``order_manager``, ``position_reconciler``...) l'utilisent sans
+modification, et leurs requêtes sont multiplexées sur le même pool.
+``submit`` / ``gather`` soumettent plusieurs requêtes sans attendre chacune
+(ex. soldes et tickers de toutes les paires d'un cycle live).
+
+Public API
+----------
+- ``AsyncBinanceClient``
+- ``SyncExchangeBridge``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+import types
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlencode
+
+import aiohttp
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+from bot_config import config as _config
+from exchange_client import (
+    _api_rate_limiter, _check_circuit, _clamped_offset, _record_circuit_failure,
+    _record_circuit_success, _retry_backoff,
+)
+from spans import timed  # PERF-18: durées des appels API
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+BINANCE_API_URL = 'https://api.binance.com'
+
+
+def _error_response(resp: aiohttp.ClientResponse, text: str) -> Any:
+    """Réponse au format ``requests`` lue par ``BinanceAPIException`` (``text``, ``status_code``)."""
+    return types.SimpleNamespace(
+        status_code=resp.status, text=text, url=str(resp.url), headers=dict(resp.headers),
+    )
+
+
+class AsyncBinanceClient:
+    """Client REST Binance asynchrone (coroutines de ``ExchangePort``).
+
+    La session aiohttp est créée au premier appel, dans la boucle qui
+    l'exécute : une instance s'utilise depuis une seule boucle.
+
+    Parameters
+    ----------
+    api_key, api_secret : str
+        Clés API Binance.
+    base_url : str
+        Racine de l'API REST (serveur de test dans les tests).
+    timeout : float, optional
+        Délai maximal d'une requête (s) ; défaut ``config.api_timeout``.
+    pool_size : int, optional
+        Connexions simultanées ; défaut ``config.exchange_pool_size``.
+    keepalive : float, optional
+        Durée de vie d'une connexion inactive (s) ; défaut
+        ``config.exchange_keepalive_seconds``.
+    max_retries : int
+        Tentatives par requête (erreur réseau ou -1021).
+    backoff : callable, optional
+        ``backoff(attempt) -> secondes`` avant la tentative suivante après une
+        erreur réseau (défaut 10 s, 20 s, 30 s max).
+    resync_delay : float
+        Attente (s) après resynchronisation sur l'erreur -1021.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        *,
+        base_url: str = BINANCE_API_URL,
+        timeout: Optional[float] = None,
+        pool_size: Optional[int] = None,
+        keepalive: Optional[float] = None,
+        max_retries: int = 3,
+        backoff: Optional[Callable[[int], float]] = None,
+        resync_delay: float = 2.0,
+    ) -> None:
+        self.api_key = api_key
+        self._secret = api_secret.encode()
+        self.base_url = base_url.rstrip('/')
+        self.timeout = float(timeout if timeout is not None else getattr(_config, 'api_timeout', 30))
+        self.pool_size = int(pool_size or getattr(_config, 'exchange_pool_size', 20))
+        self.keepalive = float(
+            keepalive if keepalive is not None
+            else getattr(_config, 'exchange_keepalive_seconds', 30.0)
+        )
+        self.recv_window = int(getattr(_config, 'recv_window', 60000))
+        self.max_retries = max(1, int(max_retries))
+        self._backoff = backoff or _retry_backoff
+        self.resync_delay = float(resync_delay)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._server_time_offset: int = -2000
+        self._last_sync: float = 0.0
+        self._error_count = 0
+
+    async def __aenter__(self) -> 'AsyncBinanceClient':
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, keepalive_timeout=self.keepalive,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'X-MBX-APIKEY': self.api_key, 'Accept': 'application/json'},
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Ferme la session et ses connexions."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    # ── Horloge ───────────────────────────────────────────────────────────
+    async def sync_time(self) -> None:
+        """Offset horloge locale / Binance (cf. ``BinanceFinalClient._perform_ultra_robust_sync``)."""
+        try:
+            local_before = int(time.time() * 1000)
+            server_time = (await self._request('GET', '/api/v3/time', retry=False))['serverTime']
+            local_after = int(time.time() * 1000)
+            self._server_time_offset, real_offset, latency = _clamped_offset(
+                server_time, local_before, local_after
+            )
+            self._last_sync = time.time()
+            self._error_count = 0
+            logger.info(
+                "SYNCHRO OK (async): offset=%sms (real=%sms, latency=%sms)",
+                self._server_time_offset, real_offset, latency,
+            )
+        except Exception as e:
+            logger.error("Echec synchronisation (async): %s", e)
+            self._server_time_offset = -2000  # fallback conservateur
+
+    async def _timestamp(self) -> int:
+        if time.time() - self._last_sync > 60 or self._error_count > 0:
+            await self.sync_time()
+        return int(time.time() * 1000) + self._server_time_offset
+
+    def _signed_query(self, params: Dict[str, Any]) -> str:
+        query = urlencode(params)
+        signature = hmac.new(self._secret, query.encode(), hashlib.sha256).hexdigest()
+        return f"{query}&signature={signature}"
+
+    # ── Requête ───────────────────────────────────────────────────────────
+    @staticmethod
+    async def _acquire_token(timeout: float = 30.0) -> None:
+        """C-05: jeton du rate limiter partagé avec le client synchrone, sans bloquer la boucle."""
+        deadline = time.time() + timeout
+        while not _api_rate_limiter.try_acquire():
+            if time.time() > deadline:
+                logger.warning("[RATE LIMITER] Timeout en attendant un token API")
+                return
+            await asyncio.sleep(0.05)
+
+    async def _send(self, method: str, path: str, signed: bool, params: Dict[str, Any]) -> Any:
+        if signed:
+            params = dict(params, timestamp=await self._timestamp(), recvWindow=self.recv_window)
+            query = self._signed_query(params)
+        else:
+            query = urlencode(params)
+        url = f"{self.base_url}{path}" + (f"?{query}" if query else '')
+        async with self._get_session().request(method, url) as resp:
+            text = await resp.text()
+            if not 200 <= resp.status < 300:
+                raise BinanceAPIException(_error_response(resp, text), resp.status, text)
+        try:
+            return json.loads(text)
+        except ValueError:
+            raise BinanceRequestException(f"Invalid Response: {text}") from None
+
+    async def _request(
+        self, method: str, path: str, signed: bool = False, *, retry: bool = True,
+        **params: Any,
+    ) -> Any:
+        """Requête REST avec les règles de ``BinanceFinalClient._request``."""
+        params = {k: v for k, v in params.items() if v is not None}
+        attempts = self.max_retries if retry else 1
+        for attempt in range(attempts):
+            # TS-P2-01: circuit breaker — bloquer si l'API Binance est en quarantaine
+            _check_circuit()
+            try:
+                await self._acquire_token()
+                result = await self._send(method, path, signed, params)
+                self._error_count = max(0, self._error_count - 1)
+                _record_circuit_success()
+                return result
+            except BinanceAPIException as e:
+                if getattr(e, 'code', None) == -1021 and retry:
+                    self._error_count += 1
+                    logger.warning(
+                        "Erreur -1021 détectée (tentative %d), resync obligatoire", attempt + 1
+                    )
+                    await self.sync_time()
+                    if attempt < attempts - 1:
+                        await asyncio.sleep(self.resync_delay)
+                        continue
+                elif getattr(e, 'code', None) == -1101:
+                    logger.error("BinanceAPIException -1101 (Duplicate recvWindow): %s", e)
+                else:
+                    logger.error("BinanceAPIException: %s", e)
+                raise
+            except Exception as e:
+                logger.error("Erreur inattendue dans _request (async): %r", e)
+                if attempt < attempts - 1:
+                    backoff = self._backoff(attempt)
+                    logger.warning(
+                        "_request: retry %d/%d après %ss", attempt + 1, attempts, backoff
+                    )
+                    await asyncio.sleep(backoff)
+                    continue
+                _record_circuit_failure(e)
+                raise
+        return None
+
+    # ── ExchangePort : lecture de soldes et infos marché ───────────────────
+    async def ping(self) -> Dict[str, Any]:
+        return await self._request('GET', '/api/v3/ping')
+
+    async def get_server_time(self, **params: Any) -> Dict[str, Any]:
+        return await self._request('GET', '/api/v3/time', **params)
+
+    async def get_account(self, **params: Any) -> Dict[str, Any]:
+        return await self._request('GET', '/api/v3/account', True, **params)
+
+    async def get_all_tickers(self, **params: Any) -> List[Dict[str, Any]]:
+        return await self._request('GET', '/api/v3/ticker/price', **params)
+
+    async def get_symbol_ticker(self, **params: Any) -> Dict[str, Any]:
+        return await self._request('GET', '/api/v3/ticker/price', **params)
+
+    async def get_exchange_info(self, **params: Any) -> Dict[str, Any]:
+        return await self._request('GET', '/api/v3/exchangeInfo', **params)
+
+    async def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Informations du symbole, ou None s'il est inconnu (comme python-binance)."""
+        try:
+            info = await self.get_exchange_info(symbol=symbol)
+        except BinanceAPIException as e:
+            if getattr(e, 'code', None) == -1121:  # Invalid symbol
+                return None
+            raise
+        for item in info.get('symbols', ()):
+            if item.get('symbol') == symbol.upper():
+                return item
+        return None
+
+    # ── ExchangePort : lecture d'ordres ─────────────────────────────────────
+    async def get_order(self, **params: Any) -> Dict[str, Any]:
+        return await self._request('GET', '/api/v3/order', True, **params)
+
+    async def get_all_orders(self, **params: Any) -> List[Dict[str, Any]]:
+        return await self._request('GET', '/api/v3/allOrders', True, **params)
+
+    async def get_open_orders(self, **params: Any) -> List[Dict[str, Any]]:
+        return await self._request('GET', '/api/v3/openOrders', True, **params)
+
+    async def get_my_trades(self, **params: Any) -> List[Dict[str, Any]]:
+        return await self._request('GET', '/api/v3/myTrades', True, **params)
+
+    async def get_trade_fee(self, **params: Any) -> List[Dict[str, Any]]:
+        return await self._request('GET', '/sapi/v1/asset/tradeFee', True, **params)
+
+    # ── ExchangePort : placement d'ordres ───────────────────────────────────
+    async def create_order(self, **params: Any) -> Dict[str, Any]:
+        return await self._request('POST', '/api/v3/order', True, **params)
+
+    async def order_market_buy(self, **params: Any) -> Dict[str, Any]:
+        return await self.create_order(side='BUY', type='MARKET', **params)
+
+    async def order_market_sell(self, **params: Any) -> Dict[str, Any]:
+        return await self.create_order(side='SELL', type='MARKET', **params)
+
+    async def cancel_order(self, **params: Any) -> Dict[str, Any]:
+        return await self._request('DELETE', '/api/v3/order', True, **params)
+
+
+class SyncExchangeBridge:
+    """``ExchangePort`` synchrone adossé à un ``AsyncBinanceClient``.
+
+    Une boucle asyncio tourne dans un thread démon ; chaque méthode y soumet
+    la coroutine correspondante et attend son résultat.  Les exceptions du
+    client (``BinanceAPIException``, ``CircuitOpenError``...) sont relevées
+    telles quelles dans le thread appelant.
+
+    Parameters
+    ----------
+    client : AsyncBinanceClient
+        Client utilisé exclusivement depuis la boucle du pont.
+    call_timeout : float, optional
+        Attente maximale d'un appel synchrone (s) ; None : celle du client
+        (retries et backoffs compris).
+    """
+
+    def __init__(self, client: AsyncBinanceClient, *, call_timeout: Optional[float] = None) -> None:
+        self.client = client
+        self.call_timeout = call_timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name='exchange-io', daemon=True,
+        )
+        self._thread.start()
+        self._closed = False
+
+    def submit(self, coro: Awaitable[T]) -> 'concurrent.futures.Future[T]':
+        """Planifie ``coro`` sur la boucle du pont ; retourne immédiatement."""
+        if self._closed:
+            raise RuntimeError("SyncExchangeBridge fermé")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)  # type: ignore[arg-type]
+
+    @timed('exchange.api')
+    def run(self, coro: Awaitable[T]) -> T:
+        """Exécute ``coro`` sur la boucle du pont et attend son résultat."""
+        return self.submit(coro).result(timeout=self.call_timeout)
+
+    def gather(self, *coros: Awaitable[Any], return_exceptions: bool = False) -> List[Any]:
+        """Exécute plusieurs requêtes simultanément (ordre des résultats conservé)."""
+        async def _all() -> List[Any]:
+            return list(await asyncio.gather(*coros, return_exceptions=return_exceptions))
+        return self.run(_all())
+
+    def close(self) -> None:
+        """Ferme la session puis arrête la boucle et son thread."""
+        if self._closed:
+            return
+        try:
+            self.run(self.client.close())
+        finally:
+            self._closed = True
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            if not self._thread.is_alive():
+                self._loop.close()
+
+    def __enter__(self) -> 'SyncExchangeBridge':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # Compatibilité timestamp_utils / MULTI_SYMBOLS (resynchronisation horloge)
+    def _sync_server_time(self) -> None:
+        self.run(self.client.sync_time())
+
+    def ping(self) -> Dict[str, Any]:
+        return self.run(self.client.ping())
+
+    # ── ExchangePort ─────────────────────────────────────────────────────────
+    def get_account(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.run(self.client.get_account(**kwargs))
+
+    def get_all_tickers(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        return self.run(self.client.get_all_tickers(**kwargs))
+
+    def get_exchange_info(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.run(self.client.get_exchange_info(**kwargs))
+
+    def get_symbol_ticker(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.run(self.client.get_symbol_ticker(**kwargs))
+
+    def get_symbol_info(self, symbol: str) -> Any:
+        return self.run(self.client.get_symbol_info(symbol))
+
+    def get_server_time(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.run(self.client.get_server_time(**kwargs))
+
+    def get_order(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.run(self.client.get_order(**kwargs))
+
+    def get_all_orders(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        return self.run(self.client.get_all_orders(**kwargs))
+
+    def get_open_orders(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        return self.run(self.client.get_open_orders(**kwargs))
+
+    def get_my_trades(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        return self.run(self.client.get_my_trades(**kwargs))
+
+    def get_trade_fee(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        return self.run(self.client.get_trade_fee(**kwargs))
+
+    def order_market_buy(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.run(self.client.order_market_buy(**kwargs))
+
+    def order_market_sell(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.run(self.client.order_market_sell(**kwargs))
+
+    def create_order(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.run(self.client.create_order(**kwargs))
+
+    def cancel_order(self, **kwargs: Any) -> Dict[str, Any]:
+        return self.run(self.client.cancel_order(**kwargs))
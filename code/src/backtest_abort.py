@@ -0,0 +1,210 @@
+"""
+backtest_abort.py — Arrêt anticipé des configurations de backtest sans espoir.
+
+Les balayages (``run_all_backtests``, grid search StochRSI, essais Optuna)
+simulent chaque configuration jusqu'à la dernière bougie, même quand elle a
+déjà perdu une large part du capital ou ne peut plus atteindre le
+classement.  ``AbortCriteria`` décrit des bornes optionnelles évaluées en fin
+de chaque bar par le moteur (Cython et boucle Python) :
+
+- ``max_drawdown``   : drawdown inline maximal toléré (fraction) ;
+- ``equity_floor``   : equity mark-to-market minimale (USDC) ;
+- ``min_trades`` / ``min_trades_bar`` : nombre minimal de positions ouvertes
+  au bar ``min_trades_bar`` ;
+- ``min_score``      : borne de classement — score Calmar
+  (``trade_helpers.calmar_key``) que la configuration doit encore pouvoir
+  atteindre.
+
+La borne de classement est **exacte** : ``growth_upper_bound`` majore la
+croissance d'une stratégie long-only sur les bars restants (produit des
+hausses open/close), une configuration n'est arrêtée que si même ce scénario
+optimal ne peut pas battre ``min_score``.  Elle n'est évaluée que hors
+position : l'equity mark-to-market y est égale à l'equity des trades
+clôturés, la borne vaut donc aussi pour ``calmar_ratio`` (trade-level).
+
+Le moteur renvoie alors ``status='pruned'`` avec des métriques partielles
+(calculées sur les bars simulés).
+
+Public API
+----------
+- ``AbortCriteria``
+- ``ABORT_*``, ``abort_reason_label``
+- ``growth_upper_bound``
+- ``score_upper_bound``
+- ``check_abort``
+- ``Leaderboard``
+- ``abort_criteria_from_config``
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from trade_helpers import calmar_key
+
+# Motifs d'arrêt (identiques à l'enum ABORT_* de backtest_engine_standard.pyx)
+ABORT_NONE = 0
+ABORT_MAX_DRAWDOWN = 1
+ABORT_EQUITY_FLOOR = 2
+ABORT_MIN_TRADES = 3
+ABORT_UNREACHABLE = 4
+
+_ABORT_LABELS = {
+    ABORT_NONE: None,
+    ABORT_MAX_DRAWDOWN: 'max_drawdown',
+    ABORT_EQUITY_FLOOR: 'equity_floor',
+    ABORT_MIN_TRADES: 'min_trades',
+    ABORT_UNREACHABLE: 'unreachable',
+}
+
+# Plancher de drawdown de trade_helpers.select_best_by_calmar
+_DD_FLOOR = 0.001
+
+
+@dataclass(frozen=True)
+class AbortCriteria:
+    """Bornes d'arrêt anticipé (0 / None = critère désactivé)."""
+
+    max_drawdown: float = 0.0
+    equity_floor: float = 0.0
+    min_trades: int = 0
+    min_trades_bar: int = 0
+    min_score: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self.max_drawdown > 0
+            or self.equity_floor > 0
+            or (self.min_trades > 0 and self.min_trades_bar > 0)
+            or self.min_score is not None
+        )
+
+    def with_min_score(self, min_score: Optional[float]) -> 'AbortCriteria':
+        """Copie avec une nouvelle borne de classement."""
+        return replace(self, min_score=min_score)
+
+
+def abort_reason_label(code: int) -> Optional[str]:
+    """Libellé du motif d'arrêt (None si non arrêté)."""
+    return _ABORT_LABELS.get(int(code))
+
+
+def growth_upper_bound(
+    close: np.ndarray, open_: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Majorant de la croissance d'equity entre la fin du bar ``i`` et la fin.
+
+    Entre deux clôtures, une stratégie long-only (fills au open suivant) ne
+    peut pas faire mieux que ``max(1, open/close_prev) × max(1, close/open)``.
+    ``bound[i]`` est le produit de ces facteurs sur les bars ``i+1..n-1``
+    (``inf`` si une valeur est manquante).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    bound = np.ones(n, dtype=np.float64)
+    if n < 2:
+        return bound
+    nxt_open = close[1:] if open_ is None else np.asarray(open_, dtype=np.float64)[1:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        step = np.maximum(1.0, nxt_open / close[:-1]) * np.maximum(1.0, close[1:] / nxt_open)
+    step[~np.isfinite(step)] = np.inf
+    with np.errstate(over='ignore', invalid='ignore'):
+        bound[:-1] = np.cumprod(step[::-1])[::-1]
+    bound[np.isnan(bound)] = np.inf
+    return bound
+
+
+def score_upper_bound(
+    equity: float, growth: float, initial_wallet: float, max_drawdown: float,
+) -> float:
+    """Meilleur score Calmar encore atteignable (cf. ``trade_helpers.calmar_key``).
+
+    Le drawdown ne peut que croître : pour un ROI maximal positif, le score
+    est majoré avec le drawdown courant ; pour un ROI maximal négatif, avec
+    un drawdown de 100 %.
+    """
+    roi_max = (equity * growth - initial_wallet) / max(initial_wallet, 1.0)
+    if roi_max < 0:
+        return roi_max
+    return roi_max / max(max_drawdown, _DD_FLOOR)
+
+
+def check_abort(
+    criteria: AbortCriteria,
+    bar: int,
+    equity: float,
+    max_drawdown: float,
+    positions_opened: int,
+    initial_wallet: float,
+    growth: float = math.inf,
+    in_position: bool = False,
+) -> int:
+    """Évalue les critères en fin de bar ; retourne un code ``ABORT_*``.
+
+    Miroir Python de ``_abort_check`` (moteur Cython).  La borne de score
+    n'est évaluée que hors position.
+    """
+    if criteria.max_drawdown > 0 and max_drawdown >= criteria.max_drawdown:
+        return ABORT_MAX_DRAWDOWN
+    if criteria.equity_floor > 0 and equity < criteria.equity_floor:
+        return ABORT_EQUITY_FLOOR
+    if (
+        criteria.min_trades > 0
+        and bar == criteria.min_trades_bar
+        and positions_opened < criteria.min_trades
+    ):
+        return ABORT_MIN_TRADES
+    if (
+        criteria.min_score is not None
+        and not in_position
+        and score_upper_bound(equity, growth, initial_wallet, max_drawdown) < criteria.min_score
+    ):
+        return ABORT_UNREACHABLE
+    return ABORT_NONE
+
+
+class Leaderboard:
+    """Meilleur score Calmar observé pendant un balayage (thread-safe).
+
+    Les résultats arrêtés (``status='pruned'``) ne sont jamais retenus.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._best: Optional[float] = None
+
+    @property
+    def best_score(self) -> Optional[float]:
+        with self._lock:
+            return self._best
+
+    def offer(self, result: Dict[str, Any]) -> None:
+        if result.get('status') == 'pruned' or not result.get('final_wallet'):
+            return
+        score = calmar_key(result)
+        with self._lock:
+            if self._best is None or score > self._best:
+                self._best = score
+
+    def criteria(self, base: AbortCriteria) -> AbortCriteria:
+        """``base`` complété de la borne courante du classement."""
+        return base.with_min_score(self.best_score)
+
+
+def abort_criteria_from_config(config: Any) -> AbortCriteria:
+    """Critères absolus issus de la configuration (``BACKTEST_ABORT_*``)."""
+    initial_wallet = float(getattr(config, 'initial_wallet', 0.0))
+    return AbortCriteria(
+        max_drawdown=float(getattr(config, 'backtest_abort_max_drawdown', 0.0)),
+        equity_floor=initial_wallet * float(
+            getattr(config, 'backtest_abort_equity_floor_pct', 0.0)
+        ),
+        min_trades=int(getattr(config, 'backtest_abort_min_trades', 0)),
+        min_trades_bar=int(getattr(config, 'backtest_abort_min_trades_bar', 0)),
+    )
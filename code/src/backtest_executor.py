@@ -0,0 +1,396 @@
+"""
+backtest_executor.py — Exécution des backtests dans un pool de processus.
+
+Complète ``backtest_runner`` (P3-SRP) : la boucle de backtest et la
+préparation pandas tiennent le GIL, un ``ThreadPoolExecutor`` sérialise donc
+le travail CPU.  Ce module propose une alternative multi-processus :
+
+- les DataFrames préparés sont publiés **une seule fois** en mémoire partagée
+  (``multiprocessing.shared_memory``) ; les workers ne reçoivent que des
+  tuples de configuration et le nom des blocs partagés (aucun pickling de
+  DataFrame par tâche) ; chaque tâche transmet aussi les noms des blocs
+  encore publiés, et un worker ferme ses attachements aux blocs détruits
+  depuis (pas de copies d'historique périmées gardées en mémoire) ;
+- le pool est **persistant** : les workers sont créés une fois, pré-chauffés
+  (imports pandas / ta / moteur Cython) puis réutilisés d'un cycle à l'autre ;
+  ``ProcessPoolExecutor`` ne forke qu'à la première soumission : une tâche
+  vide par worker est donc soumise à la création du pool, pour que le fork
+  ait lieu dans le thread appelant (démarrage de ``MULTI_SYMBOLS``, avant
+  tout autre thread) ;
+- la soumission est **chunkée** (``Executor.map(chunksize=...)``) et les
+  résultats sont restitués dans l'ordre des tâches.
+
+Les seuils StochRSI courants sont transmis dans chaque tuple : un worker ne
+voit pas les mises à jour runtime de ``config.update_stoch_thresholds``.
+
+Méthode de démarrage : ``fork`` sous Linux (copie-sur-écriture des modules
+déjà importés, pas de ré-import du script principal), ``spawn`` ailleurs.
+Surcharge possible via ``BACKTEST_MP_START_METHOD``.  Un pool recréé hors du
+thread principal (après un ``BrokenProcessPool``) utilise ``forkserver`` :
+forker un processus multi-threadé peut hériter d'un verrou tenu.
+
+Public API
+----------
+- ``SharedFrameSpec``
+- ``publish_frames``
+- ``release_frames``
+- ``get_process_pool``
+- ``shutdown_process_pool``
+- ``run_backtest_tasks_in_processes``
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bot_config import config
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de blocs partagés gardés attachés par worker (LRU).
+# Un cycle publie au plus un bloc par timeframe et par paire ; les blocs
+# détruits par le parent sont fermés dès la tâche suivante (_drop_released).
+_WORKER_CACHE_SIZE = 8
+
+# Blocs publiés et non encore détruits (processus parent)
+_live_blocks: Set[str] = set()
+_live_lock = threading.Lock()
+
+
+class SharedFrameSpec(NamedTuple):
+    """Description picklable d'un DataFrame publié en mémoire partagée.
+
+    Le bloc contient ``len(columns) + 1`` lignes de ``n_rows`` valeurs 8 octets :
+    la ligne 0 est l'index (int64, ns depuis epoch), les suivantes les
+    colonnes numériques (float64).
+    """
+
+    shm_name: str
+    columns: Tuple[str, ...]
+    n_rows: int
+    index_tz: Optional[str]
+
+
+# --- Publication (processus parent) -------------------------------------------
+
+def _numeric_columns(df: pd.DataFrame) -> List[str]:
+    return [str(c) for c in df.columns if pd.api.types.is_numeric_dtype(df[c].dtype)]
+
+
+def publish_frames(
+    frames: Dict[str, pd.DataFrame],
+) -> Tuple[Dict[str, SharedFrameSpec], List[shared_memory.SharedMemory]]:
+    """Copie chaque DataFrame dans un bloc de mémoire partagée.
+
+    Parameters
+    ----------
+    frames : dict[str, pd.DataFrame]
+        DataFrames indexés par ``DatetimeIndex`` (colonnes non numériques
+        ignorées, colonnes numériques converties en float64).
+
+    Returns
+    -------
+    tuple
+        ``(specs, blocks)`` — ``specs`` à transmettre aux workers, ``blocks``
+        à libérer via ``release_frames`` une fois les tâches terminées.
+    """
+    specs: Dict[str, SharedFrameSpec] = {}
+    blocks: List[shared_memory.SharedMemory] = []
+    try:
+        for key, df in frames.items():
+            columns = _numeric_columns(df)
+            n_rows = len(df)
+            shm = shared_memory.SharedMemory(
+                create=True, size=max((len(columns) + 1) * n_rows * 8, 8)
+            )
+            blocks.append(shm)
+            with _live_lock:
+                _live_blocks.add(shm.name)
+            index = pd.DatetimeIndex(df.index)
+            np.ndarray((n_rows,), dtype=np.int64, buffer=shm.buf)[:] = (
+                np.asarray(index.as_unit('ns').values).view(np.int64)
+            )
+            values = np.ndarray(
+                (len(columns), n_rows), dtype=np.float64, buffer=shm.buf, offset=n_rows * 8
+            )
+            for row, col in enumerate(columns):
+                values[row, :] = df[col].to_numpy(dtype=np.float64)
+            specs[key] = SharedFrameSpec(
+                shm_name=shm.name,
+                columns=tuple(columns),
+                n_rows=n_rows,
+                index_tz=str(index.tz) if index.tz is not None else None,
+            )
+    except Exception:
+        release_frames(blocks)
+        raise
+    return specs, blocks
+
+
+def release_frames(blocks: List[shared_memory.SharedMemory]) -> None:
+    """Ferme et détruit les blocs créés par ``publish_frames``."""
+    with _live_lock:
+        _live_blocks.difference_update(shm.name for shm in blocks)
+    for shm in blocks:
+        try:
+            shm.close()
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug("[EXECUTOR] Libération bloc %s échouée: %s", shm.name, e)
+
+
+# --- Attachement (workers) ----------------------------------------------------
+
+_worker_frames: 'OrderedDict[str, Tuple[shared_memory.SharedMemory, pd.DataFrame]]' = OrderedDict()
+_worker_inputs: Dict[str, Any] = {}
+
+
+def _open_shared_block(name: str) -> shared_memory.SharedMemory:
+    """Attache un bloc existant sans l'enregistrer auprès du resource_tracker.
+
+    Sous POSIX (Python < 3.13), l'attachement enregistre le bloc et le
+    tracker le détruirait à la sortie du worker alors que le parent en est
+    propriétaire.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == 'posix':
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')  # type: ignore[attr-defined]
+        except Exception:
+            pass
+    return shm
+
+
+def _close_attachment(name: str) -> None:
+    """Détache le bloc ``name`` du worker (vues et ``BacktestInputs`` compris)."""
+    _worker_inputs.pop(name, None)
+    entry = _worker_frames.pop(name, None)
+    if entry is None:
+        return
+    try:
+        entry[0].close()
+    except BufferError:
+        # Une vue numpy est encore référencée : la fermeture se fera au GC.
+        pass
+
+
+def _drop_released(live: FrozenSet[str]) -> None:
+    """Ferme les attachements aux blocs que le parent a détruits depuis.
+
+    ``live`` : blocs publiés au moment de la soumission.  Un bloc publié
+    ensuite par un autre cycle concurrent est au pire ré-attaché.
+    """
+    for name in [n for n in _worker_frames if n not in live]:
+        _close_attachment(name)
+
+
+def _attach_frame(spec: SharedFrameSpec) -> pd.DataFrame:
+    """Reconstruit (sans copie) le DataFrame décrit par ``spec``."""
+    cached = _worker_frames.get(spec.shm_name)
+    if cached is not None:
+        _worker_frames.move_to_end(spec.shm_name)
+        return cached[1]
+
+    shm = _open_shared_block(spec.shm_name)
+    n_rows = spec.n_rows
+    index_ns = np.ndarray((n_rows,), dtype=np.int64, buffer=shm.buf)
+    values = np.ndarray(
+        (len(spec.columns), n_rows), dtype=np.float64, buffer=shm.buf, offset=n_rows * 8
+    )
+    values.flags.writeable = False
+    index = pd.DatetimeIndex(index_ns.astype('datetime64[ns]'))
+    if spec.index_tz:
+        index = index.tz_localize('UTC').tz_convert(spec.index_tz)
+    df = pd.DataFrame(values.T, index=index, columns=list(spec.columns), copy=False)
+
+    _worker_frames[spec.shm_name] = (shm, df)
+    while len(_worker_frames) > _WORKER_CACHE_SIZE:
+        _close_attachment(next(iter(_worker_frames)))
+    return df
+
+
+def _warm_worker() -> None:
+    """Initializer : pré-charge les modules lourds une fois par worker."""
+    try:
+        import backtest_runner  # noqa: F401
+        import walk_forward  # noqa: F401
+    except Exception as e:
+        logger.warning("[EXECUTOR] Pré-chauffage worker incomplet: %s", e)
+
+
+def _attach_inputs(spec: SharedFrameSpec) -> Any:
+    """PERF-24: ``BacktestInputs`` du bloc ``spec`` (vues sans copie), un par bloc attaché."""
+    from backtest_inputs import BacktestInputs
+    df = _attach_frame(spec)
+    inputs = _worker_inputs.get(spec.shm_name)
+    if inputs is None:
+        # Bloc en lecture seule, détenu par le parent jusqu'à release_frames
+        inputs = BacktestInputs(df, copy=False)
+        _worker_inputs[spec.shm_name] = inputs
+    return inputs
+
+
+def _noop() -> None:
+    """Tâche vide : force le démarrage des workers (``get_process_pool``)."""
+
+
+def _run_task(task: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Exécute une tâche ``(tf, ema1, ema2, scenario, spec, pair, sizing, stoch, abort, live)``."""
+    from backtest_runner import run_single_backtest_optimized
+    timeframe, ema1, ema2, scenario, spec, pair, sizing_mode, stoch, abort, live = task
+    _drop_released(live)
+    inputs = _attach_inputs(spec)
+    return run_single_backtest_optimized(
+        (timeframe, ema1, ema2, scenario, inputs, pair, sizing_mode, stoch, abort)
+    )
+
+
+# --- Pool persistant ----------------------------------------------------------
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _resolve_start_method() -> str:
+    method = str(getattr(config, 'backtest_mp_start_method', '') or '').strip()
+    if not method:
+        method = 'fork' if sys.platform.startswith('linux') else 'spawn'
+    if method == 'fork' and threading.current_thread() is not threading.main_thread():
+        # Pool recréé depuis un thread de backtest : ne pas forker un processus multi-threadé
+        method = 'forkserver'
+    return method
+
+
+def _resolve_workers(max_workers: Optional[int]) -> int:
+    if max_workers is None:
+        max_workers = int(getattr(config, 'backtest_process_workers', 0) or 0)
+    if max_workers <= 0:
+        max_workers = os.cpu_count() or 1
+    return max(1, max_workers)
+
+
+def get_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Retourne le pool persistant (créé, workers démarrés et pré-chauffés au premier appel).
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Nombre de workers ; défaut ``config.backtest_process_workers``
+        (0 = ``os.cpu_count()``).  Ignoré si le pool existe déjà.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            n_workers = _resolve_workers(max_workers)
+            ctx = multiprocessing.get_context(_resolve_start_method())
+            pool = ProcessPoolExecutor(
+                max_workers=n_workers, mp_context=ctx, initializer=_warm_worker,
+            )
+            # Les workers ne sont créés qu'à la première soumission : les
+            # démarrer maintenant, dans le thread appelant
+            for future in [pool.submit(_noop) for _ in range(n_workers)]:
+                future.result()
+            _pool = pool
+            logger.info(
+                "[EXECUTOR] Pool de processus créé (%d workers, %s)",
+                n_workers, ctx.get_start_method(),
+            )
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    """Arrête le pool persistant (idempotent)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_process_pool)
+
+
+def run_backtest_tasks_in_processes(
+    tasks: List[Tuple[Any, ...]],
+    *,
+    chunksize: Optional[int] = None,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    abort: Optional[Any] = None,
+) -> List[Dict[str, Any]]:
+    """Exécute des tâches ``run_single_backtest_optimized`` dans le pool.
+
+    Parameters
+    ----------
+    tasks : list[tuple]
+        ``(timeframe, ema1, ema2, scenario, base_df, pair, sizing_mode)``.
+        Chaque ``base_df`` distinct (par identité) est publié une fois en
+        mémoire partagée.
+    chunksize : int, optional
+        Taille des lots envoyés aux workers ; défaut ``config.backtest_chunksize``.
+    on_result : callable, optional
+        Appelé pour chaque résultat reçu (barre de progression).
+    abort : AbortCriteria, optional
+        Critères d'arrêt anticipé transmis à chaque tâche (PERF-05).  Les
+        workers ne partagent pas de classement : seuls les critères absolus
+        s'appliquent.
+
+    Returns
+    -------
+    list[dict]
+        Résultats dans l'ordre de ``tasks``.
+    """
+    if not tasks:
+        return []
+    if chunksize is None:
+        chunksize = int(getattr(config, 'backtest_chunksize', 4) or 1)
+
+    frames: Dict[str, pd.DataFrame] = {}
+    for task in tasks:
+        frames.setdefault(str(id(task[4])), task[4])
+    specs, blocks = publish_frames(frames)
+
+    stoch = (
+        config.stoch_rsi_buy_min, config.stoch_rsi_buy_max, config.stoch_rsi_sell_exit,
+    )
+    with _live_lock:
+        live = frozenset(_live_blocks)
+    payloads = [
+        (tf, ema1, ema2, scenario, specs[str(id(df))], pair, sizing_mode, stoch, abort, live)
+        for (tf, ema1, ema2, scenario, df, pair, sizing_mode) in tasks
+    ]
+    try:
+        results: List[Dict[str, Any]] = []
+        try:
+            iterator: Iterator[Dict[str, Any]] = get_process_pool().map(
+                _run_task, payloads, chunksize=max(1, chunksize)
+            )
+            for result in iterator:
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+        except BrokenProcessPool:
+            # Worker tué (OOM, signal) : le pool est inutilisable, on le recrée
+            # au prochain appel et on laisse l'appelant basculer en threads.
+            shutdown_process_pool()
+            raise
+        return results
+    finally:
+        release_frames(blocks)
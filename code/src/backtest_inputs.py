@@ -0,0 +1,294 @@
+"""
+backtest_inputs.py — Tableaux d'entrée des moteurs de backtest, préparés une fois.
+
+``backtest_from_dataframe`` copiait le DataFrame à chaque appel
+(``df.copy()``), y ajoutait les colonnes ``ema1`` / ``ema2`` / ``sma_long``
+/ ``adx`` / ``TRIX_HISTO`` / ``vol_sma``, recalculait la tendance 4h (MTF)
+puis convertissait chaque colonne en tableau.  Une grille de seuils, les
+tâches de ``run_all_backtests`` ou les folds du walk-forward refaisaient
+ce travail, identique, pour chaque configuration.
+
+Un ``BacktestInputs`` contient les colonnes lues par les moteurs sous forme
+de tableaux float64 en lecture seule, partagés sans copie par toutes les
+fenêtres (``bar_range``, PERF-10 : vues ``[début:fin]``).  Les indicateurs
+dérivés (EMA, SMA, ADX, TRIX, SMA de volume, tendance MTF) sont calculés au
+premier accès puis conservés, une fois par paramètre (thread-safe) : les
+threads d'un même timeframe se partagent le calcul.  Ces indicateurs étant
+causaux, la valeur au bar ``i`` ne dépend que des lignes ``<= i`` : les
+calculer sur tout l'historique puis découper la fenêtre donne les mêmes
+valeurs que sur ``df[:fin]``.
+
+``backtest_inputs(df)`` retourne le jeu de tableaux d'un DataFrame, mis en
+cache (LRU borné) par empreinte des données (``frame_fingerprint``) : deux
+appels sur les mêmes données partagent tableaux et indicateurs.  Les
+empreintes de préfixe utilisées par ``backtest_memo`` sont aussi mises en
+cache (``prefix_fingerprint``).
+
+Public API
+----------
+- ``BacktestInputs``
+- ``backtest_inputs``
+- ``clear_inputs_cache``
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from ta.trend import ADXIndicator
+
+from backtest_memo import _DATA_COLUMNS, arrays_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Nombre de jeux de tableaux conservés par backtest_inputs (LRU)
+_CACHE_SIZE = 8
+
+
+def _readonly(values: np.ndarray) -> np.ndarray:
+    values.flags.writeable = False
+    return values
+
+
+def _compute_mtf_bullish(df_1h: pd.DataFrame, ema_fast: int, ema_slow: int) -> np.ndarray:
+    """Compute 4h multi-timeframe bullish trend array aligned to 1h index.
+
+    No look-ahead bias: shift(1) on 4h level ensures only completed 4h
+    candles are used for the EMA comparison.
+
+    Parameters
+    ----------
+    df_1h : pd.DataFrame
+        1h OHLCV DataFrame with a DatetimeIndex.
+    ema_fast, ema_slow : int
+        EMA periods to compute on 4h close.
+
+    Returns
+    -------
+    np.ndarray[float64]
+        1.0 when 4h EMA_fast > EMA_slow (bullish), 0.0 otherwise.
+        Same length as df_1h.
+    """
+    # Resample 1h close to 4h (closed='left', label='left' = default)
+    df_4h_close = df_1h['close'].resample('4h').last().dropna()
+
+    # Compute EMAs on 4h
+    ema_f = df_4h_close.ewm(span=ema_fast, adjust=False).mean()
+    ema_s = df_4h_close.ewm(span=ema_slow, adjust=False).mean()
+
+    # Bullish = fast > slow; shift(1) → only completed 4h candles
+    bullish_4h = (ema_f > ema_s).astype(float).shift(1).fillna(0.0)
+
+    # Reindex to 1h with forward fill
+    bullish_1h = bullish_4h.reindex(df_1h.index, method='ffill').fillna(0.0)
+
+    result_arr: np.ndarray = np.asarray(bullish_1h.to_numpy(dtype=np.float64), dtype=np.float64)
+    return result_arr
+
+
+class BacktestInputs:
+    """Colonnes d'un DataFrame préparé, en tableaux float64 en lecture seule.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame OHLCV + indicateurs (``close``, ``atr``, ``stoch_rsi``,
+        ``ema_{period}``...).  Seules les colonnes ``_DATA_COLUMNS`` et
+        ``ema_*`` sont conservées ; ``df`` n'est pas modifié.
+    copy : bool
+        Copie les colonnes (défaut).  ``False`` réutilise la mémoire de
+        ``df`` quand elle est déjà en float64 : réservé aux données
+        immuables (blocs partagés en lecture seule de ``backtest_executor``).
+    """
+
+    def __init__(self, df: pd.DataFrame, *, copy: bool = True) -> None:
+        self.index = df.index
+        self._columns: Dict[str, np.ndarray] = {}
+        for col in df.columns:
+            if col in _DATA_COLUMNS or (isinstance(col, str) and col.startswith('ema_')):
+                values = df[col].to_numpy(dtype=np.float64)
+                self._columns[col] = _readonly(np.array(values) if copy else values.view())
+        self._derived: Dict[Tuple[Hashable, ...], Optional[np.ndarray]] = {}
+        self._fingerprints: Dict[Tuple[Hashable, ...], str] = {}
+        self._key_locks: Dict[Tuple[Hashable, ...], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Noms des colonnes conservées."""
+        return tuple(self._columns)
+
+    def has(self, name: str) -> bool:
+        return name in self._columns
+
+    def get(self, name: str) -> Optional[np.ndarray]:
+        """Colonne ``name`` (lecture seule), ou None si absente."""
+        return self._columns.get(name)
+
+    def column(self, name: str) -> np.ndarray:
+        """Colonne ``name`` (lecture seule) ; ``KeyError`` si absente."""
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"colonne '{name}' absente des données de backtest") from None
+
+    def _cached(
+        self, key: Tuple[Hashable, ...], build: Callable[[], Optional[np.ndarray]],
+    ) -> Optional[np.ndarray]:
+        """Indicateur ``key`` calculé au plus une fois (``build()``), en lecture seule."""
+        with self._lock:
+            if key in self._derived:
+                return self._derived[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._derived:
+                    return self._derived[key]
+            values = build()
+            if values is not None:
+                values = _readonly(np.ascontiguousarray(values, dtype=np.float64))
+            with self._lock:
+                self._derived[key] = values
+        return values
+
+    def _close(self) -> pd.Series:
+        return pd.Series(self.column('close'), copy=False)
+
+    def ema(self, period: int) -> np.ndarray:
+        """EMA du close : colonne ``ema_{period}`` si présente, sinon calculée."""
+        values = self._columns.get(f'ema_{period}')
+        if values is not None:
+            return values
+        result = self._cached(
+            ('ema', int(period)),
+            lambda: self._close().ewm(span=period, adjust=False).mean().to_numpy(),
+        )
+        assert result is not None
+        return result
+
+    def sma(self, period: int) -> np.ndarray:
+        """Moyenne mobile simple du close (``sma_long``)."""
+        result = self._cached(
+            ('sma', int(period)),
+            lambda: self._close().rolling(window=period).mean().to_numpy(),
+        )
+        assert result is not None
+        return result
+
+    def adx(self, period: int) -> np.ndarray:
+        """ADX : colonne ``adx`` si présente, sinon ``ADXIndicator(window=period)``."""
+        values = self._columns.get('adx')
+        if values is not None:
+            return values
+        result = self._cached(
+            ('adx', int(period)),
+            lambda: ADXIndicator(
+                high=pd.Series(self.column('high'), copy=False),
+                low=pd.Series(self.column('low'), copy=False),
+                close=self._close(),
+                window=period,
+            ).adx().to_numpy(),
+        )
+        assert result is not None
+        return result
+
+    def trix_histo(self, length: int, signal: int) -> np.ndarray:
+        """Histogramme TRIX : ``TRIX_PCT - SMA(TRIX_PCT, signal)``."""
+        def _build() -> np.ndarray:
+            trix_ema1 = self._close().ewm(span=length, adjust=False).mean()
+            trix_ema2 = trix_ema1.ewm(span=length, adjust=False).mean()
+            trix_ema3 = trix_ema2.ewm(span=length, adjust=False).mean()
+            trix_pct = trix_ema3.pct_change() * 100
+            return (trix_pct - trix_pct.rolling(window=signal).mean()).to_numpy()
+
+        result = self._cached(('trix', int(length), int(signal)), _build)
+        assert result is not None
+        return result
+
+    def vol_sma(self, period: int) -> np.ndarray:
+        """SMA du volume (filtre de volume A-1)."""
+        result = self._cached(
+            ('vol_sma', int(period)),
+            lambda: pd.Series(self.column('volume'), copy=False).rolling(window=period).mean().to_numpy(),
+        )
+        assert result is not None
+        return result
+
+    def mtf_bullish(self, ema_fast: int, ema_slow: int) -> Optional[np.ndarray]:
+        """Tendance 4h (A-2, ``_compute_mtf_bullish``), ou None sans ``DatetimeIndex``."""
+        def _build() -> Optional[np.ndarray]:
+            if not isinstance(self.index, pd.DatetimeIndex):
+                return None
+            try:
+                close = pd.DataFrame({'close': self.column('close')}, index=self.index)
+                return _compute_mtf_bullish(close, ema_fast, ema_slow)
+            except Exception as e:
+                logger.warning("A-2 MTF computation failed: %s — filter disabled", e)
+                return None
+
+        return self._cached(('mtf', int(ema_fast), int(ema_slow)), _build)
+
+    def prefix_fingerprint(self, end: int, columns: Iterable[str] = ()) -> str:
+        """Empreinte des ``end`` premières lignes, égale à ``frame_fingerprint(df.iloc[:end])``."""
+        key: Tuple[Hashable, ...] = (int(end),) + tuple(sorted(columns))
+        with self._lock:
+            cached = self._fingerprints.get(key)
+        if cached is not None:
+            return cached
+        window = slice(0, int(end))
+        digest = arrays_fingerprint(
+            self.index[window],
+            {col: values[window] for col, values in self._columns.items()},
+            columns,
+        )
+        with self._lock:
+            self._fingerprints[key] = digest
+        return digest
+
+
+_cache: 'OrderedDict[str, BacktestInputs]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def backtest_inputs(df: Union[pd.DataFrame, BacktestInputs]) -> BacktestInputs:
+    """Jeu de tableaux de ``df``, partagé par les appels sur les mêmes données.
+
+    Un ``BacktestInputs`` est retourné tel quel.  Pour un DataFrame, la clé
+    du cache est son empreinte (index, colonnes lues et ``ema_*``) : une
+    modification du DataFrame produit un nouveau jeu de tableaux.
+    """
+    if isinstance(df, BacktestInputs):
+        return df
+    ema_columns = [c for c in df.columns if isinstance(c, str) and c.startswith('ema_')]
+    key = arrays_fingerprint(
+        df.index,
+        {col: df[col].to_numpy(dtype=np.float64)
+         for col in (*_DATA_COLUMNS, *ema_columns) if col in df.columns},
+        ema_columns,
+    )
+    with _cache_lock:
+        inputs = _cache.get(key)
+        if inputs is not None:
+            _cache.move_to_end(key)
+            return inputs
+    inputs = BacktestInputs(df)
+    with _cache_lock:
+        inputs = _cache.setdefault(key, inputs)
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return inputs
+
+
+def clear_inputs_cache() -> None:
+    """Vide le cache de ``backtest_inputs``."""
+    with _cache_lock:
+        _cache.clear()
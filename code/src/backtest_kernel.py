@@ -0,0 +1,654 @@
+"""
+backtest_kernel.py — Boucle de backtest par bar sur tableaux numpy (repli sans Cython).
+
+Machine à états de la boucle Python de ``backtest_from_dataframe`` (partiels,
+break-even, cooldown, trailing stop, filtres SMA / ADX / TRIX / volume / MTF,
+sizing ``SIZING_MODES``, critères d'arrêt PERF-05, checkpoints
+PERF-08) exécutée sur des tableaux float64 au lieu de ``.iloc`` ligne à ligne.
+
+Compilée avec numba (``njit``, ``nogil``, cache disque) si le paquet est
+installé ; sinon la même fonction s'exécute en Python pur, déjà bien plus
+rapide que l'accès pandas par ligne.
+
+Les coûts d'exécution d'un ``cost_model.CostModel`` (slippage fixe,
+proportionnel à l'ATR, à la participation au volume, aléatoire
+counter-based ; frais) sont évalués dans la boucle (PERF-23).  Le slippage
+stochastique historique (``BasicSlippageModel``) est passé sous forme de
+facteurs achat / vente tirés par bar avant la boucle.
+
+Public API
+----------
+- ``NUMBA_AVAILABLE``
+- ``SIZING_MODES``
+- ``STATE_FIELDS``
+- ``initial_state``
+- ``run_backtest_kernel``
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from backtest_abort import (
+    ABORT_EQUITY_FLOOR, ABORT_MAX_DRAWDOWN, ABORT_MIN_TRADES, ABORT_NONE, ABORT_UNREACHABLE,
+    AbortCriteria,
+)
+from cost_model import FILL_BUY, FILL_SELL, CostModel, counter_uniform
+from trade_log import (
+    KIND_BUY, KIND_PARTIAL_1, KIND_PARTIAL_2, KIND_SELL,
+    REASON_NONE, REASON_SIGNAL, REASON_STOP_LOSS, REASON_TAKE_PROFIT, REASON_TRAILING_STOP,
+    TRADE_LOG_DTYPE,
+)
+
+logger = logging.getLogger(__name__)
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE: bool = True
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    NUMBA_AVAILABLE = False
+
+    def njit(*args: Any, **kwargs: Any) -> Callable[[_F], _F]:  # type: ignore[no-redef]
+        """Sans numba : décorateur identité (boucle interprétée)."""
+        def _identity(fn: _F) -> _F:
+            return fn
+        return _identity
+
+# Champs du journal de trades, dans l'ordre des colonnes de ``log``
+_LOG_FIELDS: Tuple[str, ...] = TRADE_LOG_DTYPE.names or ()
+
+# Codes des modes de sizing (position_sizing.compute_position_size_*),
+# identiques à backtest_engine_standard.SIZING_MODES
+SIZING_MODES: Dict[str, int] = {
+    'baseline': 0, 'risk': 1, 'fixed_notional': 2, 'volatility_parity': 3,
+}
+(_SIZING_BASELINE, _SIZING_RISK, _SIZING_FIXED_NOTIONAL, _SIZING_VOL_PARITY) = range(4)
+
+# Champs de l'état du moteur (checkpoint PERF-08, ``engine='python'``)
+STATE_FIELDS: Tuple[str, ...] = (
+    'usd', 'coin', 'peak_wallet', 'max_drawdown', 'total_trades', 'winning_trades',
+    'cooldown_remaining', 'in_position', 'entry_bar', 'entry_price', 'entry_usd_invested',
+    'max_price', 'trailing_stop', 'stop_loss', 'trailing_activated',
+    'trailing_activation_price', 'partial_taken_1', 'partial_taken_2', 'atr_at_entry',
+    'breakeven_triggered',
+)
+_INT_FIELDS = frozenset(('total_trades', 'winning_trades', 'cooldown_remaining', 'entry_bar'))
+_BOOL_FIELDS = frozenset((
+    'in_position', 'trailing_activated', 'partial_taken_1', 'partial_taken_2',
+    'breakeven_triggered',
+))
+
+# Index de l'état (vecteur float64, ordre de STATE_FIELDS)
+(_S_USD, _S_COIN, _S_PEAK, _S_MAX_DD, _S_TOTAL, _S_WINS, _S_COOLDOWN, _S_IN_POS,
+ _S_ENTRY_BAR, _S_ENTRY_PRICE, _S_ENTRY_USD, _S_MAX_PRICE, _S_TRAILING, _S_STOP_LOSS,
+ _S_TRAIL_ON, _S_TRAIL_ACT_PRICE, _S_PARTIAL_1, _S_PARTIAL_2, _S_ATR_ENTRY,
+ _S_BREAKEVEN) = range(len(STATE_FIELDS))
+
+# Index des paramètres (vecteur float64)
+(_P_FEE, _P_SLIP_BUY, _P_SLIP_SELL, _P_ATR_MULT, _P_ATR_STOP_MULT, _P_ADX_THRESHOLD,
+ _P_RISK_PER_TRADE, _P_PARTIAL_TH_1, _P_PARTIAL_TH_2, _P_PARTIAL_PCT_1, _P_PARTIAL_PCT_2,
+ _P_MIN_NOTIONAL, _P_BE_TRIGGER, _P_COOLDOWN, _P_BUY_MAX, _P_BUY_MIN, _P_SELL_EXIT,
+ _P_INITIAL_WALLET, _P_SIZING, _P_PARTIAL_ON, _P_BE_ON, _P_USE_SMA, _P_USE_ADX,
+ _P_USE_TRIX, _P_USE_VOL, _P_USE_MTF, _P_HAS_OPEN, _P_USE_SLIP_MODEL, _P_WRITE_EQUITY,
+ _P_ABORT_ON, _P_ABORT_MAX_DD, _P_ABORT_FLOOR, _P_ABORT_MIN_TRADES, _P_ABORT_MIN_TRADES_BAR,
+ _P_ABORT_USE_SCORE, _P_ABORT_MIN_SCORE, _P_TARGET_VOL, _P_COST_ON, _P_COST_FIXED,
+ _P_COST_ATR, _P_COST_PART, _P_COST_RAND_MIN, _P_COST_RAND_MAX, _P_COST_SEED,
+ _N_PARAMS) = range(45)
+
+# Compteurs renvoyés par le noyau
+(_C_ROWS, _C_ROWS_AT_CHECKPOINT, _C_LAST_BAR, _C_ABORT, _C_CHECKPOINT) = range(5)
+
+_DD_FLOOR = 0.001  # identique à backtest_abort._DD_FLOOR
+
+
+def _abort_code(
+    p: np.ndarray, bar: int, equity: float, max_drawdown: float, opened: float,
+    growth: float, in_position: bool,
+) -> int:
+    """Miroir de ``backtest_abort.check_abort`` (codes ABORT_*)."""
+    if p[_P_ABORT_MAX_DD] > 0 and max_drawdown >= p[_P_ABORT_MAX_DD]:
+        return ABORT_MAX_DRAWDOWN
+    if p[_P_ABORT_FLOOR] > 0 and equity < p[_P_ABORT_FLOOR]:
+        return ABORT_EQUITY_FLOOR
+    if (
+        p[_P_ABORT_MIN_TRADES] > 0
+        and bar == p[_P_ABORT_MIN_TRADES_BAR]
+        and opened < p[_P_ABORT_MIN_TRADES]
+    ):
+        return ABORT_MIN_TRADES
+    if p[_P_ABORT_USE_SCORE] > 0 and not in_position:
+        initial = p[_P_INITIAL_WALLET]
+        roi_max = (equity * growth - initial) / max(initial, 1.0)
+        score = roi_max if roi_max < 0 else roi_max / max(max_drawdown, _DD_FLOOR)
+        if score < p[_P_ABORT_MIN_SCORE]:
+            return ABORT_UNREACHABLE
+    return ABORT_NONE
+
+
+def _push(
+    log: np.ndarray, row: int, entry_bar: float, exit_bar: float, kind: int, reason: int,
+    entry_price: float, exit_price: float, qty: float, pnl: float, fees: float,
+) -> int:
+    log[row, 0] = entry_bar
+    log[row, 1] = exit_bar
+    log[row, 2] = kind
+    log[row, 3] = reason
+    log[row, 4] = entry_price
+    log[row, 5] = exit_price
+    log[row, 6] = qty
+    log[row, 7] = pnl
+    log[row, 8] = fees
+    return row + 1
+
+
+_counter_uniform = counter_uniform
+
+
+def _entry_coin(p: np.ndarray, usd: float, price: float, row_atr: float) -> float:
+    """Quantité brute achetée au prix ``price`` (sizing ``SIZING_MODES``)."""
+    if price <= 0:
+        return 0.0
+    sizing = int(p[_P_SIZING])
+    if sizing == _SIZING_RISK and row_atr > 0:
+        stop_distance = p[_P_ATR_STOP_MULT] * row_atr
+        if stop_distance > 0:
+            qty_by_risk = usd * p[_P_RISK_PER_TRADE] / stop_distance
+            return min((usd * 0.98) / price, qty_by_risk)
+        return (usd * 0.98) / price
+    if sizing == _SIZING_FIXED_NOTIONAL:
+        # compute_position_size_fixed_notional : 10 % du cash, 100 USDC minimum
+        return min((usd * 0.98) / price, max(100.0, usd * 0.1) / price)
+    if sizing == _SIZING_VOL_PARITY and row_atr > 0:
+        # compute_position_size_volatility_parity : cash × cible / (ATR × prix)
+        return min((usd * 0.98) / price, usd * p[_P_TARGET_VOL] / (row_atr * price))
+    return (usd * 0.98) / price
+
+
+def _fill_cost(
+    p: np.ndarray, bar: int, trade: int, side: int, row_close: float, row_atr: float,
+    qty: float, bar_volume: float,
+) -> float:
+    """Surcoût d'un fill en fraction du prix (coefficients ``CostModel``, PERF-23)."""
+    cost = p[_P_COST_FIXED]
+    if p[_P_COST_ATR] > 0 and row_atr > 0 and row_close > 0:
+        cost += p[_P_COST_ATR] * row_atr / row_close
+    if p[_P_COST_PART] > 0:
+        cost += p[_P_COST_PART] * (min(1.0, qty / bar_volume) if bar_volume > 0 else 1.0)
+    if p[_P_COST_RAND_MAX] > 0:
+        u = _counter_uniform(int(p[_P_COST_SEED]), bar, trade, side)
+        cost += p[_P_COST_RAND_MIN] + (p[_P_COST_RAND_MAX] - p[_P_COST_RAND_MIN]) * u
+    return cost
+
+
+def _run_bars(
+    close: np.ndarray, open_: np.ndarray, ema1: np.ndarray, ema2: np.ndarray,
+    stoch: np.ndarray, atr: np.ndarray, sma_long: np.ndarray, adx: np.ndarray,
+    trix_histo: np.ndarray, volume: np.ndarray, vol_sma: np.ndarray, mtf: np.ndarray,
+    buy_slip: np.ndarray, sell_slip: np.ndarray, growth: np.ndarray, p: np.ndarray,
+    s: np.ndarray, start: int, checkpoint_bar: int, checkpoint_state: np.ndarray,
+    equity_curve: np.ndarray, equity_out: np.ndarray, log: np.ndarray, counters: np.ndarray,
+) -> None:
+    """Boucle par bar ``[start, n)`` ; ``s`` (état) est mis à jour en place.
+
+    ``equity_curve[i + 1]`` reçoit l'equity de début de bar (corrigée après
+    une sortie), ``log`` les lignes du journal (colonnes TRADE_LOG_DTYPE).
+    """
+    n = close.shape[0]
+    rows = int(counters[_C_ROWS])
+    fee_rate = p[_P_FEE]
+    cooldown_candles = int(p[_P_COOLDOWN])
+    for i in range(start, n):
+        if i == checkpoint_bar:
+            checkpoint_state[:] = s
+            counters[_C_ROWS_AT_CHECKPOINT] = rows
+            counters[_C_CHECKPOINT] = 1
+        row_close = close[i]
+        row_atr = atr[i]
+
+        # === EQUITY TRACKING — tous les bars (en ET hors position) ===
+        current_wallet = s[_S_USD] + s[_S_COIN] * row_close
+        equity_curve[i + 1] = current_wallet
+        if current_wallet > s[_S_PEAK]:
+            s[_S_PEAK] = current_wallet
+        bar_dd = (s[_S_PEAK] - current_wallet) / s[_S_PEAK] if s[_S_PEAK] > 0 else 0.0
+        if bar_dd > s[_S_MAX_DD]:
+            s[_S_MAX_DD] = bar_dd
+
+        if s[_S_IN_POS] > 0:
+            trailing_distance = p[_P_ATR_MULT] * s[_S_ATR_ENTRY]
+            if row_close > s[_S_MAX_PRICE]:
+                s[_S_MAX_PRICE] = row_close
+            if s[_S_TRAIL_ON] == 0 and row_close >= s[_S_TRAIL_ACT_PRICE]:
+                s[_S_TRAIL_ON] = 1.0
+                s[_S_TRAILING] = s[_S_MAX_PRICE] - trailing_distance
+            if s[_S_TRAIL_ON] > 0:
+                new_trailing = s[_S_MAX_PRICE] - trailing_distance
+                if new_trailing > s[_S_TRAILING]:
+                    s[_S_TRAILING] = new_trailing
+
+            # B-3: Break-even stop
+            if p[_P_BE_ON] > 0 and s[_S_BREAKEVEN] == 0 and s[_S_ENTRY_PRICE] > 0:
+                be_profit = (row_close - s[_S_ENTRY_PRICE]) / s[_S_ENTRY_PRICE]
+                if be_profit >= p[_P_BE_TRIGGER]:
+                    be_new_stop = s[_S_ENTRY_PRICE] * (1 + p[_P_SLIP_BUY])
+                    if be_new_stop > s[_S_STOP_LOSS]:
+                        s[_S_STOP_LOSS] = be_new_stop
+                    s[_S_BREAKEVEN] = 1.0
+
+            # Partial profit taking (P2-01) — position >= 3× min_notional
+            if p[_P_PARTIAL_ON] > 0:
+                min_notional = p[_P_MIN_NOTIONAL]
+                partial_ok = s[_S_COIN] * row_close >= min_notional * 3
+                if s[_S_COIN] > 0 and s[_S_ENTRY_PRICE] > 0 and partial_ok:
+                    entry_price = s[_S_ENTRY_PRICE]
+                    profit_pct = (row_close - entry_price) / entry_price
+                    if s[_S_PARTIAL_1] == 0 and profit_pct >= p[_P_PARTIAL_TH_1]:
+                        qty = s[_S_COIN] * p[_P_PARTIAL_PCT_1]
+                        if qty * row_close >= min_notional:
+                            proceeds = qty * row_close * (1 - fee_rate)
+                            s[_S_USD] += proceeds
+                            s[_S_COIN] -= qty
+                            rows = _push(
+                                log, rows, s[_S_ENTRY_BAR], i, KIND_PARTIAL_1,
+                                REASON_TAKE_PROFIT, entry_price, row_close, qty,
+                                proceeds - qty * entry_price, qty * row_close * fee_rate,
+                            )
+                        s[_S_PARTIAL_1] = 1.0
+                    if (
+                        s[_S_PARTIAL_2] == 0
+                        and profit_pct >= p[_P_PARTIAL_TH_2]
+                        and s[_S_COIN] > 0
+                    ):
+                        qty = s[_S_COIN] * p[_P_PARTIAL_PCT_2]
+                        if qty * row_close >= min_notional:
+                            proceeds = qty * row_close * (1 - fee_rate)
+                            s[_S_USD] += proceeds
+                            s[_S_COIN] -= qty
+                            rows = _push(
+                                log, rows, s[_S_ENTRY_BAR], i, KIND_PARTIAL_2,
+                                REASON_TAKE_PROFIT, entry_price, row_close, qty,
+                                proceeds - qty * entry_price, qty * row_close * fee_rate,
+                            )
+                        s[_S_PARTIAL_2] = 1.0
+
+            # Exit conditions
+            reason = REASON_NONE
+            if row_close <= s[_S_STOP_LOSS]:
+                reason = REASON_STOP_LOSS
+            elif s[_S_TRAIL_ON] > 0 and row_close <= s[_S_TRAILING]:
+                reason = REASON_TRAILING_STOP
+            elif ema2[i] > ema1[i] and stoch[i] > p[_P_SELL_EXIT]:
+                reason = REASON_SIGNAL
+
+            if reason != REASON_NONE:
+                if p[_P_HAS_OPEN] > 0 and i + 1 < n:
+                    exit_price = open_[i + 1] * (1 - p[_P_SLIP_SELL])
+                else:
+                    exit_price = row_close * (1 - p[_P_SLIP_SELL])
+                if p[_P_USE_SLIP_MODEL] > 0:
+                    exit_price = exit_price * sell_slip[i]
+                if p[_P_COST_ON] > 0:
+                    exit_price = exit_price * (1.0 - _fill_cost(
+                        p, i, int(s[_S_TOTAL]), FILL_SELL, row_close, row_atr, s[_S_COIN],
+                        volume[i] if p[_P_COST_PART] > 0 else 0.0,
+                    ))
+                sold_qty = s[_S_COIN]
+                gross_proceeds = sold_qty * exit_price
+                fee = gross_proceeds * fee_rate
+                s[_S_USD] = s[_S_USD] + (gross_proceeds - fee)
+                s[_S_COIN] = 0.0
+                trade_profit = s[_S_USD] - s[_S_ENTRY_USD]
+                # Sortie à open[i+1] : correction de l'equity du bar si gap baissier
+                post_exit_wallet = s[_S_USD]
+                if post_exit_wallet < equity_curve[i + 1]:
+                    equity_curve[i + 1] = post_exit_wallet
+                post_exit_dd = (
+                    (s[_S_PEAK] - post_exit_wallet) / s[_S_PEAK] if s[_S_PEAK] > 0 else 0.0
+                )
+                if post_exit_dd > s[_S_MAX_DD]:
+                    s[_S_MAX_DD] = post_exit_dd
+                if trade_profit > 0:
+                    s[_S_WINS] += 1
+                s[_S_TOTAL] += 1
+                rows = _push(
+                    log, rows, s[_S_ENTRY_BAR], i, KIND_SELL, reason, s[_S_ENTRY_PRICE],
+                    exit_price, sold_qty, trade_profit, fee,
+                )
+                s[_S_IN_POS] = 0.0
+                s[_S_ENTRY_PRICE] = 0.0
+                s[_S_ENTRY_USD] = 0.0
+                s[_S_MAX_PRICE] = 0.0
+                s[_S_TRAILING] = 0.0
+                s[_S_TRAIL_ON] = 0.0
+                s[_S_BREAKEVEN] = 0.0
+                # A-3: cooldown après un stop-loss
+                if reason == REASON_STOP_LOSS and cooldown_candles > 0:
+                    s[_S_COOLDOWN] = cooldown_candles
+                if p[_P_WRITE_EQUITY] > 0:
+                    equity_out[i] = s[_S_USD]
+                if p[_P_ABORT_ON] > 0:
+                    code = _abort_code(
+                        p, i, s[_S_USD], s[_S_MAX_DD], s[_S_TOTAL],
+                        growth[i] if p[_P_ABORT_USE_SCORE] > 0 else math.inf, False,
+                    )
+                    if code != ABORT_NONE:
+                        counters[_C_ROWS] = rows
+                        counters[_C_LAST_BAR] = i
+                        counters[_C_ABORT] = code
+                        return
+                continue
+
+        # A-3: cooldown decrement when not in position
+        if s[_S_IN_POS] == 0 and s[_S_COOLDOWN] > 0:
+            s[_S_COOLDOWN] -= 1
+
+        # Buy condition
+        buy = (
+            ema1[i] > ema2[i]
+            and stoch[i] < p[_P_BUY_MAX]
+            and stoch[i] > p[_P_BUY_MIN]
+            and s[_S_USD] > 0
+        )
+        if buy and s[_S_COOLDOWN] > 0:
+            buy = False
+        if buy and p[_P_USE_SMA] > 0:
+            buy = row_close > sma_long[i]
+        if buy and p[_P_USE_ADX] > 0:
+            buy = adx[i] > p[_P_ADX_THRESHOLD]
+        if buy and p[_P_USE_TRIX] > 0:
+            buy = trix_histo[i] > 0
+        # A-1: Volume filter — volume > SMA(volume)
+        if buy and p[_P_USE_VOL] > 0:
+            if math.isnan(volume[i]) or math.isnan(vol_sma[i]) or vol_sma[i] <= 0:
+                buy = False
+            else:
+                buy = volume[i] > vol_sma[i]
+        # A-2: Multi-timeframe filter
+        if buy and p[_P_USE_MTF] > 0:
+            buy = mtf[i] > 0.5
+        # P0-SL-GUARD: ATR indisponible → SL incalculable
+        if math.isnan(row_atr) or row_atr <= 0:
+            buy = False
+
+        if buy and s[_S_IN_POS] == 0:
+            if p[_P_HAS_OPEN] > 0 and i + 1 < n:
+                price = open_[i + 1] * (1 + p[_P_SLIP_BUY])
+            else:
+                price = row_close * (1 + p[_P_SLIP_BUY])
+            if p[_P_USE_SLIP_MODEL] > 0:
+                price = price * buy_slip[i]
+            usd = s[_S_USD]
+            if p[_P_COST_ON] > 0 and price > 0:
+                # PERF-23: participation mesurée sur la quantité au prix avant coût
+                price = price * (1.0 + _fill_cost(
+                    p, i, int(s[_S_TOTAL]), FILL_BUY, row_close, row_atr,
+                    _entry_coin(p, usd, price, row_atr) if p[_P_COST_PART] > 0 else 0.0,
+                    volume[i] if p[_P_COST_PART] > 0 else 0.0,
+                ))
+            gross_coin = _entry_coin(p, usd, price, row_atr)
+
+            if gross_coin > 0:
+                fee_in_coin = gross_coin * fee_rate
+                s[_S_COIN] = gross_coin - fee_in_coin
+                # P1-07-FIX: seul le coût réel est débité
+                actual_cost = gross_coin * price
+                if actual_cost > usd:
+                    actual_cost = usd
+                s[_S_ENTRY_USD] = usd
+                s[_S_USD] = usd - actual_cost
+                s[_S_ENTRY_PRICE] = price
+                s[_S_MAX_PRICE] = price
+                s[_S_ATR_ENTRY] = row_atr
+                s[_S_STOP_LOSS] = price - p[_P_ATR_STOP_MULT] * row_atr
+                s[_S_TRAIL_ACT_PRICE] = price + p[_P_ATR_MULT] * row_atr
+                s[_S_TRAILING] = 0.0
+                s[_S_TRAIL_ON] = 0.0
+                s[_S_PARTIAL_1] = 0.0
+                s[_S_PARTIAL_2] = 0.0
+                s[_S_BREAKEVEN] = 0.0
+                rows = _push(
+                    log, rows, i, -1, KIND_BUY, REASON_NONE, price, math.nan,
+                    s[_S_COIN], 0.0, fee_in_coin * price,
+                )
+                s[_S_ENTRY_BAR] = i
+                s[_S_IN_POS] = 1.0
+
+        equity = s[_S_USD] + s[_S_COIN] * row_close
+        if p[_P_WRITE_EQUITY] > 0:
+            equity_out[i] = equity
+        if p[_P_ABORT_ON] > 0:
+            code = _abort_code(
+                p, i, equity, s[_S_MAX_DD], s[_S_TOTAL] + s[_S_IN_POS],
+                growth[i] if p[_P_ABORT_USE_SCORE] > 0 else math.inf, s[_S_IN_POS] > 0,
+            )
+            if code != ABORT_NONE:
+                counters[_C_ROWS] = rows
+                counters[_C_LAST_BAR] = i
+                counters[_C_ABORT] = code
+                return
+    counters[_C_ROWS] = rows
+    counters[_C_LAST_BAR] = n - 1
+
+
+if NUMBA_AVAILABLE:
+    _abort_code = njit(cache=True, nogil=True)(_abort_code)
+    _push = njit(cache=True, nogil=True)(_push)
+    _counter_uniform = njit(cache=True, nogil=True)(counter_uniform)
+    _entry_coin = njit(cache=True, nogil=True)(_entry_coin)
+    _fill_cost = njit(cache=True, nogil=True)(_fill_cost)
+    _run_bars = njit(cache=True, nogil=True)(_run_bars)
+
+
+def initial_state(initial_wallet: float) -> Dict[str, Any]:
+    """État du moteur avant le premier bar."""
+    state = _state_to_dict(np.zeros(len(STATE_FIELDS)))
+    state.update(usd=float(initial_wallet), peak_wallet=float(initial_wallet), entry_bar=-1)
+    return state
+
+
+def _state_to_dict(vector: np.ndarray) -> Dict[str, Any]:
+    state: Dict[str, Any] = {}
+    for name, value in zip(STATE_FIELDS, vector.tolist()):
+        if name in _INT_FIELDS:
+            state[name] = int(value)
+        elif name in _BOOL_FIELDS:
+            state[name] = bool(value)
+        else:
+            state[name] = float(value)
+    return state
+
+
+def _array(values: Optional[np.ndarray]) -> np.ndarray:
+    # Entrées en lecture seule : une seule signature numba, que l'appelant
+    # passe ses propres tableaux ou les vues de BacktestInputs (PERF-24)
+    out = np.ascontiguousarray(
+        values if values is not None else np.empty(0), dtype=np.float64
+    ).view()
+    out.flags.writeable = False
+    return out
+
+
+def _log_from_rows(log: np.ndarray) -> np.ndarray:
+    out = np.empty(len(log), dtype=TRADE_LOG_DTYPE)
+    for col, name in enumerate(_LOG_FIELDS):
+        out[name] = log[:, col]
+    return out
+
+
+def run_backtest_kernel(
+    close: np.ndarray,
+    ema1: np.ndarray,
+    ema2: np.ndarray,
+    stoch_rsi: np.ndarray,
+    atr: np.ndarray,
+    *,
+    open_: Optional[np.ndarray] = None,
+    sma_long: Optional[np.ndarray] = None,
+    adx: Optional[np.ndarray] = None,
+    trix_histo: Optional[np.ndarray] = None,
+    volume: Optional[np.ndarray] = None,
+    vol_sma: Optional[np.ndarray] = None,
+    mtf_bullish: Optional[np.ndarray] = None,
+    slippage_factors: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    initial_wallet: float,
+    taker_fee: float,
+    slippage_buy: float,
+    slippage_sell: float,
+    atr_multiplier: float,
+    atr_stop_multiplier: float,
+    adx_threshold: float,
+    sizing_mode: str,
+    risk_per_trade: float,
+    partial_enabled: bool,
+    partial_threshold_1: float,
+    partial_threshold_2: float,
+    partial_pct_1: float,
+    partial_pct_2: float,
+    min_notional: float,
+    breakeven_enabled: bool,
+    breakeven_trigger_pct: float,
+    cooldown_candles: int,
+    stoch_buy_max: float,
+    stoch_buy_min: float,
+    stoch_sell_exit: float,
+    equity_out: Optional[np.ndarray] = None,
+    abort: Optional[AbortCriteria] = None,
+    abort_growth: Optional[np.ndarray] = None,
+    checkpoint_bar: Optional[int] = None,
+    resume: Optional[Dict[str, Any]] = None,
+    target_volatility_pct: float = 0.02,
+    cost_model: Optional[CostModel] = None,
+) -> Dict[str, Any]:
+    """Simule la stratégie sur ``[resume['bar'] ou 0, n)``.
+
+    Les filtres ``sma_long`` / ``adx`` / ``trix_histo`` / ``volume`` +
+    ``vol_sma`` / ``mtf_bullish`` sont actifs si le tableau est fourni.
+    ``slippage_factors`` : facteurs (achat, sortie) par bar appliqués au prix
+    d'exécution (P2-02).  ``sizing_mode`` : clé de ``SIZING_MODES``
+    (formules de ``position_sizing`` plafonnées à 98 % du cash, ATR du bar
+    de signal, ``target_volatility_pct`` pour ``'volatility_parity'``) ;
+    mode inconnu : 98 % du cash.  ``cost_model`` : coûts d'exécution
+    évalués à chaque entrée et sortie complète (PERF-23), ``volume`` requis
+    pour ``participation_impact`` ; ``taker_fee`` reste celui de l'appelant.
+
+    Returns
+    -------
+    dict
+        ``{'state', 'trade_log', 'equity_curve', 'last_bar', 'abort_code',
+        'checkpoint'}`` — ``equity_curve`` : capital initial puis equity de
+        début de chaque bar simulé (bars antérieurs à la reprise inclus).
+    """
+    n = len(close)
+    start = 0
+    state = initial_state(initial_wallet)
+    log_prefix: Optional[np.ndarray] = None
+    curve_prefix = np.array([initial_wallet], dtype=np.float64)
+    if resume is not None:
+        start = int(resume['bar'])
+        state = resume['state']
+        log_prefix = resume['trade_log']
+        curve_prefix = np.asarray(resume['equity_curve'], dtype=np.float64)
+    s = np.array([float(state[name]) for name in STATE_FIELDS], dtype=np.float64)
+
+    _abort_on = abort is not None and abort.enabled
+    use_score = _abort_on and abort is not None and abort.min_score is not None
+    p = np.zeros(_N_PARAMS, dtype=np.float64)
+    p[_P_FEE] = taker_fee
+    p[_P_SLIP_BUY] = slippage_buy
+    p[_P_SLIP_SELL] = slippage_sell
+    p[_P_ATR_MULT] = atr_multiplier
+    p[_P_ATR_STOP_MULT] = atr_stop_multiplier
+    p[_P_ADX_THRESHOLD] = adx_threshold
+    p[_P_RISK_PER_TRADE] = risk_per_trade
+    p[_P_PARTIAL_TH_1] = partial_threshold_1
+    p[_P_PARTIAL_TH_2] = partial_threshold_2
+    p[_P_PARTIAL_PCT_1] = partial_pct_1
+    p[_P_PARTIAL_PCT_2] = partial_pct_2
+    p[_P_MIN_NOTIONAL] = min_notional
+    p[_P_BE_TRIGGER] = breakeven_trigger_pct
+    p[_P_COOLDOWN] = cooldown_candles
+    p[_P_BUY_MAX] = stoch_buy_max
+    p[_P_BUY_MIN] = stoch_buy_min
+    p[_P_SELL_EXIT] = stoch_sell_exit
+    p[_P_INITIAL_WALLET] = initial_wallet
+    p[_P_SIZING] = SIZING_MODES.get(sizing_mode, _SIZING_BASELINE)
+    p[_P_TARGET_VOL] = target_volatility_pct
+    p[_P_PARTIAL_ON] = partial_enabled
+    p[_P_BE_ON] = breakeven_enabled
+    p[_P_USE_SMA] = sma_long is not None
+    p[_P_USE_ADX] = adx is not None
+    p[_P_USE_TRIX] = trix_histo is not None
+    p[_P_USE_VOL] = volume is not None and vol_sma is not None
+    p[_P_USE_MTF] = mtf_bullish is not None
+    p[_P_HAS_OPEN] = open_ is not None
+    p[_P_USE_SLIP_MODEL] = slippage_factors is not None
+    p[_P_WRITE_EQUITY] = equity_out is not None
+    if cost_model is not None:
+        if cost_model.participation_impact > 0 and volume is None:
+            raise ValueError("cost_model.participation_impact exige le tableau volume")
+        p[_P_COST_ON] = True
+        p[_P_COST_FIXED] = cost_model.fixed_slippage
+        p[_P_COST_ATR] = cost_model.atr_slippage
+        p[_P_COST_PART] = cost_model.participation_impact
+        p[_P_COST_RAND_MIN] = cost_model.random_slippage_min
+        p[_P_COST_RAND_MAX] = cost_model.random_slippage_max
+        p[_P_COST_SEED] = cost_model.engine_kwargs()['cost_seed']
+    p[_P_ABORT_ON] = _abort_on
+    if _abort_on and abort is not None:
+        p[_P_ABORT_MAX_DD] = abort.max_drawdown
+        p[_P_ABORT_FLOOR] = abort.equity_floor
+        p[_P_ABORT_MIN_TRADES] = abort.min_trades
+        p[_P_ABORT_MIN_TRADES_BAR] = abort.min_trades_bar
+        p[_P_ABORT_USE_SCORE] = use_score
+        p[_P_ABORT_MIN_SCORE] = abort.min_score if abort.min_score is not None else 0.0
+
+    # Une position = 1 achat + 2 partiels + 1 vente, sur au moins 2 bars
+    log = np.empty((2 * (n - start) + 4, len(_LOG_FIELDS)), dtype=np.float64)
+    equity_curve = np.empty(n + 1, dtype=np.float64)
+    equity_curve[:start + 1] = curve_prefix
+    counters = np.zeros(5, dtype=np.int64)
+    counters[_C_LAST_BAR] = start - 1
+    checkpoint_state = np.zeros(len(STATE_FIELDS), dtype=np.float64)
+    buy_slip, sell_slip = (
+        (_array(slippage_factors[0]), _array(slippage_factors[1]))
+        if slippage_factors is not None else (_array(None), _array(None))
+    )
+
+    _run_bars(
+        _array(close), _array(open_), _array(ema1), _array(ema2), _array(stoch_rsi),
+        _array(atr), _array(sma_long), _array(adx), _array(trix_histo), _array(volume),
+        _array(vol_sma), _array(mtf_bullish), buy_slip, sell_slip,
+        _array(abort_growth) if use_score else _array(None), p, s, start,
+        -1 if checkpoint_bar is None else int(checkpoint_bar), checkpoint_state,
+        equity_curve, equity_out if equity_out is not None else np.empty(0, dtype=np.float64), log, counters,
+    )
+
+    trade_log = _log_from_rows(log[:counters[_C_ROWS]])
+    if log_prefix is not None:
+        trade_log = np.concatenate((log_prefix, trade_log))
+    prefix_rows = len(log_prefix) if log_prefix is not None else 0
+    last_bar = int(counters[_C_LAST_BAR])
+    checkpoint: Optional[Dict[str, Any]] = None
+    if counters[_C_CHECKPOINT]:
+        bar = int(checkpoint_bar)  # type: ignore[arg-type]
+        checkpoint = {
+            'engine': 'python',
+            'bar': bar,
+            'state': _state_to_dict(checkpoint_state),
+            'trade_log': trade_log[:prefix_rows + int(counters[_C_ROWS_AT_CHECKPOINT])].copy(),
+            'equity_curve': equity_curve[:bar + 1].copy(),
+        }
+    return {
+        'state': _state_to_dict(s),
+        'trade_log': trade_log,
+        'equity_curve': equity_curve[:last_bar + 2],
+        'last_bar': last_bar,
+        'abort_code': int(counters[_C_ABORT]),
+        'checkpoint': checkpoint,
+    }
@@ -0,0 +1,403 @@
+"""
+backtest_memo.py — Mémoïsation persistante des résultats de backtest.
+
+Le cycle horaire relance chaque configuration (``run_all_backtests``, folds
+walk-forward, essais Optuna) sur un historique le plus souvent identique
+(un timeframe 4h ou 1d n'a pas de nouvelle bougie à la plupart des cycles).
+Ce module conserve les résultats dans une base SQLite locale, indexée par :
+
+- la fonction de backtest, la paire et le timeframe ;
+- les paramètres de l'appel (EMA, scénario, sizing, overrides, critères
+  d'arrêt...) ;
+- une empreinte blake2b des données lues (index + colonnes OHLCV /
+  indicateurs utilisées) ;
+- la version du moteur (``current_engine_version``) : niveau d'API du
+  moteur Cython (ou boucle Python) et empreinte des paramètres de
+  configuration qui influencent un backtest (frais, slippage, ATR,
+  partiels, seuils StochRSI...).
+
+Un changement de configuration ou de moteur change la clé : les anciennes
+entrées ne sont plus jamais lues et expirent après
+``config.backtest_memo_max_age_days``.
+
+Les appels non déterministes (``slippage_model`` stochastique P2-02) ou dont
+un paramètre n'est pas sérialisable ne sont pas mémoïsés ; un ``cost_model``
+(PERF-23, tirage counter-based déterministe) fait partie de la clé.  Un run arrêté
+(``status='pruned'``, PERF-05) est indexé avec ses critères d'arrêt ; un run
+complet est indexé sans critères et sert tous les appels suivants.
+
+Mode incrémental (PERF-08) : chaque run enregistre aussi, par configuration
+et par horodatage du premier bar (sans empreinte de données), le checkpoint
+du moteur avant son dernier bar et l'empreinte des lignes qu'il couvre.
+Quand de nouvelles bougies arrivent, le run suivant reprend depuis ce
+checkpoint si ces lignes sont inchangées : seuls les nouveaux bars sont
+simulés.  Limite : l'état du moteur (position, capital, drawdown, journal)
+dépend de tout l'historique depuis le premier bar, aucun checkpoint ne se
+transpose donc à une fenêtre qui commence plus tard.  La ``start_date`` du
+cycle horaire (``today - backtest_days``, au jour près) avance chaque jour :
+seuls les cycles d'une même journée reprennent, le premier cycle de chaque
+journée refait la simulation complète.  Le coût n'est donc pas
+O(nouveaux bars) d'un jour à l'autre.  Indexer par premier bar évite que
+deux fenêtres (ex. IS 70 % et historique complet) écrasent mutuellement
+leur checkpoint.
+
+Public API
+----------
+- ``BacktestMemo``
+- ``frame_fingerprint``
+- ``arrays_fingerprint``
+- ``current_engine_version``
+- ``memo_key``
+- ``memoize_backtest``
+- ``get_backtest_memo``
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bot_config import config
+
+logger = logging.getLogger(__name__)
+
+# Incrémenté si le format des entrées change
+MEMO_SCHEMA_VERSION = 2
+
+# Colonnes lues par backtest_from_dataframe (hors EMA, ajoutées par appel)
+_DATA_COLUMNS = ('open', 'high', 'low', 'close', 'volume', 'atr', 'stoch_rsi', 'adx')
+
+# Paramètres de configuration qui influencent le résultat d'un backtest
+_CONFIG_FIELDS = (
+    'initial_wallet', 'backtest_taker_fee', 'slippage_buy', 'slippage_sell',
+    'atr_multiplier', 'atr_stop_multiplier', 'adx_threshold', 'risk_per_trade',
+    'partial_threshold_1', 'partial_threshold_2', 'partial_pct_1', 'partial_pct_2',
+    'backtest_min_notional', 'breakeven_enabled', 'breakeven_trigger_pct',
+    'stop_loss_cooldown_candles', 'volume_filter_enabled', 'volume_sma_period',
+    'mtf_filter_enabled', 'mtf_ema_fast', 'mtf_ema_slow', 'stoch_rsi_buy_min',
+    'stoch_rsi_buy_max', 'stoch_rsi_sell_exit', 'risk_free_rate', 'atr_period',
+    'target_volatility_pct',
+)
+
+# Paramètres d'appel exclus de la clé (données / buffers)
+_EXCLUDED_KWARGS = ('df', 'equity_out')
+
+
+class _Unmemoizable(Exception):
+    """Paramètre non sérialisable : l'appel n'est pas mémoïsé."""
+
+
+def _digest(payload: bytes) -> str:
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def arrays_fingerprint(
+    index: pd.Index, arrays: Mapping[str, np.ndarray], columns: Iterable[str] = (),
+) -> str:
+    """Empreinte de tableaux alignés sur ``index`` (cf. ``frame_fingerprint``).
+
+    Couvre l'index et les tableaux ``_DATA_COLUMNS`` + ``columns`` présents
+    dans ``arrays`` : ``BacktestInputs`` (PERF-24) obtient ainsi l'empreinte
+    du DataFrame dont il est issu.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(len(index)).encode())
+    if isinstance(index, pd.DatetimeIndex):
+        h.update(np.ascontiguousarray(np.asarray(index.as_unit('ns').values).view(np.int64)).tobytes())
+    else:
+        h.update(np.ascontiguousarray(np.asarray(index, dtype=np.float64)).tobytes())
+    for col in sorted(set(_DATA_COLUMNS) | set(columns)):
+        if col not in arrays:
+            continue
+        h.update(col.encode())
+        h.update(np.ascontiguousarray(arrays[col], dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def frame_fingerprint(df: pd.DataFrame, columns: Iterable[str] = ()) -> str:
+    """Empreinte des données lues par un backtest.
+
+    Couvre l'index et les colonnes ``_DATA_COLUMNS`` + ``columns`` présentes
+    dans ``df`` (nom et valeurs float64).
+    """
+    wanted = set(_DATA_COLUMNS) | set(columns)
+    return arrays_fingerprint(
+        df.index,
+        {col: df[col].to_numpy(dtype=np.float64) for col in wanted if col in df.columns},
+        columns,
+    )
+
+
+def _prefix_fingerprint(df: Any, end: int, columns: Iterable[str]) -> str:
+    """Empreinte des ``end`` premières lignes d'un DataFrame ou d'un ``BacktestInputs``."""
+    if isinstance(df, pd.DataFrame):
+        return frame_fingerprint(df if end >= len(df) else df.iloc[:end], columns)
+    return df.prefix_fingerprint(end, columns)
+
+
+def current_engine_version() -> str:
+    """Version du moteur + empreinte de la configuration de backtest."""
+    import backtest_runner  # import local : backtest_runner importe ce module
+    engine = (
+        f"cython{backtest_runner._CYTHON_API_LEVEL}"
+        if backtest_runner.CYTHON_BACKTEST_AVAILABLE else 'python'
+    )
+    cfg = {name: getattr(config, name, None) for name in _CONFIG_FIELDS}
+    return f"{MEMO_SCHEMA_VERSION}:{engine}:{_digest(json.dumps(cfg, sort_keys=True).encode())}"
+
+
+def _canonical(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {type(value).__name__: _canonical(dataclasses.asdict(value))}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    raise _Unmemoizable(type(value).__name__)
+
+
+def memo_key(
+    fn_name: str,
+    pair: str,
+    timeframe: str,
+    params: Dict[str, Any],
+    data_fingerprint: str,
+    engine_version: str,
+) -> str:
+    """Clé d'une entrée (lève ``_Unmemoizable`` si ``params`` ne se sérialise pas)."""
+    payload = json.dumps(
+        [fn_name, pair, timeframe, _canonical(params), data_fingerprint, engine_version],
+        sort_keys=True,
+    )
+    return _digest(payload.encode())
+
+
+class BacktestMemo:
+    """Base SQLite des résultats de backtest (thread-safe, multi-processus).
+
+    Parameters
+    ----------
+    path : str
+        Fichier SQLite (créé au besoin, journal WAL).
+    max_age_days : float
+        Les entrées plus anciennes sont supprimées à l'ouverture.
+    """
+
+    def __init__(self, path: str, max_age_days: float = 7.0) -> None:
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS backtest_memo ('
+                ' key TEXT PRIMARY KEY, pair TEXT, timeframe TEXT,'
+                ' engine_version TEXT, created_at REAL, result BLOB)'
+            )
+            if max_age_days > 0:
+                self._conn.execute(
+                    'DELETE FROM backtest_memo WHERE created_at < ?',
+                    (time.time() - max_age_days * 86400.0,),
+                )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Valeur mémoïsée pour ``key`` (None si absente ou illisible)."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT result FROM backtest_memo WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])
+        except Exception as e:
+            logger.debug("[MEMO] Entrée illisible %s: %s", key, e)
+            return None
+
+    def put(
+        self, key: str, value: Any, *, pair: str = '', timeframe: str = '',
+        engine_version: str = '',
+    ) -> None:
+        """Enregistre ``value`` (remplace une entrée existante)."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO backtest_memo VALUES (?, ?, ?, ?, ?, ?)',
+                (key, pair, timeframe, engine_version, time.time(), sqlite3.Binary(blob)),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute('SELECT COUNT(*) FROM backtest_memo').fetchone()[0])
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM backtest_memo')
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_memo: Optional[BacktestMemo] = None
+_memo_pid: int = 0
+_memo_lock = threading.Lock()
+
+
+def get_backtest_memo() -> Optional[BacktestMemo]:
+    """Base partagée du processus, ou None si ``BACKTEST_MEMO`` est désactivé.
+
+    Rouverte après un ``fork`` (une connexion SQLite ne se partage pas entre
+    processus).
+    """
+    global _memo, _memo_pid
+    if not getattr(config, 'backtest_memo_enabled', False):
+        return None
+    with _memo_lock:
+        if _memo is None or _memo_pid != os.getpid():
+            path = getattr(config, 'backtest_memo_path', '') or os.path.join(
+                config.cache_dir, 'backtest_memo.sqlite'
+            )
+            try:
+                _memo = BacktestMemo(
+                    path, float(getattr(config, 'backtest_memo_max_age_days', 7.0))
+                )
+                _memo_pid = os.getpid()
+            except sqlite3.Error as e:
+                logger.warning("[MEMO] Base %s indisponible: %s", path, e)
+                return None
+        return _memo
+
+
+def memoize_backtest(
+    fn: Callable[..., Dict[str, Any]],
+    *,
+    pair: str = '',
+    timeframe: str = '',
+    memo: Optional[BacktestMemo] = None,
+    incremental: bool = False,
+) -> Callable[..., Dict[str, Any]]:
+    """Enveloppe ``fn`` (signature de ``backtest_from_dataframe``, appels par mot-clé).
+
+    Sans base (``memo`` absent et ``BACKTEST_MEMO`` désactivé), ``fn`` est
+    retournée telle quelle.  Si ``equity_out`` est fourni, la courbe
+    mémoïsée y est recopiée.  ``incremental`` : ``fn`` accepte
+    ``checkpoint_bar`` / ``resume`` (PERF-08) ; utilisé hors ``equity_out``,
+    critères d'arrêt et ``bar_range``.  ``df`` peut être un DataFrame ou un
+    ``backtest_inputs.BacktestInputs`` (PERF-24, empreintes mises en cache).
+    """
+    store = memo if memo is not None else get_backtest_memo()
+    if store is None:
+        return fn
+    fn_name = f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', repr(fn))}"
+
+    @functools.wraps(fn)
+    def _wrapper(**kwargs: Any) -> Dict[str, Any]:
+        df = kwargs.get('df')
+        equity_out = kwargs.get('equity_out')
+        if df is None or kwargs.get('slippage_model') is not None:
+            return fn(**kwargs)
+        params = {k: v for k, v in kwargs.items() if k not in _EXCLUDED_KWARGS}
+        params['equity_out'] = equity_out is not None
+        ema_columns = (f"ema_{kwargs.get('ema1_period')}", f"ema_{kwargs.get('ema2_period')}")
+        bar_range = kwargs.get('bar_range')
+        try:
+            # PERF-10: une fenêtre ne dépend que des lignes qui la précèdent
+            fingerprint = _prefix_fingerprint(
+                df, len(df) if bar_range is None else int(bar_range[1]), ema_columns
+            )
+            version = current_engine_version()
+            full_key = memo_key(
+                fn_name, pair, timeframe, dict(params, abort=None), fingerprint, version
+            )
+            abort_key = (
+                memo_key(fn_name, pair, timeframe, params, fingerprint, version)
+                if params.get('abort') is not None else full_key
+            )
+        except _Unmemoizable:
+            return fn(**kwargs)
+
+        # Un run complet vaut pour tous les critères d'arrêt
+        for key in dict.fromkeys((full_key, abort_key)):
+            cached: Optional[Tuple[Dict[str, Any], Optional[np.ndarray]]] = store.get(key)
+            if cached is not None:
+                result, equity = cached
+                if equity_out is not None:
+                    if equity is None:
+                        continue
+                    equity_out[:] = equity
+                store.hits += 1
+                return result
+
+        store.misses += 1
+        resume_kwargs: Dict[str, Any] = {}
+        checkpoint_key = None
+        if (
+            incremental and equity_out is None and params.get('abort') is None
+            and 'checkpoint_bar' not in kwargs and bar_range is None and len(df) > 1
+        ):
+            checkpoint_key = memo_key(
+                fn_name, pair, timeframe, params, f'checkpoint:{df.index[0]}', version
+            )
+            resume_kwargs = _resume_kwargs(store.get(checkpoint_key), df, ema_columns)
+        result = fn(**kwargs, **resume_kwargs)
+        checkpoint = result.pop('checkpoint', None) if checkpoint_key is not None else None
+        if checkpoint_key is not None and checkpoint is not None:
+            store.put(
+                checkpoint_key,
+                {
+                    'checkpoint': checkpoint,
+                    'prefix': _prefix_fingerprint(df, checkpoint['bar'] + 1, ema_columns),
+                },
+                pair=pair, timeframe=timeframe, engine_version=version,
+            )
+        if result.get('final_wallet'):
+            key = abort_key if result.get('status') == 'pruned' else full_key
+            store.put(
+                key,
+                (result, None if equity_out is None else np.array(equity_out, copy=True)),
+                pair=pair, timeframe=timeframe, engine_version=version,
+            )
+        return result
+
+    return _wrapper
+
+
+def _resume_kwargs(
+    saved: Optional[Dict[str, Any]], df: Any, ema_columns: Tuple[str, str],
+) -> Dict[str, Any]:
+    """PERF-08: checkpoint à exporter (dernier bar) et reprise si le préfixe est inchangé.
+
+    ``saved`` provient de la même fenêtre (clé par premier bar) ; la reprise
+    exige en plus que les lignes ``[0, bar]`` soient identiques.
+    """
+    kwargs: Dict[str, Any] = {'checkpoint_bar': len(df) - 1}
+    if saved is None:
+        return kwargs
+    bar = int(saved['checkpoint']['bar'])
+    # Le bar précédant le checkpoint a exécuté ses ordres à open[bar] : ligne incluse
+    if 0 < bar < len(df) and saved['prefix'] == _prefix_fingerprint(
+        df, bar + 1, ema_columns
+    ):
+        kwargs['resume'] = saved['checkpoint']
+    return kwargs
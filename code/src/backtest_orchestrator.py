@@ -7,21 +7,36 @@ Toutes les fonctions reçoivent un _BacktestDeps injecté par des wrappers dans
 Cela permet aux tests de continuer à patcher via monkeypatch.setattr(ms, ...) sans modification.
 """
 
+import functools
 import logging
 import sys
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 from rich.console import Console
 from rich.panel import Panel
+from backtest_abort import AbortCriteria
+from backtest_inputs import BacktestInputs, backtest_inputs
+from backtest_summary import rank_indices, summarize_results
+from cycle_context import cycle_scope
+from drift_monitor import (
+    DRIFT_BASELINE_KEY, DriftReport, assess_drift, atr_pct, baseline_staleness,
+    drift_thresholds_from_config, make_baseline, read_live_outcomes, recent_bar_range,
+)
 from exchange_client import ExchangePort
+from spans import span, timed
+from task_scheduler import Priority, TaskScheduler
 
 logger = logging.getLogger(__name__)
 
 _LIVE_ONLY_POST_SCHEDULED_SKIP_SECONDS = 90.0
+# PERF-20: attente max. du verrou de paire par le cycle live (l'exécution
+# horaire peut tenir la paire) : la gestion des stops n'est pas sautée.
+_LIVE_ONLY_PAIR_LOCK_WAIT_SECONDS = 30.0
 
 
 def _has_console_output(console_obj: Any) -> bool:
@@ -50,6 +65,20 @@ def _safe_stdout_flush() -> None:
         pass
 
 
+def _cycle_scoped(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """PERF-15: exécute ``fn`` dans un ``cycle_scope``.
+
+    ``run_all_backtests`` et la reconstruction des DataFrames walk-forward
+    partagent alors les frames préparés par ``prepare_base_dataframe`` ; le
+    cache est libéré au retour de ``fn``.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with cycle_scope(label=fn.__name__):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
 # ─── Injection de dépendances ─────────────────────────────────────────────────
 
 @dataclass
@@ -62,7 +91,7 @@ class _BacktestDeps:
     client: ExchangePort                            # BinanceFinalClient (ExchangePort structurellement)
     console: Any                                    # Rich Console (global)
     timeframes: List[str]
-    schedule: Any                                   # schedule module
+    scheduler: Optional[TaskScheduler]              # planificateur installé (PERF-20)
     # Callables
     save_fn: Callable                               # save_bot_state
     send_alert_fn: Callable                         # send_trading_alert_email
@@ -88,10 +117,12 @@ class _BacktestDeps:
     # Constants
     wf_scenarios: List[Dict[str, Any]]              # WF_SCENARIOS
     scenario_default_params: Dict[str, Dict[str, Any]]  # SCENARIO_DEFAULT_PARAMS
+    backtest_threshold_grid_fn: Optional[Callable] = None  # backtest_threshold_grid (PERF-06)
 
 
 # ─── Fonctions extraites ──────────────────────────────────────────────────────
 
+@timed('stoch_grid')
 def run_stoch_threshold_grid_search(
     is_results: List[Dict[str, Any]],
     base_dataframes: Dict[str, Any],
@@ -100,18 +131,29 @@ def run_stoch_threshold_grid_search(
     sizing_mode: str = 'risk',
     *,
     n_top: int = 5,
+    batch_fn: Optional[Callable] = None,
+    max_workers: Optional[int] = None,
 ) -> "Optional[Dict[str, Any]]":
     """Grid search sur buy_min × buy_max × sell_exit avec les n_top meilleurs configs IS.
 
     Utilise les résultats IS (full-sample) comme proxy pour trouver les seuils
     StochRSI optimaux, indépendamment des EMAs sélectionnées.
 
+    Seuls les runs à Calmar > 0 comptent : chaque backtest est arrêté dès
+    qu'il ne peut plus finir en gain (``AbortCriteria(min_score=0.0)``,
+    PERF-05) et les runs ``status='pruned'`` sont ignorés.
+
+    PERF-06: la grille de seuils est évaluée par config en un seul appel
+    ``batch_fn`` (``backtest_threshold_grid``), les configs en parallèle.
+
     Parameters
     ----------
     is_results : list[dict]
         Résultats IS complets (sortie de run_all_backtests).
     base_dataframes : dict[str, DataFrame]
-        DataFrames par timeframe, déjà préparés (colonnes indicateurs incluses).
+        DataFrames par timeframe, déjà préparés (colonnes indicateurs incluses) ;
+        non modifiés : les EMA sont calculées par le ``BacktestInputs`` du
+        timeframe (PERF-24), partagé par les configs et les threads.
     backtest_fn : callable
         ``backtest_from_dataframe`` avec support des overrides stoch.
     scenario_default_params : dict
@@ -120,6 +162,11 @@ def run_stoch_threshold_grid_search(
         Mode de position sizing à utiliser.
     n_top : int
         Nombre de configs IS à utiliser comme proxy (défaut 5).
+    batch_fn : callable, optional
+        ``backtest_threshold_grid`` : évalue toute la grille pour une config.
+        Si absent, ``backtest_fn`` est appelé pour chaque combinaison.
+    max_workers : int, optional
+        Threads évaluant les configs en parallèle (défaut : une par config).
 
     Returns
     -------
@@ -132,10 +179,12 @@ def run_stoch_threshold_grid_search(
     BUY_MIN_GRID   = [0.02, 0.05, 0.08, 0.10, 0.15]
     BUY_MAX_GRID   = [0.70, 0.75, 0.80, 0.85]
     SELL_EXIT_GRID = [0.30, 0.40, 0.50]
+    # PERF-05: un run qui ne peut plus finir en gain ne compte pas
+    _abort = AbortCriteria(min_score=0.0)
 
     # Top N configs triées par calmar_ratio décroissant
-    sorted_results = sorted(is_results, key=lambda r: r.get('calmar_ratio', 0.0), reverse=True)
-    top_configs = sorted_results[:n_top]
+    _order = rank_indices(summarize_results(is_results), 'calmar_ratio')  # PERF-19
+    top_configs = [is_results[i] for i in _order[:n_top]]
 
     if not top_configs:
         logger.warning("[STOCH-OPT] Aucun résultat IS disponible pour le grid search.")
@@ -143,64 +192,98 @@ def run_stoch_threshold_grid_search(
 
     best_score = -_np.inf
     best_combo: "Optional[Dict[str, Any]]" = None
-    total_combos = sum(
-        1 for bmin in BUY_MIN_GRID for bmax in BUY_MAX_GRID if bmin < bmax
-    ) * len(SELL_EXIT_GRID)
+    combos = [
+        (buy_min, buy_max, sell_exit)
+        for buy_min in BUY_MIN_GRID
+        for buy_max in BUY_MAX_GRID
+        if buy_min < buy_max
+        for sell_exit in SELL_EXIT_GRID
+    ]
     logger.info(
         "[STOCH-OPT] Grid search: %d combos × top-%d configs IS = %d backtests",
-        total_combos, len(top_configs), total_combos * len(top_configs),
+        len(combos), len(top_configs), len(combos) * len(top_configs),
     )
 
-    for buy_min in BUY_MIN_GRID:
-        for buy_max in BUY_MAX_GRID:
-            if buy_min >= buy_max:
+    # Configs évaluables ; un BacktestInputs par timeframe (PERF-24) : EMA
+    # calculées à la demande (thread-safe), DataFrames d'entrée non modifiés.
+    inputs_by_tf: Dict[str, BacktestInputs] = {}
+    jobs: List[Tuple[BacktestInputs, int, int, Dict[str, Any]]] = []
+    for cfg in top_configs:
+        tf = cfg.get('timeframe', '')
+        df = base_dataframes.get(tf)
+        if df is None or (hasattr(df, 'empty') and df.empty):
+            continue
+        if tf not in inputs_by_tf:
+            inputs_by_tf[tf] = backtest_inputs(df)
+        ema1, ema2 = cfg.get('ema_periods', (26, 50))[:2]
+        sc_params = scenario_default_params.get(cfg.get('scenario', 'StochRSI'), {})
+        jobs.append((inputs_by_tf[tf], ema1, ema2, sc_params))
+
+    def _evaluate(job: Tuple[BacktestInputs, int, int, Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        df, ema1, ema2, sc_params = job
+        scenario_kwargs = dict(
+            sma_long=sc_params.get('sma_long'),
+            adx_period=sc_params.get('adx_period'),
+            trix_length=sc_params.get('trix_length'),
+            trix_signal=sc_params.get('trix_signal'),
+            sizing_mode=sizing_mode,
+            abort=_abort,
+        )
+        if batch_fn is not None:
+            try:
+                return list(batch_fn(
+                    df=df, ema1_period=ema1, ema2_period=ema2, thresholds=combos,
+                    **scenario_kwargs,
+                ))
+            except Exception as _e:
+                logger.debug("[STOCH-OPT] Grille erreur (EMA %d/%d): %s", ema1, ema2, _e)
+                return [None] * len(combos)
+        results: List[Optional[Dict[str, Any]]] = []
+        for buy_min, buy_max, sell_exit in combos:
+            try:
+                results.append(backtest_fn(
+                    df=df,
+                    ema1_period=ema1,
+                    ema2_period=ema2,
+                    stoch_buy_min_override=buy_min,
+                    stoch_buy_max_override=buy_max,
+                    stoch_sell_exit_override=sell_exit,
+                    **scenario_kwargs,
+                ))
+            except Exception as _e:
+                logger.debug("[STOCH-OPT] Backtest erreur (buy_min=%.2f buy_max=%.2f sell=%.2f): %s", buy_min, buy_max, sell_exit, _e)
+                results.append(None)
+        return results
+
+    # PERF-06: une grille par config, configs en parallèle (moteur Cython sans GIL)
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers or len(jobs)) as executor:
+            per_config = list(executor.map(_evaluate, jobs))
+    else:
+        per_config = [_evaluate(job) for job in jobs]
+
+    for j, (buy_min, buy_max, sell_exit) in enumerate(combos):
+        total_calmar = 0.0
+        valid_runs = 0
+        for results in per_config:
+            result = results[j]
+            if result is None:
                 continue
-            for sell_exit in SELL_EXIT_GRID:
-                total_calmar = 0.0
-                valid_runs = 0
-
-                for cfg in top_configs:
-                    tf = cfg.get('timeframe', '')
-                    ema_periods = cfg.get('ema_periods', (26, 50))
-                    ema1, ema2 = ema_periods[0], ema_periods[1]
-                    scenario_name = cfg.get('scenario', 'StochRSI')
-                    sc_params = scenario_default_params.get(scenario_name, {})
-
-                    df = base_dataframes.get(tf)
-                    if df is None or (hasattr(df, 'empty') and df.empty):
-                        continue
-
-                    try:
-                        result = backtest_fn(
-                            df=df,
-                            ema1_period=ema1,
-                            ema2_period=ema2,
-                            sma_long=sc_params.get('sma_long'),
-                            adx_period=sc_params.get('adx_period'),
-                            trix_length=sc_params.get('trix_length'),
-                            trix_signal=sc_params.get('trix_signal'),
-                            sizing_mode=sizing_mode,
-                            stoch_buy_min_override=buy_min,
-                            stoch_buy_max_override=buy_max,
-                            stoch_sell_exit_override=sell_exit,
-                        )
-                        calmar = result.get('calmar_ratio', 0.0)
-                        if calmar > 0:
-                            total_calmar += calmar
-                            valid_runs += 1
-                    except Exception as _e:
-                        logger.debug("[STOCH-OPT] Backtest erreur (buy_min=%.2f buy_max=%.2f sell=%.2f): %s", buy_min, buy_max, sell_exit, _e)
-
-                score = total_calmar / valid_runs if valid_runs > 0 else 0.0
-                if score > best_score:
-                    best_score = score
-                    best_combo = {
-                        'buy_min': buy_min,
-                        'buy_max': buy_max,
-                        'sell_exit': sell_exit,
-                        'avg_calmar': score,
-                        'n_valid': valid_runs,
-                    }
+            calmar = result.get('calmar_ratio', 0.0)
+            if result.get('status') != 'pruned' and calmar > 0:
+                total_calmar += calmar
+                valid_runs += 1
+
+        score = total_calmar / valid_runs if valid_runs > 0 else 0.0
+        if score > best_score:
+            best_score = score
+            best_combo = {
+                'buy_min': buy_min,
+                'buy_max': buy_max,
+                'sell_exit': sell_exit,
+                'avg_calmar': score,
+                'n_valid': valid_runs,
+            }
 
     if best_combo is not None:
         logger.info(
@@ -233,11 +316,11 @@ def _apply_oos_quality_gate(
         *oos_blocked* est True si aucun résultat n'a passé les gates.
     """
     try:
-        from walk_forward import validate_oos_result as _validate_oos
-        valid = [
-            r for r in results
-            if _validate_oos(r.get('sharpe_ratio', 0.0), r.get('win_rate', 0.0))
-        ]
+        from walk_forward import validate_oos_results as _validate_oos
+        # PERF-19: filtre vectorisé sur le résumé compact des résultats
+        _summary = summarize_results(results)
+        _mask = _validate_oos(_summary['sharpe_ratio'], _summary['win_rate'])
+        valid = [r for r, ok in zip(results, _mask) if ok]
     except Exception as _imp_err:
         logger.warning("[%s] validate_oos_result indisponible: %s", log_tag, _imp_err)
         valid = []  # situation dégradée → bloquer
@@ -309,6 +392,89 @@ def _apply_oos_quality_gate(
     return pool, blocked
 
 
+def _check_pair_drift(
+    backtest_pair: str,
+    real_trading_pair: str,
+    best_params: Dict[str, Any],
+    sizing_mode: str,
+    deps: '_BacktestDeps',
+) -> Optional[DriftReport]:
+    """PERF-21: revalidation légère de la config active (un backtest récent).
+
+    Returns
+    -------
+    DriftReport or None
+        None si la revalidation a échoué (ré-optimisation complète par défaut).
+    """
+    thresholds = drift_thresholds_from_config(deps.config)
+    with deps.bot_state_lock:
+        ps = cast(Dict[str, Any], deps.bot_state.get(backtest_pair, {}))
+        baseline = ps.get(DRIFT_BASELINE_KEY)
+        oos_blocked = bool(ps.get('oos_blocked'))
+    stale = baseline_staleness(baseline, best_params, thresholds, oos_blocked=oos_blocked)
+    if stale is not None or baseline is None:
+        return DriftReport(reasons=(stale or 'no_baseline',))
+    try:
+        from walk_forward import timeframe_to_periods_per_year
+        tf = best_params['timeframe']
+        start_date = (datetime.today() - timedelta(days=deps.config.backtest_days)).strftime("%d %B %Y")
+        df = deps.prepare_base_dataframe_fn(backtest_pair, tf, start_date, 14)
+        if df is None or df.empty:
+            return DriftReport(reasons=('no_data',))
+        recent = deps.backtest_from_dataframe_fn(
+            df=df,
+            bar_range=recent_bar_range(len(df), thresholds.recent_bars),
+            ema1_period=best_params['ema1_period'],
+            ema2_period=best_params['ema2_period'],
+            sma_long=best_params.get('sma_long'),
+            adx_period=best_params.get('adx_period'),
+            trix_length=best_params.get('trix_length'),
+            trix_signal=best_params.get('trix_signal'),
+            sizing_mode=sizing_mode,
+            periods_per_year=timeframe_to_periods_per_year(tf),
+            build_trades_frame=False,
+        ) or {}
+        with span('market_changes'):
+            market_changes = deps.detect_market_changes_fn(backtest_pair, [tf], start_date)
+        return assess_drift(
+            baseline, best_params, thresholds,
+            recent_sharpe=recent.get('sharpe_ratio'),
+            live=read_live_outcomes(real_trading_pair, float(baseline['validated_at'])),
+            market_changes=market_changes,
+            atr=atr_pct(df, thresholds.recent_bars),
+        )
+    except Exception as _drift_err:
+        logger.warning("[DRIFT] %s — revalidation impossible: %s", backtest_pair, _drift_err)
+        return None
+
+
+def _record_drift_baseline(
+    backtest_pair: str,
+    params: Dict[str, Any],
+    wf_config: Optional[Dict[str, Any]],
+    frame: Any,
+    deps: '_BacktestDeps',
+) -> None:
+    """PERF-21: enregistre la référence de dérive d'une config validée par le WF.
+
+    Sans config WF (repli IS-Calmar ou paramètres conservateurs), la
+    référence est supprimée : le cycle suivant ré-optimise.
+    """
+    thresholds = drift_thresholds_from_config(deps.config)
+    with deps.bot_state_lock:
+        ps = deps.bot_state.setdefault(backtest_pair, {})
+        if not wf_config:
+            ps.pop(DRIFT_BASELINE_KEY, None)
+            return
+        ps[DRIFT_BASELINE_KEY] = make_baseline(
+            params,
+            expected_sharpe=wf_config.get('avg_oos_sharpe'),
+            expected_win_rate=wf_config.get('avg_oos_win_rate'),
+            atr=atr_pct(frame, thresholds.recent_bars),
+        )
+
+
+@_cycle_scoped
 def _execute_scheduled_trading(
     real_trading_pair: str,
     time_interval: str,
@@ -335,10 +501,25 @@ def _execute_scheduled_trading(
             _last_bt = deps.last_backtest_time.get(backtest_pair, 0)
         _time_since_last = _now - _last_bt
 
+        # PERF-21: ré-optimisation complète seulement si la config active dérive
+        _drift = None
+        if _time_since_last >= deps.config.backtest_throttle_seconds and deps.config.drift_monitor_enabled:
+            with span('drift_check'):
+                _drift = _check_pair_drift(backtest_pair, real_trading_pair, best_params, sizing_mode, deps)
+
         if _time_since_last < deps.config.backtest_throttle_seconds:
             _remaining = int((deps.config.backtest_throttle_seconds - _time_since_last) / 60)
             logger.info(f"[SCHEDULED] Backtest throttlé pour {backtest_pair} — prochain dans ~{_remaining} min. Utilisation des anciens paramètres.")
+        elif _drift is not None and not _drift.reoptimize:
+            with deps.bot_state_lock:
+                deps.last_backtest_time[backtest_pair] = time.time()
+            logger.info(
+                "[SCHEDULED DRIFT] %s — aucune dérive (%s) : ré-optimisation sautée, paramètres conservés.",
+                backtest_pair, ', '.join(f"{k}={v:.3f}" for k, v in sorted(_drift.metrics.items())),
+            )
         else:
+            if _drift is not None:
+                logger.info("[SCHEDULED DRIFT] %s — ré-optimisation complète (%s)", backtest_pair, ', '.join(_drift.reasons))
             logger.info(f"[SCHEDULED] Re-backtest de {backtest_pair} pour obtenir les paramètres les plus à jour...")
 
             # Calculer les dates dynamiquement
@@ -349,12 +530,13 @@ def _execute_scheduled_trading(
             # Re-exécuter le backtest et AFFICHER les résultats
             logger.info("[SCHEDULED] Lancement des backtests...")
             try:
-                backtest_results = deps.run_all_backtests_fn(
-                    backtest_pair,
-                    dynamic_start_date,
-                    deps.timeframes,
-                    sizing_mode=sizing_mode
-                )
+                with span('backtests'):
+                    backtest_results = deps.run_all_backtests_fn(
+                        backtest_pair,
+                        dynamic_start_date,
+                        deps.timeframes,
+                        sizing_mode=sizing_mode
+                    )
             except Exception as backtest_err:
                 logger.error(f"[SCHEDULED] ERREUR backtest {backtest_pair}: {backtest_err}")
                 logger.error(f"[SCHEDULED] Traceback backtest: {traceback.format_exc()}")
@@ -375,10 +557,10 @@ def _execute_scheduled_trading(
                 # P2-01: Walk-Forward OOS validation pour la sélection planifiée.
                 # ML-07: Optuna bayésien en priorité, fallback vers grid WF.
                 _sched_wf_best = None
+                _wf_dfs_sched: Dict[str, Any] = {}
                 try:
                     from walk_forward import run_walk_forward_optuna as _run_wf_optuna
                     from walk_forward import run_walk_forward_validation as _run_wf_sched
-                    _wf_dfs_sched = {}
                     for _tf_s in deps.timeframes:
                         _df_s = deps.prepare_base_dataframe_fn(backtest_pair, _tf_s, dynamic_start_date, 14)
                         _wf_dfs_sched[_tf_s] = _df_s if _df_s is not None and not _df_s.empty else __import__('pandas').DataFrame()
@@ -391,6 +573,7 @@ def _execute_scheduled_trading(
                             backtest_fn=deps.backtest_from_dataframe_fn,
                             scenario_default_params=deps.scenario_default_params,
                             sizing_mode=sizing_mode,
+                            batch_fn=deps.backtest_threshold_grid_fn,
                         )
                         if _stoch_opt_s:
                             from bot_config import config as _cfg_s2
@@ -422,6 +605,7 @@ def _execute_scheduled_trading(
                         initial_capital=deps.config.initial_wallet,
                         sizing_mode=sizing_mode,
                         n_trials=100,
+                        pair=backtest_pair,  # PERF-12: étude persistée par paire
                     )
                     # Fallback to grid WF if Optuna found nothing valid
                     if not _wf_res_sched.get('any_passed'):
@@ -483,6 +667,10 @@ def _execute_scheduled_trading(
                         'scenario': best_result['scenario'],
                     }
                 updated_best_params.update(deps.scenario_default_params.get(updated_best_params.get('scenario', 'StochRSI'), {}))
+                _record_drift_baseline(
+                    backtest_pair, updated_best_params, _sched_wf_best,
+                    _wf_dfs_sched.get(updated_best_params['timeframe']), deps,
+                )
 
                 # Vérifier si les paramètres ont changé
                 if updated_best_params != best_params:
@@ -511,7 +699,8 @@ def _execute_scheduled_trading(
         # Exécuter le trading avec les paramètres mis à jour
         try:
             logger.info(f"[SCHEDULED] Appel execute_real_trades avec {best_params['scenario']} sur {best_params['timeframe']} + sizing_mode='{sizing_mode}'...")
-            deps.execute_trades_fn(real_trading_pair, best_params['timeframe'], best_params, backtest_pair, sizing_mode=sizing_mode)
+            with span('trade'):
+                deps.execute_trades_fn(real_trading_pair, best_params['timeframe'], best_params, backtest_pair, sizing_mode=sizing_mode)
             with deps.bot_state_lock:
                 deps.last_scheduled_trade_time[backtest_pair] = time.time()
             logger.info("[SCHEDULED] execute_real_trades complété avec succès")
@@ -622,7 +811,11 @@ def _execute_live_trading_only(
         )
 
         try:
-            deps.execute_trades_fn(real_trading_pair, tf, current_params, backtest_pair, sizing_mode=sizing_mode)
+            with span('trade'):
+                deps.execute_trades_fn(
+                    real_trading_pair, tf, current_params, backtest_pair, sizing_mode=sizing_mode,
+                    lock_wait=_LIVE_ONLY_PAIR_LOCK_WAIT_SECONDS,
+                )
         except Exception as trade_err:
             logger.error(f"[LIVE-ONLY] Erreur trading {backtest_pair}: {trade_err}")
             logger.error(f"[LIVE-ONLY] Traceback: {traceback.format_exc()}")
@@ -675,6 +868,45 @@ def _execute_live_trading_only(
             logger.warning("[LIVE-ONLY] Email alerte impossible: %s", _e)
 
 
+def _reschedule_pair(
+    backtest_pair: str,
+    real_trading_pair: str,
+    sizing_mode: str,
+    deps: '_BacktestDeps',
+) -> None:
+    """Planifie ``_backtest_and_display_results`` pour la paire (une seule tâche par paire).
+
+    PERF-20: la tâche est confiée au planificateur de la boucle principale
+    (file de fond), la bibliothèque ``schedule`` n'y étant plus exécutée ;
+    une planification antérieure de la même paire est remplacée.
+    """
+    if deps.scheduler is None:
+        logger.warning(f"Aucun planificateur actif — {backtest_pair} non replanifié")
+        return
+    job_name = f"backtest_and_display:{backtest_pair}"
+    for job in deps.scheduler.jobs:
+        if job.name == job_name:
+            deps.scheduler.cancel(job)
+            logger.info(f"Ancienne planification supprimée pour {backtest_pair}")
+
+    # Programmer une tâche UNIQUE et HOMOGENE toutes les schedule_interval_minutes
+    deps.scheduler.every(
+        deps.config.schedule_interval_minutes * 60,
+        lambda bp=backtest_pair, rp=real_trading_pair, tfs=deps.timeframes, sm=sizing_mode, d=deps:
+            _backtest_and_display_results(
+                bp,
+                rp,
+                (datetime.today() - timedelta(days=d.config.backtest_days)).strftime("%d %B %Y"),
+                tfs,
+                sm,
+                d,
+            ),
+        name=job_name,
+        priority=Priority.REOPTIMIZATION,
+    )
+
+
+@_cycle_scoped
 def _backtest_and_display_results(
     backtest_pair: str,
     real_trading_pair: str,
@@ -697,7 +929,8 @@ def _backtest_and_display_results(
 
     # DETECTION INTELLIGENTE DES CHANGEMENTS DE MARCHE
     console.print("\n[bold cyan][ANALYZE] Analyse des changements du marche...[/bold cyan]")
-    market_changes = deps.detect_market_changes_fn(backtest_pair, deps.timeframes, dynamic_start_date)
+    with span('market_changes'):
+        market_changes = deps.detect_market_changes_fn(backtest_pair, deps.timeframes, dynamic_start_date)
     deps.display_market_changes_fn(market_changes, backtest_pair, console=console)
 
     logger.info(f"Backtest period: 5 years from today | Start date: {dynamic_start_date}")
@@ -715,7 +948,8 @@ def _backtest_and_display_results(
     pair_state = cast(Dict[str, Any], deps.bot_state[backtest_pair])
 
     try:
-        results = deps.run_all_backtests_fn(backtest_pair, dynamic_start_date, deps.timeframes, sizing_mode=sizing_mode)
+        with span('backtests'):
+            results = deps.run_all_backtests_fn(backtest_pair, dynamic_start_date, deps.timeframes, sizing_mode=sizing_mode)
     except Exception as e:
         logger.error(f"Une erreur est survenue pendant les backtests : {e}")
         return
@@ -726,10 +960,10 @@ def _backtest_and_display_results(
 
     # === WALK-FORWARD VALIDATION — ML-07: Optuna bayésien (prioritaire) ===
     wf_result: Dict[str, Any] = {}
+    wf_base_dataframes: Dict[str, Any] = {}
     try:
         from walk_forward import run_walk_forward_optuna, run_walk_forward_validation
         # Recréer base_dataframes pour WF (données déjà en cache)
-        wf_base_dataframes = {}
         for tf in deps.timeframes:
             df_wf = deps.prepare_base_dataframe_fn(backtest_pair, tf, dynamic_start_date, 14)
             wf_base_dataframes[tf] = df_wf if df_wf is not None and not df_wf.empty else __import__('pandas').DataFrame()
@@ -745,6 +979,7 @@ def _backtest_and_display_results(
                 backtest_fn=deps.backtest_from_dataframe_fn,
                 scenario_default_params=deps.scenario_default_params,
                 sizing_mode=sizing_mode,
+                batch_fn=deps.backtest_threshold_grid_fn,
             )
             if _stoch_opt:
                 from bot_config import config as _cfg_s
@@ -778,6 +1013,7 @@ def _backtest_and_display_results(
             initial_capital=deps.config.initial_wallet,
             sizing_mode=sizing_mode,
             n_trials=100,
+            pair=backtest_pair,  # PERF-12: étude persistée par paire
         )
         # Fallback: grid WF si Optuna ne passe pas les OOS gates
         if not wf_result.get('any_passed'):
@@ -861,13 +1097,18 @@ def _backtest_and_display_results(
 
     # Mise a jour de l'etat du bot
     pair_state['last_best_params'] = best_params
+    _record_drift_baseline(  # PERF-21
+        backtest_pair, best_params, _wf_best_cfg,
+        wf_base_dataframes.get(best_params['timeframe']), deps,
+    )
     pair_state['execution_count'] = pair_state.get('execution_count', 0) + 1
     deps.save_fn()
 
     console.print("\n")
     try:
         # POSITION SIZING: utiliser le mode passé en paramètre
-        deps.execute_trades_fn(real_trading_pair, best_params['timeframe'], best_params, backtest_pair, sizing_mode=sizing_mode)
+        with span('trade'):
+            deps.execute_trades_fn(real_trading_pair, best_params['timeframe'], best_params, backtest_pair, sizing_mode=sizing_mode)
     except Exception as e:
         logger.error(f"Une erreur est survenue lors de l'execution des ordres en reel: {e}")
         from email_templates import trading_execution_error_email
@@ -880,33 +1121,7 @@ def _backtest_and_display_results(
     # Panel pour l'historique et la planification
     pair_state['last_run_time'] = current_run_time
 
-    # SOLUTION DEFINITIVE - Éviter les planifications multiples
-    existing_job = None
-    for job in deps.schedule.jobs:
-        try:
-            job_func = job.job_func
-            if job_func is not None and hasattr(job_func, 'args') and len(job_func.args) >= 2 and job_func.args[0] == backtest_pair:
-                existing_job = job
-                break
-        except Exception:
-            continue
-
-    if existing_job:
-        deps.schedule.cancel_job(existing_job)
-        logger.info(f"Ancienne planification supprimée pour {backtest_pair}")
-
-    # Programmer une tâche UNIQUE et HOMOGENE toutes les 2 minutes
-    deps.schedule.every(deps.config.schedule_interval_minutes).minutes.do(
-        lambda bp=backtest_pair, rp=real_trading_pair, tfs=deps.timeframes, sm=sizing_mode, d=deps:
-            _backtest_and_display_results(
-                bp,
-                rp,
-                (datetime.today() - timedelta(days=d.config.backtest_days)).strftime("%d %B %Y"),
-                tfs,
-                sm,
-                d,
-            )
-    )
+    _reschedule_pair(backtest_pair, real_trading_pair, sizing_mode, deps)
 
     console.print(deps.build_tracking_panel_fn(pair_state, current_run_time))
     console.print("\n")
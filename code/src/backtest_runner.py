@@ -6,11 +6,13 @@ functions: single backtest execution, parallel orchestration, Cython
 delegation, and result formatting.
 
 The Cython compiled backtest engine (``backtest_engine_standard.pyd``) is
-imported here and used as first choice when available (baseline sizing).
+imported here and used as first choice when available (all sizing modes
+from API level 6, ``baseline`` / ``risk`` only with older binaries).
 
 Public API
 ----------
 - ``backtest_from_dataframe``
+- ``backtest_threshold_grid``
 - ``empty_result_dict``
 - ``run_single_backtest_optimized``
 - ``run_all_backtests``
@@ -21,22 +23,35 @@ Public API
 from __future__ import annotations
 
 import logging
-import math
 import os
 import random
 import sys
 import traceback
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Callable, cast, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, cast, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 import numpy as np
 import pandas as pd
 from rich.console import Console
-from ta.trend import ADXIndicator
 from tqdm import tqdm
 
+from backtest_abort import (
+    ABORT_NONE, AbortCriteria, Leaderboard, abort_criteria_from_config, abort_reason_label,
+    growth_upper_bound,
+)
+from backtest_inputs import BacktestInputs, backtest_inputs
+from backtest_kernel import SIZING_MODES, run_backtest_kernel
+from backtest_memo import memoize_backtest
+from backtest_summary import compact_results
 from bot_config import config
+from cost_model import CostModel
+from cycle_context import current_cycle, cycle_scope
 from indicators_engine import get_optimal_ema_periods
+from task_scheduler import yield_to_foreground
+from trade_log import (
+    REASON_SIGNAL, REASON_STOP_LOSS, REASON_TRAILING_STOP,
+    empty_trade_log, trade_equity_points, trade_log_from_records, trades_frame,
+)
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -49,7 +64,9 @@ class BasicSlippageModel:
 
     Ajoute un surcoût aléatoire de 1-3 bps + un impact volume sur chaque
     transaction.  N'est activé qu'en mode OOS (pas en grid search pour ne
-    pas ralentir l'optimisation).
+    pas ralentir l'optimisation).  Les facteurs sont tirés en Python avant
+    la boucle : le backtest passe par ``backtest_kernel``.  Le walk-forward
+    utilise ``cost_model.CostModel``, évalué dans le moteur (PERF-23).
 
     Parameters
     ----------
@@ -90,44 +107,6 @@ class BasicSlippageModel:
         return 1.0 - spread - vol_impact
 
 
-# --- A-2: Multi-Timeframe Helper ---------------------------------------------
-
-def _compute_mtf_bullish(df_1h: pd.DataFrame, ema_fast: int, ema_slow: int) -> np.ndarray:
-    """Compute 4h multi-timeframe bullish trend array aligned to 1h index.
-
-    No look-ahead bias: shift(1) on 4h level ensures only completed 4h
-    candles are used for the EMA comparison.
-
-    Parameters
-    ----------
-    df_1h : pd.DataFrame
-        1h OHLCV DataFrame with a DatetimeIndex.
-    ema_fast, ema_slow : int
-        EMA periods to compute on 4h close.
-
-    Returns
-    -------
-    np.ndarray[float64]
-        1.0 when 4h EMA_fast > EMA_slow (bullish), 0.0 otherwise.
-        Same length as df_1h.
-    """
-    # Resample 1h close to 4h (closed='left', label='left' = default)
-    df_4h_close = df_1h['close'].resample('4h').last().dropna()
-
-    # Compute EMAs on 4h
-    ema_f = df_4h_close.ewm(span=ema_fast, adjust=False).mean()
-    ema_s = df_4h_close.ewm(span=ema_slow, adjust=False).mean()
-
-    # Bullish = fast > slow; shift(1) → only completed 4h candles
-    bullish_4h = (ema_f > ema_s).astype(float).shift(1).fillna(0.0)
-
-    # Reindex to 1h with forward fill
-    bullish_1h = bullish_4h.reindex(df_1h.index, method='ffill').fillna(0.0)
-
-    result_arr: np.ndarray = np.asarray(bullish_1h.to_numpy(dtype=np.float64), dtype=np.float64)
-    return result_arr
-
-
 # --- Cython Backtest Engine Import -------------------------------------------
 
 _BIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'bin'))
@@ -147,10 +126,312 @@ except ImportError as e:
     )
     # backtest_engine stays None
 
+# Niveau d'API du binaire Cython : 0 = liste de dicts seule (binaire antérieur),
+# 1 = trade_log + build_trade_dicts (PERF-03), 2 = equity_out (PERF-04),
+# 3 = critères d'arrêt anticipé (PERF-05), 4 = grille de seuils (PERF-06),
+# 5 = checkpoints de reprise (PERF-08), 6 = sizing fixed_notional / volatility_parity (PERF-22),
+# 7 = coûts d'exécution cost_* (PERF-23)
+_CYTHON_API_LEVEL: int = (
+    int(getattr(backtest_engine, 'ENGINE_API_LEVEL', 1))
+    if backtest_engine is not None and hasattr(backtest_engine, 'TRADE_LOG_DTYPE')
+    else 0
+)
+_CYTHON_SIZING_MODES: Tuple[str, ...] = (
+    tuple(SIZING_MODES) if _CYTHON_API_LEVEL >= 6 else ('baseline', 'risk')
+)
+_CYTHON_TRADE_LOG: bool = _CYTHON_API_LEVEL >= 1
+_CYTHON_EXTRA_KWARGS: Dict[str, Any] = (
+    {'build_trade_dicts': False} if _CYTHON_TRADE_LOG else {}
+)
+
+_MOTIF_CODES = {
+    'SIGNAL': REASON_SIGNAL,
+    'STOP_LOSS': REASON_STOP_LOSS,
+    'TRAILING_STOP': REASON_TRAILING_STOP,
+}
+
 # --- Core Backtest -----------------------------------------------------------
 
+def _apply_bar_equity_metrics(
+    result: Dict[str, Any], equity_out: np.ndarray, periods_per_year: int,
+) -> None:
+    """PERF-04: remplace les métriques risk-adjusted par celles de l'equity bar-à-bar.
+
+    ``max_drawdown`` reste le max des estimations (inline / trade-level / bar).
+    Pour un backtest arrêté (PERF-05), seuls les bars simulés sont utilisés et
+    la fin du buffer est mise à NaN.
+    """
+    bars_run = int(result.get('bars_run', len(equity_out)))
+    if bars_run < len(equity_out):
+        equity_out[bars_run:] = np.nan
+        equity_out = equity_out[:bars_run]
+    from walk_forward import compute_bar_risk_metrics
+    bar_metrics = compute_bar_risk_metrics(
+        equity_out,
+        periods_per_year=periods_per_year,
+        risk_free_rate=config.risk_free_rate,
+        initial_equity=config.initial_wallet,
+    )
+    bar_metrics['max_drawdown'] = max(
+        result.get('max_drawdown', 0.0), bar_metrics['max_drawdown']
+    )
+    result.update(bar_metrics)
+
+
+def _bar_window(n_rows: int, bar_range: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+    """PERF-10: ``(premier bar simulé, fin de la fenêtre)`` parmi ``n_rows`` lignes.
+
+    Les bars antérieurs à la fenêtre servent de préchauffage aux indicateurs
+    (vues ``[début:fin]`` des tableaux ``BacktestInputs``, sans copie).
+    """
+    if bar_range is None:
+        return 0, n_rows
+    start, end = int(bar_range[0]), int(bar_range[1])
+    if not 0 <= start < end <= n_rows:
+        raise ValueError(f"bar_range=({start}, {end}) hors de [0, {n_rows}]")
+    return start, end
+
+
+def _taker_fee(cost_model: Optional[CostModel]) -> float:
+    """Frais taker du backtest (``CostModel.fee_rate`` prioritaire, PERF-23)."""
+    if cost_model is not None and cost_model.fee_rate is not None:
+        return cost_model.fee_rate
+    return config.backtest_taker_fee
+
+
+def _engine_arrays(
+    inputs: BacktestInputs,
+    bar_start: int,
+    bar_end: int,
+    ema1_period: int,
+    ema2_period: int,
+    sma_long: Optional[int],
+    adx_period: Optional[int],
+    trix_length: Optional[int],
+    trix_signal: Optional[int],
+    cost_model: Optional[CostModel] = None,
+) -> Dict[str, Any]:
+    """PERF-24: tableaux de la fenêtre ``[bar_start, bar_end[`` lus par les moteurs.
+
+    Les indicateurs sont calculés (une fois, cf. ``BacktestInputs``) sur tout
+    l'historique ; seules des vues en lecture seule de la fenêtre sont
+    renvoyées (PERF-10).  Un filtre ou indicateur inactif vaut None.
+    """
+    window = slice(bar_start, bar_end)
+
+    def _cut(values: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        return None if values is None else values[window]
+
+    # A-1: Volume filter — SMA du volume (PERF-23: volume aussi pour la participation)
+    use_vol = bool(getattr(config, 'volume_filter_enabled', False)) and inputs.has('volume')
+    cost_volume = cost_model is not None and cost_model.participation_impact > 0
+    # A-2: Multi-timeframe filter — 4h EMA trend (DatetimeIndex requis)
+    mtf_bullish = None
+    if getattr(config, 'mtf_filter_enabled', False):
+        mtf_bullish = inputs.mtf_bullish(
+            getattr(config, 'mtf_ema_fast', 18), getattr(config, 'mtf_ema_slow', 58)
+        )
+    return {
+        'close': _cut(inputs.column('close')),
+        'high': _cut(inputs.get('high')),
+        'low': _cut(inputs.get('low')),
+        'open': _cut(inputs.get('open')),
+        'ema1': _cut(inputs.ema(ema1_period)),
+        'ema2': _cut(inputs.ema(ema2_period)),
+        'stoch_rsi': _cut(inputs.column('stoch_rsi')),
+        'atr': _cut(inputs.column('atr')),
+        'sma_long': _cut(inputs.sma(sma_long)) if sma_long else None,
+        'adx': _cut(inputs.adx(adx_period)) if adx_period else None,
+        'trix_histo': (
+            _cut(inputs.trix_histo(trix_length, trix_signal))
+            if trix_length and trix_signal else None
+        ),
+        'volume': _cut(inputs.get('volume')) if use_vol or cost_volume else None,
+        'vol_sma': (
+            _cut(inputs.vol_sma(int(getattr(config, 'volume_sma_period', 20))))
+            if use_vol else None
+        ),
+        'mtf_bullish': _cut(mtf_bullish),
+        'index': inputs.index[window],
+    }
+
+
+def _cython_engine_inputs(
+    arrays: Dict[str, Any],
+    sma_long: Optional[int],
+    adx_period: Optional[int],
+    trix_length: Optional[int],
+    sizing_mode: str,
+    partial_enabled: bool,
+    cost_model: Optional[CostModel] = None,
+) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """Prépare les entrées de ``backtest_engine`` (hors seuils StochRSI).
+
+    ``arrays`` : tableaux de la fenêtre simulée (``_engine_arrays``).
+    ``cost_model`` (PERF-23) exige ``ENGINE_API_LEVEL`` 7.
+
+    Returns
+    -------
+    tuple
+        ``(args, kwargs)`` — ``kwargs`` n'inclut ni les seuils StochRSI, ni
+        ``equity_out``, ni les critères d'arrêt.
+    """
+    args = (
+        arrays['close'],
+        arrays['high'],
+        arrays['low'],
+        arrays['ema1'],
+        arrays['ema2'],
+        arrays['stoch_rsi'],
+        arrays['atr'],
+        arrays['sma_long'],
+        arrays['adx'],
+        arrays['trix_histo'],
+        arrays['open'],
+        arrays['volume'],
+        arrays['vol_sma'],
+        config.initial_wallet,
+        'StochRSI',
+        sma_long is not None,
+        adx_period is not None,
+        trix_length is not None,
+        arrays['vol_sma'] is not None,  # A-1: use_vol_filter
+        _taker_fee(cost_model),
+        config.slippage_buy,
+        config.slippage_sell,
+    )
+    kwargs: Dict[str, Any] = dict(
+        atr_multiplier=config.atr_multiplier,
+        atr_stop_multiplier=config.atr_stop_multiplier,
+        adx_threshold=config.adx_threshold,
+        sizing_mode=sizing_mode,
+        risk_per_trade=config.risk_per_trade,
+        partial_enabled=partial_enabled,
+        partial_threshold_1=config.partial_threshold_1,
+        partial_threshold_2=config.partial_threshold_2,
+        partial_pct_1=config.partial_pct_1,
+        partial_pct_2=config.partial_pct_2,
+        min_notional=getattr(config, 'backtest_min_notional', 5.0),
+        breakeven_enabled=getattr(config, 'breakeven_enabled', True),
+        breakeven_trigger_pct=getattr(config, 'breakeven_trigger_pct', 0.015),
+        cooldown_candles=getattr(config, 'stop_loss_cooldown_candles', 0),
+        mtf_bullish=arrays['mtf_bullish'],
+        use_mtf_filter=arrays['mtf_bullish'] is not None,
+        **_CYTHON_EXTRA_KWARGS,
+    )
+    if _CYTHON_API_LEVEL >= 6:
+        kwargs['target_volatility_pct'] = getattr(config, 'target_volatility_pct', 0.02)
+    if cost_model is not None:
+        kwargs.update(cost_model.engine_kwargs())
+    return args, kwargs
+
+
+def _cython_abort_kwargs(
+    abort: Optional[AbortCriteria], arrays: Dict[str, Any],
+) -> Dict[str, Any]:
+    """PERF-05: critères d'arrêt pour le moteur (ignorés par un binaire antérieur)."""
+    if abort is None or not abort.enabled or _CYTHON_API_LEVEL < 3:
+        return {}
+    kwargs: Dict[str, Any] = {
+        'abort_max_drawdown': abort.max_drawdown,
+        'abort_equity_floor': abort.equity_floor,
+        'abort_min_trades': abort.min_trades,
+        'abort_min_trades_bar': abort.min_trades_bar,
+    }
+    if abort.min_score is not None:
+        kwargs['abort_min_score'] = abort.min_score
+        kwargs['abort_growth'] = growth_upper_bound(arrays['close'], arrays['open'])
+    return kwargs
+
+
+def _cython_resume_kwargs(
+    resume: Optional[Dict[str, Any]], checkpoint_bar: Optional[int],
+) -> Dict[str, Any]:
+    """PERF-08: état de reprise et bar de checkpoint pour le moteur."""
+    kwargs: Dict[str, Any] = {}
+    if resume is not None:
+        kwargs['resume_state'] = resume['state']
+        kwargs['start_bar'] = int(resume['bar'])
+    if checkpoint_bar is not None:
+        kwargs['checkpoint_bar'] = int(checkpoint_bar)
+    return kwargs
+
+
+def _merge_cython_resume(
+    result: Dict[str, Any], resume: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """PERF-08: complète le journal d'un run repris et construit son checkpoint.
+
+    Le moteur ne renvoie que les enregistrements du run ; le journal antérieur
+    au bar de reprise est préfixé.  Retourne le checkpoint exporté (ou None).
+    """
+    prefix = resume['trade_log'] if resume is not None else empty_trade_log()
+    if resume is not None:
+        result['trade_log'] = np.concatenate((prefix, result['trade_log']))
+    raw = result.get('checkpoint')
+    if raw is None:
+        return None
+    return {
+        'engine': 'cython',
+        'bar': int(raw['bar']),
+        'state': raw['state'],
+        'trade_log': result['trade_log'][:len(prefix) + int(raw['n_trades'])].copy(),
+    }
+
+
+def _cython_result_dict(
+    result: Dict[str, Any],
+    index: pd.Index,
+    periods_per_year: int,
+    build_trades_frame: bool,
+) -> Dict[str, Any]:
+    """Convertit un résultat brut du moteur Cython (métriques incluses)."""
+    # PERF-03: journal numpy structuré ; un .pyd antérieur ne renvoie
+    # que la liste de dicts → conversion.
+    _log = result.get('trade_log')
+    if _log is None:
+        _log = trade_log_from_records(result['trades'] or [])
+    _bars_run = int(result.get('last_bar', len(index) - 1)) + 1
+    _cython_result = {
+        'final_wallet': result['final_wallet'],
+        'trade_log': _log,
+        'max_drawdown': result['max_drawdown'],
+        'win_rate': result['win_rate'],
+        'status': result.get('status', 'completed'),
+        'abort_reason': abort_reason_label(result.get('abort_reason', ABORT_NONE)),
+        'bars_run': _bars_run,
+    }
+    if build_trades_frame:
+        _cython_result['trades'] = trades_frame(_log, index)
+    # Calculer sharpe_ratio + métriques risk-adjusted à partir des profits
+    # de chaque trade SELL. Sans cela, r.get('sharpe_ratio', 0.0) = 0.0
+    # et les OOS gates (sharpe > 0.3) bloquent TOUS les achats en permanence.
+    try:
+        from walk_forward import compute_risk_metrics as _crm_cy
+        _eq_pts = trade_equity_points(_log, config.initial_wallet)
+        if len(_eq_pts) > 1:
+            # Bug #1 fix: trade_log transmis → profit_factor et
+            # max_consecutive_losses calculés (vectorisés) sur les ventes.
+            _rm = _crm_cy(
+                _eq_pts,
+                trade_log=_log,
+                periods_per_year=periods_per_year,
+                n_bars_total=_bars_run,
+            )
+            _cython_result.update(_rm)
+            # Source de vérité unique pour max_drawdown (Cython path) :
+            # max(DD inline Cython in-position, DD compute_risk_metrics sur equity trade-level)
+            _metrics_dd_cy = _rm.get('max_drawdown', 0.0)
+            _cython_result['max_drawdown'] = max(
+                result['max_drawdown'], _metrics_dd_cy
+            )
+    except Exception as _exc:
+        logger.debug("[backtest_runner] compute_risk_metrics Cython a échoué: %s", _exc)
+    return _cython_result
+
+
 def backtest_from_dataframe(
-    df: pd.DataFrame,
+    df: Union[pd.DataFrame, BacktestInputs],
     ema1_period: int,
     ema2_period: int,
     sma_long: Optional[int] = None,
@@ -160,24 +441,35 @@ def backtest_from_dataframe(
     sizing_mode: str = 'risk',  # B-2: risk-based sizing
     partial_enabled: bool = True,  # P2-01: toggle simulation des partiels
     slippage_model: Optional[BasicSlippageModel] = None,  # P2-02: slippage stochastique OOS
+    cost_model: Optional[CostModel] = None,  # PERF-23: coûts d'exécution dans le moteur
     periods_per_year: int = 8766,
     stoch_buy_min_override: Optional[float] = None,   # grid search — override config
     stoch_buy_max_override: Optional[float] = None,   # grid search — override config
     stoch_sell_exit_override: Optional[float] = None, # grid search — override config
+    build_trades_frame: bool = True,  # PERF-03: DataFrame 'trades' pour affichage
+    equity_out: Optional[np.ndarray] = None,  # PERF-04: buffer equity bar-à-bar
+    abort: Optional[AbortCriteria] = None,  # PERF-05: critères d'arrêt anticipé
+    checkpoint_bar: Optional[int] = None,  # PERF-08: état exporté avant ce bar
+    resume: Optional[Dict[str, Any]] = None,  # PERF-08: reprise depuis un checkpoint
+    bar_range: Optional[Tuple[int, int]] = None,  # PERF-10: fenêtre [début, fin[ simulée
     **_kwargs: Any,
 ) -> Dict[str, Any]:
     """Exécute un backtest à partir d'un DataFrame préparé.
 
-    Utilise le moteur Cython accéléré (30–50×) quand disponible et que
-    ``sizing_mode in ('baseline', 'risk')``.  Pour les modes avancés (``'risk'``,
-    ``'fixed_notional'``, ``'volatility_parity'``), utilise la boucle
-    Python qui gère explicitement le position sizing.
+    Utilise le moteur Cython accéléré (30–50×) quand disponible, pour tous
+    les modes de sizing depuis ``ENGINE_API_LEVEL`` 6 (PERF-22 ; ``'baseline'``
+    et ``'risk'`` seulement avec un binaire plus ancien).  Sinon, utilise la
+    boucle sur tableaux de ``backtest_kernel`` (compilée par numba si
+    installé, PERF-09), qui applique les mêmes formules de position sizing.
 
     Parameters
     ----------
-    df : pd.DataFrame
+    df : pd.DataFrame or BacktestInputs
         DataFrame OHLCV + indicateurs (doit contenir ``close``, ``atr``,
-        ``stoch_rsi`` et les colonnes ``ema_{period}``).
+        ``stoch_rsi`` ; colonnes ``ema_{period}`` calculées si absentes), non
+        modifié, ou son jeu de tableaux ``backtest_inputs(df)`` (PERF-24) :
+        l'appelant qui enchaîne les backtests sur les mêmes données le
+        construit une fois.
     ema1_period, ema2_period : int
         Périodes EMA rapide / lente.
     sma_long, adx_period : int, optional
@@ -191,92 +483,107 @@ def backtest_from_dataframe(
         Active la simulation des prises de profit partielles (P2-01).
     periods_per_year : int
         Nombre de périodes par an (pour les métriques risk-adjusted).
+    build_trades_frame : bool
+        Construit le DataFrame ``trades`` (affichage).  ``False`` en grid
+        search : seul le journal numpy ``trade_log`` est renvoyé (PERF-03).
+    equity_out : np.ndarray, optional
+        Buffer float64 de ``len(df)`` valeurs fourni par l'appelant ; reçoit
+        l'equity de fin de bar marquée au close (PERF-04).  Sharpe, Sortino,
+        Calmar, drawdown et durée sous l'eau sont alors calculés sur cette
+        courbe (``compute_bar_risk_metrics``).
+    abort : AbortCriteria, optional
+        Critères d'arrêt anticipé (PERF-05).  Si l'un est atteint, la
+        simulation s'arrête : ``status='pruned'``, ``abort_reason`` et
+        métriques partielles calculées sur les ``bars_run`` premiers bars.
+    checkpoint_bar : int, optional
+        Le résultat porte ``'checkpoint'`` : état du moteur avant ce bar
+        (position, cash, drawdown, cooldown, journal antérieur), ou None si
+        la simulation s'est arrêtée avant (PERF-08).
+    resume : dict, optional
+        Checkpoint d'un run précédent : seuls les bars ``>= resume['bar']``
+        sont simulés.  L'appelant garantit que les ``resume['bar'] + 1``
+        premières lignes de ``df`` sont identiques à celles du run d'origine
+        (``backtest_memo`` compare leurs empreintes).  Incompatible avec
+        ``equity_out`` et ``abort``.
+    bar_range : (int, int), optional
+        Fenêtre ``[début, fin[`` de ``df`` à simuler, capital initial au
+        bar ``début`` (PERF-10).  Les indicateurs (causaux) valent ceux de
+        ``df[:fin]`` : les bars antérieurs servent de préchauffage, sans
+        copie de fold.  ``equity_out``, ``checkpoint_bar``, ``resume`` et
+        les index du journal sont relatifs à la fenêtre.
+    slippage_model : BasicSlippageModel, optional
+        Slippage stochastique tiré en Python (P2-02) : boucle
+        ``backtest_kernel`` uniquement.
+    cost_model : CostModel, optional
+        Coûts d'exécution évalués dans le moteur, Cython ou ``backtest_kernel``
+        (PERF-23) : slippage fixe, proportionnel à l'ATR, à la participation
+        au volume, aléatoire counter-based ; ``fee_rate`` remplace
+        ``config.backtest_taker_fee``.  Déterministe : mémoïsable.
 
     Returns
     -------
     dict
-        ``{'final_wallet', 'trades', 'max_drawdown', 'win_rate',
-        'sharpe_ratio', 'sortino_ratio', 'calmar_ratio', ...}``
+        ``{'final_wallet', 'trade_log', 'trades', 'max_drawdown', 'win_rate',
+        'status', 'abort_reason', 'bars_run', 'sharpe_ratio', 'sortino_ratio',
+        'calmar_ratio', ...}`` — ``trade_log`` suit ``trade_log.TRADE_LOG_DTYPE``.
     """
+    inputs = backtest_inputs(df)
+    bar_start, bar_end = _bar_window(len(inputs), bar_range)
+    n_bars = bar_end - bar_start
+    if equity_out is not None and (
+        equity_out.dtype != np.float64 or equity_out.shape != (n_bars,)
+    ):
+        raise ValueError(
+            f"equity_out doit être un tableau float64 de {n_bars} valeurs"
+        )
+    if checkpoint_bar is not None and not 0 <= checkpoint_bar < n_bars:
+        raise ValueError(f"checkpoint_bar={checkpoint_bar} hors de [0, {n_bars}[")
+    if resume is not None:
+        if equity_out is not None or abort is not None:
+            raise ValueError("resume est incompatible avec equity_out et abort")
+        if not 0 < int(resume['bar']) < n_bars or (
+            checkpoint_bar is not None and checkpoint_bar < int(resume['bar'])
+        ):
+            raise ValueError(
+                f"checkpoint de reprise (bar {resume['bar']}) incompatible avec "
+                f"{n_bars} bars / checkpoint_bar={checkpoint_bar}"
+            )
     try:
-        if df.empty or len(df) < 50:
+        if len(inputs) == 0 or n_bars < 50:
             return {
                 'final_wallet': 0.0,
+                'trade_log': empty_trade_log(),
                 'trades': pd.DataFrame(),
                 'max_drawdown': 0.0,
                 'win_rate': 0.0,
             }
 
-        # Securiser la presence des colonnes EMA dynamiques
-        if f'ema_{ema1_period}' not in df.columns:
-            df[f'ema_{ema1_period}'] = df['close'].ewm(
-                span=ema1_period, adjust=False
-            ).mean()
-        if f'ema_{ema2_period}' not in df.columns:
-            df[f'ema_{ema2_period}'] = df['close'].ewm(
-                span=ema2_period, adjust=False
-            ).mean()
+        # PERF-24: vues de la fenêtre sur les tableaux partagés (aucune copie
+        # du DataFrame ; indicateurs calculés une fois par jeu de données)
+        arrays = _engine_arrays(
+            inputs, bar_start, bar_end, ema1_period, ema2_period,
+            sma_long, adx_period, trix_length, trix_signal, cost_model,
+        )
 
         # === CYTHON PATH ===
-        # P4-CYTHON: Cython engine supports baseline + risk sizing and partials
+        # P4-CYTHON: Cython engine supports all sizing modes (PERF-22) and partials
         if (
             CYTHON_BACKTEST_AVAILABLE
             and backtest_engine is not None
-            and sizing_mode in ('baseline', 'risk')
+            and sizing_mode in _CYTHON_SIZING_MODES
+            and slippage_model is None
+            and (cost_model is None or _CYTHON_API_LEVEL >= 7)
+            and (equity_out is None or _CYTHON_API_LEVEL >= 2)
+            and (
+                (resume is None and checkpoint_bar is None) or _CYTHON_API_LEVEL >= 5
+            )
+            and (resume is None or resume.get('engine') == 'cython')
         ):
             try:
-                df_work = df.copy()
-                df_work['ema1'] = df_work[f'ema_{ema1_period}']
-                df_work['ema2'] = df_work[f'ema_{ema2_period}']
-                if sma_long:
-                    df_work['sma_long'] = df_work['close'].rolling(
-                        window=sma_long
-                    ).mean()
-                if adx_period:
-                    if 'adx' in df.columns:
-                        df_work['adx'] = df['adx'].values
-                    else:
-                        df_work['adx'] = ADXIndicator(
-                            high=df_work['high'],
-                            low=df_work['low'],
-                            close=df_work['close'],
-                            window=adx_period,
-                        ).adx()
-                if trix_length and trix_signal:
-                    trix_ema1 = df_work['close'].ewm(
-                        span=trix_length, adjust=False
-                    ).mean()
-                    trix_ema2 = trix_ema1.ewm(
-                        span=trix_length, adjust=False
-                    ).mean()
-                    trix_ema3 = trix_ema2.ewm(
-                        span=trix_length, adjust=False
-                    ).mean()
-                    df_work['TRIX_PCT'] = trix_ema3.pct_change() * 100
-                    df_work['TRIX_SIGNAL'] = df_work['TRIX_PCT'].rolling(
-                        window=trix_signal
-                    ).mean()
-                    df_work['TRIX_HISTO'] = (
-                        df_work['TRIX_PCT'] - df_work['TRIX_SIGNAL']
-                    )
-
-                # A-1: Volume filter — SMA du volume
-                _use_vol = getattr(config, 'volume_filter_enabled', False)
-                if _use_vol and 'volume' in df_work.columns:
-                    _vol_period = int(getattr(config, 'volume_sma_period', 20))
-                    df_work['vol_sma'] = df_work['volume'].rolling(window=_vol_period).mean()
-
-                # A-2: Multi-timeframe filter — compute 4h EMA trend
-                _use_mtf = getattr(config, 'mtf_filter_enabled', False)
-                _mtf_bullish = None
-                if _use_mtf and hasattr(df_work.index, 'freq') or isinstance(df_work.index, pd.DatetimeIndex):
-                    try:
-                        _mtf_fast = getattr(config, 'mtf_ema_fast', 18)
-                        _mtf_slow = getattr(config, 'mtf_ema_slow', 58)
-                        _mtf_bullish = _compute_mtf_bullish(df_work, _mtf_fast, _mtf_slow)
-                    except Exception as _mtf_err:
-                        logger.warning("A-2 MTF computation failed: %s — filter disabled", _mtf_err)
-                        _use_mtf = False
+                _cy_args, _cy_kwargs = _cython_engine_inputs(
+                    arrays, sma_long, adx_period, trix_length,
+                    sizing_mode, partial_enabled, cost_model,
+                )
 
                 # Threshold overrides for grid search (None = use config default)
                 _cy_stoch_buy_max   = stoch_buy_max_override   if stoch_buy_max_override   is not None else config.stoch_rsi_buy_max
@@ -284,129 +591,23 @@ def backtest_from_dataframe(
                 _cy_stoch_sell_exit = stoch_sell_exit_override if stoch_sell_exit_override is not None else config.stoch_rsi_sell_exit
 
                 result = backtest_engine.backtest_from_dataframe_fast(
-                    df_work['close'].to_numpy(dtype=np.float64),
-                    df_work['high'].to_numpy(dtype=np.float64),
-                    df_work['low'].to_numpy(dtype=np.float64),
-                    df_work['ema1'].to_numpy(dtype=np.float64),
-                    df_work['ema2'].to_numpy(dtype=np.float64),
-                    df_work['stoch_rsi'].to_numpy(dtype=np.float64),
-                    df_work['atr'].to_numpy(dtype=np.float64),
-                    (
-                        df_work['sma_long'].to_numpy(dtype=np.float64)
-                        if sma_long and 'sma_long' in df_work.columns
-                        else None
-                    ),
-                    (
-                        df_work['adx'].to_numpy(dtype=np.float64)
-                        if adx_period and 'adx' in df_work.columns
-                        else None
-                    ),
-                    (
-                        df_work['TRIX_HISTO'].to_numpy(dtype=np.float64)
-                        if trix_length and 'TRIX_HISTO' in df_work.columns
-                        else None
-                    ),
-                    (
-                        df_work['open'].to_numpy(dtype=np.float64)
-                        if 'open' in df_work.columns
-                        else None
-                    ),
-                    # A-1: volume arrays
-                    (
-                        df_work['volume'].to_numpy(dtype=np.float64)
-                        if _use_vol and 'volume' in df_work.columns
-                        else None
-                    ),
-                    (
-                        df_work['vol_sma'].to_numpy(dtype=np.float64)
-                        if _use_vol and 'vol_sma' in df_work.columns
-                        else None
-                    ),
-                    config.initial_wallet,
-                    'StochRSI',
-                    sma_long is not None,
-                    adx_period is not None,
-                    trix_length is not None,
-                    _use_vol and 'vol_sma' in df_work.columns,  # A-1: use_vol_filter
-                    config.backtest_taker_fee,
-                    config.slippage_buy,
-                    config.slippage_sell,
-                    atr_multiplier=config.atr_multiplier,
-                    atr_stop_multiplier=config.atr_stop_multiplier,
+                    *_cy_args,
                     stoch_threshold_buy=_cy_stoch_buy_max,
                     stoch_threshold_sell=_cy_stoch_sell_exit,
-                    adx_threshold=config.adx_threshold,
-                    sizing_mode=sizing_mode,
-                    risk_per_trade=config.risk_per_trade,
-                    partial_enabled=partial_enabled,
-                    partial_threshold_1=config.partial_threshold_1,
-                    partial_threshold_2=config.partial_threshold_2,
-                    partial_pct_1=config.partial_pct_1,
-                    partial_pct_2=config.partial_pct_2,
-                    min_notional=getattr(config, 'backtest_min_notional', 5.0),
                     stoch_threshold_buy_min=_cy_stoch_buy_min,
-                    breakeven_enabled=getattr(config, 'breakeven_enabled', True),
-                    breakeven_trigger_pct=getattr(config, 'breakeven_trigger_pct', 0.015),
-                    cooldown_candles=getattr(config, 'stop_loss_cooldown_candles', 0),
-                    mtf_bullish=_mtf_bullish if _use_mtf and _mtf_bullish is not None else None,
-                    use_mtf_filter=_use_mtf and _mtf_bullish is not None,
+                    **_cy_kwargs,
+                    **({'equity_out': equity_out} if equity_out is not None else {}),
+                    **_cython_abort_kwargs(abort, arrays),
+                    **_cython_resume_kwargs(resume, checkpoint_bar),
                 )
-                _cython_result = {
-                    'final_wallet': result['final_wallet'],
-                    'trades': (
-                        pd.DataFrame(result['trades'])
-                        if result['trades']
-                        else pd.DataFrame()
-                    ),
-                    'max_drawdown': result['max_drawdown'],
-                    'win_rate': result['win_rate'],
-                }
-                # Calculer sharpe_ratio + métriques risk-adjusted à partir des profits
-                # de chaque trade SELL. Sans cela, r.get('sharpe_ratio', 0.0) = 0.0
-                # et les OOS gates (sharpe > 0.3) bloquent TOUS les achats en permanence.
-                try:
-                    from walk_forward import compute_risk_metrics as _crm_cy
-                    _sell_profits = [
-                        t.get('profit', 0.0)
-                        for t in (result['trades'] or [])
-                        if t.get('type') == 'SELL'
-                    ]
-                    if _sell_profits:
-                        _running = config.initial_wallet
-                        _eq_pts = [_running]
-                        for _p in _sell_profits:
-                            _running += _p
-                            _eq_pts.append(_running)
-                        _rm = _crm_cy(
-                            np.array(_eq_pts),
-                            trades_df=None,
-                            periods_per_year=periods_per_year,
-                            n_bars_total=len(df),
-                        )
-                        _cython_result.update(_rm)
-                        # Bug #1 fix: profit_factor et max_consecutive_losses toujours 0
-                        # car trades_df=None est passé à compute_risk_metrics.
-                        # On les calcule directement depuis _sell_profits.
-                        _gp = sum(p for p in _sell_profits if p > 0)
-                        _gl = abs(sum(p for p in _sell_profits if p < 0))
-                        _pf = _gp / _gl if _gl > 0 else (999.0 if _gp > 0 else 0.0)
-                        _cython_result['profit_factor'] = round(min(_pf, 999.0), 4)
-                        _streak, _max_cl = 0, 0
-                        for _p in _sell_profits:
-                            if _p < 0:
-                                _streak += 1
-                                _max_cl = max(_max_cl, _streak)
-                            else:
-                                _streak = 0
-                        _cython_result['max_consecutive_losses'] = _max_cl
-                        # Source de vérité unique pour max_drawdown (Cython path) :
-                        # max(DD inline Cython in-position, DD compute_risk_metrics sur equity trade-level)
-                        _metrics_dd_cy = _rm.get('max_drawdown', 0.0)
-                        _cython_result['max_drawdown'] = max(
-                            _cython_result['max_drawdown'], _metrics_dd_cy
-                        )
-                except Exception as _exc:
-                    logger.debug("[backtest_runner] compute_risk_metrics Cython a échoué: %s", _exc)
+                _checkpoint = _merge_cython_resume(result, resume)
+                _cython_result = _cython_result_dict(
+                    result, arrays['index'], periods_per_year, build_trades_frame
+                )
+                if checkpoint_bar is not None:
+                    _cython_result['checkpoint'] = _checkpoint
+                if equity_out is not None:
+                    _apply_bar_equity_metrics(_cython_result, equity_out, periods_per_year)
                 return _cython_result
             except Exception as e:
                 logger.warning(
@@ -415,386 +616,105 @@ def backtest_from_dataframe(
                 traceback.print_exc()
 
         # === PYTHON FALLBACK ===
-        df_work = df.copy()
-        if f'ema_{ema1_period}' not in df_work.columns:
-            df_work[f'ema_{ema1_period}'] = df_work['close'].ewm(
-                span=ema1_period, adjust=False
-            ).mean()
-        if f'ema_{ema2_period}' not in df_work.columns:
-            df_work[f'ema_{ema2_period}'] = df_work['close'].ewm(
-                span=ema2_period, adjust=False
-            ).mean()
-        df_work['ema1'] = df_work[f'ema_{ema1_period}']
-        df_work['ema2'] = df_work[f'ema_{ema2_period}']
-
-        if sma_long:
-            df_work['sma_long'] = df_work['close'].rolling(window=sma_long).mean()
-        if adx_period and 'adx' in df.columns:
-            df_work['adx'] = df['adx'].values
-        elif adx_period:
-            df_work['adx'] = ADXIndicator(
-                high=df_work['high'],
-                low=df_work['low'],
-                close=df_work['close'],
-                window=adx_period,
-            ).adx()
-        if trix_length and trix_signal:
-            trix_ema1 = df_work['close'].ewm(
-                span=trix_length, adjust=False
-            ).mean()
-            trix_ema2 = trix_ema1.ewm(
-                span=trix_length, adjust=False
-            ).mean()
-            trix_ema3 = trix_ema2.ewm(
-                span=trix_length, adjust=False
-            ).mean()
-            df_work['TRIX_PCT'] = trix_ema3.pct_change() * 100
-            df_work['TRIX_SIGNAL'] = df_work['TRIX_PCT'].rolling(
-                window=trix_signal
-            ).mean()
-            df_work['TRIX_HISTO'] = df_work['TRIX_PCT'] - df_work['TRIX_SIGNAL']
-
-        # A-1: Volume filter — SMA du volume (Python fallback)
-        if getattr(config, 'volume_filter_enabled', False) and 'volume' in df_work.columns:
-            _vol_period = int(getattr(config, 'volume_sma_period', 20))
-            df_work['vol_sma'] = df_work['volume'].rolling(window=_vol_period).mean()
-
-        # A-2: Multi-timeframe filter (Python fallback)
-        _use_mtf_py = getattr(config, 'mtf_filter_enabled', False)
-        _mtf_bullish_py = None
-        if _use_mtf_py and isinstance(df_work.index, pd.DatetimeIndex):
-            try:
-                _mtf_fast_py = getattr(config, 'mtf_ema_fast', 18)
-                _mtf_slow_py = getattr(config, 'mtf_ema_slow', 58)
-                _mtf_bullish_py = _compute_mtf_bullish(df_work, _mtf_fast_py, _mtf_slow_py)
-            except Exception:
-                _use_mtf_py = False
-
         # P2-02: Précomputer le rang de volume (percentile roulant 50 bars) pour
         # le modèle de slippage stochastique OOS.  0=faible volume, 1=fort volume.
-        _vol_rank_arr: Optional[np.ndarray] = None
-        if slippage_model is not None and 'volume' in df_work.columns:
-            _vol_series = df_work['volume'].rolling(50, min_periods=1).rank(pct=True)
-            _vol_rank_arr = _vol_series.to_numpy(dtype=np.float64)
+        # Les facteurs achat / sortie sont tirés par bar avant la boucle.
+        _slippage_factors: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        if slippage_model is not None:
+            _volume = inputs.get('volume')
+            _vol_rank_arr = (
+                pd.Series(_volume[bar_start:bar_end]).rolling(50, min_periods=1).rank(pct=True)
+                .to_numpy(dtype=np.float64)
+                if _volume is not None else np.full(n_bars, 0.5)
+            )
+            _slippage_factors = (
+                np.array([slippage_model.buy_factor(float(v)) for v in _vol_rank_arr]),
+                np.array([slippage_model.sell_factor(float(v)) for v in _vol_rank_arr]),
+            )
 
-        # --- Python backtest loop ---
-        usd = config.initial_wallet
         # Threshold overrides for grid search (None = use config default)
         _stoch_buy_max   = stoch_buy_max_override   if stoch_buy_max_override   is not None else config.stoch_rsi_buy_max
         _stoch_buy_min   = stoch_buy_min_override   if stoch_buy_min_override   is not None else config.stoch_rsi_buy_min
         _stoch_sell_exit = stoch_sell_exit_override if stoch_sell_exit_override is not None else config.stoch_rsi_sell_exit
-        coin = 0.0
-        trades_history: List[Any] = []
-        in_position = False
-        entry_price = 0.0
-        entry_usd_invested = 0.0
-        max_price = 0.0
-        trailing_stop = 0.0
-        trailing_stop_activated = False
-        stop_loss = 0.0
-        max_drawdown = 0.0
-        peak_wallet = config.initial_wallet
-        winning_trades = 0
-        total_trades = 0
-        equity_curve = [config.initial_wallet]
-
-        atr_at_entry = 0.0
-        stop_loss_at_entry = 0.0
-        trailing_activation_price_at_entry = 0.0
-        partial_taken_1 = False
-        partial_taken_2 = False
-        breakeven_triggered = False
-        # A-3: cooldown after stop-loss/breakeven exit
-        cooldown_remaining = 0
-        _cooldown_candles = getattr(config, 'stop_loss_cooldown_candles', 0)
-
-        for i in range(len(df_work)):
-            idx_signal = i
-            row_close = float(df_work['close'].iloc[i])
-            row_atr = float(df_work['atr'].iloc[i])
-            index = df_work.index[i]
-
-            # === EQUITY TRACKING — tous les bars (en ET hors position) ===
-            # coin=0 quand hors position, donc usd + 0 = wallet cash correct.
-            # Cela garantit que le DD entre les trades est toujours capturé.
-            current_wallet = usd + (coin * row_close)
-            equity_curve.append(current_wallet)
-            if current_wallet > peak_wallet:
-                peak_wallet = current_wallet
-            _bar_dd = (
-                (peak_wallet - current_wallet) / peak_wallet
-                if peak_wallet > 0 else 0.0
-            )
-            max_drawdown = max(max_drawdown, _bar_dd)
-
-            if in_position:
-                trailing_distance = config.atr_multiplier * atr_at_entry
-                if row_close > max_price:
-                    max_price = row_close
-                if (
-                    not trailing_stop_activated
-                    and row_close >= trailing_activation_price_at_entry
-                ):
-                    trailing_stop_activated = True
-                    trailing_stop = max_price - trailing_distance
-                if trailing_stop_activated:
-                    new_trailing = max_price - trailing_distance
-                    if new_trailing > trailing_stop:
-                        trailing_stop = new_trailing
-
-                # B-3: Break-even stop — remonter SL au prix d'entrée si profit >= seuil
-                _be_enabled = getattr(config, 'breakeven_enabled', True)
-                if _be_enabled and not breakeven_triggered and entry_price > 0:
-                    _be_profit = (row_close - entry_price) / entry_price
-                    if _be_profit >= getattr(config, 'breakeven_trigger_pct', 0.015):
-                        _be_new_stop = entry_price * (1 + config.slippage_buy)
-                        if _be_new_stop > stop_loss_at_entry:
-                            stop_loss_at_entry = _be_new_stop
-                        breakeven_triggered = True
-
-                # Partial profit taking (P2-01: conditionné par partial_enabled)
-                # partial_enabled : vérifier si la position est assez grosse pour
-                # des partials sûrs (valeur totale >= 3× min_notional pour absorber
-                # 2 partials + le reste). Identique au guard live.
-                if partial_enabled:
-                    _bt_min_notional = getattr(config, 'backtest_min_notional', 5.0)
-                    _partial_ok = (coin * row_close) >= (_bt_min_notional * 3)
-
-                    if in_position and coin > 0 and entry_price > 0 and _partial_ok:
-                        profit_pct = (row_close - entry_price) / entry_price
-                        if not partial_taken_1 and profit_pct >= config.partial_threshold_1:
-                            partial_qty_1 = coin * config.partial_pct_1
-                            # MIN_NOTIONAL: bloquer si la valeur de la vente partielle < seuil
-                            if partial_qty_1 * row_close >= _bt_min_notional:
-                                partial_proceeds_1 = (
-                                    partial_qty_1 * row_close * (1 - config.backtest_taker_fee)
-                                )
-                                usd += partial_proceeds_1
-                                coin -= partial_qty_1
-                                # P2-01: log partial dans trades_history
-                                trades_history.append({
-                                    'date': index,
-                                    'type': 'partial_sell_1',
-                                    'price': row_close,
-                                    'qty': partial_qty_1,
-                                    'proceeds': partial_proceeds_1,
-                                    'profit_pct': profit_pct,
-                                })
-                            partial_taken_1 = True  # flag True même si bloqué (éviter retry)
-                        if (
-                            not partial_taken_2
-                            and profit_pct >= config.partial_threshold_2
-                            and coin > 0
-                        ):
-                            partial_qty_2 = coin * config.partial_pct_2
-                            # MIN_NOTIONAL: bloquer si la valeur de la vente partielle < seuil
-                            if partial_qty_2 * row_close >= _bt_min_notional:
-                                partial_proceeds_2 = (
-                                    partial_qty_2 * row_close * (1 - config.backtest_taker_fee)
-                                )
-                                usd += partial_proceeds_2
-                                coin -= partial_qty_2
-                                # P2-01: log partial dans trades_history
-                                trades_history.append({
-                                    'date': index,
-                                    'type': 'partial_sell_2',
-                                    'price': row_close,
-                                    'qty': partial_qty_2,
-                                    'proceeds': partial_proceeds_2,
-                                    'profit_pct': profit_pct,
-                                })
-                            partial_taken_2 = True  # flag True même si bloqué (éviter retry)
-
-                # Exit conditions
-                exit_trade = False
-                motif_sortie = None
-                if row_close <= stop_loss_at_entry:
-                    exit_trade = True
-                    motif_sortie = 'STOP_LOSS'
-                elif trailing_stop_activated and row_close <= trailing_stop:
-                    exit_trade = True
-                    motif_sortie = 'TRAILING_STOP'
-                elif (
-                    df_work['ema2'].iloc[i] > df_work['ema1'].iloc[i]
-                    and df_work['stoch_rsi'].iloc[i] > _stoch_sell_exit  # P2-08
-                ):
-                    exit_trade = True
-                    motif_sortie = 'SIGNAL'
-
-                if exit_trade:
-                    if i + 1 < len(df_work):
-                        exit_base_price = df_work.iloc[i + 1]['open']
-                    else:
-                        exit_base_price = row_close
-                    optimized_exit_price = exit_base_price * (1 - config.slippage_sell)
-                    # P2-02: appliquer le slippage stochastique OOS si activé
-                    if slippage_model is not None:
-                        _vr = float(_vol_rank_arr[i]) if _vol_rank_arr is not None else 0.5
-                        optimized_exit_price = optimized_exit_price * slippage_model.sell_factor(_vr)
-                    gross_proceeds = coin * optimized_exit_price
-                    fee = gross_proceeds * config.backtest_taker_fee
-                    usd = usd + (gross_proceeds - fee)
-                    coin = 0.0
-                    trade_profit = usd - entry_usd_invested
-                    # Correction post-exit : l'exit se fait à open[i+1], pas close[i].
-                    # Si le prix a gappé à la baisse (stop-loss), le vrai wallet post-exit
-                    # est inférieur à ce qu'on a tracké en haut du bar → on corrige.
-                    _post_exit_wallet = usd  # coin=0, tout en cash
-                    equity_curve[-1] = min(equity_curve[-1], _post_exit_wallet)
-                    _post_exit_dd = (
-                        (peak_wallet - _post_exit_wallet) / peak_wallet
-                        if peak_wallet > 0 else 0.0
-                    )
-                    max_drawdown = max(max_drawdown, _post_exit_dd)
-                    if trade_profit > 0:
-                        winning_trades += 1
-                    total_trades += 1
-                    trades_history.append({
-                        'date': index,
-                        'type': 'sell',
-                        'price': optimized_exit_price,
-                        'profit': trade_profit,
-                        'motif': motif_sortie,
-                        'stop_loss': f'{stop_loss:.4f} USDC',
-                        'trailing_stop': f'{trailing_stop:.4f} USDC',
-                    })
-                    in_position = False
-                    entry_price = 0.0
-                    entry_usd_invested = 0.0
-                    max_price = 0.0
-                    trailing_stop = 0.0
-                    stop_loss = 0.0
-                    trailing_stop_activated = False
-                    breakeven_triggered = False
-                    # A-3: set cooldown after stop-loss/breakeven exit
-                    if motif_sortie == 'STOP_LOSS' and _cooldown_candles > 0:
-                        cooldown_remaining = _cooldown_candles
-                    continue
-
-            # A-3: cooldown decrement when not in position
-            if not in_position and cooldown_remaining > 0:
-                cooldown_remaining -= 1
-
-            # Buy condition
-            buy_condition = (
-                df_work['ema1'].iloc[idx_signal] > df_work['ema2'].iloc[idx_signal]
-                and df_work['stoch_rsi'].iloc[idx_signal] < _stoch_buy_max  # P2-08
-                and df_work['stoch_rsi'].iloc[idx_signal] > _stoch_buy_min  # P2-08
-                and usd > 0
-            )
-            # A-3: block buy during cooldown after stop-loss/breakeven exit
-            if buy_condition and cooldown_remaining > 0:
-                buy_condition = False
-            if sma_long and 'sma_long' in df_work.columns:
-                buy_condition &= row_close > df_work['sma_long'].iloc[idx_signal]
-            if adx_period and 'adx' in df_work.columns:
-                buy_condition &= df_work['adx'].iloc[idx_signal] > config.adx_threshold  # P2-08
-            if trix_length and 'TRIX_HISTO' in df_work.columns:
-                buy_condition &= df_work['TRIX_HISTO'].iloc[idx_signal] > 0
-
-            # A-1: Volume filter — volume > SMA(volume)
-            if getattr(config, 'volume_filter_enabled', False) and 'vol_sma' in df_work.columns:
-                _vol = df_work['volume'].iloc[idx_signal]
-                _vol_sma = df_work['vol_sma'].iloc[idx_signal]
-                if not (isinstance(_vol, float) and isinstance(_vol_sma, float)):
-                    buy_condition = False
-                elif math.isnan(_vol) or math.isnan(_vol_sma) or _vol_sma <= 0:
-                    buy_condition = False
-                else:
-                    buy_condition &= _vol > _vol_sma
-
-            # A-2: Multi-timeframe filter — 4h trend must be bullish
-            if buy_condition and _use_mtf_py and _mtf_bullish_py is not None:
-                buy_condition = _mtf_bullish_py[i] > 0.5
-
-            # P0-SL-GUARD: bloquer l'achat si ATR indisponible → SL incalculable
-            _atr_invalid = (
-                row_atr is None
-                or (isinstance(row_atr, float) and math.isnan(row_atr))
-                or row_atr <= 0
-            )
-            if _atr_invalid:
-                buy_condition = False
-
-            if buy_condition and not in_position:
-                if i + 1 < len(df_work):
-                    base_price = df_work.iloc[i + 1]['open']
-                else:
-                    base_price = row_close
-                optimized_price = base_price * (1 + config.slippage_buy)
-                # P2-02: appliquer le slippage stochastique OOS si activé
-                if slippage_model is not None:
-                    _vr = float(_vol_rank_arr[i]) if _vol_rank_arr is not None else 0.5
-                    optimized_price = optimized_price * slippage_model.buy_factor(_vr)
-
-                if sizing_mode == 'risk' and row_atr > 0 and optimized_price > 0:
-                    stop_distance = config.atr_stop_multiplier * row_atr
-                    if stop_distance > 0:
-                        risk_amount = usd * config.risk_per_trade
-                        qty_by_risk = risk_amount / stop_distance
-                        max_affordable = (usd * 0.98) / optimized_price
-                        gross_coin = min(max_affordable, qty_by_risk)
-                    else:
-                        gross_coin = (usd * 0.98) / optimized_price if optimized_price > 0 else 0.0
-                elif optimized_price > 0:
-                    gross_coin = (usd * 0.98) / optimized_price
-                else:
-                    gross_coin = 0.0
-
-                if gross_coin and gross_coin > 0:
-                    fee_in_coin = gross_coin * config.backtest_taker_fee
-                    coin = gross_coin - fee_in_coin
-                    # P1-07-FIX: only deduct actual cost of coins purchased.
-                    # Previously usd was zeroed entirely, destroying uninvested
-                    # cash when sizing_mode != 'baseline' and causing 100% loss.
-                    actual_cost = gross_coin * optimized_price
-                    if actual_cost > usd:
-                        actual_cost = usd  # safety cap
-                    entry_usd_invested = usd
-                    usd = usd - actual_cost
-                    entry_price = optimized_price
-                    max_price = optimized_price
-                    atr_at_entry = row_atr
-                    stop_loss_at_entry = optimized_price - (
-                        config.atr_stop_multiplier * atr_at_entry
-                    )
-                    trailing_activation_price_at_entry = optimized_price + (
-                        config.atr_multiplier * atr_at_entry
-                    )
-                    trailing_stop = 0.0
-                    trailing_stop_activated = False
-                    partial_taken_1 = False
-                    partial_taken_2 = False
-                    breakeven_triggered = False
-                    trades_history.append({
-                        'date': index,
-                        'type': 'buy',
-                        'price': optimized_price,
-                    })
-                    in_position = True
+        # PERF-05: arrêt anticipé
+        _growth_py: Optional[np.ndarray] = None
+        if abort is not None and abort.enabled and abort.min_score is not None:
+            _growth_py = growth_upper_bound(arrays['close'], arrays['open'])
+        # PERF-08: un checkpoint du moteur Cython ne se reprend pas ici
+        if resume is not None and resume.get('engine') != 'python':
+            logger.debug("[PERF-08] checkpoint %s ignoré (boucle Python)", resume.get('engine'))
+            resume = None
+
+        # --- Boucle par bar sur tableaux (PERF-09, numba si disponible) ---
+        _kernel = run_backtest_kernel(
+            arrays['close'], arrays['ema1'], arrays['ema2'], arrays['stoch_rsi'], arrays['atr'],
+            open_=arrays['open'],
+            sma_long=arrays['sma_long'],
+            adx=arrays['adx'],
+            trix_histo=arrays['trix_histo'],
+            volume=arrays['volume'],
+            vol_sma=arrays['vol_sma'],
+            mtf_bullish=arrays['mtf_bullish'],
+            slippage_factors=_slippage_factors,
+            cost_model=cost_model,
+            initial_wallet=config.initial_wallet,
+            taker_fee=_taker_fee(cost_model),
+            slippage_buy=config.slippage_buy,
+            slippage_sell=config.slippage_sell,
+            atr_multiplier=config.atr_multiplier,
+            atr_stop_multiplier=config.atr_stop_multiplier,
+            adx_threshold=config.adx_threshold,
+            sizing_mode=sizing_mode,
+            risk_per_trade=config.risk_per_trade,
+            target_volatility_pct=getattr(config, 'target_volatility_pct', 0.02),
+            partial_enabled=partial_enabled,
+            partial_threshold_1=config.partial_threshold_1,
+            partial_threshold_2=config.partial_threshold_2,
+            partial_pct_1=config.partial_pct_1,
+            partial_pct_2=config.partial_pct_2,
+            min_notional=getattr(config, 'backtest_min_notional', 5.0),
+            breakeven_enabled=getattr(config, 'breakeven_enabled', True),
+            breakeven_trigger_pct=getattr(config, 'breakeven_trigger_pct', 0.015),
+            cooldown_candles=getattr(config, 'stop_loss_cooldown_candles', 0),
+            stoch_buy_max=_stoch_buy_max,
+            stoch_buy_min=_stoch_buy_min,
+            stoch_sell_exit=_stoch_sell_exit,
+            equity_out=equity_out,
+            abort=abort,
+            abort_growth=_growth_py,
+            checkpoint_bar=checkpoint_bar,
+            resume=resume,
+        )
+        _state = _kernel['state']
+        last_bar = _kernel['last_bar']
+        abort_code = _kernel['abort_code']
+        trade_log = _kernel['trade_log']
+        _checkpoint = _kernel['checkpoint']
+        max_drawdown = _state['max_drawdown']
+        total_trades = _state['total_trades']
+        winning_trades = _state['winning_trades']
 
         # Final wallet
         win_rate = (
             (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
         )
         final_wallet = (
-            usd + (coin * df_work['close'].iloc[-1]) if in_position else usd
+            _state['usd'] + (_state['coin'] * arrays['close'][last_bar])
+            if _state['in_position'] else _state['usd']
         )
-        equity_curve.append(final_wallet)
+        equity_curve = np.append(_kernel['equity_curve'], final_wallet)
 
         # Compute risk-adjusted metrics
-        # n_bars_total = len(df_work) : permet à compute_risk_metrics de calculer
+        # n_bars_total = bars simulés : permet à compute_risk_metrics de calculer
         # _years sur le span réel des données (3 ans) et non sur les bars in-position.
         try:
             from walk_forward import compute_risk_metrics
             risk_metrics = compute_risk_metrics(
-                np.array(equity_curve),
-                trades_df=(
-                    pd.DataFrame(trades_history) if trades_history else None
-                ),
+                equity_curve,
+                trade_log=trade_log,
                 periods_per_year=periods_per_year,
                 risk_free_rate=config.risk_free_rate,  # P2-03
-                n_bars_total=len(df_work),
+                n_bars_total=last_bar + 1,
             )
         except Exception:
             risk_metrics = {}
@@ -807,19 +727,29 @@ def backtest_from_dataframe(
 
         result: Dict[str, Any] = {
             'final_wallet': final_wallet,
-            'trades': pd.DataFrame(trades_history),
+            'trade_log': trade_log,
             'max_drawdown': final_max_drawdown,
             'win_rate': win_rate,
+            'status': 'pruned' if abort_code != ABORT_NONE else 'completed',
+            'abort_reason': abort_reason_label(abort_code),
+            'bars_run': last_bar + 1,
         }
+        if build_trades_frame:
+            result['trades'] = trades_frame(trade_log, arrays['index'])
+        if checkpoint_bar is not None:
+            result['checkpoint'] = _checkpoint
         result.update(risk_metrics)
         # Assurer que max_drawdown dans result reflète la valeur unifiée
         result['max_drawdown'] = final_max_drawdown
+        if equity_out is not None:
+            _apply_bar_equity_metrics(result, equity_out, periods_per_year)
         return result
 
     except Exception as e:
         logger.error(f"Erreur dans backtest_from_dataframe: {e}", exc_info=True)
         return {
             'final_wallet': 0.0,
+            'trade_log': empty_trade_log(),
             'trades': pd.DataFrame(),
             'max_drawdown': 0.0,
             'win_rate': 0.0,
@@ -828,6 +758,98 @@ def backtest_from_dataframe(
 
 # --- Result Helpers -----------------------------------------------------------
 
+
+def backtest_threshold_grid(
+    df: Union[pd.DataFrame, BacktestInputs],
+    ema1_period: int,
+    ema2_period: int,
+    thresholds: Sequence[Tuple[float, float, float]],
+    sma_long: Optional[int] = None,
+    adx_period: Optional[int] = None,
+    trix_length: Optional[int] = None,
+    trix_signal: Optional[int] = None,
+    sizing_mode: str = 'risk',
+    partial_enabled: bool = True,
+    periods_per_year: int = 8766,
+    abort: Optional[AbortCriteria] = None,
+    bar_range: Optional[Tuple[int, int]] = None,
+) -> List[Dict[str, Any]]:
+    """Évalue une grille de seuils StochRSI sur une configuration (PERF-06).
+
+    Avec le moteur Cython (niveau d'API >= 4), les indicateurs sont préparés
+    une fois et toute la grille est simulée en un appel
+    (``backtest_threshold_batch``) : les conditions qui ne dépendent pas des
+    seuils (croisements EMA, filtres SMA/ADX/TRIX/volume/MTF) sont
+    pré-calculées en masques partagés.  Sinon, repli sur un
+    ``backtest_from_dataframe`` par combinaison.
+
+    Parameters
+    ----------
+    df : pd.DataFrame or BacktestInputs
+        Données préparées (cf. ``backtest_from_dataframe``).
+    ema1_period, ema2_period : int
+        Périodes EMA rapide / lente.
+    thresholds : sequence of (buy_min, buy_max, sell_exit)
+        Jeux de seuils à évaluer.
+    sma_long, adx_period, trix_length, trix_signal : int, optional
+        Paramètres du scénario.
+    sizing_mode, partial_enabled, periods_per_year, abort, bar_range
+        Voir ``backtest_from_dataframe``.
+
+    Returns
+    -------
+    list[dict]
+        Un résultat par jeu de seuils, dans l'ordre de ``thresholds``
+        (sans DataFrame ``trades``).
+    """
+    grid = np.asarray(thresholds, dtype=np.float64).reshape(-1, 3)
+    if len(grid) == 0:
+        return []
+    inputs = backtest_inputs(df)
+    bar_start, bar_end = _bar_window(len(inputs), bar_range)
+    if (
+        CYTHON_BACKTEST_AVAILABLE
+        and backtest_engine is not None
+        and _CYTHON_API_LEVEL >= 4
+        and sizing_mode in _CYTHON_SIZING_MODES
+        and bar_end - bar_start >= 50
+    ):
+        try:
+            arrays = _engine_arrays(
+                inputs, bar_start, bar_end, ema1_period, ema2_period,
+                sma_long, adx_period, trix_length, trix_signal,
+            )
+            _cy_args, _cy_kwargs = _cython_engine_inputs(
+                arrays, sma_long, adx_period, trix_length, sizing_mode, partial_enabled,
+            )
+            raw = backtest_engine.backtest_threshold_batch(
+                grid, *_cy_args, **_cy_kwargs, **_cython_abort_kwargs(abort, arrays),
+            )
+            return [
+                _cython_result_dict(r, arrays['index'], periods_per_year, False) for r in raw
+            ]
+        except Exception as e:
+            logger.warning(
+                "[backtest_runner] Grille de seuils Cython échouée (%s) — repli par combinaison", e
+            )
+    return [
+        backtest_from_dataframe(
+            inputs, ema1_period, ema2_period,
+            sma_long=sma_long, adx_period=adx_period,
+            trix_length=trix_length, trix_signal=trix_signal,
+            sizing_mode=sizing_mode, partial_enabled=partial_enabled,
+            periods_per_year=periods_per_year,
+            stoch_buy_min_override=float(buy_min),
+            stoch_buy_max_override=float(buy_max),
+            stoch_sell_exit_override=float(sell_exit),
+            build_trades_frame=False,
+            abort=abort,
+            bar_range=bar_range,
+        )
+        for buy_min, buy_max, sell_exit in grid
+    ]
+
+
 def empty_result_dict(
     timeframe: str, ema1: int, ema2: int, scenario_name: str,
 ) -> Dict[str, Any]:
@@ -853,7 +875,7 @@ def empty_result_dict(
         'scenario': scenario_name,
         'initial_wallet': config.initial_wallet,
         'final_wallet': 0.0,
-        'trades': pd.DataFrame(),
+        'trade_log': empty_trade_log(),
         'max_drawdown': 0.0,
         'win_rate': 0.0,
         'sharpe_ratio': 0.0,
@@ -869,24 +891,51 @@ def run_single_backtest_optimized(args: Tuple[Any, ...]) -> Dict[str, Any]:
     ----------
     args : tuple
         ``(timeframe, ema1, ema2, scenario_dict, base_df, pair_symbol
-        [, sizing_mode])``.
+        [, sizing_mode [, (stoch_buy_min, stoch_buy_max, stoch_sell_exit)
+        [, abort]]])`` ; ``base_df`` peut être un ``BacktestInputs`` (PERF-24).
+        Le 8e élément (ou None) est transmis par les workers du pool de
+        processus, qui ne voient pas les seuils StochRSI mis à jour au
+        runtime ; le 9e est un ``AbortCriteria`` optionnel (PERF-05).
 
     Returns
     -------
     dict
         Résultat complet du backtest.  Voir ``backtest_from_dataframe``.
     """
+    stoch: Optional[Tuple[float, float, float]] = None
+    abort: Optional[AbortCriteria] = None
     if len(args) == 6:
-        (timeframe, ema1, ema2, scenario, base_df, _pair_symbol) = args
+        (timeframe, ema1, ema2, scenario, base_df, pair_symbol) = args
         sizing_mode = 'risk'  # B-2: risk-based sizing
-    else:
+    elif len(args) == 7:
         _args7 = cast(
             'Tuple[Any, Any, Any, Any, Any, Any, Any]', args
         )
         (timeframe, ema1, ema2, scenario, base_df, pair_symbol, sizing_mode) = _args7
+    elif len(args) == 8:
+        _args8 = cast(
+            'Tuple[Any, Any, Any, Any, Any, Any, Any, Any]', args
+        )
+        (timeframe, ema1, ema2, scenario, base_df, pair_symbol, sizing_mode, stoch) = _args8
+    else:
+        _args9 = cast(
+            'Tuple[Any, Any, Any, Any, Any, Any, Any, Any, Any]', args
+        )
+        (timeframe, ema1, ema2, scenario, base_df, pair_symbol, sizing_mode, stoch,
+         abort) = _args9
     try:
-        result = backtest_from_dataframe(
-            df=base_df,
+        # PERF-07: résultat relu depuis la base de mémoïsation si les données,
+        # les paramètres et la version du moteur sont inchangés ; PERF-08 : sinon
+        # reprise depuis le checkpoint d'un cycle précédent de la même fenêtre
+        # (même premier bar, donc même journée pour la start_date glissante)
+        _backtest = memoize_backtest(
+            backtest_from_dataframe, pair=str(pair_symbol), timeframe=str(timeframe),
+            incremental=config.backtest_memo_incremental,
+        )
+        # PERF-24: jeu de tableaux partagé par toutes les tâches du timeframe
+        # (cache par empreinte : indicateurs et empreintes mémo calculés une fois)
+        result = _backtest(
+            df=backtest_inputs(base_df),
             ema1_period=ema1,
             ema2_period=ema2,
             sma_long=scenario['params'].get('sma_long'),
@@ -894,6 +943,11 @@ def run_single_backtest_optimized(args: Tuple[Any, ...]) -> Dict[str, Any]:
             trix_length=scenario['params'].get('trix_length'),
             trix_signal=scenario['params'].get('trix_signal'),
             sizing_mode=sizing_mode,
+            stoch_buy_min_override=stoch[0] if stoch else None,
+            stoch_buy_max_override=stoch[1] if stoch else None,
+            stoch_sell_exit_override=stoch[2] if stoch else None,
+            build_trades_frame=False,
+            abort=abort,
         )
         return {
             'timeframe': timeframe,
@@ -901,18 +955,36 @@ def run_single_backtest_optimized(args: Tuple[Any, ...]) -> Dict[str, Any]:
             'scenario': scenario['name'],
             'initial_wallet': config.initial_wallet,
             'final_wallet': result['final_wallet'],
-            'trades': result['trades'],
+            'trade_log': result['trade_log'],
             'max_drawdown': result['max_drawdown'],
             'win_rate': result['win_rate'],
             'sharpe_ratio': result.get('sharpe_ratio', 0.0),
             'sortino_ratio': result.get('sortino_ratio', 0.0),
             'calmar_ratio': result.get('calmar_ratio', 0.0),
+            'status': result.get('status', 'completed'),
+            'abort_reason': result.get('abort_reason'),
         }
     except Exception as e:
         logger.error(f"Erreur backtest parallele: {e}")
         return empty_result_dict(timeframe, ema1, ema2, scenario['name'])
 
 
+def _abort_waves(n_tasks: int, first: int) -> List[Tuple[int, int]]:
+    """Découpe ``[0, n_tasks)`` en vagues ``(début, fin)`` de tailles ``first``, ``2×first``...
+
+    La borne de classement (PERF-05) est mise à jour entre deux vagues : la
+    première s'exécute sans borne, les vagues doublent ensuite de taille
+    pour limiter les points de synchronisation.
+    """
+    waves: List[Tuple[int, int]] = []
+    start, size = 0, max(1, int(first))
+    while start < n_tasks:
+        end = min(n_tasks, start + size)
+        waves.append((start, end))
+        start, size = end, size * 2
+    return waves
+
+
 def run_all_backtests(
     backtest_pair: str,
     start_date: str,
@@ -924,7 +996,17 @@ def run_all_backtests(
     """Exécute tous les backtests en parallèle (version optimisée).
 
     Pour chaque timeframe, prépare un DataFrame de base, génère les
-    combinaisons EMA × scénarios et les distribue en ``ThreadPoolExecutor``.
+    combinaisons EMA × scénarios et les distribue en ``ThreadPoolExecutor``
+    ou, si ``config.backtest_executor == 'process'``, dans le pool de
+    processus persistant de ``backtest_executor`` (mémoire partagée).
+    Les résultats sont retournés dans l'ordre des tâches.
+
+    Si ``config.backtest_early_abort`` est actif (PERF-05), les
+    configurations sans espoir sont arrêtées avant la fin
+    (``status='pruned'``) : critères absolus ``BACKTEST_ABORT_*`` et, en
+    mode thread, borne du meilleur score Calmar des vagues de tâches
+    précédentes (``_abort_waves``, figée avant la soumission de chaque vague :
+    résultats indépendants de l'ordre de complétion des threads).
 
     Parameters
     ----------
@@ -944,6 +1026,9 @@ def run_all_backtests(
     -------
     list[dict]
         Liste de résultats, un par combinaison (timeframe, EMA, scénario).
+        ``n_trades`` est renseigné pour tous ; ``trade_log`` n'est conservé
+        que pour les ``config.backtest_keep_trade_logs`` meilleures
+        configurations (PERF-19, ``backtest_summary.compact_results``).
 
     Raises
     ------
@@ -1039,41 +1124,96 @@ def run_all_backtests(
                     (timeframe, ema1, ema2, scenario, is_df, backtest_pair, sizing_mode)
                 )
 
-    with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
-        future_to_task = {
-            executor.submit(run_single_backtest_optimized, task): task
-            for task in tasks
-        }
-        _stderr = getattr(sys, 'stderr', None)
-        _has_tty_progress = bool(_stderr and hasattr(_stderr, 'write') and hasattr(_stderr, 'isatty') and _stderr.isatty())
-        if _has_tty_progress:
-            with tqdm(
-                total=len(tasks),
-                desc="[BACKTESTS]",
-                colour="green",
-                bar_format=(
-                    "{desc}: {percentage:3.0f}%|"
-                    "\u2588{bar:30}\u2588| "
-                    "{n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]"
-                ),
-            ) as pbar:
-                for future in as_completed(future_to_task):
-                    try:
-                        result = future.result()
-                        results.append(result)
+    _stderr = getattr(sys, 'stderr', None)
+    _has_tty_progress = bool(_stderr and hasattr(_stderr, 'write') and hasattr(_stderr, 'isatty') and _stderr.isatty())
+    pbar = None
+    if _has_tty_progress:
+        pbar = tqdm(
+            total=len(tasks),
+            desc="[BACKTESTS]",
+            colour="green",
+            bar_format=(
+                "{desc}: {percentage:3.0f}%|"
+                "\u2588{bar:30}\u2588| "
+                "{n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]"
+            ),
+        )
+    # PERF-05: arrêt anticipé des configurations sans espoir
+    abort_base: Optional[AbortCriteria] = None
+    leaderboard = Leaderboard()
+    if getattr(config, 'backtest_early_abort', False):
+        abort_base = abort_criteria_from_config(config)
+
+    # PERF-19: journaux de trades conservés pour le top Calmar seulement
+    _keep_logs = int(getattr(config, 'backtest_keep_trade_logs', -1))
+
+    def _run_task(task: Tuple[Any, ...], criteria: Optional[AbortCriteria]) -> Dict[str, Any]:
+        yield_to_foreground()  # PERF-20: cède la main au cycle live
+        if criteria is None:
+            return run_single_backtest_optimized(task)
+        return run_single_backtest_optimized(task + (None, criteria))
+
+    try:
+        # PERF-01: pool de processus + mémoire partagée (contourne le GIL)
+        if getattr(config, 'backtest_executor', 'thread') == 'process' and tasks:
+            try:
+                from backtest_executor import run_backtest_tasks_in_processes
+                def _progress(_r: Dict[str, Any]) -> None:
+                    if pbar is not None:
                         pbar.update(1)
+
+                return compact_results(run_backtest_tasks_in_processes(
+                    tasks,
+                    on_result=_progress if pbar is not None else None,
+                    abort=abort_base if abort_base is not None and abort_base.enabled else None,
+                ), _keep_logs)
+            except Exception as e:
+                logger.warning(
+                    "[BACKTESTS] Pool de processus indisponible (%s) — repli ThreadPool", e
+                )
+                if pbar is not None:
+                    pbar.reset()
+
+        # PERF-24: un BacktestInputs par timeframe, construit une fois : les
+        # tâches ne recalculent plus l'empreinte du DataFrame à chaque appel
+        prepared: Dict[int, BacktestInputs] = {}
+        for task in tasks:
+            if id(task[4]) not in prepared:
+                prepared[id(task[4])] = backtest_inputs(task[4])
+        tasks = [task[:4] + (prepared[id(task[4])],) + task[5:] for task in tasks]
+
+        # Résultats rangés dans l'ordre des tâches (identique au pool de processus)
+        slots: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+        # PERF-05: borne de classement figée par vague de tâches (meilleur
+        # score des vagues précédentes) : l'arrêt d'une tâche ne dépend pas de
+        # l'ordre de complétion des threads
+        waves = (
+            _abort_waves(len(tasks), config.max_workers) if abort_base is not None
+            else [(0, len(tasks))]
+        )
+        with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
+            for start, end in waves:
+                criteria = leaderboard.criteria(abort_base) if abort_base is not None else None
+                future_to_index = {
+                    executor.submit(_run_task, tasks[i], criteria): i
+                    for i in range(start, end)
+                }
+                for future in as_completed(future_to_index):
+                    try:
+                        slots[future_to_index[future]] = future.result()
                     except Exception as e:
                         logger.error(f"Erreur future: {e}")
+                    if pbar is not None:
                         pbar.update(1)
-        else:
-            for future in as_completed(future_to_task):
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    logger.error(f"Erreur future: {e}")
+                for result in slots[start:end]:
+                    if result is not None:
+                        leaderboard.offer(result)
+        results.extend(r for r in slots if r is not None)
+    finally:
+        if pbar is not None:
+            pbar.close()
 
-    return results
+    return compact_results(results, _keep_logs)
 
 
 def run_parallel_backtests(
@@ -1099,6 +1239,12 @@ def run_parallel_backtests(
     prepare_base_dataframe_fn : callable
         Injecté depuis MULTI_SYMBOLS.
 
+    Notes
+    -----
+    Les paires sont parallélisées en threads (I/O de préparation) ; les
+    backtests de chaque paire partagent le pool de processus persistant
+    lorsque ``config.backtest_executor == 'process'``.
+
     Returns
     -------
     dict
@@ -1130,15 +1276,19 @@ def run_parallel_backtests(
         "avec optimisation sniper...[/bold cyan]"
     )
 
+    # PERF-15: le cycle actif (ContextVar) n'est pas hérité par les threads du pool
+    cycle = current_cycle()
+
     def run_single_pair(pair_info: Dict[str, Any]) -> Tuple[str, str, List[Any]]:
         try:
-            results = run_all_backtests(
-                pair_info["backtest_pair"],
-                start_date,
-                timeframes,
-                sizing_mode=sizing_mode,
-                prepare_base_dataframe_fn=prepare_base_dataframe_fn,
-            )
+            with cycle_scope(cycle):
+                results = run_all_backtests(
+                    pair_info["backtest_pair"],
+                    start_date,
+                    timeframes,
+                    sizing_mode=sizing_mode,
+                    prepare_base_dataframe_fn=prepare_base_dataframe_fn,
+                )
             return pair_info["backtest_pair"], pair_info["real_pair"], results
         except Exception as e:
             logger.error(f"Erreur backtest {pair_info['backtest_pair']}: {e}")
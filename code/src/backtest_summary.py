@@ -0,0 +1,152 @@
+"""
+backtest_summary.py — Résumé compact (numpy) des résultats de ``run_all_backtests``.
+
+``run_all_backtests`` produit un dict par configuration (timeframe × EMA ×
+scénario), journal de trades inclus.  Tous ces journaux restaient en
+mémoire pendant le tri, le filtre OOS (``_apply_oos_quality_gate``), la
+grille StochRSI et le walk-forward, qui ne lisent que les métriques.
+
+Ce module décrit chaque résultat par une ligne d'un tableau structuré
+(``SUMMARY_DTYPE`` : configuration + métriques clés).  Classements et
+filtres deviennent des opérations vectorisées sur ce tableau, dont la ligne
+``i`` correspond à ``results[i]``.  ``compact_results`` ne conserve le
+journal de trades que pour les ``keep`` meilleures configurations (score
+Calmar, cf. ``trade_helpers.calmar_key``) ; les autres gardent leur nombre
+d'événements (``n_trades``).  Un journal abandonné se régénère en rejouant
+la configuration (relecture PERF-07 si les données n'ont pas changé).
+
+Public API
+----------
+- ``SUMMARY_DTYPE``
+- ``summarize_results``
+- ``calmar_scores``
+- ``rank_indices``
+- ``compact_results``
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_DTYPE = np.dtype([
+    ('timeframe', 'U8'),
+    ('ema1', np.int32),
+    ('ema2', np.int32),
+    ('scenario', 'U32'),
+    ('initial_wallet', np.float64),
+    ('final_wallet', np.float64),
+    ('max_drawdown', np.float64),
+    ('win_rate', np.float64),
+    ('sharpe_ratio', np.float64),
+    ('sortino_ratio', np.float64),
+    ('calmar_ratio', np.float64),
+    ('n_trades', np.int64),
+    ('pruned', np.bool_),           # arrêt anticipé (status='pruned', PERF-05)
+])
+
+# Plancher de drawdown du score Calmar (identique à trade_helpers.calmar_key)
+_MIN_DRAWDOWN = 0.001
+
+
+def _n_trades(result: Dict[str, Any]) -> int:
+    if 'n_trades' in result:
+        return int(result['n_trades'])
+    return len(result.get('trade_log', result.get('trades', ())))
+
+
+def summarize_results(results: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """Tableau ``SUMMARY_DTYPE`` des résultats, une ligne par résultat (même ordre).
+
+    Les clés absentes prennent les valeurs par défaut des consommateurs
+    historiques (0.0 pour les ratios, plancher de drawdown pour le Calmar).
+    """
+    summary = np.zeros(len(results), dtype=SUMMARY_DTYPE)
+    for i, r in enumerate(results):
+        ema = r.get('ema_periods') or (0, 0)
+        summary[i] = (
+            r.get('timeframe', ''), ema[0], ema[1], r.get('scenario', ''),
+            r.get('initial_wallet', 0.0), r.get('final_wallet', 0.0),
+            r.get('max_drawdown', _MIN_DRAWDOWN), r.get('win_rate', 0.0),
+            r.get('sharpe_ratio', 0.0), r.get('sortino_ratio', 0.0),
+            r.get('calmar_ratio', 0.0), _n_trades(r), r.get('status') == 'pruned',
+        )
+    return summary
+
+
+def calmar_scores(summary: np.ndarray) -> np.ndarray:
+    """Score ROI / max(drawdown, 0.001) de chaque ligne (vectorisé ``calmar_key``)."""
+    roi = (summary['final_wallet'] - summary['initial_wallet']) / np.maximum(summary['initial_wallet'], 1.0)
+    return roi / np.maximum(summary['max_drawdown'], _MIN_DRAWDOWN)
+
+
+def rank_indices(
+    summary: np.ndarray,
+    key: str = 'calmar',
+    *,
+    completed_only: bool = False,
+) -> np.ndarray:
+    """Indices des lignes triées par ``key`` décroissant (tri stable).
+
+    Parameters
+    ----------
+    summary : np.ndarray
+        Tableau ``SUMMARY_DTYPE``.
+    key : str
+        ``'calmar'`` (score ``calmar_scores``) ou un champ de ``SUMMARY_DTYPE``.
+    completed_only : bool
+        Exclut les configurations arrêtées par anticipation.
+
+    Returns
+    -------
+    np.ndarray
+        Indices dans ``summary`` (et dans la liste de résultats d'origine) ;
+        à score égal, l'ordre d'origine est conservé comme avec ``sorted``.
+    """
+    scores = calmar_scores(summary) if key == 'calmar' else summary[key].astype(np.float64)
+    candidates = np.flatnonzero(~summary['pruned']) if completed_only else np.arange(len(summary))
+    order = np.argsort(-scores[candidates], kind='stable')
+    return candidates[order]
+
+
+def compact_results(results: List[Dict[str, Any]], keep: int) -> List[Dict[str, Any]]:
+    """Abandonne les journaux de trades hors des ``keep`` meilleures configurations.
+
+    Les résultats sont modifiés en place : ``n_trades`` est renseigné pour
+    tous, ``trade_log`` (et ``trades``) supprimés hors du top-``keep``
+    (classement Calmar, configurations complètes d'abord).
+
+    Parameters
+    ----------
+    results : list[dict]
+        Résultats de ``run_all_backtests``.
+    keep : int
+        Nombre de configurations conservant leur journal (< 0 : toutes).
+
+    Returns
+    -------
+    list[dict]
+        ``results`` (même liste, même ordre).
+    """
+    if keep < 0 or not results:
+        return results
+    summary = summarize_results(results)
+    # Complètes d'abord (Calmar décroissant), puis les arrêtées
+    order = np.lexsort((-calmar_scores(summary), summary['pruned']))
+    kept = set(order[:keep].tolist())
+    dropped = 0
+    for i, result in enumerate(results):
+        result['n_trades'] = int(summary['n_trades'][i])
+        if i not in kept:
+            dropped += result.pop('trade_log', None) is not None
+            result.pop('trades', None)
+    if dropped:
+        logger.debug(
+            "[SUMMARY] %d journaux de trades libérés, %d conservés (top Calmar)",
+            dropped, len(results) - dropped,
+        )
+    return results
@@ -97,6 +97,42 @@ class Config:
     mtf_ema_fast: int = 18             # A-2: période EMA rapide sur 4h
     mtf_ema_slow: int = 58             # A-2: période EMA lente sur 4h
     max_parallel_pairs: int = 5      # P2-09: cap parallélisation run_parallel_backtests
+    backtest_executor: str = 'thread'  # PERF-01: 'thread' ou 'process' (pool + mémoire partagée)
+    backtest_process_workers: int = 0  # PERF-01: workers du pool de processus (0 = nb de CPU)
+    backtest_chunksize: int = 4        # PERF-01: tâches envoyées par lot à chaque worker
+    backtest_mp_start_method: str = ''  # PERF-01: '' = fork (Linux) / spawn (autres)
+    wf_bar_equity_metrics: bool = False  # PERF-04: métriques WF sur l'equity bar-à-bar
+    backtest_early_abort: bool = False  # PERF-05: arrêt anticipé des configs sans espoir
+    backtest_abort_max_drawdown: float = 0.0  # PERF-05: drawdown max toléré (0 = désactivé)
+    backtest_abort_equity_floor_pct: float = 0.0  # PERF-05: plancher d'equity (fraction du capital)
+    backtest_abort_min_trades: int = 0  # PERF-05: positions minimales au bar ..._min_trades_bar
+    backtest_abort_min_trades_bar: int = 0  # PERF-05: bar du contrôle min_trades (0 = désactivé)
+    backtest_memo_enabled: bool = False  # PERF-07: mémoïsation persistante des backtests
+    backtest_memo_path: str = ''  # PERF-07: base SQLite ('' = <cache_dir>/backtest_memo.sqlite)
+    backtest_memo_max_age_days: float = 7.0  # PERF-07: durée de vie des entrées (0 = illimitée)
+    backtest_memo_incremental: bool = True  # PERF-08: reprise depuis le checkpoint mémoïsé
+    optuna_persistent: bool = True  # PERF-12: étude Optuna WF persistée par paire (journal)
+    optuna_storage_dir: str = ''  # PERF-12: répertoire des journaux ('' = <cache_dir>/optuna)
+    optuna_n_jobs: int = 0  # PERF-12: essais Optuna en parallèle (0 = max_workers)
+    optuna_pruner: str = 'median'  # PERF-12: 'median', 'hyperband' ou 'none'
+    optuna_warm_start_trials: int = 10  # PERF-12: meilleurs essais du cycle précédent rejoués
+    monte_carlo_paths: int = 1000  # PERF-13: chemins Monte Carlo sur les trades OOS (0 = désactivé)
+    monte_carlo_skip_prob: float = 0.05  # PERF-13: probabilité d'ordre non exécuté par trade
+    monte_carlo_fee_shock: float = 0.5  # PERF-13: majoration maximale des frais (0.5 = +50 %)
+    span_timing_enabled: bool = True  # PERF-18: chronométrage hiérarchique des étapes du cycle
+    backtest_keep_trade_logs: int = 5  # PERF-19: journaux de trades conservés (top Calmar, -1 = tous)
+    scheduler_foreground_workers: int = 2  # PERF-20: workers live / métriques
+    scheduler_background_workers: int = 1  # PERF-20: workers ré-optimisation
+    scheduler_max_pause: float = 60.0  # PERF-20: suspension max. d'une tâche de fond (s)
+    drift_monitor_enabled: bool = True  # PERF-21: ré-optimisation complète sur dérive seulement
+    drift_max_age_hours: float = 168.0  # PERF-21: âge max. d'une config validée avant ré-optimisation
+    drift_recent_bars: int = 500  # PERF-21: bougies de la revalidation légère de la config active
+    drift_sharpe_drop: float = 1.0  # PERF-21: baisse de Sharpe tolérée vs attente OOS validée
+    drift_win_rate_drop: float = 20.0  # PERF-21: baisse de win rate tolérée (points de %)
+    drift_min_live_trades: int = 3  # PERF-21: ventes live minimales pour juger le win rate réel
+    drift_atr_ratio: float = 1.5  # PERF-21: variation d'ATR relatif tolérée (ratio, dans les 2 sens)
+    exchange_pool_size: int = 20  # PERF-25: connexions HTTP simultanées du client asynchrone
+    exchange_keepalive_seconds: float = 30.0  # PERF-25: durée de vie d'une connexion inactive (s)
     backtest_throttle_seconds: float = 3600.0  # P3-02: intervalle minimum entre deux backtests (s)
     project_name: str = "MULTI_ASSETS"  # Préfixe de tous les sujets d'alertes mail
     # P5-A: bloquer les achats si perte journalière > 5 % du capital initial
@@ -246,6 +282,80 @@ class Config:
         config_data['mtf_ema_slow'] = int(os.getenv('MTF_EMA_SLOW', '58'))  # A-2
         config_data['max_parallel_pairs'] = int(
             os.getenv('MAX_PARALLEL_PAIRS', '5'))  # P2-09
+        config_data['backtest_executor'] = os.getenv(
+            'BACKTEST_EXECUTOR', 'thread').lower()  # PERF-01
+        config_data['backtest_process_workers'] = int(
+            os.getenv('BACKTEST_PROCESS_WORKERS', '0'))  # PERF-01
+        config_data['backtest_chunksize'] = int(
+            os.getenv('BACKTEST_CHUNKSIZE', '4'))  # PERF-01
+        config_data['backtest_mp_start_method'] = os.getenv(
+            'BACKTEST_MP_START_METHOD', '')  # PERF-01
+        config_data['wf_bar_equity_metrics'] = (
+            os.getenv('WF_BAR_EQUITY_METRICS', 'false').lower()
+            in ('true', '1', 'yes'))  # PERF-04
+        config_data['backtest_early_abort'] = (
+            os.getenv('BACKTEST_EARLY_ABORT', 'false').lower()
+            in ('true', '1', 'yes'))  # PERF-05
+        config_data['backtest_abort_max_drawdown'] = float(
+            os.getenv('BACKTEST_ABORT_MAX_DRAWDOWN', '0.0'))  # PERF-05
+        config_data['backtest_abort_equity_floor_pct'] = float(
+            os.getenv('BACKTEST_ABORT_EQUITY_FLOOR_PCT', '0.0'))  # PERF-05
+        config_data['backtest_abort_min_trades'] = int(
+            os.getenv('BACKTEST_ABORT_MIN_TRADES', '0'))  # PERF-05
+        config_data['backtest_abort_min_trades_bar'] = int(
+            os.getenv('BACKTEST_ABORT_MIN_TRADES_BAR', '0'))  # PERF-05
+        config_data['backtest_memo_enabled'] = (
+            os.getenv('BACKTEST_MEMO', 'false').lower()
+            in ('true', '1', 'yes'))  # PERF-07
+        config_data['backtest_memo_path'] = os.getenv('BACKTEST_MEMO_PATH', '')  # PERF-07
+        config_data['backtest_memo_max_age_days'] = float(
+            os.getenv('BACKTEST_MEMO_MAX_AGE_DAYS', '7.0'))  # PERF-07
+        config_data['backtest_memo_incremental'] = (
+            os.getenv('BACKTEST_MEMO_INCREMENTAL', 'true').lower()
+            in ('true', '1', 'yes'))  # PERF-08
+        config_data['optuna_persistent'] = (
+            os.getenv('OPTUNA_PERSISTENT', 'true').lower()
+            in ('true', '1', 'yes'))  # PERF-12
+        config_data['optuna_storage_dir'] = os.getenv('OPTUNA_STORAGE_DIR', '')  # PERF-12
+        config_data['optuna_n_jobs'] = int(os.getenv('OPTUNA_N_JOBS', '0'))  # PERF-12
+        config_data['optuna_pruner'] = os.getenv('OPTUNA_PRUNER', 'median').lower()  # PERF-12
+        config_data['optuna_warm_start_trials'] = int(
+            os.getenv('OPTUNA_WARM_START_TRIALS', '10'))  # PERF-12
+        config_data['monte_carlo_paths'] = int(os.getenv('MONTE_CARLO_PATHS', '1000'))  # PERF-13
+        config_data['monte_carlo_skip_prob'] = float(
+            os.getenv('MONTE_CARLO_SKIP_PROB', '0.05'))  # PERF-13
+        config_data['monte_carlo_fee_shock'] = float(
+            os.getenv('MONTE_CARLO_FEE_SHOCK', '0.5'))  # PERF-13
+        config_data['span_timing_enabled'] = (
+            os.getenv('SPAN_TIMING_ENABLED', 'true').lower()
+            in ('true', '1', 'yes'))  # PERF-18
+        config_data['backtest_keep_trade_logs'] = int(
+            os.getenv('BACKTEST_KEEP_TRADE_LOGS', '5'))  # PERF-19
+        config_data['scheduler_foreground_workers'] = int(
+            os.getenv('SCHEDULER_FOREGROUND_WORKERS', '2'))  # PERF-20
+        config_data['scheduler_background_workers'] = int(
+            os.getenv('SCHEDULER_BACKGROUND_WORKERS', '1'))  # PERF-20
+        config_data['scheduler_max_pause'] = float(
+            os.getenv('SCHEDULER_MAX_PAUSE', '60.0'))  # PERF-20
+        config_data['drift_monitor_enabled'] = (
+            os.getenv('DRIFT_MONITOR_ENABLED', 'true').lower()
+            in ('true', '1', 'yes'))  # PERF-21
+        config_data['drift_max_age_hours'] = float(
+            os.getenv('DRIFT_MAX_AGE_HOURS', '168.0'))  # PERF-21
+        config_data['drift_recent_bars'] = int(
+            os.getenv('DRIFT_RECENT_BARS', '500'))  # PERF-21
+        config_data['drift_sharpe_drop'] = float(
+            os.getenv('DRIFT_SHARPE_DROP', '1.0'))  # PERF-21
+        config_data['drift_win_rate_drop'] = float(
+            os.getenv('DRIFT_WIN_RATE_DROP', '20.0'))  # PERF-21
+        config_data['drift_min_live_trades'] = int(
+            os.getenv('DRIFT_MIN_LIVE_TRADES', '3'))  # PERF-21
+        config_data['drift_atr_ratio'] = float(
+            os.getenv('DRIFT_ATR_RATIO', '1.5'))  # PERF-21
+        config_data['exchange_pool_size'] = int(
+            os.getenv('EXCHANGE_POOL_SIZE', '20'))  # PERF-25
+        config_data['exchange_keepalive_seconds'] = float(
+            os.getenv('EXCHANGE_KEEPALIVE_SECONDS', '30.0'))  # PERF-25
         config_data['backtest_throttle_seconds'] = float(
             os.getenv('BACKTEST_THROTTLE_SECONDS', '3600.0'))  # P3-02
         config_data['project_name'] = os.getenv('BOT_PROJECT_NAME', 'MULTI_ASSETS')
@@ -293,6 +403,53 @@ class Config:
         if self.sizing_mode not in valid_modes:
             errors.append(
                 f"sizing_mode='{self.sizing_mode}' invalide. Valides: {valid_modes}")
+        # PERF-01: exécuteur de backtests
+        valid_executors = {'thread', 'process'}
+        if self.backtest_executor not in valid_executors:
+            errors.append(
+                f"backtest_executor='{self.backtest_executor}' invalide. "
+                f"Valides: {valid_executors}")
+        if self.backtest_chunksize < 1:
+            errors.append(f"backtest_chunksize={self.backtest_chunksize} doit être >= 1")
+        # PERF-05: critères d'arrêt anticipé
+        if not 0.0 <= self.backtest_abort_max_drawdown <= 1.0:
+            errors.append(
+                f"backtest_abort_max_drawdown={self.backtest_abort_max_drawdown} "
+                f"doit être dans [0, 1]")
+        if not 0.0 <= self.backtest_abort_equity_floor_pct < 1.0:
+            errors.append(
+                f"backtest_abort_equity_floor_pct={self.backtest_abort_equity_floor_pct} "
+                f"doit être dans [0, 1[")
+        if self.backtest_abort_min_trades < 0 or self.backtest_abort_min_trades_bar < 0:
+            errors.append("backtest_abort_min_trades / _min_trades_bar doivent être >= 0")
+        if self.backtest_memo_max_age_days < 0:
+            errors.append(
+                f"backtest_memo_max_age_days={self.backtest_memo_max_age_days} doit être >= 0")
+        if self.optuna_pruner not in ('median', 'hyperband', 'none'):
+            errors.append(
+                f"optuna_pruner='{self.optuna_pruner}' doit être 'median', 'hyperband' ou 'none'")
+        if self.optuna_n_jobs < 0 or self.optuna_warm_start_trials < 0:
+            errors.append("optuna_n_jobs / optuna_warm_start_trials doivent être >= 0")
+        if self.monte_carlo_paths < 0 or self.monte_carlo_fee_shock < 0:
+            errors.append("monte_carlo_paths / monte_carlo_fee_shock doivent être >= 0")
+        if not 0.0 <= self.monte_carlo_skip_prob < 1.0:
+            errors.append(
+                f"monte_carlo_skip_prob={self.monte_carlo_skip_prob} doit être dans [0, 1[")
+        if self.backtest_keep_trade_logs < -1:
+            errors.append(
+                f"backtest_keep_trade_logs={self.backtest_keep_trade_logs} doit être >= -1")
+        if self.scheduler_foreground_workers < 1 or self.scheduler_background_workers < 1:
+            errors.append("scheduler_foreground_workers / _background_workers doivent être >= 1")
+        if self.scheduler_max_pause < 0:
+            errors.append(f"scheduler_max_pause={self.scheduler_max_pause} doit être >= 0")
+        if self.drift_max_age_hours <= 0 or self.drift_recent_bars < 50:
+            errors.append("drift_max_age_hours doit être > 0 et drift_recent_bars >= 50")
+        if self.drift_sharpe_drop < 0 or self.drift_win_rate_drop < 0 or self.drift_min_live_trades < 1:
+            errors.append("drift_sharpe_drop / drift_win_rate_drop doivent être >= 0, drift_min_live_trades >= 1")
+        if self.drift_atr_ratio <= 1.0:
+            errors.append(f"drift_atr_ratio={self.drift_atr_ratio} doit être > 1")
+        if self.exchange_pool_size < 1 or self.exchange_keepalive_seconds < 0:
+            errors.append("exchange_pool_size doit être >= 1 et exchange_keepalive_seconds >= 0")
         # Partial thresholds cohérents
         if self.partial_threshold_2 <= self.partial_threshold_1:
             errors.append(
@@ -4,6 +4,7 @@ Centralise toutes les valeurs numériques significatives pour faciliter
 la modification, l'audit, et la documentation des seuils métier.
 """
 from decimal import Decimal
+from typing import Any, Dict, List
 
 # ── Order Manager ──────────────────────────────────────────────────────────────
 QTY_OVERSHOOT_TOLERANCE = Decimal('1.02')   # 2% de tolérance sur min_qty (MI-03)
@@ -31,6 +32,16 @@ PARTIAL_2_QTY_MIN: float = 0.25      # Ratio quantité min pour détection parti
 PARTIAL_2_QTY_MAX: float = 0.35      # Ratio quantité max pour détection partial-2
 SNIPER_BAND_PCT: float = 2.0         # Écart max % pour entrée sniper
 
+# ── Scénarios Walk-Forward ─────────────────────────────────────────────────────
+# P6-C: liste de scénarios Walk-Forward — source unique de vérité (MULTI_SYMBOLS,
+# cycle_benchmark) ; ici car MULTI_SYMBOLS crée le client Binance à l'import
+WF_SCENARIOS: List[Dict[str, Any]] = [
+    {'name': 'StochRSI',      'params': {'stoch_period': 14}},
+    {'name': 'StochRSI_SMA',  'params': {'stoch_period': 14, 'sma_long': 200}},
+    {'name': 'StochRSI_ADX',  'params': {'stoch_period': 14, 'adx_period': 14}},
+    {'name': 'StochRSI_TRIX', 'params': {'stoch_period': 14, 'trix_length': 7, 'trix_signal': 15}},
+]
+
 # ── MULTI_SYMBOLS Runtime ──────────────────────────────────────────────────────
 SAVE_THROTTLE_SECONDS: float = 5.0   # Intervalle min entre sauvegardes d'état
 MAX_SAVE_FAILURES: int = 3           # Max d'échecs consécutifs avant emergency halt
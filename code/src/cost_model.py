@@ -0,0 +1,125 @@
+"""
+cost_model.py — Modèles de coûts d'exécution simulés dans le moteur de backtest.
+
+``BasicSlippageModel`` (P2-02) tire son slippage en Python (``random.Random``)
+fill par fill : les facteurs sont calculés avant la boucle et le run OOS
+quitte le moteur Cython.  ``CostModel`` décrit les mêmes coûts sous forme de
+coefficients, évalués dans la boucle des deux moteurs
+(``backtest_engine_standard`` et ``backtest_kernel``) à chaque entrée et
+sortie complète.  Le surcoût d'un fill, en fraction du prix, est la somme de :
+
+- ``fixed_slippage`` : coût fixe (0.0001 = 1 bp) ;
+- ``atr_slippage × ATR / close`` du bar de signal ;
+- ``participation_impact × min(1, quantité / volume du bar)`` ;
+- un tirage uniforme dans ``[random_slippage_min, random_slippage_max]``.
+
+Il s'ajoute au slippage fixe de la configuration (``slippage_buy`` /
+``slippage_sell``) : prix d'achat × (1 + coût), prix de vente × (1 − coût).
+``fee_rate`` remplace, s'il est fourni, les frais taker de la configuration.
+
+Le tirage aléatoire est *counter-based* : ``counter_uniform(seed, bar,
+trade, side)`` est un hachage (finaliseur murmur3 32 bits) de la graine, du
+bar, du nombre de trades clôturés et du sens du fill.  Il ne dépend d'aucun
+état de générateur : le résultat est identique quel que soit l'ordre
+d'exécution des tâches, la reprise depuis un checkpoint (PERF-08) ou le
+moteur utilisé.
+
+Public API
+----------
+- ``FILL_BUY``, ``FILL_SELL``
+- ``CostModel``
+- ``OOS_COST_MODEL``
+- ``counter_uniform``
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sens du fill (flux du tirage aléatoire)
+FILL_BUY = 0
+FILL_SELL = 1
+
+_M32 = 0xFFFFFFFF
+
+
+def counter_uniform(seed: int, bar: int, trade: int, side: int) -> float:
+    """Tirage uniforme dans ``[0, 1)`` déterminé par ``(seed, bar, trade, side)``.
+
+    Arithmétique 32 bits masquée, identique en Python, sous numba et dans
+    ``backtest_engine_standard`` (``uint32_t``).
+    """
+    h = seed & _M32
+    for key in (bar, trade, side):
+        h ^= key & _M32
+        h ^= h >> 16
+        h = (h * 0x85EBCA6B) & _M32
+        h ^= h >> 13
+        h = (h * 0xC2B2AE35) & _M32
+        h ^= h >> 16
+    return h / 4294967296.0
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """Coefficients de coûts d'exécution (fractions du prix, 0.0001 = 1 bp).
+
+    Parameters
+    ----------
+    fixed_slippage : float
+        Surcoût fixe par fill.
+    atr_slippage : float
+        Multiplicateur de l'ATR relatif (``ATR / close``) du bar de signal.
+    participation_impact : float
+        Multiplicateur du taux de participation ``min(1, quantité / volume)``
+        (volume du bar de signal, en unités de l'actif) ; exige la colonne
+        ``volume``.
+    random_slippage_min, random_slippage_max : float
+        Bornes du surcoût aléatoire (``counter_uniform``).
+    seed : int
+        Graine du tirage (32 bits de poids faible).
+    fee_rate : float, optional
+        Frais taker par fill (None : ``config.backtest_taker_fee``).
+    """
+
+    fixed_slippage: float = 0.0
+    atr_slippage: float = 0.0
+    participation_impact: float = 0.0
+    random_slippage_min: float = 0.0
+    random_slippage_max: float = 0.0
+    seed: int = 0
+    fee_rate: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if min(self.fixed_slippage, self.atr_slippage, self.participation_impact,
+               self.random_slippage_min) < 0:
+            raise ValueError("CostModel: coefficients de slippage négatifs")
+        if self.random_slippage_max < self.random_slippage_min:
+            raise ValueError("CostModel: random_slippage_max < random_slippage_min")
+        if self.fee_rate is not None and not 0 <= self.fee_rate < 1:
+            raise ValueError(f"CostModel: fee_rate={self.fee_rate} hors de [0, 1[")
+
+    def engine_kwargs(self) -> Dict[str, Any]:
+        """Arguments ``cost_*`` de ``backtest_engine_standard.backtest_from_dataframe_fast``."""
+        return {
+            'cost_fixed': float(self.fixed_slippage),
+            'cost_atr': float(self.atr_slippage),
+            'cost_participation': float(self.participation_impact),
+            'cost_random_min': float(self.random_slippage_min),
+            'cost_random_max': float(self.random_slippage_max),
+            'cost_seed': int(self.seed) & _M32,
+        }
+
+
+# Coûts de la validation OOS du walk-forward, calibrés sur BasicSlippageModel :
+# tirage aléatoire de 1-3 bps + impact volume d'au plus 2 bps (atteint pour
+# un ordre égal au volume du bar), soit 1-5 bps par fill comme l'ancien modèle.
+OOS_COST_MODEL = CostModel(
+    random_slippage_min=0.0001,
+    random_slippage_max=0.0003,
+    participation_impact=0.0002,
+)
@@ -0,0 +1,540 @@
+"""
+cycle_benchmark.py — Benchmark de bout en bout des cycles horaire et live.
+
+``benchmark.py`` ne compare que les indicateurs Cython et Python, et
+``tests/bench_optimization.py`` dépend des caches pickle locaux.  Ce module
+mesure, sur un marché synthétique reproductible (``synthetic_market``) et un
+exchange simulé (``SyntheticExchange``), le coût de chaque étape :
+
+- ``data_load`` : ``data_fetcher.fetch_historical_data`` à froid
+  (téléchargement + écriture du cache) puis à chaud (lecture du cache +
+  mise à jour incrémentale), dans un répertoire de cache temporaire ;
+- ``prepare`` : ``prepare_base_dataframe`` par (paire, timeframe) ;
+- ``run_all_backtests`` : grille EMA × scénarios complète ;
+- ``walk_forward`` : ``run_walk_forward_validation`` sur les résultats ;
+- ``optuna`` : ``run_walk_forward_optuna`` (étude en mémoire) ;
+- ``live_cycle`` : cycle live réel d'une paire
+  (``backtest_orchestrator._execute_live_trading_only`` →
+  ``MULTI_SYMBOLS.execute_real_trades``) branché sur l'exchange simulé :
+  données, indicateurs, soldes, filtres, historique d'ordres, signaux,
+  gestion des stops et, si les règles de capital le permettent, ordres
+  simulés (``DEMO``).
+  État du bot, journal des trades et WAL restent en mémoire ou dans un
+  répertoire temporaire ; ``MULTI_SYMBOLS`` n'est importé que pour cette
+  étape (il crée le client Binance à l'import).
+
+Les résultats sont écrits en JSON ; ``compare_results`` signale les étapes
+plus lentes qu'une référence (détection de régressions).
+
+Usage::
+
+    python code/src/cycle_benchmark.py --pairs 3 --days 365 --output bench.json
+    python code/src/cycle_benchmark.py --baseline bench.json
+
+Public API
+----------
+- ``STAGES``
+- ``SyntheticExchange``
+- ``run_benchmark``
+- ``write_results``
+- ``compare_results``
+- ``main``
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from constants import WF_SCENARIOS
+from synthetic_market import generate_market, timeframe_delta, to_klines
+
+logger = logging.getLogger(__name__)
+
+STAGES: Tuple[str, ...] = (
+    'data_load', 'prepare', 'run_all_backtests', 'walk_forward', 'optuna', 'live_cycle',
+)
+
+# Incrémenté si le format du JSON change
+RESULTS_SCHEMA_VERSION = 1
+
+
+class SyntheticExchange:
+    """Exchange simulé servant un marché ``{pair: {timeframe: DataFrame}}``.
+
+    Implémente le sous-ensemble de l'API python-binance lu par
+    ``data_fetcher`` et le cycle live : klines, ticker, compte, filtres de
+    symbole et historique d'ordres (vide : les ordres du cycle live sont
+    simulés, cf. ``_live_environment``).
+
+    Parameters
+    ----------
+    market : dict
+        Historiques par paire et timeframe (``synthetic_market.generate_market``).
+    usdc_balance : float
+        Solde USDC retourné par ``get_account``.
+    """
+
+    def __init__(self, market: Dict[str, Dict[str, pd.DataFrame]], usdc_balance: float = 10000.0) -> None:
+        self.market = market
+        self.usdc_balance = usdc_balance
+        self.calls: Dict[str, int] = {}
+        self._klines: Dict[Tuple[str, str], List[List[Any]]] = {}
+
+    def _count(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _start_position(self, df: pd.DataFrame, start_str: str) -> int:
+        parts = start_str.split()
+        if len(parts) == 3 and parts[2] == 'ago':
+            # "3 hours ago" : relatif à la dernière bougie (horloge du marché simulé)
+            since = df.index[-1] - timeframe_delta(parts[0] + parts[1][0])
+        else:
+            since = pd.Timestamp(start_str)
+        return int(df.index.searchsorted(since))
+
+    def get_historical_klines(self, symbol: str, interval: str, start_str: str,
+                              end_str: Optional[str] = None, limit: Optional[int] = None) -> List[List[Any]]:
+        self._count('get_historical_klines')
+        df = self.market[symbol][interval]
+        key = (symbol, interval)
+        if key not in self._klines:
+            self._klines[key] = to_klines(df, interval)
+        return self._klines[key][self._start_position(df, start_str):]
+
+    def get_symbol_ticker(self, symbol: str) -> Dict[str, str]:
+        self._count('get_symbol_ticker')
+        close = next(iter(self.market[symbol].values()))['close'].iloc[-1]
+        return {'symbol': symbol, 'price': f"{close:.8f}"}
+
+    def get_account(self) -> Dict[str, Any]:
+        self._count('get_account')
+        balances = [{'asset': 'USDC', 'free': f"{self.usdc_balance:.8f}", 'locked': '0'}]
+        balances += [
+            {'asset': pair[:-4], 'free': '0', 'locked': '0'} for pair in self.market
+        ]
+        return {'balances': balances}
+
+    def get_all_tickers(self) -> List[Dict[str, str]]:
+        self._count('get_all_tickers')
+        return [
+            {'symbol': pair, 'price': f"{next(iter(frames.values()))['close'].iloc[-1]:.8f}"}
+            for pair, frames in self.market.items()
+        ]
+
+    def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        self._count('get_symbol_info')
+        return self._symbol_info(symbol) if symbol in self.market else None
+
+    def get_exchange_info(self) -> Dict[str, Any]:
+        self._count('get_exchange_info')
+        return {'symbols': [self._symbol_info(pair) for pair in self.market]}
+
+    @staticmethod
+    def _symbol_info(symbol: str) -> Dict[str, Any]:
+        return {
+            'symbol': symbol, 'status': 'TRADING',
+            'baseAsset': symbol[:-4], 'quoteAsset': symbol[-4:],
+            'filters': [
+                {'filterType': 'PRICE_FILTER', 'minPrice': '0.00000001',
+                 'maxPrice': '1000000.00000000', 'tickSize': '0.00000001'},
+                {'filterType': 'LOT_SIZE', 'minQty': '0.00001000',
+                 'maxQty': '9000000.00000000', 'stepSize': '0.00001000'},
+                {'filterType': 'MIN_NOTIONAL', 'minNotional': '5.00000000'},
+            ],
+        }
+
+    def get_all_orders(self, symbol: str, limit: int = 500) -> List[Dict[str, Any]]:
+        self._count('get_all_orders')
+        return []
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        self._count('get_open_orders')
+        return []
+
+    def get_my_trades(self, symbol: str, **kwargs: Any) -> List[Dict[str, Any]]:
+        self._count('get_my_trades')
+        return []
+
+
+@contextlib.contextmanager
+def _temporary_cache_dir() -> Iterator[str]:
+    """Redirige le cache OHLCV vers un répertoire temporaire (caches locaux intacts)."""
+    import cache_manager
+    saved = (cache_manager._effective_cache_dir, cache_manager._cache_dir_initialized)
+    path = tempfile.mkdtemp(prefix='cycle_bench_')
+    cache_manager._effective_cache_dir = path
+    cache_manager._cache_dir_initialized = True
+    try:
+        yield path
+    finally:
+        cache_manager._effective_cache_dir, cache_manager._cache_dir_initialized = saved
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class _StageTimer:
+    """Cumule les durées par étape."""
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+    @contextlib.contextmanager
+    def __call__(self, stage: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + time.perf_counter() - t0
+            self.calls[stage] = self.calls.get(stage, 0) + 1
+
+
+def _environment() -> Dict[str, Any]:
+    import backtest_runner
+    try:
+        import numba
+        numba_version: Optional[str] = numba.__version__
+    except ImportError:
+        numba_version = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'numba': numba_version,
+        'cython_backtest': bool(backtest_runner.CYTHON_BACKTEST_AVAILABLE),
+    }
+
+
+def _best_params(results: List[Dict[str, Any]], default_tf: str) -> Dict[str, Any]:
+    """Paramètres live de la meilleure configuration (Sharpe), à défaut EMA 26/50."""
+    ranked = [r for r in results if r.get('ema_periods')]
+    if ranked:
+        best = max(ranked, key=lambda r: r.get('sharpe_ratio', 0.0) or 0.0)
+        tf, (ema1, ema2), scenario = best['timeframe'], best['ema_periods'], best['scenario']
+    else:
+        tf, ema1, ema2, scenario = default_tf, 26, 50, 'StochRSI'
+    params = next((s['params'] for s in WF_SCENARIOS if s['name'] == scenario), {})
+    return {
+        'timeframe': tf, 'ema1_period': ema1, 'ema2_period': ema2, 'scenario': scenario,
+        'sma_long': params.get('sma_long'), 'adx_period': params.get('adx_period'),
+        'trix_length': params.get('trix_length'), 'trix_signal': params.get('trix_signal'),
+    }
+
+
+class _DryRunConfig:
+    """Configuration vue par ``exchange_client`` pendant l'étape live : ordres simulés."""
+
+    bot_mode = 'DEMO'
+
+    def __init__(self, config: Any) -> None:
+        self._config = config
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._config, name)
+
+
+@contextlib.contextmanager
+def _live_environment(exchange: SyntheticExchange, work_dir: str) -> Iterator[Any]:
+    """Branche le cycle live réel (``MULTI_SYMBOLS``) sur l'exchange simulé.
+
+    Le client, l'état du bot (en mémoire, jamais sauvegardé), les alertes et
+    la console sont remplacés ; journal des trades et WAL écrivent dans
+    ``work_dir``.  Les ordres passent par ``safe_market_buy`` /
+    ``place_exchange_stop_loss_order`` en mode ``DEMO`` : les ordres réels
+    signent et postent directement vers l'API Binance.  Rend le module
+    ``MULTI_SYMBOLS``.
+    """
+    import MULTI_SYMBOLS as ms
+    import exchange_client
+    import order_manager
+    import wal_logger
+    from rich.console import Console
+    from trade_journal import log_trade
+
+    def journal(logs_dir: str, **kwargs: Any) -> None:
+        log_trade(logs_dir=work_dir, **kwargs)
+
+    patches: List[Tuple[Any, str, Any]] = [
+        (ms, 'client', exchange),
+        (ms, 'bot_state', {}),
+        (ms, 'save_bot_state', lambda force=False: None),
+        (ms, 'send_trading_alert_email', lambda *a, **kw: False),
+        (ms, 'console', Console(file=io.StringIO())),
+        (order_manager, 'log_trade', journal),
+        (exchange_client, '_config', _DryRunConfig(exchange_client._config)),
+        (wal_logger, '_WAL_DIR', work_dir),
+        (wal_logger, '_WAL_FILE', os.path.join(work_dir, 'wal.jsonl')),
+    ]
+    saved = [(obj, name, getattr(obj, name)) for obj, name, _ in patches]
+    best_params = dict(ms._runtime.live_best_params)
+    scheduled = dict(ms._runtime.last_scheduled_trade_time)
+    for obj, name, value in patches:
+        setattr(obj, name, value)
+    try:
+        yield ms
+    finally:
+        for obj, name, value in saved:
+            setattr(obj, name, value)
+        ms._runtime.live_best_params.clear()
+        ms._runtime.live_best_params.update(best_params)
+        ms._runtime.last_scheduled_trade_time.clear()
+        ms._runtime.last_scheduled_trade_time.update(scheduled)
+
+
+def run_benchmark(
+    n_pairs: int = 3,
+    history_days: int = 365,
+    timeframes: Sequence[str] = ('1h', '4h', '1d'),
+    seed: int = 0,
+    stages: Sequence[str] = STAGES,
+    optuna_trials: int = 20,
+    live_iterations: int = 5,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Chronomètre les étapes des cycles horaire et live sur un marché synthétique.
+
+    Parameters
+    ----------
+    n_pairs : int
+        Nombre de paires simulées.
+    history_days : int
+        Profondeur d'historique par paire.
+    timeframes : sequence of str
+        Timeframes du cycle horaire.
+    seed : int
+        Graine du marché synthétique.
+    stages : sequence of str
+        Étapes à mesurer (sous-ensemble de ``STAGES``).
+    optuna_trials : int
+        Essais de l'étude Optuna par paire.
+    live_iterations : int
+        Cycles live chronométrés par paire.
+    max_workers : int, optional
+        Threads du walk-forward (défaut : configuration).
+
+    Returns
+    -------
+    dict
+        ``params``, ``environment``, ``stages`` (``{stage: {'seconds',
+        'calls'}}``), ``total_seconds`` et ``skipped`` (étapes non mesurées).
+    """
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"étapes inconnues: {sorted(unknown)}")
+    from backtest_runner import backtest_from_dataframe, run_all_backtests
+    from data_fetcher import fetch_historical_data
+    from indicators_engine import prepare_base_dataframe
+
+    t_gen = time.perf_counter()
+    # Historique qui se termine maintenant : le cycle live lit une fenêtre
+    # glissante datée depuis l'horloge réelle (_fresh_start_date).
+    market_start = pd.Timestamp.now().floor('h') - pd.Timedelta(days=history_days)
+    market = generate_market(n_pairs, history_days, timeframes, seed=seed,
+                             start=market_start.strftime('%Y-%m-%d %H:%M'))
+    generation_seconds = time.perf_counter() - t_gen
+    exchange = SyntheticExchange(market)
+    first_bar = min(df.index[0] for frames in market.values() for df in frames.values())
+    start_date = first_bar.strftime('%d %B %Y')
+    timer = _StageTimer()
+    skipped: List[str] = []
+
+    def fetch_memory(pair: str, tf: str, _start: str) -> pd.DataFrame:
+        return market[pair][tf].copy()
+
+    def prepare_fn(pair: str, tf: str, start: str, stoch_period: int = 14) -> Optional[pd.DataFrame]:
+        return prepare_base_dataframe(pair, tf, start, stoch_period, fetch_data_fn=fetch_memory)
+
+    with _temporary_cache_dir() as cache_dir:
+        if 'data_load' in stages:
+            for pair in market:
+                for tf in timeframes:
+                    with timer('data_load_cold'):
+                        fetch_historical_data(pair, tf, start_date, exchange)
+                    with timer('data_load_warm'):
+                        fetch_historical_data(pair, tf, start_date, exchange)
+
+        results_by_pair: Dict[str, List[Dict[str, Any]]] = {}
+        for pair in market:
+            if 'prepare' in stages:
+                for tf in timeframes:
+                    with timer('prepare'):
+                        prepare_fn(pair, tf, start_date)
+
+            results: List[Dict[str, Any]] = []
+            if {'run_all_backtests', 'walk_forward', 'live_cycle'} & set(stages):
+                with timer('run_all_backtests'):
+                    results = run_all_backtests(
+                        pair, start_date, list(timeframes), prepare_base_dataframe_fn=prepare_fn,
+                    )
+            results_by_pair[pair] = results
+
+            if {'walk_forward', 'optuna'} & set(stages):
+                base_dataframes = {}
+                for tf in timeframes:
+                    df = prepare_fn(pair, tf, start_date)
+                    base_dataframes[tf] = df if df is not None else pd.DataFrame()
+                if 'walk_forward' in stages:
+                    from walk_forward import run_walk_forward_validation
+                    with timer('walk_forward'):
+                        run_walk_forward_validation(
+                            base_dataframes=base_dataframes, full_sample_results=results,
+                            scenarios=WF_SCENARIOS, backtest_fn=backtest_from_dataframe,
+                            max_workers=max_workers,
+                        )
+                if 'optuna' in stages:
+                    try:
+                        import optuna  # noqa: F401
+                    except ImportError:
+                        if 'optuna' not in skipped:
+                            skipped.append('optuna')
+                    else:
+                        from walk_forward import run_walk_forward_optuna
+                        with timer('optuna'):
+                            run_walk_forward_optuna(
+                                base_dataframes=base_dataframes, scenarios=WF_SCENARIOS,
+                                backtest_fn=backtest_from_dataframe, n_trials=optuna_trials,
+                            )
+
+            if 'live_cycle' in stages:
+                from backtest_orchestrator import _execute_live_trading_only
+                with _live_environment(exchange, os.path.join(cache_dir, 'live')) as ms:
+                    ms._runtime.live_best_params[pair] = _best_params(results, timeframes[0])
+                    ms._runtime.last_scheduled_trade_time.pop(pair, None)
+                    deps = ms._make_backtest_deps()
+                    for _ in range(live_iterations):
+                        with timer('live_cycle'):
+                            _execute_live_trading_only(pair, pair, 'risk', deps)
+
+    stage_results = {
+        name: {'seconds': round(seconds, 6), 'calls': timer.calls[name]}
+        for name, seconds in timer.seconds.items()
+    }
+    if 'run_all_backtests' not in stages:
+        stage_results.pop('run_all_backtests', None)
+    return {
+        'schema': RESULTS_SCHEMA_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'params': {
+            'n_pairs': n_pairs, 'history_days': history_days, 'timeframes': list(timeframes),
+            'seed': seed, 'stages': list(stages), 'optuna_trials': optuna_trials,
+            'live_iterations': live_iterations,
+            'bars': {tf: len(next(iter(market.values()))[tf]) for tf in timeframes},
+        },
+        'environment': _environment(),
+        'generation_seconds': round(generation_seconds, 6),
+        'stages': stage_results,
+        'total_seconds': round(sum(s['seconds'] for s in stage_results.values()), 6),
+        'skipped': skipped,
+    }
+
+
+def write_results(results: Dict[str, Any], path: str) -> None:
+    """Écrit les résultats du benchmark en JSON (écriture atomique)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+    min_seconds: float = 0.05,
+) -> List[Dict[str, Any]]:
+    """Étapes plus lentes que la référence au-delà de ``tolerance``.
+
+    Parameters
+    ----------
+    current, baseline : dict
+        Résultats de ``run_benchmark`` (ou JSON relu).
+    tolerance : float
+        Ralentissement relatif toléré (0.25 → +25 %).
+    min_seconds : float
+        Durée de référence par appel en dessous de laquelle l'écart est
+        ignoré (bruit de mesure).
+
+    Returns
+    -------
+    list[dict]
+        ``{'stage', 'baseline', 'current', 'ratio'}`` par régression.
+    """
+    if current.get('params', {}).get('bars') != baseline.get('params', {}).get('bars'):
+        logger.warning("[BENCH] Tailles de marché différentes : comparaison indicative")
+    regressions = []
+    for stage, ref in baseline.get('stages', {}).items():
+        cur = current.get('stages', {}).get(stage)
+        if cur is None:
+            continue
+        # Comparaison par appel : le nombre de paires peut différer
+        ref_unit = ref['seconds'] / max(ref.get('calls', 1), 1)
+        cur_unit = cur['seconds'] / max(cur.get('calls', 1), 1)
+        if ref_unit < min_seconds:
+            continue
+        ratio = cur_unit / ref_unit if ref_unit > 0 else float('inf')
+        if ratio > 1.0 + tolerance:
+            regressions.append({
+                'stage': stage, 'baseline': ref_unit, 'current': cur_unit, 'ratio': round(ratio, 3),
+            })
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Point d'entrée CLI ; code retour 1 si une régression est détectée."""
+    parser = argparse.ArgumentParser(description="Benchmark de bout en bout des cycles horaire et live")
+    parser.add_argument('--pairs', type=int, default=3, help="Nombre de paires synthétiques")
+    parser.add_argument('--days', type=int, default=365, help="Profondeur d'historique (jours)")
+    parser.add_argument('--timeframes', default='1h,4h,1d', help="Timeframes séparés par des virgules")
+    parser.add_argument('--seed', type=int, default=0, help="Graine du marché synthétique")
+    parser.add_argument('--stages', default=','.join(STAGES), help="Étapes à mesurer")
+    parser.add_argument('--optuna-trials', type=int, default=20, help="Essais Optuna par paire")
+    parser.add_argument('--live-iterations', type=int, default=5, help="Décisions live par paire")
+    parser.add_argument('--output', default='', help="Fichier JSON des résultats")
+    parser.add_argument('--baseline', default='', help="JSON de référence pour la détection de régressions")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Ralentissement toléré (0.25 = +25 %%)")
+    args = parser.parse_args(argv)
+
+    timeframes = [tf.strip() for tf in args.timeframes.split(',') if tf.strip()]
+    for tf in timeframes:
+        timeframe_delta(tf)
+    results = run_benchmark(
+        n_pairs=args.pairs, history_days=args.days, timeframes=timeframes, seed=args.seed,
+        stages=[s.strip() for s in args.stages.split(',') if s.strip()],
+        optuna_trials=args.optuna_trials, live_iterations=args.live_iterations,
+    )
+    for stage, res in results['stages'].items():
+        print(f"{stage:<20} {res['seconds']:>10.3f} s  ({res['calls']} appels)")
+    print(f"{'total':<20} {results['total_seconds']:>10.3f} s")
+    if args.output:
+        write_results(results, args.output)
+        print(f"Résultats écrits dans {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        regressions = compare_results(results, baseline, tolerance=args.tolerance)
+        for reg in regressions:
+            print(f"[REGRESSION] {reg['stage']}: {reg['baseline']:.3f} s -> {reg['current']:.3f} s (x{reg['ratio']})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+cycle_context.py — Cache de préparation des DataFrames, limité à un cycle.
+
+Au cours d'un même cycle horaire, ``detect_market_changes``,
+``run_all_backtests`` puis la reconstruction des ``base_dataframes`` du
+walk-forward appellent chacun ``prepare_base_dataframe`` sur les mêmes
+données (pair, timeframe) : les EMA, RSI, ATR, StochRSI et SMA de volume
+étaient recalculés trois fois.
+
+Un ``CycleContext`` conserve le DataFrame préparé, indexé par l'empreinte
+des données brutes (``frame_fingerprint``) et les paramètres de préparation.
+Il est publié dans une ``ContextVar`` par ``cycle_scope`` : chaque
+consommateur le retrouve via ``current_cycle()`` sans modifier les
+signatures injectées.  Les frames mis en cache sont rendus en copie (les
+consommateurs ajoutent des colonnes) et le cache est vidé à la sortie du
+scope pour borner la mémoire au cycle courant.
+
+Les ``ContextVar`` ne se propagent pas dans les threads d'un pool : un
+worker qui doit partager le cache réactive le contexte avec
+``cycle_scope(ctx)``.
+
+Public API
+----------
+- ``CycleContext``
+- ``cycle_scope``
+- ``current_cycle``
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import logging
+import threading
+from typing import Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_ACTIVE: contextvars.ContextVar[Optional['CycleContext']] = contextvars.ContextVar(
+    'cycle_context', default=None,
+)
+
+
+class CycleContext:
+    """Cache des DataFrames préparés pendant un cycle (thread-safe).
+
+    Parameters
+    ----------
+    label : str
+        Libellé du cycle (journalisation).
+    """
+
+    def __init__(self, label: str = '') -> None:
+        self.label = label
+        self.hits = 0
+        self.misses = 0
+        self._frames: Dict[Tuple[Hashable, ...], Optional[pd.DataFrame]] = {}
+        self._key_locks: Dict[Tuple[Hashable, ...], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frames)
+
+    def prepared_frame(
+        self,
+        key: Tuple[Hashable, ...],
+        build: Callable[[], Optional[pd.DataFrame]],
+    ) -> Optional[pd.DataFrame]:
+        """Retourne une copie du frame préparé pour ``key``, calculé au plus une fois.
+
+        Parameters
+        ----------
+        key : tuple
+            Clé de préparation (paramètres + empreinte des données brutes).
+        build : callable
+            ``build() -> DataFrame or None`` ; appelé seulement au premier accès.
+
+        Returns
+        -------
+        pd.DataFrame or None
+            Copie indépendante du frame en cache (ou None si ``build`` a
+            retourné None).
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Verrou par clé : deux consommateurs concurrents ne préparent pas deux fois
+        with key_lock:
+            with self._lock:
+                found = key in self._frames
+                frame = self._frames.get(key)
+                if found:
+                    self.hits += 1
+            if not found:
+                frame = build()
+                with self._lock:
+                    self._frames[key] = frame
+                    self.misses += 1
+        return frame.copy() if frame is not None else None
+
+    def release(self) -> None:
+        """Libère les frames en cache (fin de cycle)."""
+        with self._lock:
+            n_frames = len(self._frames)
+            self._frames.clear()
+            self._key_locks.clear()
+        if self.hits or self.misses:
+            logger.debug(
+                "[CYCLE] %s : %d frame(s) préparé(s), %d réutilisation(s) — cache libéré",
+                self.label or 'cycle', n_frames, self.hits,
+            )
+
+
+def current_cycle() -> Optional[CycleContext]:
+    """Contexte du cycle actif dans le contexte d'exécution courant, ou None."""
+    return _ACTIVE.get()
+
+
+@contextlib.contextmanager
+def cycle_scope(
+    context: Optional[CycleContext] = None,
+    label: str = '',
+) -> Iterator[CycleContext]:
+    """Active un contexte de cycle pour la durée du bloc.
+
+    Sans ``context``, réutilise le cycle déjà actif (scopes imbriqués) ou en
+    ouvre un nouveau, libéré à la sortie du bloc.  Avec ``context`` (worker
+    d'un pool), active ce contexte sans le libérer : son propriétaire s'en
+    charge.
+
+    Parameters
+    ----------
+    context : CycleContext, optional
+        Contexte existant à propager.
+    label : str
+        Libellé d'un nouveau cycle.
+
+    Yields
+    ------
+    CycleContext
+    """
+    owned = False
+    if context is None:
+        context = _ACTIVE.get()
+        if context is None:
+            context = CycleContext(label)
+            owned = True
+    token = _ACTIVE.set(context)
+    try:
+        yield context
+    finally:
+        _ACTIVE.reset(token)
+        if owned:
+            context.release()
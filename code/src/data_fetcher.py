@@ -22,6 +22,7 @@ from cache_manager import (
     safe_cache_read, safe_cache_write,
     update_cache_with_recent_data,
 )
+from spans import timed  # PERF-18: durée des chargements
 
 logger = logging.getLogger(__name__)
 
@@ -93,6 +94,7 @@ def validate_data_integrity(df: pd.DataFrame) -> bool:
 
 # ─── Historical Data Fetch ───────────────────────────────────────────────────
 
+@timed('fetch')
 @retry_with_backoff(max_retries=3, base_delay=2.0)
 @log_exceptions(default_return=pd.DataFrame())
 def fetch_historical_data(
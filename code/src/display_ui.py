@@ -39,6 +39,15 @@ def _fmt_price(price: float) -> str:
     return f"{price:.2f}" if price >= 1.0 else f"{price:.8g}"
 
 
+def _fmt_trade_count(result: Mapping[str, Any]) -> str:
+    """Nombre d'événements du journal de trades (⚠ si < 10)."""
+    if 'n_trades' in result:  # PERF-19: journal libéré hors du top-K
+        n_trades = int(result['n_trades'])
+    else:
+        n_trades = len(result.get('trade_log', result.get('trades', ())))
+    return f"[bold yellow]⚠[/bold yellow] {n_trades}" if n_trades < 10 else str(n_trades)
+
+
 # ─── Signal Panels ──────────────────────────────────────────────────────────
 
 def display_buy_signal_panel(
@@ -519,7 +528,7 @@ def display_results_for_pair(backtest_pair: str, results: List[Dict], console: O
             f"{result['ema_periods'][0]}/{result['ema_periods'][1]}",
             result['scenario'],
             f"[{profit_color}]{profit:,.2f}[/{profit_color}]",
-            f"[bold yellow]⚠[/bold yellow] {len(result['trades'])}" if len(result['trades']) < 10 else str(len(result['trades'])),
+            _fmt_trade_count(result),
             f"[red]{result['max_drawdown']*100:.2f}%[/red]",
             f"[cyan]{result['win_rate']:.2f}%[/cyan]",
             style=row_style,
@@ -602,7 +611,7 @@ def display_backtest_table(
             f"${result['initial_wallet']:,.2f}",
             f"[{final_wallet_color}]${result['final_wallet']:,.2f}[/{final_wallet_color}]",
             f"[{profit_color}]${profit:,.2f}[/{profit_color}]",
-            f"[bold yellow]⚠[/bold yellow] {len(result['trades'])}" if len(result['trades']) < 10 else str(len(result['trades'])),
+            _fmt_trade_count(result),
             f"[red]{result['max_drawdown']*100:.2f}%[/red]",
             f"[cyan]{result['win_rate']:.2f}%[/cyan]",
             style=row_style,
@@ -0,0 +1,277 @@
+"""
+drift_monitor.py — Ré-optimisation déclenchée par la dérive de la config active.
+
+Le cycle planifié relançait toutes les heures, pour chaque paire, la chaîne
+complète backtests → grille StochRSI → Optuna → walk-forward, que le marché
+ait changé ou non.  Ce module décide si cette ré-optimisation est utile.
+
+À chaque sélection validée par le walk-forward, une *référence* est
+enregistrée dans l'état de la paire (``bot_state[pair]['drift_baseline']``) :
+paramètres actifs, Sharpe et win rate OOS attendus, ATR relatif du
+timeframe actif.  Aux cycles suivants, une revalidation légère la compare
+à la situation courante :
+
+- Sharpe de la config active rejouée sur les ``drift_recent_bars``
+  dernières bougies (un seul backtest) vs Sharpe OOS attendu ;
+- win rate des ventes live depuis la validation (``trade_journal``) vs win
+  rate OOS attendu ;
+- croisement EMA 26/50 sur le timeframe actif (``detect_market_changes``) ;
+- variation de l'ATR relatif (hausse ou baisse au-delà de ``drift_atr_ratio``).
+
+La ré-optimisation complète n'est lancée que si l'un de ces signaux dépasse
+son seuil, si la référence manque, ne correspond plus aux paramètres actifs,
+a dépassé ``drift_max_age_hours`` ou si la paire est bloquée par les OOS
+gates (P0-03).
+
+Public API
+----------
+- ``DRIFT_BASELINE_KEY``
+- ``DriftThresholds``
+- ``DriftReport``
+- ``drift_thresholds_from_config``
+- ``make_baseline``
+- ``baseline_staleness``
+- ``assess_drift``
+- ``atr_pct``
+- ``recent_bar_range``
+- ``live_outcomes``
+- ``read_live_outcomes``
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DRIFT_BASELINE_KEY = 'drift_baseline'
+
+# Paramètres qui identifient la config active (le reste découle du scénario)
+_PARAM_KEYS = ('timeframe', 'ema1_period', 'ema2_period', 'scenario')
+
+
+@dataclass(frozen=True)
+class DriftThresholds:
+    """Seuils de dérive (cf. ``DRIFT_*`` dans ``.env.example``)."""
+
+    max_age_s: float = 168.0 * 3600.0
+    recent_bars: int = 500
+    sharpe_drop: float = 1.0
+    win_rate_drop: float = 20.0
+    min_live_trades: int = 3
+    atr_ratio: float = 1.5
+
+
+@dataclass(frozen=True)
+class DriftReport:
+    """Décision de la revalidation : ``reasons`` vide ⇔ config conservée."""
+
+    reasons: Tuple[str, ...] = ()
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def reoptimize(self) -> bool:
+        return bool(self.reasons)
+
+
+def drift_thresholds_from_config(config: Any) -> DriftThresholds:
+    """Seuils issus de la configuration (``DRIFT_*``)."""
+    return DriftThresholds(
+        max_age_s=float(getattr(config, 'drift_max_age_hours', 168.0)) * 3600.0,
+        recent_bars=int(getattr(config, 'drift_recent_bars', 500)),
+        sharpe_drop=float(getattr(config, 'drift_sharpe_drop', 1.0)),
+        win_rate_drop=float(getattr(config, 'drift_win_rate_drop', 20.0)),
+        min_live_trades=int(getattr(config, 'drift_min_live_trades', 3)),
+        atr_ratio=float(getattr(config, 'drift_atr_ratio', 1.5)),
+    )
+
+
+def _finite(value: Any) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def make_baseline(
+    params: Mapping[str, Any],
+    *,
+    expected_sharpe: Any,
+    expected_win_rate: Any,
+    atr: Optional[float],
+    now: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Référence (sérialisable JSON) d'une config validée par le walk-forward.
+
+    Parameters
+    ----------
+    params : mapping
+        Paramètres actifs (``timeframe``, ``ema1_period``, ``ema2_period``,
+        ``scenario``...).
+    expected_sharpe, expected_win_rate : float
+        Sharpe et win rate (%) OOS moyens du walk-forward.
+    atr : float, optional
+        ATR relatif du timeframe actif (``atr_pct``) à la validation.
+    now : float, optional
+        Horodatage ``time.time()`` de la validation.
+    """
+    return {
+        'params': {k: params.get(k) for k in _PARAM_KEYS},
+        'expected_sharpe': _finite(expected_sharpe),
+        'expected_win_rate': _finite(expected_win_rate),
+        'atr_pct': _finite(atr),
+        'validated_at': time.time() if now is None else float(now),
+    }
+
+
+def baseline_staleness(
+    baseline: Optional[Mapping[str, Any]],
+    params: Mapping[str, Any],
+    thresholds: DriftThresholds,
+    *,
+    oos_blocked: bool = False,
+    now: Optional[float] = None,
+) -> Optional[str]:
+    """Motif de ré-optimisation indépendant du marché, ou None.
+
+    Vérifié avant toute mesure : aucune donnée n'est chargée si la
+    référence est absente, périmée ou ne décrit plus la config active.
+    """
+    if oos_blocked:
+        return 'oos_blocked'
+    if not baseline:
+        return 'no_baseline'
+    if baseline.get('params') != {k: params.get(k) for k in _PARAM_KEYS}:
+        return 'params_changed'
+    now = time.time() if now is None else now
+    if now - float(baseline.get('validated_at', 0.0)) >= thresholds.max_age_s:
+        return 'max_age'
+    return None
+
+
+def assess_drift(
+    baseline: Optional[Mapping[str, Any]],
+    params: Mapping[str, Any],
+    thresholds: DriftThresholds,
+    *,
+    recent_sharpe: Optional[float] = None,
+    live: Tuple[int, float] = (0, 0.0),
+    market_changes: Optional[Mapping[str, Any]] = None,
+    atr: Optional[float] = None,
+    oos_blocked: bool = False,
+    now: Optional[float] = None,
+) -> DriftReport:
+    """Compare la situation courante à la référence de la config active.
+
+    Parameters
+    ----------
+    baseline : mapping, optional
+        Référence ``make_baseline`` (None : ré-optimisation).
+    params : mapping
+        Paramètres actuellement tradés.
+    thresholds : DriftThresholds
+        Seuils de dérive.
+    recent_sharpe : float, optional
+        Sharpe de la config active sur les bougies récentes.
+    live : (int, float)
+        Nombre de ventes live depuis la validation et leur win rate (%).
+    market_changes : mapping, optional
+        Résultat de ``detect_market_changes``.
+    atr : float, optional
+        ATR relatif courant du timeframe actif.
+    oos_blocked : bool
+        Paire bloquée par les OOS gates (P0-03).
+    now : float, optional
+        Horodatage ``time.time()`` courant.
+
+    Returns
+    -------
+    DriftReport
+        Motifs de ré-optimisation (vide : config conservée) et mesures.
+    """
+    stale = baseline_staleness(baseline, params, thresholds, oos_blocked=oos_blocked, now=now)
+    if stale is not None or baseline is None:
+        return DriftReport(reasons=(stale or 'no_baseline',))
+
+    reasons = []
+    metrics: Dict[str, float] = {}
+
+    expected_sharpe = baseline.get('expected_sharpe')
+    recent_sharpe = _finite(recent_sharpe)
+    if recent_sharpe is not None:
+        metrics['recent_sharpe'] = recent_sharpe
+        if expected_sharpe is not None and recent_sharpe < expected_sharpe - thresholds.sharpe_drop:
+            reasons.append('recent_sharpe')
+
+    n_live, live_win_rate = live
+    metrics['live_trades'] = float(n_live)
+    expected_wr = baseline.get('expected_win_rate')
+    if n_live >= thresholds.min_live_trades:
+        metrics['live_win_rate'] = live_win_rate
+        if expected_wr is not None and live_win_rate < expected_wr - thresholds.win_rate_drop:
+            reasons.append('live_win_rate')
+
+    timeframe = params.get('timeframe')
+    crosses = [
+        c for c in (market_changes or {}).get('ema_crosses', ())
+        if c.get('timeframe') == timeframe
+    ]
+    if crosses:
+        reasons.append('ema_cross')
+
+    base_atr = baseline.get('atr_pct')
+    atr = _finite(atr)
+    if atr is not None and base_atr:
+        ratio = atr / base_atr
+        metrics['atr_ratio'] = ratio
+        if ratio >= thresholds.atr_ratio or ratio <= 1.0 / thresholds.atr_ratio:
+            reasons.append('atr_shift')
+
+    return DriftReport(reasons=tuple(reasons), metrics=metrics)
+
+
+def recent_bar_range(n_bars: int, recent_bars: int) -> Tuple[int, int]:
+    """Fenêtre ``[début, fin[`` des ``recent_bars`` dernières bougies (``bar_range``)."""
+    return max(0, n_bars - recent_bars), n_bars
+
+
+def atr_pct(df: Optional[pd.DataFrame], bars: int) -> Optional[float]:
+    """ATR relatif moyen (``atr / close``) des ``bars`` dernières bougies, ou None."""
+    if df is None or df.empty or 'atr' not in df.columns:
+        return None
+    tail = df.iloc[-bars:]
+    value = (tail['atr'] / tail['close']).mean()
+    return _finite(value)
+
+
+def live_outcomes(records: Iterable[Mapping[str, Any]], pair: str, since: float) -> Tuple[int, float]:
+    """Nombre de ventes clôturées de ``pair`` depuis ``since`` et leur win rate (%)."""
+    wins = total = 0
+    for record in records:
+        if record.get('pair') != pair or record.get('side') != 'sell' or record.get('pnl') is None:
+            continue
+        try:
+            ts = datetime.fromisoformat(str(record.get('ts'))).timestamp()
+        except ValueError:
+            continue
+        if ts < since:
+            continue
+        total += 1
+        wins += float(record['pnl']) > 0
+    return total, (100.0 * wins / total if total else 0.0)
+
+
+def read_live_outcomes(pair: str, since: float, logs_dir: Optional[str] = None) -> Tuple[int, float]:
+    """``live_outcomes`` sur le journal de trading (``trade_journal.jsonl``)."""
+    from trade_journal import read_journal
+    logs_dir = logs_dir or os.path.join(os.path.dirname(__file__), 'logs')
+    return live_outcomes(read_journal(logs_dir), pair, since)
@@ -14,12 +14,13 @@ from decimal import Decimal
 from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple, Union, cast
 
 import requests
-import schedule
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 
 from bot_config import log_exceptions, retry_with_backoff, config as _config
 from exceptions import BalanceUnavailableError, CircuitOpenError, OrderError
+from spans import timed  # PERF-18: durées des appels API et des ordres
+from task_scheduler import current_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -68,18 +69,24 @@ class _TokenBucket:
         self._last: float = time.time()
         self._lock = threading.Lock()
 
+    def try_acquire(self) -> bool:
+        """Consomme un token s'il est disponible, sans attendre."""
+        with self._lock:
+            now = time.time()
+            elapsed = now - self._last
+            self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+            self._last = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+        return False
+
     def acquire(self, timeout: float = 30.0) -> bool:
         """Attend qu'un token soit disponible. Retourne False si timeout dépassé."""
         deadline = time.time() + timeout
         while True:
-            with self._lock:
-                now = time.time()
-                elapsed = now - self._last
-                self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
-                self._last = now
-                if self._tokens >= 1.0:
-                    self._tokens -= 1.0
-                    return True
+            if self.try_acquire():
+                return True
             if time.time() > deadline:
                 logger.warning("[RATE LIMITER] Timeout en attendant un token API")
                 return False
@@ -104,6 +111,74 @@ def set_circuit_alert_callback(callback: Optional[Callable]) -> None:
     _circuit_alert_callback = callback
 
 
+def _check_circuit() -> None:
+    """TS-P2-01: lève ``CircuitOpenError`` si l'API Binance est en quarantaine."""
+    with _circuit_lock:
+        _cb_open_until: float = _circuit_state['open_until']
+    if _cb_open_until > 0 and time.time() < _cb_open_until:
+        _remaining = _cb_open_until - time.time()
+        raise CircuitOpenError(
+            f"Circuit breaker ouvert — API Binance en quarantaine "
+            f"({_remaining:.0f}s restantes)."
+        )
+
+
+def _record_circuit_success() -> None:
+    """TS-P2-01: succès → réinitialiser le compteur d'échecs circuit breaker."""
+    with _circuit_lock:
+        _circuit_state['failure_count'] = 0
+
+
+def _record_circuit_failure(error: BaseException) -> None:
+    """TS-P2-01: échec définitif (retries épuisés) → incrémenter le compteur circuit breaker."""
+    with _circuit_lock:
+        _circuit_state['failure_count'] += 1
+        _threshold: int = getattr(_config, 'circuit_breaker_threshold', 10)
+        _reset_s: int = getattr(_config, 'circuit_breaker_reset_seconds', 60)
+        if _circuit_state['failure_count'] >= _threshold:
+            _circuit_state['open_until'] = time.time() + _reset_s
+            _circuit_state['failure_count'] = 0
+            logger.critical(
+                "[CIRCUIT-BREAKER TS-P2-01] Circuit ouvert après %d échecs "
+                "réseau consécutifs — API Binance en quarantaine %ds. "
+                "Tous les appels API sont bloqués.",
+                _threshold, _reset_s,
+            )
+            _cb = _circuit_alert_callback
+            if _cb is not None:
+                try:
+                    _cb(
+                        f"Le circuit breaker API Binance s'est ouvert après "
+                        f"{_threshold} échecs réseau consécutifs.\n\n"
+                        f"Les appels API sont en quarantaine pour {_reset_s}s.\n"
+                        f"Dernière erreur: {error}\n\n"
+                        f"Le circuit se réouvrira automatiquement après {_reset_s}s."
+                    )
+                except Exception as _cb_err:
+                    logger.warning(
+                        "[CIRCUIT-BREAKER] Alerte email impossible: %s", _cb_err
+                    )
+
+
+def _retry_backoff(attempt: int) -> float:
+    """Attente avant la tentative ``attempt + 1`` après une erreur réseau : 10s, 20s, 30s max."""
+    return min(10 * (2 ** attempt), 30)
+
+
+def _clamped_offset(server_time: int, local_before: int, local_after: int) -> Tuple[int, int, int]:
+    """Offset horloge locale → Binance : ``(offset appliqué, offset réel, latence)`` en ms.
+
+    offset = serverTime - localTime - latence/2, plus une marge de sécurité
+    conservatrice de -1000 ms (absorbe ~1000ms de dérive horloge Windows sans
+    jamais envoyer un timestamp trop ancien ; recvWindow=60000ms couvre
+    largement le reste), borné à [-10 s, +1 s].
+    """
+    latency = (local_after - local_before) // 2
+    real_offset = server_time - (local_before + latency)
+    SAFETY_MARGIN_MS = -1000  # pylint: disable=invalid-name
+    return max(-10000, min(1000, real_offset + SAFETY_MARGIN_MS)), real_offset, latency
+
+
 # ─── Client Binance robuste ────────────────────────────────────────────────
 class BinanceFinalClient(Client):
     """Client Binance ULTRA ROBUSTE - Correction définitive du timestamp -1021"""
@@ -161,15 +236,9 @@ class BinanceFinalClient(Client):
             local_before = int(time.time() * 1000)
             server_time = self.get_server_time()['serverTime']
             local_after = int(time.time() * 1000)
-            latency = (local_after - local_before) // 2
-            real_offset = server_time - (local_before + latency)
-            # Marge de sécurité conservatrice : -1000 ms.
-            # Absorbe ~1000ms de dérive horloge Windows sans jamais envoyer un
-            # timestamp trop ancien (recvWindow=60000ms couvre largement le reste).
-            SAFETY_MARGIN_MS = -1000  # pylint: disable=invalid-name
-            adjusted_offset = real_offset + SAFETY_MARGIN_MS
-            # Clamp : jamais plus de -10 s ni plus de +1 s
-            self._server_time_offset = max(-10000, min(1000, adjusted_offset))
+            self._server_time_offset, real_offset, latency = _clamped_offset(
+                server_time, local_before, local_after
+            )
             # CRITICAL: BaseClient uses self.timestamp_offset, NOT self._server_time_offset
             self.timestamp_offset = self._server_time_offset
             self._last_sync = time.time()
@@ -193,6 +262,7 @@ class BinanceFinalClient(Client):
         safe_ts = int(current_time * 1000) + self._server_time_offset
         return safe_ts
 
+    @timed('exchange.api')
     def _request(
             self, method: str, uri: str, signed: bool,
             force_params: bool = False, **kwargs: Any) -> Any:
@@ -200,14 +270,7 @@ class BinanceFinalClient(Client):
         max_retries = 3
         for attempt in range(max_retries):
             # TS-P2-01: circuit breaker — bloquer si l'API Binance est en quarantaine
-            with _circuit_lock:
-                _cb_open_until: float = _circuit_state['open_until']
-            if _cb_open_until > 0 and time.time() < _cb_open_until:
-                _remaining = _cb_open_until - time.time()
-                raise CircuitOpenError(
-                    f"Circuit breaker ouvert — API Binance en quarantaine "
-                    f"({_remaining:.0f}s restantes)."
-                )
+            _check_circuit()
             try:
                 # C-05: Rate limiting — acquérir un token avant tout appel réseau
                 _api_rate_limiter.acquire(timeout=30.0)
@@ -235,9 +298,7 @@ class BinanceFinalClient(Client):
                     method, uri, signed, force_params=force_params, **kwargs
                 )
                 self._error_count = max(0, self._error_count - 1)
-                # TS-P2-01: succès → réinitialiser le compteur d'échecs circuit breaker
-                with _circuit_lock:
-                    _circuit_state['failure_count'] = 0
+                _record_circuit_success()
                 return result
             except BinanceAPIException as e:
                 if getattr(e, 'code', None) == -1021:
@@ -262,7 +323,8 @@ class BinanceFinalClient(Client):
                 logger.error(f"Erreur inattendue dans _request: {e}")
                 if attempt < max_retries - 1:
                     now = datetime.now()
-                    next_run = schedule.next_run()
+                    _sched = current_scheduler()  # PERF-20
+                    next_run = _sched.next_run() if _sched is not None else None
                     if next_run:
                         delta = next_run - now
                         seconds_left = max(0, int(delta.total_seconds()))
@@ -274,40 +336,13 @@ class BinanceFinalClient(Client):
                         logger.debug(
                             "[RETRY] %s - Bot actif (RUNNING) | Prochaine execution non planifiee",
                             now.strftime('%H:%M:%S'))
-                    _backoff = min(10 * (2 ** attempt), 30)  # 10s, 20s, 30s max
+                    _backoff = _retry_backoff(attempt)
                     logger.warning(
                         f"_request: retry {attempt+1}/{max_retries} après {_backoff}s"
                     )
                     time.sleep(_backoff)
                     continue
-                # TS-P2-01: échec définitif (retries épuisés) → incrémenter compteur circuit breaker
-                with _circuit_lock:
-                    _circuit_state['failure_count'] += 1
-                    _threshold: int = getattr(_config, 'circuit_breaker_threshold', 10)
-                    _reset_s: int = getattr(_config, 'circuit_breaker_reset_seconds', 60)
-                    if _circuit_state['failure_count'] >= _threshold:
-                        _circuit_state['open_until'] = time.time() + _reset_s
-                        _circuit_state['failure_count'] = 0
-                        logger.critical(
-                            "[CIRCUIT-BREAKER TS-P2-01] Circuit ouvert après %d échecs "
-                            "réseau consécutifs — API Binance en quarantaine %ds. "
-                            "Tous les appels API sont bloqués.",
-                            _threshold, _reset_s,
-                        )
-                        _cb = _circuit_alert_callback
-                        if _cb is not None:
-                            try:
-                                _cb(
-                                    f"Le circuit breaker API Binance s'est ouvert après "
-                                    f"{_threshold} échecs réseau consécutifs.\n\n"
-                                    f"Les appels API sont en quarantaine pour {_reset_s}s.\n"
-                                    f"Dernière erreur: {e}\n\n"
-                                    f"Le circuit se réouvrira automatiquement après {_reset_s}s."
-                                )
-                            except Exception as _cb_err:
-                                logger.warning(
-                                    "[CIRCUIT-BREAKER] Alerte email impossible: %s", _cb_err
-                                )
+                _record_circuit_failure(e)
                 raise
         return None
 
@@ -429,6 +464,7 @@ def _direct_market_order(client: Any, symbol: str, side: str,
         raise OrderError(f"Exception {side.upper()} order: {e}", symbol=symbol) from e
 
 
+@timed('order.buy')
 def safe_market_buy(client: Any, symbol: str, quoteOrderQty: float,  # pylint: disable=invalid-name
                     max_retries: int = 4, send_alert: Any = None) -> Dict[str, Any]:
     """Place a market BUY by quote amount with idempotency/retry and safety checks."""
@@ -504,6 +540,7 @@ def safe_market_buy(client: Any, symbol: str, quoteOrderQty: float,  # pylint: d
     )
 
 
+@timed('order.sell')
 def safe_market_sell(client: Any, symbol: str, quantity: Union[float, str],
                      max_retries: int = 4, send_alert: Any = None) -> Dict[str, Any]:
     """Place a market SELL with idempotent retries and safety checks."""
@@ -594,6 +631,7 @@ def place_trailing_stop_order(client: Any, symbol: str, quantity: float,
         raise
 
 
+@timed('order.stop_loss')
 @retry_with_backoff(max_retries=3, base_delay=2.0)
 @log_exceptions(default_return=None)
 def place_stop_loss_order(
@@ -705,6 +743,7 @@ _tickers_lock = threading.Lock()
 _tickers_cache: Dict[str, Any] = {'data': None, 'timestamp': 0.0}
 
 
+@timed('order.exchange_stop_loss')
 def place_exchange_stop_loss(
     client: Any,
     symbol: str,
@@ -35,7 +35,9 @@ from ta.trend import ADXIndicator, MACD
 from ta.volatility import AverageTrueRange
 
 from bot_config import config
+from backtest_memo import frame_fingerprint
 from cache_manager import get_cache_key
+from cycle_context import current_cycle
 
 logger = logging.getLogger(__name__)
 
@@ -432,6 +434,10 @@ def prepare_base_dataframe(
     StochRSI.  Le résultat est directement consommable par
     ``run_single_backtest_optimized``.
 
+    Dans un ``cycle_scope`` actif (PERF-15), le frame préparé est mis en
+    cache sous l'empreinte des données brutes : les appels suivants du
+    cycle sur les mêmes données reçoivent une copie sans recalcul.
+
     Parameters
     ----------
     pair : str
@@ -463,6 +469,20 @@ def prepare_base_dataframe(
     if df.empty:
         return None
 
+    # PERF-15: un seul calcul par (données, paramètres) pendant le cycle actif
+    cycle = current_cycle()
+    if cycle is None:
+        return _add_base_indicators(df, stoch_period)
+    volume_sma_period = getattr(config, 'volume_sma_period', 20)
+    key = (
+        pair, timeframe, stoch_period, config.atr_period, volume_sma_period,
+        frame_fingerprint(df),
+    )
+    return cycle.prepared_frame(key, lambda: _add_base_indicators(df, stoch_period))
+
+
+def _add_base_indicators(df: pd.DataFrame, stoch_period: int) -> pd.DataFrame:
+    """Ajoute en place les indicateurs de base à ``df`` (OHLCV brut)."""
     # Calculer TOUS les EMA possibles (adjust=False = methode recursive/online)
     for period in [14, 25, 26, 45, 50]:
         df[f'ema_{period}'] = df['close'].ewm(span=period, adjust=False).mean()
@@ -5,25 +5,105 @@ Extracted from MULTI_SYMBOLS.py (P3-SRP) to isolate market analysis
 (EMA crosses, StochRSI extremes, price records) from trading logic.
 
 Pure function — no mutable global state.  Accepts ``prepare_base_dataframe``
-as a callable parameter to avoid circular imports.
+(or the raw ``fetch_historical_data``) as a callable parameter to avoid
+circular imports.
+
+Tail-only mode (PERF-16): only the last two candles are compared, so with
+``fetch_data_fn`` the indicators (EMA 26/50, RSI, StochRSI) are computed on
+the last ``tail_window()`` candles instead of the whole history.  The
+recursive averages (EMA, Wilder RSI) forget their seed geometrically: the
+window is sized so that the seed weight is below ``_TAIL_TOLERANCE``, and
+the values — hence the change flags — match the full-history computation.
+
+Public API
+----------
+- ``detect_market_changes``
+- ``tail_window``
+- ``tail_indicator_frame``
 """
 
 from __future__ import annotations
 
 import logging
+import math
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
 import pandas as pd
+from ta.momentum import RSIIndicator
+
+from indicators_engine import compute_stochrsi
 
 logger = logging.getLogger(__name__)
 
+# Poids résiduel toléré de l'amorce des moyennes récursives (EMA, RSI de Wilder)
+_TAIL_TOLERANCE = 1e-12
+_EMA_FAST, _EMA_SLOW = 26, 50
+_RSI_WINDOW = 14
+# Fenêtre des records de prix (20 dernières bougies)
+_RECORD_WINDOW = 20
+
+
+def tail_window(stoch_period: int = 14, tolerance: float = _TAIL_TOLERANCE) -> int:
+    """Nombre de bougies nécessaires pour les indicateurs des deux dernières.
+
+    Parameters
+    ----------
+    stoch_period : int
+        Période du StochRSI.
+    tolerance : float
+        Poids maximal de la valeur d'amorce dans les moyennes récursives.
+
+    Returns
+    -------
+    int
+        Taille de la fenêtre de warm-up (deux bougies comparées incluses).
+    """
+    log_tol = math.log(tolerance)
+    ema_warmup = math.ceil(log_tol / math.log(1.0 - 2.0 / (_EMA_SLOW + 1)))
+    rsi_warmup = math.ceil(log_tol / math.log(1.0 - 1.0 / _RSI_WINDOW)) + stoch_period
+    return max(ema_warmup, rsi_warmup, _RECORD_WINDOW) + 2
+
+
+def tail_indicator_frame(df: pd.DataFrame, stoch_period: int = 14) -> Optional[pd.DataFrame]:
+    """Indicateurs lus par ``detect_market_changes``, sur la fin de l'historique.
+
+    Mêmes formules que ``prepare_base_dataframe`` (EMA ``adjust=False``, RSI
+    ``ta``, ``compute_stochrsi``) limitées aux colonnes comparées, appliquées
+    aux ``tail_window(stoch_period)`` dernières bougies de ``df``.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        OHLCV brut (non modifié).
+    stoch_period : int
+        Période du StochRSI.
+
+    Returns
+    -------
+    pd.DataFrame or None
+        Fin de l'historique enrichie de ``ema_26``, ``ema_50``, ``rsi`` et
+        ``stoch_rsi`` ; None si ``df`` est vide.
+    """
+    if df is None or df.empty:
+        return None
+    tail = df.iloc[-tail_window(stoch_period):][['high', 'low', 'close']].copy()
+    for period in (_EMA_FAST, _EMA_SLOW):
+        tail[f'ema_{period}'] = tail['close'].ewm(span=period, adjust=False).mean()
+    tail['rsi'] = RSIIndicator(tail['close'], window=_RSI_WINDOW).rsi()
+    tail['stoch_rsi'] = compute_stochrsi(tail['rsi'], period=stoch_period)
+    # Mêmes lignes que prepare_base_dataframe (l'ATR n'y produit jamais de NaN)
+    tail.dropna(subset=['close', 'rsi'], inplace=True)
+    return tail
+
 
 def detect_market_changes(
     pair: str,
     timeframes: List[str],
     start_date: str,
-    prepare_base_dataframe_fn: Callable[..., Optional[pd.DataFrame]],
+    prepare_base_dataframe_fn: Optional[Callable[..., Optional[pd.DataFrame]]] = None,
+    *,
+    fetch_data_fn: Optional[Callable[..., pd.DataFrame]] = None,
 ) -> Dict[str, Any]:
     """
     Détecte intelligemment les changements IMPORTANTS du marché.
@@ -39,12 +119,31 @@ def detect_market_changes(
     prepare_base_dataframe_fn : callable
         Function(pair, tf, start_date, stoch_period) -> DataFrame.
         Injected to avoid circular imports with MULTI_SYMBOLS.
+        Full-history path, used when ``fetch_data_fn`` is not given.
+    fetch_data_fn : callable, optional
+        Function(pair, tf, start_date) -> raw OHLCV DataFrame.  Enables the
+        tail-only path (``tail_indicator_frame``, PERF-16).
 
     Returns
     -------
     dict
         Keys: ema_crosses, stoch_extremes, trix_changes, price_records, execution_time.
+
+    Raises
+    ------
+    ValueError
+        If neither ``prepare_base_dataframe_fn`` nor ``fetch_data_fn`` is provided.
     """
+    if prepare_base_dataframe_fn is None and fetch_data_fn is None:
+        raise ValueError("prepare_base_dataframe_fn or fetch_data_fn must be provided")
+
+    def load_frame(tf: str) -> Optional[pd.DataFrame]:
+        if fetch_data_fn is not None:
+            return tail_indicator_frame(fetch_data_fn(pair, tf, start_date), 14)
+        if prepare_base_dataframe_fn is not None:
+            return prepare_base_dataframe_fn(pair, tf, start_date, 14)
+        return None
+
     changes: Dict[str, Any] = {
         'ema_crosses': [],
         'stoch_extremes': [],
@@ -56,7 +155,7 @@ def detect_market_changes(
     try:
         for tf in timeframes:
             try:
-                df = prepare_base_dataframe_fn(pair, tf, start_date, 14)
+                df = load_frame(tf)
                 if df is None or df.empty or len(df) < 50:
                     continue
 
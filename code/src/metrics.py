@@ -33,7 +33,30 @@ Format du fichier
             },
             ...
         },
-        "api_latency_ms": null
+        "api_latency_ms": null,
+        "stage_timings": {
+            "enabled": true,
+            "cycles": {
+                "scheduled_cycle": {
+                    "ended_at": "2026-04-06T10:02:41+00:00",
+                    "seconds": 161.2,
+                    "stages": {
+                        "scheduled_cycle/trading/backtests": {"count": 1, "total_s": 52.3, "max_s": 52.3},
+                        ...
+                    }
+                }
+            },
+            "totals": {...}
+        },
+        "scheduler": {
+            "foreground_active": 0,
+            "missed_deadlines": 0,
+            "jobs": {
+                "_dispatch_live_parallel": {"priority": "LIVE", "runs": 30, "missed_deadlines": 0,
+                                            "skipped": 0, "max_latency_s": 0.8, ...},
+                ...
+            }
+        }
     }
 """
 from __future__ import annotations
@@ -117,6 +140,8 @@ def write_metrics(
     circuit_breaker: Any = None,
     pairs: Optional[list] = None,
     api_latency_ms: Optional[float] = None,
+    stage_timings: Optional[Dict[str, Any]] = None,
+    scheduler: Optional[Dict[str, Any]] = None,
 ) -> bool:
     """Écrit un snapshot des métriques du bot dans ``metrics/metrics.json``.
 
@@ -135,6 +160,11 @@ def write_metrics(
         Si None, toutes les clés non-système de ``bot_state`` sont utilisées.
     api_latency_ms : float, optional
         Latence de la dernière requête API en millisecondes.
+    stage_timings : dict, optional
+        Durées des étapes des cycles (``spans.stage_timings()``, PERF-18).
+    scheduler : dict, optional
+        Échéances et retards des tâches planifiées
+        (``TaskScheduler.stats()``, PERF-20).
 
     Returns
     -------
@@ -183,6 +213,8 @@ def write_metrics(
             'circuit_breaker_available': cb_available,
             'pairs': pairs_snapshot,
             'api_latency_ms': api_latency_ms,
+            'stage_timings': stage_timings,
+            'scheduler': scheduler,
         }
 
         # --- Écriture atomique (write-then-rename) ---
@@ -0,0 +1,220 @@
+"""
+monte_carlo.py — Robustesse Monte Carlo vectorisée des résultats de backtest.
+
+Un backtest ne produit qu'un seul chemin : l'ordre des trades observé et un
+seul tirage du slippage stochastique (``BasicSlippageModel``, P2-02).  Ce
+module rééchantillonne le journal de trades structuré (``TRADE_LOG_DTYPE``)
+en milliers de chemins, dans une seule matrice numpy ``(n_paths, n_trades)`` :
+
+- bootstrap de l'ordre des aller-retours (tirage avec remise) ;
+- choc de slippage par trade (entrée + sortie, bornes du modèle P2-02) ;
+- choc de frais (multiplicateur aléatoire des frais réels du trade) ;
+- ordres non exécutés (trade remplacé par un rendement nul).
+
+Les rendements sont exprimés en fraction de l'equity avant chaque trade,
+puis recomposés par chemin : le coût est de l'ordre de la milliseconde au
+lieu de milliers de backtests supplémentaires.
+
+Public API
+----------
+- ``trade_returns``
+- ``run_monte_carlo``
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from trade_log import KIND_BUY, KIND_SELL
+
+logger = logging.getLogger(__name__)
+
+# Bornes du surcoût de slippage par exécution (identiques à BasicSlippageModel)
+DEFAULT_SLIPPAGE_RANGE = (0.0001, 0.0003)
+
+
+def trade_returns(trade_log: np.ndarray, initial_wallet: float) -> Dict[str, np.ndarray]:
+    """Rendements par aller-retour clôturé, relatifs à l'equity avant le trade.
+
+    Le P&L d'une vente (``KIND_SELL``) est net de l'aller-retour complet
+    (ventes partielles et frais compris) ; hors position tout le capital est
+    en USDC, donc l'equity avant le trade ``k`` vaut le capital initial plus
+    les P&L des ventes précédentes.
+
+    Parameters
+    ----------
+    trade_log : np.ndarray
+        Journal ``TRADE_LOG_DTYPE``.
+    initial_wallet : float
+        Capital au début du backtest (ou du fold).
+
+    Returns
+    -------
+    dict
+        ``returns`` (P&L / equity), ``exposure`` (notionnel d'entrée /
+        equity) et ``fees`` (frais de l'aller-retour / equity), un élément
+        par vente.
+    """
+    kind = trade_log['kind']
+    sells = np.flatnonzero(kind == KIND_SELL)
+    if len(sells) == 0 or initial_wallet <= 0:
+        empty = np.empty(0, dtype=np.float64)
+        return {'returns': empty, 'exposure': empty, 'fees': empty}
+
+    # Position de chaque événement : index de l'achat qui l'a ouverte (-1 avant le 1er achat)
+    position = np.cumsum(kind == KIND_BUY) - 1
+    buys = np.flatnonzero(kind == KIND_BUY)
+    sell_position = position[sells]
+
+    pnl = np.asarray(trade_log['pnl'][sells], dtype=np.float64)
+    equity_before = np.empty(len(pnl), dtype=np.float64)
+    equity_before[0] = initial_wallet
+    np.cumsum(pnl[:-1], out=equity_before[1:])
+    equity_before[1:] += initial_wallet
+
+    # Notionnel d'entrée : ligne d'achat de la position, à défaut la vente elle-même
+    notional = trade_log['qty'][sells] * trade_log['exit_price'][sells]
+    has_buy = sell_position >= 0
+    buy_rows = buys[sell_position[has_buy]]
+    notional[has_buy] = trade_log['qty'][buy_rows] * trade_log['entry_price'][buy_rows]
+
+    opened = position >= 0
+    fees_by_position = np.bincount(
+        position[opened], weights=trade_log['fees'][opened], minlength=len(buys),
+    )
+    fees = np.where(has_buy, fees_by_position[np.maximum(sell_position, 0)], trade_log['fees'][sells])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = pnl / equity_before
+        exposure = np.nan_to_num(notional / equity_before)
+        fee_frac = np.nan_to_num(fees / equity_before)
+    valid = np.isfinite(returns) & (equity_before > 0)
+    return {
+        'returns': returns[valid],
+        'exposure': exposure[valid],
+        'fees': fee_frac[valid],
+    }
+
+
+def _interval(values: np.ndarray, confidence: float) -> Dict[str, float]:
+    alpha = (1.0 - confidence) / 2.0
+    low, median, high = np.quantile(values, [alpha, 0.5, 1.0 - alpha])
+    return {
+        'low': round(float(low), 4),
+        'median': round(float(median), 4),
+        'high': round(float(high), 4),
+        'mean': round(float(values.mean()), 4),
+    }
+
+
+def run_monte_carlo(
+    trade_logs: Union[np.ndarray, Sequence[np.ndarray]],
+    initial_wallet: float = 10000.0,
+    n_paths: int = 1000,
+    confidence: float = 0.90,
+    slippage_range: Tuple[float, float] = DEFAULT_SLIPPAGE_RANGE,
+    fee_shock: float = 0.5,
+    skip_prob: float = 0.05,
+    n_bars_total: Optional[int] = None,
+    periods_per_year: Optional[int] = None,
+    risk_free_rate: float = 0.0,
+    max_drawdown_limit: float = 1.0,
+    seed: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    """Intervalles de confiance Monte Carlo sur rendement, drawdown et Sharpe.
+
+    Parameters
+    ----------
+    trade_logs : np.ndarray or sequence of np.ndarray
+        Journal ``TRADE_LOG_DTYPE``, ou un journal par fold (chacun démarrant
+        à ``initial_wallet``) dont les aller-retours sont mis en commun.
+    initial_wallet : float
+        Capital initial de chaque journal.
+    n_paths : int
+        Nombre de chemins simulés.
+    confidence : float
+        Niveau des intervalles (0.90 → percentiles 5 / 95).
+    slippage_range : tuple of float
+        Surcoût de slippage uniforme par exécution (fraction du notionnel),
+        appliqué à l'entrée et à la sortie.
+    fee_shock : float
+        Majoration maximale des frais réels du trade (0.5 → jusqu'à +50 %).
+    skip_prob : float
+        Probabilité qu'un ordre ne soit pas exécuté (rendement nul).
+    n_bars_total, periods_per_year : int, optional
+        Durée couverte par les journaux ; annualise le Sharpe au nombre de
+        trades par an (comme ``compute_risk_metrics``).  Sans ces valeurs le
+        Sharpe est exprimé par trade.
+    risk_free_rate : float
+        Taux sans risque annuel (ignoré sans annualisation).
+    max_drawdown_limit : float
+        Drawdown maximal toléré pour qu'un chemin compte comme robuste.
+    seed : int, optional
+        Graine du générateur (résultats reproductibles).
+
+    Returns
+    -------
+    dict or None
+        ``total_return_pct``, ``max_drawdown`` et ``sharpe_ratio`` (chacun
+        ``{'low', 'median', 'high', 'mean'}``), ``prob_profit``,
+        ``robustness_score`` (part des chemins rentables sous
+        ``max_drawdown_limit``), ``n_paths``, ``n_trades`` ; None si moins de
+        deux aller-retours clôturés.
+    """
+    if isinstance(trade_logs, np.ndarray):
+        trade_logs = [trade_logs]
+    parts = [trade_returns(log, initial_wallet) for log in trade_logs]
+    returns = np.concatenate([p['returns'] for p in parts]) if parts else np.empty(0)
+    n_trades = len(returns)
+    if n_trades < 2 or n_paths < 1:
+        return None
+    exposure = np.concatenate([p['exposure'] for p in parts])
+    fees = np.concatenate([p['fees'] for p in parts])
+
+    rng = np.random.default_rng(seed)
+    shape = (n_paths, n_trades)
+    picks = rng.integers(0, n_trades, size=shape)
+    paths = returns[picks]
+    slip_min, slip_max = slippage_range
+    if slip_max > 0:
+        # Entrée + sortie : deux exécutions par aller-retour
+        paths -= 2.0 * exposure[picks] * rng.uniform(slip_min, slip_max, size=shape)
+    if fee_shock > 0:
+        paths -= fees[picks] * rng.uniform(0.0, fee_shock, size=shape)
+    if skip_prob > 0:
+        paths[rng.random(size=shape) < skip_prob] = 0.0
+    np.maximum(paths, -1.0, out=paths)
+
+    growth = np.cumprod(1.0 + paths, axis=1)
+    total_return = growth[:, -1] - 1.0
+    peak = np.maximum(np.maximum.accumulate(growth, axis=1), 1.0)
+    max_dd = ((peak - growth) / peak).max(axis=1)
+
+    # Sharpe au niveau trade, annualisé au nombre de trades par an
+    trades_per_year = 1.0
+    rf_per_trade = 0.0
+    if n_bars_total and periods_per_year:
+        years = max(n_bars_total / periods_per_year, 1e-6)
+        trades_per_year = max(n_trades / years, 1.0)
+        rf_per_trade = (1.0 + risk_free_rate) ** (1.0 / trades_per_year) - 1.0
+    excess = paths - rf_per_trade
+    std = excess.std(axis=1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(
+            std > 1e-12, excess.mean(axis=1) / std * np.sqrt(trades_per_year), 0.0,
+        )
+
+    profitable = total_return > 0
+    return {
+        'n_paths': int(n_paths),
+        'n_trades': int(n_trades),
+        'confidence': confidence,
+        'total_return_pct': _interval(total_return * 100.0, confidence),
+        'max_drawdown': _interval(max_dd, confidence),
+        'sharpe_ratio': _interval(sharpe, confidence),
+        'prob_profit': round(float(profitable.mean()), 4),
+        'robustness_score': round(float((profitable & (max_dd <= max_drawdown_limit)).mean()), 4),
+    }
@@ -0,0 +1,588 @@
+"""
+portfolio_backtest.py — Backtest multi-paires sur une timeline unifiée.
+
+``backtest_from_dataframe`` simule chaque paire avec son propre capital.  En
+live, toutes les paires partagent un seul solde USDC et le garde
+``max_concurrent_long`` (ST-P1-01) bloque les achats au-delà de N positions
+longues simultanées : les backtests par paire surestiment donc la capacité
+et ne mesurent pas la contention du capital.
+
+Ce module (PERF-14) avance toutes les paires bar par bar sur l'union de leurs index :
+
+- cash partagé ; le capital de sizing d'une entrée est le cash divisé par
+  le nombre de places encore libres sous ``max_concurrent_long`` ;
+- sizing par paire selon les formules de ``position_sizing`` (``risk``,
+  ``fixed_notional``, ``volatility_parity`` ; ``baseline`` = coussin du
+  cash), plafonné au cash disponible ;
+- même machine à états par position que ``backtest_kernel`` (stop ATR,
+  trailing, break-even, partiels, cooldown, filtres SMA / ADX / TRIX /
+  volume / MTF) ;
+- sorties d'abord, puis entrées dans l'ordre de priorité des paires
+  (départage déterministe des signaux simultanés) ; les signaux refusés
+  faute de place sont comptés (``blocked_signals``).
+
+La boucle est compilée avec numba (``njit``, cache disque) si le paquet est
+installé ; sinon elle s'exécute en Python pur avec les mêmes résultats.
+
+Public API
+----------
+- ``SIZING_MODES``
+- ``prepare_pair_arrays``
+- ``run_portfolio_backtest``
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest_inputs import backtest_inputs
+from backtest_kernel import NUMBA_AVAILABLE, SIZING_MODES
+from backtest_runner import _engine_arrays
+from bot_config import config
+from trade_log import (
+    KIND_BUY, KIND_PARTIAL_1, KIND_PARTIAL_2, KIND_SELL,
+    REASON_NONE, REASON_SIGNAL, REASON_STOP_LOSS, REASON_TAKE_PROFIT, REASON_TRAILING_STOP,
+    TRADE_LOG_DTYPE,
+)
+
+if NUMBA_AVAILABLE:
+    from numba import njit
+
+logger = logging.getLogger(__name__)
+
+# Colonnes des tableaux d'entrée (une ligne par paire)
+_INPUT_COLUMNS: Tuple[str, ...] = (
+    'close', 'open', 'ema1', 'ema2', 'stoch_rsi', 'atr', 'sma_long', 'adx', 'TRIX_HISTO',
+    'volume', 'vol_sma', 'mtf_bullish',
+)
+(_I_CLOSE, _I_OPEN, _I_EMA1, _I_EMA2, _I_STOCH, _I_ATR, _I_SMA, _I_ADX, _I_TRIX,
+ _I_VOLUME, _I_VOL_SMA, _I_MTF) = range(len(_INPUT_COLUMNS))
+
+# État par paire (vecteur float64)
+(_S_COIN, _S_IN_POS, _S_ENTRY_BAR, _S_ENTRY_PRICE, _S_ENTRY_COST, _S_PROCEEDS,
+ _S_MAX_PRICE, _S_TRAILING, _S_STOP_LOSS, _S_TRAIL_ON, _S_TRAIL_ACT_PRICE, _S_PARTIAL_1,
+ _S_PARTIAL_2, _S_ATR_ENTRY, _S_BREAKEVEN, _S_COOLDOWN, _S_LAST_CLOSE, _S_TOTAL, _S_WINS,
+ _S_BLOCKED, _N_STATE) = range(21)
+
+# Paramètres par paire
+(_Q_BUY_MAX, _Q_BUY_MIN, _Q_SELL_EXIT, _Q_SIZING, _Q_USE_SMA, _Q_USE_ADX, _Q_USE_TRIX,
+ _Q_USE_VOL, _Q_USE_MTF, _Q_HAS_OPEN, _N_PAIR_PARAMS) = range(11)
+
+# Paramètres globaux
+(_G_FEE, _G_SLIP_BUY, _G_SLIP_SELL, _G_ATR_MULT, _G_ATR_STOP_MULT, _G_ADX_THRESHOLD,
+ _G_RISK_PER_TRADE, _G_PARTIAL_ON, _G_PARTIAL_TH_1, _G_PARTIAL_TH_2, _G_PARTIAL_PCT_1,
+ _G_PARTIAL_PCT_2, _G_MIN_NOTIONAL, _G_BE_ON, _G_BE_TRIGGER, _G_COOLDOWN, _G_CUSHION,
+ _G_TARGET_VOL, _G_MAX_CONCURRENT, _G_INITIAL_WALLET, _N_GLOBAL_PARAMS) = range(21)
+
+# Compteurs renvoyés par le noyau
+(_C_ROWS, _C_MAX_OPEN, _C_CASH, _C_MAX_DD, _N_COUNTERS) = range(5)
+
+# Champs du journal de trades, dans l'ordre des colonnes du journal du noyau
+_LOG_FIELDS: Tuple[str, ...] = TRADE_LOG_DTYPE.names or ()
+_LOG_COLUMNS = len(_LOG_FIELDS) + 1  # + index de la paire
+
+
+def _push(
+    log: np.ndarray, row: int, pair: int, entry_bar: float, exit_bar: float, kind: int,
+    reason: int, entry_price: float, exit_price: float, qty: float, pnl: float, fees: float,
+) -> np.ndarray:
+    """Écrit la ligne ``row`` (colonnes TRADE_LOG_DTYPE + paire) ; agrandit si plein."""
+    if row >= log.shape[0]:
+        grown = np.empty((2 * log.shape[0] + 16, log.shape[1]), dtype=np.float64)
+        grown[:row] = log[:row]
+        log = grown
+    log[row, 0] = entry_bar
+    log[row, 1] = exit_bar
+    log[row, 2] = kind
+    log[row, 3] = reason
+    log[row, 4] = entry_price
+    log[row, 5] = exit_price
+    log[row, 6] = qty
+    log[row, 7] = pnl
+    log[row, 8] = fees
+    log[row, 9] = pair
+    return log
+
+
+def _entry_qty(
+    sizing: int, capital: float, price: float, atr: float, g: np.ndarray,
+) -> float:
+    """Quantité brute achetée — formules de ``position_sizing``, plafond coussin × capital."""
+    affordable = (capital * g[_G_CUSHION]) / price
+    if sizing == 1:  # risk
+        stop_distance = g[_G_ATR_STOP_MULT] * atr
+        if stop_distance > 0:
+            return min(affordable, capital * g[_G_RISK_PER_TRADE] / stop_distance)
+        return affordable
+    if sizing == 2:  # fixed_notional (défaut : 10 % du capital, 100 USDC minimum)
+        return min(affordable, max(100.0, capital * 0.1) / price)
+    if sizing == 3:  # volatility_parity
+        return min(affordable, capital * g[_G_TARGET_VOL] / (atr * price))
+    return affordable
+
+
+def _buy_signal(
+    x: np.ndarray, k: int, i: int, q: np.ndarray, g: np.ndarray, s: np.ndarray, cash: float,
+) -> bool:
+    """Condition d'achat de ``backtest_kernel`` pour la paire ``k`` au bar ``i``."""
+    stoch = x[_I_STOCH, k, i]
+    if not (x[_I_EMA1, k, i] > x[_I_EMA2, k, i] and q[_Q_BUY_MIN] < stoch < q[_Q_BUY_MAX]):
+        return False
+    if cash <= 0 or s[_S_COOLDOWN] > 0:
+        return False
+    if q[_Q_USE_SMA] > 0 and not x[_I_CLOSE, k, i] > x[_I_SMA, k, i]:
+        return False
+    if q[_Q_USE_ADX] > 0 and not x[_I_ADX, k, i] > g[_G_ADX_THRESHOLD]:
+        return False
+    if q[_Q_USE_TRIX] > 0 and not x[_I_TRIX, k, i] > 0:
+        return False
+    if q[_Q_USE_VOL] > 0:
+        volume = x[_I_VOLUME, k, i]
+        vol_sma = x[_I_VOL_SMA, k, i]
+        if math.isnan(volume) or math.isnan(vol_sma) or vol_sma <= 0 or not volume > vol_sma:
+            return False
+    if q[_Q_USE_MTF] > 0 and not x[_I_MTF, k, i] > 0.5:
+        return False
+    atr = x[_I_ATR, k, i]
+    return not (math.isnan(atr) or atr <= 0)
+
+
+def _run_portfolio(
+    x: np.ndarray, valid: np.ndarray, order: np.ndarray, pair_params: np.ndarray,
+    g: np.ndarray, s: np.ndarray, equity_curve: np.ndarray, log: np.ndarray,
+    counters: np.ndarray,
+) -> np.ndarray:
+    """Boucle sur la timeline unifiée ; renvoie le journal (éventuellement agrandi).
+
+    ``x`` : ``(len(_INPUT_COLUMNS), n_pairs, n_bars)`` ; ``valid[k, i]`` :
+    la paire ``k`` a une bougie au bar ``i``.  ``s`` (état par paire) est mis
+    à jour en place ; ``equity_curve[i]`` reçoit l'equity de fin de bar.
+    """
+    n_pairs = x.shape[1]
+    n = x.shape[2]
+    fee_rate = g[_G_FEE]
+    max_open = int(g[_G_MAX_CONCURRENT])
+    cooldown_candles = int(g[_G_COOLDOWN])
+    cash = g[_G_INITIAL_WALLET]
+    peak = cash
+    max_dd = 0.0
+    rows = 0
+    n_open = 0
+    exited = np.zeros(n_pairs, dtype=np.bool_)
+    for i in range(n):
+        # === EQUITY DE DÉBUT DE BAR (positions marquées au dernier close connu) ===
+        wallet = cash
+        for k in range(n_pairs):
+            if valid[k, i]:
+                s[k, _S_LAST_CLOSE] = x[_I_CLOSE, k, i]
+            if s[k, _S_IN_POS] > 0:
+                wallet += s[k, _S_COIN] * s[k, _S_LAST_CLOSE]
+        if wallet > peak:
+            peak = wallet
+        bar_dd = (peak - wallet) / peak if peak > 0 else 0.0
+        if bar_dd > max_dd:
+            max_dd = bar_dd
+
+        # === GESTION DES POSITIONS OUVERTES (sorties avant entrées) ===
+        any_exit = False
+        for j in range(n_pairs):
+            k = order[j]
+            exited[k] = False
+            st = s[k]
+            if not valid[k, i] or st[_S_IN_POS] == 0:
+                continue
+            q = pair_params[k]
+            row_close = x[_I_CLOSE, k, i]
+            trailing_distance = g[_G_ATR_MULT] * st[_S_ATR_ENTRY]
+            if row_close > st[_S_MAX_PRICE]:
+                st[_S_MAX_PRICE] = row_close
+            if st[_S_TRAIL_ON] == 0 and row_close >= st[_S_TRAIL_ACT_PRICE]:
+                st[_S_TRAIL_ON] = 1.0
+                st[_S_TRAILING] = st[_S_MAX_PRICE] - trailing_distance
+            if st[_S_TRAIL_ON] > 0:
+                new_trailing = st[_S_MAX_PRICE] - trailing_distance
+                if new_trailing > st[_S_TRAILING]:
+                    st[_S_TRAILING] = new_trailing
+
+            # B-3: Break-even stop
+            if g[_G_BE_ON] > 0 and st[_S_BREAKEVEN] == 0 and st[_S_ENTRY_PRICE] > 0:
+                be_profit = (row_close - st[_S_ENTRY_PRICE]) / st[_S_ENTRY_PRICE]
+                if be_profit >= g[_G_BE_TRIGGER]:
+                    be_new_stop = st[_S_ENTRY_PRICE] * (1 + g[_G_SLIP_BUY])
+                    if be_new_stop > st[_S_STOP_LOSS]:
+                        st[_S_STOP_LOSS] = be_new_stop
+                    st[_S_BREAKEVEN] = 1.0
+
+            # Partial profit taking (P2-01) — position >= 3× min_notional
+            if g[_G_PARTIAL_ON] > 0:
+                min_notional = g[_G_MIN_NOTIONAL]
+                partial_ok = st[_S_COIN] * row_close >= min_notional * 3
+                if st[_S_COIN] > 0 and st[_S_ENTRY_PRICE] > 0 and partial_ok:
+                    entry_price = st[_S_ENTRY_PRICE]
+                    profit_pct = (row_close - entry_price) / entry_price
+                    if st[_S_PARTIAL_1] == 0 and profit_pct >= g[_G_PARTIAL_TH_1]:
+                        qty = st[_S_COIN] * g[_G_PARTIAL_PCT_1]
+                        if qty * row_close >= min_notional:
+                            proceeds = qty * row_close * (1 - fee_rate)
+                            cash += proceeds
+                            st[_S_PROCEEDS] += proceeds
+                            st[_S_COIN] -= qty
+                            log = _push(
+                                log, rows, k, st[_S_ENTRY_BAR], i, KIND_PARTIAL_1,
+                                REASON_TAKE_PROFIT, entry_price, row_close, qty,
+                                proceeds - qty * entry_price, qty * row_close * fee_rate,
+                            )
+                            rows += 1
+                        st[_S_PARTIAL_1] = 1.0
+                    if (
+                        st[_S_PARTIAL_2] == 0
+                        and profit_pct >= g[_G_PARTIAL_TH_2]
+                        and st[_S_COIN] > 0
+                    ):
+                        qty = st[_S_COIN] * g[_G_PARTIAL_PCT_2]
+                        if qty * row_close >= min_notional:
+                            proceeds = qty * row_close * (1 - fee_rate)
+                            cash += proceeds
+                            st[_S_PROCEEDS] += proceeds
+                            st[_S_COIN] -= qty
+                            log = _push(
+                                log, rows, k, st[_S_ENTRY_BAR], i, KIND_PARTIAL_2,
+                                REASON_TAKE_PROFIT, entry_price, row_close, qty,
+                                proceeds - qty * entry_price, qty * row_close * fee_rate,
+                            )
+                            rows += 1
+                        st[_S_PARTIAL_2] = 1.0
+
+            # Exit conditions
+            reason = REASON_NONE
+            if row_close <= st[_S_STOP_LOSS]:
+                reason = REASON_STOP_LOSS
+            elif st[_S_TRAIL_ON] > 0 and row_close <= st[_S_TRAILING]:
+                reason = REASON_TRAILING_STOP
+            elif x[_I_EMA2, k, i] > x[_I_EMA1, k, i] and x[_I_STOCH, k, i] > q[_Q_SELL_EXIT]:
+                reason = REASON_SIGNAL
+            if reason == REASON_NONE:
+                continue
+
+            if q[_Q_HAS_OPEN] > 0 and i + 1 < n and valid[k, i + 1]:
+                exit_price = x[_I_OPEN, k, i + 1] * (1 - g[_G_SLIP_SELL])
+            else:
+                exit_price = row_close * (1 - g[_G_SLIP_SELL])
+            sold_qty = st[_S_COIN]
+            gross_proceeds = sold_qty * exit_price
+            fee = gross_proceeds * fee_rate
+            cash += gross_proceeds - fee
+            trade_profit = st[_S_PROCEEDS] + (gross_proceeds - fee) - st[_S_ENTRY_COST]
+            if trade_profit > 0:
+                st[_S_WINS] += 1
+            st[_S_TOTAL] += 1
+            log = _push(
+                log, rows, k, st[_S_ENTRY_BAR], i, KIND_SELL, reason, st[_S_ENTRY_PRICE],
+                exit_price, sold_qty, trade_profit, fee,
+            )
+            rows += 1
+            st[_S_COIN] = 0.0
+            st[_S_IN_POS] = 0.0
+            st[_S_ENTRY_PRICE] = 0.0
+            st[_S_ENTRY_COST] = 0.0
+            st[_S_PROCEEDS] = 0.0
+            st[_S_MAX_PRICE] = 0.0
+            st[_S_TRAILING] = 0.0
+            st[_S_TRAIL_ON] = 0.0
+            st[_S_BREAKEVEN] = 0.0
+            # A-3: cooldown après un stop-loss
+            if reason == REASON_STOP_LOSS and cooldown_candles > 0:
+                st[_S_COOLDOWN] = cooldown_candles
+            exited[k] = True
+            any_exit = True
+            n_open -= 1
+
+        # Sortie à open[i+1] : correction du drawdown si gap baissier
+        if any_exit:
+            post_exit_wallet = cash
+            for k in range(n_pairs):
+                if s[k, _S_IN_POS] > 0:
+                    post_exit_wallet += s[k, _S_COIN] * s[k, _S_LAST_CLOSE]
+            post_exit_dd = (peak - post_exit_wallet) / peak if peak > 0 else 0.0
+            if post_exit_dd > max_dd:
+                max_dd = post_exit_dd
+
+        # === ENTRÉES (ordre de priorité, ST-P1-01 : max_concurrent_long) ===
+        for j in range(n_pairs):
+            k = order[j]
+            st = s[k]
+            if not valid[k, i] or exited[k] or st[_S_IN_POS] > 0:
+                continue
+            # A-3: cooldown decrement when not in position
+            if st[_S_COOLDOWN] > 0:
+                st[_S_COOLDOWN] -= 1
+            q = pair_params[k]
+            if not _buy_signal(x, k, i, q, g, st, cash):
+                continue
+            if n_open >= max_open:
+                st[_S_BLOCKED] += 1
+                continue
+
+            row_close = x[_I_CLOSE, k, i]
+            row_atr = x[_I_ATR, k, i]
+            if q[_Q_HAS_OPEN] > 0 and i + 1 < n and valid[k, i + 1]:
+                price = x[_I_OPEN, k, i + 1] * (1 + g[_G_SLIP_BUY])
+            else:
+                price = row_close * (1 + g[_G_SLIP_BUY])
+            if price <= 0:
+                continue
+            # Cash partagé : réparti entre les places encore libres
+            capital = cash / (max_open - n_open)
+            gross_coin = _entry_qty(int(q[_Q_SIZING]), capital, price, row_atr, g)
+            if gross_coin <= 0:
+                continue
+            fee_in_coin = gross_coin * fee_rate
+            actual_cost = gross_coin * price
+            if actual_cost > cash:
+                actual_cost = cash
+            cash -= actual_cost
+            st[_S_COIN] = gross_coin - fee_in_coin
+            st[_S_ENTRY_COST] = actual_cost
+            st[_S_PROCEEDS] = 0.0
+            st[_S_ENTRY_PRICE] = price
+            st[_S_MAX_PRICE] = price
+            st[_S_ATR_ENTRY] = row_atr
+            st[_S_STOP_LOSS] = price - g[_G_ATR_STOP_MULT] * row_atr
+            st[_S_TRAIL_ACT_PRICE] = price + g[_G_ATR_MULT] * row_atr
+            st[_S_TRAILING] = 0.0
+            st[_S_TRAIL_ON] = 0.0
+            st[_S_PARTIAL_1] = 0.0
+            st[_S_PARTIAL_2] = 0.0
+            st[_S_BREAKEVEN] = 0.0
+            log = _push(
+                log, rows, k, i, -1, KIND_BUY, REASON_NONE, price, math.nan,
+                st[_S_COIN], 0.0, fee_in_coin * price,
+            )
+            rows += 1
+            st[_S_ENTRY_BAR] = i
+            st[_S_IN_POS] = 1.0
+            n_open += 1
+            if n_open > counters[_C_MAX_OPEN]:
+                counters[_C_MAX_OPEN] = n_open
+
+        # === EQUITY DE FIN DE BAR ===
+        equity = cash
+        for k in range(n_pairs):
+            if s[k, _S_IN_POS] > 0:
+                equity += s[k, _S_COIN] * s[k, _S_LAST_CLOSE]
+        equity_curve[i] = equity
+
+    counters[_C_ROWS] = rows
+    counters[_C_CASH] = cash
+    counters[_C_MAX_DD] = max_dd
+    return log
+
+
+if NUMBA_AVAILABLE:
+    _push = njit(cache=True, nogil=True)(_push)
+    _entry_qty = njit(cache=True, nogil=True)(_entry_qty)
+    _buy_signal = njit(cache=True, nogil=True)(_buy_signal)
+    _run_portfolio = njit(cache=True, nogil=True)(_run_portfolio)
+
+
+def prepare_pair_arrays(df: pd.DataFrame, params: Mapping[str, Any]) -> pd.DataFrame:
+    """Indicateurs d'une paire, calculés comme pour ``backtest_from_dataframe``.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        OHLCV + ``stoch_rsi`` / ``atr`` (colonnes ``ema_{period}`` calculées
+        si absentes).
+    params : mapping
+        Paramètres au format ``best_params`` : ``ema1_period``,
+        ``ema2_period`` et optionnellement ``sma_long``, ``adx_period``,
+        ``trix_length``, ``trix_signal``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Une colonne par entrée du noyau (``_INPUT_COLUMNS``), NaN pour les
+        filtres inactifs, indexée comme ``df``.
+    """
+    # PERF-24: mêmes tableaux que backtest_from_dataframe (df non modifié)
+    arrays = _engine_arrays(
+        backtest_inputs(df), 0, len(df),
+        int(params['ema1_period']), int(params['ema2_period']),
+        params.get('sma_long'), params.get('adx_period'),
+        params.get('trix_length'), params.get('trix_signal'),
+    )
+    out = pd.DataFrame(index=df.index)
+    for name in _INPUT_COLUMNS:
+        values = arrays['trix_histo' if name == 'TRIX_HISTO' else name]
+        out[name] = np.array(values, dtype=np.float64) if values is not None else np.nan
+    return out
+
+
+def _log_from_rows(rows: np.ndarray) -> np.ndarray:
+    out = np.empty(len(rows), dtype=TRADE_LOG_DTYPE)
+    for col, name in enumerate(_LOG_FIELDS):
+        out[name] = rows[:, col]
+    return out
+
+
+def run_portfolio_backtest(
+    pair_frames: Mapping[str, pd.DataFrame],
+    pair_params: Mapping[str, Mapping[str, Any]],
+    max_concurrent_long: Optional[int] = None,
+    initial_wallet: Optional[float] = None,
+    priority: Optional[Sequence[str]] = None,
+    sizing_mode: str = 'risk',
+    periods_per_year: int = 8766,
+) -> Dict[str, Any]:
+    """Backtest de portefeuille : cash partagé et garde ``max_concurrent_long``.
+
+    Parameters
+    ----------
+    pair_frames : mapping
+        ``{pair: DataFrame}`` (même timeframe ; OHLCV + ``stoch_rsi`` /
+        ``atr``).  Les index sont alignés sur leur union ; une paire sans
+        bougie à un bar n'y agit pas (sa position reste marquée au dernier
+        close connu).
+    pair_params : mapping
+        ``{pair: best_params}`` (``prepare_pair_arrays``) ; clés optionnelles
+        ``stoch_buy_min`` / ``stoch_buy_max`` / ``stoch_sell_exit`` (défaut
+        config) et ``sizing_mode``.
+    max_concurrent_long : int, optional
+        Positions longues simultanées maximales (défaut
+        ``config.max_concurrent_long``).
+    initial_wallet : float, optional
+        Capital USDC partagé (défaut ``config.initial_wallet``).
+    priority : sequence of str, optional
+        Ordre de départage des signaux d'achat d'un même bar (premier =
+        servi en premier) ; défaut : paires triées par nom.
+    sizing_mode : str
+        Mode de sizing des paires sans ``sizing_mode`` propre.
+    periods_per_year : int
+        Nombre de bars par an (métriques risk-adjusted).
+
+    Returns
+    -------
+    dict
+        ``final_wallet``, ``equity_curve`` (fin de bar, ``pd.Series`` sur la
+        timeline unifiée), ``trade_logs`` (``{pair: TRADE_LOG_DTYPE}``, bars
+        de la timeline), ``total_trades``, ``winning_trades``, ``win_rate``,
+        ``max_drawdown``, ``max_open_positions``, ``blocked_signals``
+        (``{pair: achats refusés faute de place}``) + métriques
+        ``compute_bar_risk_metrics``.
+    """
+    pairs = sorted(pair_frames)
+    if not pairs:
+        raise ValueError("run_portfolio_backtest: aucune paire")
+    unknown = [p for p in pairs if p not in pair_params]
+    if unknown:
+        raise ValueError(f"run_portfolio_backtest: paramètres absents pour {unknown}")
+    if priority is not None:
+        ranked = [p for p in priority if p in pair_frames]
+        ranked += [p for p in pairs if p not in ranked]
+    else:
+        ranked = pairs
+    if max_concurrent_long is None:
+        max_concurrent_long = int(config.max_concurrent_long)
+    if max_concurrent_long < 1:
+        raise ValueError(f"max_concurrent_long={max_concurrent_long} doit être >= 1")
+    if initial_wallet is None:
+        initial_wallet = float(config.initial_wallet)
+
+    # Timeline unifiée : union des index, une ligne par paire
+    prepared = [prepare_pair_arrays(pair_frames[p], pair_params[p]) for p in pairs]
+    timeline = prepared[0].index
+    for frame in prepared[1:]:
+        timeline = timeline.union(frame.index)
+    n = len(timeline)
+    x = np.full((len(_INPUT_COLUMNS), len(pairs), n), np.nan, dtype=np.float64)
+    valid = np.zeros((len(pairs), n), dtype=np.bool_)
+    for k, frame in enumerate(prepared):
+        positions = timeline.get_indexer(frame.index)
+        x[:, k, positions] = frame[list(_INPUT_COLUMNS)].to_numpy(dtype=np.float64).T
+        valid[k, positions] = np.isfinite(x[_I_CLOSE, k, positions])
+
+    q = np.zeros((len(pairs), _N_PAIR_PARAMS), dtype=np.float64)
+    for k, pair in enumerate(pairs):
+        params = pair_params[pair]
+        mode = params.get('sizing_mode', sizing_mode)
+        if mode not in SIZING_MODES:
+            raise ValueError(f"sizing_mode='{mode}' inconnu pour {pair}")
+        q[k, _Q_BUY_MAX] = params.get('stoch_buy_max', config.stoch_rsi_buy_max)
+        q[k, _Q_BUY_MIN] = params.get('stoch_buy_min', config.stoch_rsi_buy_min)
+        q[k, _Q_SELL_EXIT] = params.get('stoch_sell_exit', config.stoch_rsi_sell_exit)
+        q[k, _Q_SIZING] = SIZING_MODES[mode]
+        q[k, _Q_USE_SMA] = bool(params.get('sma_long'))
+        q[k, _Q_USE_ADX] = bool(params.get('adx_period'))
+        q[k, _Q_USE_TRIX] = bool(params.get('trix_length') and params.get('trix_signal'))
+        q[k, _Q_USE_VOL] = bool(np.isfinite(x[_I_VOLUME, k]).any())
+        q[k, _Q_USE_MTF] = bool(np.isfinite(x[_I_MTF, k]).any())
+        q[k, _Q_HAS_OPEN] = bool(np.isfinite(x[_I_OPEN, k]).any())
+
+    g = np.zeros(_N_GLOBAL_PARAMS, dtype=np.float64)
+    g[_G_FEE] = config.backtest_taker_fee
+    g[_G_SLIP_BUY] = config.slippage_buy
+    g[_G_SLIP_SELL] = config.slippage_sell
+    g[_G_ATR_MULT] = config.atr_multiplier
+    g[_G_ATR_STOP_MULT] = config.atr_stop_multiplier
+    g[_G_ADX_THRESHOLD] = config.adx_threshold
+    g[_G_RISK_PER_TRADE] = config.risk_per_trade
+    g[_G_PARTIAL_ON] = True
+    g[_G_PARTIAL_TH_1] = config.partial_threshold_1
+    g[_G_PARTIAL_TH_2] = config.partial_threshold_2
+    g[_G_PARTIAL_PCT_1] = config.partial_pct_1
+    g[_G_PARTIAL_PCT_2] = config.partial_pct_2
+    g[_G_MIN_NOTIONAL] = getattr(config, 'backtest_min_notional', 5.0)
+    g[_G_BE_ON] = getattr(config, 'breakeven_enabled', True)
+    g[_G_BE_TRIGGER] = getattr(config, 'breakeven_trigger_pct', 0.015)
+    g[_G_COOLDOWN] = getattr(config, 'stop_loss_cooldown_candles', 0)
+    g[_G_CUSHION] = getattr(config, 'position_size_cushion', 0.98)
+    g[_G_TARGET_VOL] = getattr(config, 'target_volatility_pct', 0.02)
+    g[_G_MAX_CONCURRENT] = max_concurrent_long
+    g[_G_INITIAL_WALLET] = initial_wallet
+
+    s = np.zeros((len(pairs), _N_STATE), dtype=np.float64)
+    s[:, _S_ENTRY_BAR] = -1
+    s[:, _S_LAST_CLOSE] = np.nan
+    order = np.array([pairs.index(p) for p in ranked], dtype=np.int64)
+    equity = np.empty(n, dtype=np.float64)
+    counters = np.zeros(_N_COUNTERS, dtype=np.float64)
+    log = np.empty((4 * len(pairs) + 64, _LOG_COLUMNS), dtype=np.float64)
+
+    log = _run_portfolio(x, valid, order, q, g, s, equity, log, counters)
+
+    rows = log[:int(counters[_C_ROWS])]
+    trade_logs = {
+        pair: _log_from_rows(rows[rows[:, -1] == k]) for k, pair in enumerate(pairs)
+    }
+    total_trades = int(s[:, _S_TOTAL].sum())
+    winning_trades = int(s[:, _S_WINS].sum())
+    final_wallet = float(equity[-1]) if n else float(initial_wallet)
+
+    from walk_forward import compute_bar_risk_metrics
+    result: Dict[str, Any] = compute_bar_risk_metrics(
+        equity, periods_per_year=periods_per_year,
+        risk_free_rate=config.risk_free_rate, initial_equity=initial_wallet,
+    )
+    result.update({
+        'final_wallet': final_wallet,
+        'equity_curve': pd.Series(equity, index=timeline),
+        'trade_logs': trade_logs,
+        'total_trades': total_trades,
+        'winning_trades': winning_trades,
+        'win_rate': (winning_trades / total_trades * 100) if total_trades > 0 else 0.0,
+        'max_drawdown': max(float(counters[_C_MAX_DD]), result.get('max_drawdown', 0.0)),
+        'max_open_positions': int(counters[_C_MAX_OPEN]),
+        'blocked_signals': {pair: int(s[k, _S_BLOCKED]) for k, pair in enumerate(pairs)},
+    })
+    _blocked = sum(result['blocked_signals'].values())
+    logger.info(
+        "[PORTFOLIO] %d paires × %d bars, max %d positions : %d trades, %d achats bloqués, "
+        "wallet final %.2f",
+        len(pairs), n, max_concurrent_long, total_trades, _blocked, final_wallet,
+    )
+    return result
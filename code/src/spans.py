@@ -0,0 +1,313 @@
+"""
+spans.py — Chronométrage hiérarchique des étapes des cycles horaire et live.
+
+Les logs indiquent qu'un cycle horaire a duré plusieurs minutes sans dire
+où : chargement des données, préparation, backtests, grille StochRSI,
+Optuna, walk-forward ou appels à l'exchange.  Ce module fournit des
+*spans* légers :
+
+- ``span(name)`` : context manager, chronomètre un bloc ;
+- ``timed(name)`` : décorateur équivalent pour une fonction ;
+- ``cycle_span(name)`` : span racine d'un cycle (context manager ou
+  décorateur) ; à sa sortie, le résumé du cycle est journalisé et conservé
+  pour ``metrics.write_metrics``.
+
+Les spans s'imbriquent par thread (pile ``threading.local``) : le chemin
+d'un span est celui de son parent suivi de son nom (``scheduled_cycle/
+backtests/fetch``).  Un span ouvert dans un worker d'un pool, sans parent
+dans son thread, est rattaché au cycle racine actif s'il est unique ; les
+cycles live et horaire pouvant se chevaucher (``task_scheduler``),
+``bind(fn)`` propage explicitement le chemin courant vers un worker.
+
+Désactivé (``config.span_timing_enabled=False``), ``span`` rend un objet
+partagé sans état et ``timed`` appelle directement la fonction : le coût
+se limite à un test de booléen.
+
+Public API
+----------
+- ``span``
+- ``timed``
+- ``cycle_span``
+- ``bind``
+- ``stage_timings``
+- ``set_enabled``
+- ``reset``
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from bot_config import config
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+_enabled: bool = bool(getattr(config, 'span_timing_enabled', True))
+_lock = threading.Lock()
+_local = threading.local()
+
+# Agrégats par chemin : [nombre, durée totale (s), durée max (s)]
+_totals: Dict[str, List[float]] = {}
+_last_cycles: Dict[str, Dict[str, Any]] = {}
+_active_cycles: Dict[str, '_CycleAccumulator'] = {}
+
+
+class _CycleAccumulator:
+    """Agrégats des spans d'un cycle en cours."""
+
+    __slots__ = ('name', 'stages')
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.stages: Dict[str, List[float]] = {}
+
+
+def _accumulate(table: Dict[str, List[float]], path: str, elapsed: float) -> None:
+    entry = table.get(path)
+    if entry is None:
+        table[path] = [1, elapsed, elapsed]
+    else:
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+
+def _record(path: str, elapsed: float) -> None:
+    with _lock:
+        _accumulate(_totals, path, elapsed)
+        cycle = _active_cycles.get(path.split('/', 1)[0])
+        if cycle is not None:
+            _accumulate(cycle.stages, path, elapsed)
+
+
+def _stack() -> List[str]:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _default_parent() -> Optional[str]:
+    # Worker sans parent : rattaché au cycle actif seulement s'il est unique
+    cycles = list(_active_cycles)
+    return cycles[0] if len(cycles) == 1 else None
+
+
+def _as_dict(table: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        path: {'count': int(n), 'total_s': round(total, 6), 'max_s': round(peak, 6)}
+        for path, (n, total, peak) in sorted(table.items())
+    }
+
+
+class _NoopSpan:
+    """Span inactif partagé (chronométrage désactivé)."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    """Span actif : mesure la durée du bloc et l'agrège sous son chemin."""
+
+    __slots__ = ('name', 'path', '_t0')
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.path = name
+        self._t0 = 0.0
+
+    def __enter__(self) -> '_Span':
+        stack = _stack()
+        parent = stack[-1] if stack else _default_parent()
+        self.path = f"{parent}/{self.name}" if parent else self.name
+        stack.append(self.path)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        elapsed = time.perf_counter() - self._t0
+        stack = _stack()
+        if stack:
+            stack.pop()
+        _record(self.path, elapsed)
+        return False
+
+
+def span(name: str) -> Any:
+    """Context manager chronométrant le bloc sous le nom ``name``.
+
+    Parameters
+    ----------
+    name : str
+        Nom de l'étape (sans ``/``) ; le chemin complet dépend des spans
+        parents du thread.
+    """
+    return _Span(name) if _enabled else _NOOP
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Décorateur : chronomètre chaque appel de la fonction comme ``span(name)``."""
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+class _CycleSpan(contextlib.ContextDecorator):
+    """Span racine d'un cycle ; ouvert sous un autre span, se comporte comme ``span``."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._inner: Optional[_Span] = None
+        self._owner: Optional[_CycleAccumulator] = None
+        self._t0 = 0.0
+
+    def _recreate_cm(self) -> '_CycleSpan':
+        # Décorateur : un état neuf par appel (réentrance, threads)
+        return _CycleSpan(self.name)
+
+    def __enter__(self) -> '_CycleSpan':
+        if not _enabled:
+            return self
+        if not _stack():
+            with _lock:
+                if self.name not in _active_cycles:
+                    self._owner = _active_cycles[self.name] = _CycleAccumulator(self.name)
+        if self._owner is None:
+            # Imbriqué dans un span (ou cycle homonyme en cours) : simple span
+            self._inner = _Span(self.name)
+            self._inner.__enter__()
+            return self
+        _stack().append(self.name)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        if self._inner is not None:
+            return self._inner.__exit__(*exc)
+        owner = self._owner
+        if owner is None:
+            return False
+        elapsed = time.perf_counter() - self._t0
+        stack = _stack()
+        if stack:
+            stack.pop()
+        _record(self.name, elapsed)
+        with _lock:
+            _active_cycles.pop(owner.name, None)
+            summary = {
+                'ended_at': datetime.now(timezone.utc).isoformat(),
+                'seconds': round(elapsed, 6),
+                'stages': _as_dict({k: v for k, v in owner.stages.items() if k != owner.name}),
+            }
+            _last_cycles[owner.name] = summary
+        _log_summary(owner.name, summary)
+        return False
+
+
+def cycle_span(name: str) -> _CycleSpan:
+    """Span racine d'un cycle (context manager ou décorateur).
+
+    À la sortie, le détail des étapes du cycle remplace le précédent résumé
+    de même nom dans ``stage_timings()`` et les étapes de premier niveau
+    sont journalisées.
+
+    Parameters
+    ----------
+    name : str
+        Nom du cycle (``'scheduled_cycle'``, ``'live_cycle'``...).
+    """
+    return _CycleSpan(name)
+
+
+def bind(fn: F) -> F:
+    """Rattache les spans de ``fn``, exécutée dans un autre thread, au span courant.
+
+    À appeler dans le thread parent au moment de la soumission au pool.
+    """
+    stack = _stack()
+    if not _enabled or not stack:
+        return fn
+    parent = stack[-1]
+
+    @functools.wraps(fn)
+    def bound(*args: Any, **kwargs: Any) -> Any:
+        worker_stack = _stack()
+        worker_stack.append(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            worker_stack.pop()
+    return bound  # type: ignore[return-value]
+
+
+def _log_summary(name: str, summary: Dict[str, Any]) -> None:
+    prefix = name + '/'
+    top = [
+        (path[len(prefix):], stats) for path, stats in summary['stages'].items()
+        if path.startswith(prefix) and '/' not in path[len(prefix):]
+    ]
+    top.sort(key=lambda item: item[1]['total_s'], reverse=True)
+    detail = ', '.join(
+        f"{stage}={stats['total_s']:.2f}s" + (f" x{stats['count']}" if stats['count'] > 1 else '')
+        for stage, stats in top
+    )
+    logger.info("[SPANS] %s : %.2fs%s", name, summary['seconds'], f" ({detail})" if detail else '')
+
+
+def stage_timings() -> Dict[str, Any]:
+    """Instantané des durées : dernier résumé par cycle et cumul depuis le démarrage.
+
+    Returns
+    -------
+    dict
+        ``{'enabled': bool, 'cycles': {cycle: {ended_at, seconds, stages}},
+        'totals': {path: {count, total_s, max_s}}}``.
+    """
+    with _lock:
+        return {
+            'enabled': _enabled,
+            'cycles': {
+                name: {**summary, 'stages': {k: dict(v) for k, v in summary['stages'].items()}}
+                for name, summary in _last_cycles.items()
+            },
+            'totals': _as_dict(_totals),
+        }
+
+
+def set_enabled(enabled: bool) -> None:
+    """Active ou désactive le chronométrage (tests, benchmark)."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def reset() -> None:
+    """Efface les durées cumulées et les résumés de cycle."""
+    with _lock:
+        _totals.clear()
+        _last_cycles.clear()
+        _active_cycles.clear()
+    _stack().clear()
@@ -85,6 +85,7 @@ _KNOWN_PAIR_KEYS: Set[str] = {
     'drawdown_halted',                         # ST-P2-02
     'quote_currency', 'ticker_spot_price', 'latest_best_params',
     'stoch_buy_min', 'stoch_buy_max', 'stoch_sell_exit',  # STOCH-OPT per-pair
+    'drift_baseline',                          # PERF-21: référence de dérive de la config active
 }
 
 # Clés globales connues de BotStateDict (C-16).
@@ -0,0 +1,235 @@
+"""
+synthetic_market.py — Générateur de marché OHLCV synthétique et reproductible.
+
+Les benchmarks et tests de bout en bout ne doivent dépendre ni de l'API
+Binance ni des caches pickle présents sur la machine.  Ce module produit,
+pour une graine donnée, des historiques au comportement proche du marché
+crypto :
+
+- régimes (haussier / baissier / range) enchaînés par une chaîne de Markov ;
+- volatilité en grappes : variance conditionnelle GARCH(1, 1) ;
+- gaps d'ouverture (saut de prix entre la clôture et l'ouverture suivante) ;
+- volume corrélé à l'amplitude des mouvements.
+
+L'historique est généré sur le plus petit timeframe demandé puis agrégé
+(``resample_ohlcv``) : les timeframes d'une même paire sont cohérents.
+
+Public API
+----------
+- ``REGIMES``
+- ``timeframe_delta``
+- ``generate_ohlcv``
+- ``resample_ohlcv``
+- ``generate_market``
+- ``to_klines``
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Hashable, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Régimes : (dérive par an, multiplicateur de volatilité)
+REGIMES: Dict[str, Tuple[float, float]] = {
+    'bull': (0.80, 1.0),
+    'bear': (-0.60, 1.3),
+    'range': (0.0, 0.6),
+}
+
+_BARS_PER_YEAR_1H = 8766
+
+# Suffixe d'intervalle Binance -> unité pandas
+_PANDAS_UNITS: Dict[str, Literal['min', 'h', 'D', 'W']] = {'m': 'min', 'h': 'h', 'd': 'D', 'w': 'W'}
+
+
+def timeframe_delta(timeframe: str) -> pd.Timedelta:
+    """Durée d'une bougie (``'15m'``, ``'1h'``, ``'4h'``, ``'1d'``...)."""
+    unit = _PANDAS_UNITS.get(timeframe[-1:])
+    if unit is None or not timeframe[:-1].isdigit():
+        raise ValueError(f"timeframe inconnu: {timeframe!r}")
+    return pd.Timedelta(int(timeframe[:-1]), unit=unit)
+
+
+def generate_ohlcv(
+    n_bars: int,
+    timeframe: str = '1h',
+    seed: Optional[int] = None,
+    start: str = '2022-01-01',
+    start_price: float = 100.0,
+    annual_vol: float = 0.70,
+    regime_persistence: float = 0.998,
+    garch: Tuple[float, float] = (0.08, 0.90),
+    gap_prob: float = 0.002,
+    gap_scale: float = 0.03,
+    base_volume: float = 1000.0,
+    with_regimes: bool = False,
+) -> pd.DataFrame:
+    """Historique OHLCV synthétique d'une paire.
+
+    Parameters
+    ----------
+    n_bars : int
+        Nombre de bougies.
+    timeframe : str
+        Intervalle des bougies.
+    seed : int, optional
+        Graine (historique identique pour une même graine).
+    start : str
+        Horodatage de la première bougie.
+    start_price : float
+        Prix d'ouverture initial.
+    annual_vol : float
+        Volatilité annualisée moyenne (régime ``bull``).
+    regime_persistence : float
+        Probabilité de rester dans le régime courant à chaque bougie 1h
+        (ajustée à la durée de ``timeframe``).
+    garch : tuple of float
+        ``(alpha, beta)`` du GARCH(1, 1) ; ``alpha + beta < 1``.  La variance
+        de long terme est celle du régime courant.
+    gap_prob : float
+        Probabilité d'un gap d'ouverture par bougie.
+    gap_scale : float
+        Écart-type du gap (rendement logarithmique).
+    base_volume : float
+        Volume moyen d'une bougie calme.
+    with_regimes : bool
+        Ajoute la colonne ``regime`` (nom du régime de chaque bougie).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes ``open``, ``high``, ``low``, ``close``, ``volume`` indexées
+        par ``DatetimeIndex``.
+    """
+    if n_bars < 1:
+        raise ValueError("n_bars doit être >= 1")
+    alpha, beta = garch
+    if alpha < 0 or beta < 0 or alpha + beta >= 1:
+        raise ValueError("garch: alpha, beta >= 0 et alpha + beta < 1 requis")
+
+    rng = np.random.default_rng(seed)
+    delta = timeframe_delta(timeframe)
+    hours = delta / pd.Timedelta(hours=1)
+    bars_per_year = _BARS_PER_YEAR_1H / hours
+
+    # Chaîne de Markov des régimes (persistance exprimée par heure)
+    names = list(REGIMES)
+    stay = regime_persistence ** hours
+    switches = rng.random(n_bars) > stay
+    switches[0] = False
+    # Saut de 1 à n-1 crans : un changement mène toujours vers un autre régime
+    jumps = rng.integers(1, len(names), size=n_bars)
+    regime = (rng.integers(0, len(names)) + np.cumsum(np.where(switches, jumps, 0))) % len(names)
+    drift = np.array([REGIMES[n][0] for n in names])[regime] / bars_per_year
+    long_var = (annual_vol * np.array([REGIMES[n][1] for n in names])[regime]) ** 2 / bars_per_year
+
+    # GARCH(1, 1) : la variance suit les chocs récents (grappes de volatilité)
+    shocks = rng.standard_normal(n_bars)
+    variance = np.empty(n_bars)
+    returns = np.empty(n_bars)
+    var_t = long_var[0]
+    prev_ret = 0.0
+    for t in range(n_bars):
+        var_t = (1.0 - alpha - beta) * long_var[t] + alpha * prev_ret * prev_ret + beta * var_t
+        variance[t] = var_t
+        prev_ret = np.sqrt(var_t) * shocks[t]
+        returns[t] = prev_ret
+    sigma = np.sqrt(variance)
+    log_close = np.log(start_price) + np.cumsum(drift - 0.5 * variance + returns)
+    close = np.exp(log_close)
+
+    # Ouverture = clôture précédente, sauf gap
+    gaps = np.where(rng.random(n_bars) < gap_prob, rng.normal(0.0, gap_scale, n_bars), 0.0)
+    prev_close = np.concatenate(([start_price], close[:-1]))
+    open_ = prev_close * np.exp(gaps)
+    body_high = np.maximum(open_, close)
+    body_low = np.minimum(open_, close)
+    high = body_high * np.exp(np.abs(rng.normal(0.0, 0.5, n_bars)) * sigma)
+    low = body_low * np.exp(-np.abs(rng.normal(0.0, 0.5, n_bars)) * sigma)
+
+    move = np.abs(np.log(close / open_)) / np.maximum(sigma, 1e-12)
+    volume = base_volume * hours * np.exp(rng.normal(0.0, 0.3, n_bars)) * (1.0 + move)
+
+    index = pd.date_range(start=start, periods=n_bars, freq=delta)
+    df = pd.DataFrame({
+        'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume,
+    }, index=index)
+    df.index.name = 'timestamp'
+    if with_regimes:
+        df['regime'] = np.array(names)[regime]
+    return df
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Agrège un historique OHLCV vers un timeframe plus long."""
+    agg: Dict[Hashable, str] = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    out = df[list(agg)].resample(timeframe_delta(timeframe), label='left', closed='left').agg(agg)
+    return out.dropna(subset=['close'])
+
+
+def generate_market(
+    n_pairs: int = 5,
+    history_days: int = 365,
+    timeframes: Sequence[str] = ('1h', '4h', '1d'),
+    seed: int = 0,
+    quote: str = 'USDC',
+    **kwargs: Any,
+) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """Historiques synthétiques de ``n_pairs`` paires indépendantes.
+
+    Parameters
+    ----------
+    n_pairs : int
+        Nombre de paires (``SYN00USDC``, ``SYN01USDC``...).
+    history_days : int
+        Profondeur d'historique.
+    timeframes : sequence of str
+        Timeframes à produire ; le plus court est généré, les autres agrégés.
+    seed : int
+        Graine du marché ; chaque paire reçoit une graine dérivée.
+    quote : str
+        Devise de cotation des symboles.
+    **kwargs
+        Paramètres transmis à ``generate_ohlcv``.
+
+    Returns
+    -------
+    dict
+        ``{pair: {timeframe: DataFrame}}``.
+    """
+    if not timeframes:
+        raise ValueError("au moins un timeframe requis")
+    ordered: List[str] = sorted(set(timeframes), key=timeframe_delta)
+    base_tf = ordered[0]
+    n_bars = max(int(pd.Timedelta(days=history_days) / timeframe_delta(base_tf)), 1)
+    pair_seeds = np.random.SeedSequence(seed).spawn(n_pairs)
+    start_prices = np.random.default_rng(seed).uniform(0.1, 1000.0, n_pairs)
+
+    market: Dict[str, Dict[str, pd.DataFrame]] = {}
+    for k in range(n_pairs):
+        base = generate_ohlcv(
+            n_bars, base_tf, seed=int(pair_seeds[k].generate_state(1)[0]),
+            start_price=float(start_prices[k]), **kwargs,
+        )
+        frames = {base_tf: base}
+        for tf in ordered[1:]:
+            frames[tf] = resample_ohlcv(base, tf)
+        market[f'SYN{k:02d}{quote}'] = frames
+    return market
+
+
+def to_klines(df: pd.DataFrame, timeframe: str) -> List[List[Any]]:
+    """Bougies au format ``get_historical_klines`` de python-binance."""
+    open_ms = np.asarray(pd.DatetimeIndex(df.index).as_unit('ms').values).view(np.int64)
+    close_ms = open_ms + int(timeframe_delta(timeframe) / pd.Timedelta(milliseconds=1)) - 1
+    cols = df[['open', 'high', 'low', 'close', 'volume']].to_numpy()
+    return [
+        [int(o), f"{r[0]:.8f}", f"{r[1]:.8f}", f"{r[2]:.8f}", f"{r[3]:.8f}", f"{r[4]:.8f}",
+         int(c), f"{r[3] * r[4]:.8f}", 0, '0', '0', '0']
+        for o, c, r in zip(open_ms, close_ms, cols)
+    ]
@@ -0,0 +1,431 @@
+"""
+task_scheduler.py — Planificateur à priorités de la boucle principale.
+
+Avec la bibliothèque ``schedule``, ``run_pending()`` exécutait les tâches
+dues l'une après l'autre dans la boucle principale : un cycle horaire de
+ré-optimisation (backtests, grille StochRSI, Optuna, walk-forward) de
+plusieurs minutes retardait d'autant le cycle live de 2 minutes (signaux,
+stops).  Chaque dispatch créait en outre son propre
+``ThreadPoolExecutor(max_workers=n_pairs)``.
+
+``TaskScheduler`` :
+
+- classes de priorité (``Priority``) : cycle live (signaux et stops)
+  > métriques > ré-optimisation ;
+- deux files persistantes : *foreground* (priorités < ``REOPTIMIZATION``)
+  et *background* (ré-optimisation) ; une tâche de fond n'occupe jamais un
+  worker du premier plan, la latence du cycle live reste bornée ;
+- préemption coopérative : le code de fond appelle ``yield_to_foreground()``
+  entre deux unités de travail et se suspend tant qu'une tâche de premier
+  plan s'exécute (le GIL reste au cycle live) ;
+- suivi d'échéance par tâche : retard au démarrage, durée, échéances
+  manquées, déclenchements sautés (tâche encore en cours), échecs —
+  exportés par ``stats()`` dans ``metrics.json`` ;
+- pools d'éventail persistants (``executor(name, max_workers)``) pour la
+  parallélisation par paire, réutilisés d'un cycle à l'autre.
+
+``run_pending()`` ne bloque pas : les tâches dues sont confiées aux files.
+
+Public API
+----------
+- ``Priority``
+- ``TaskScheduler``
+- ``current_scheduler``
+- ``yield_to_foreground``
+"""
+
+from __future__ import annotations
+
+import enum
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_ACTIVE: Optional['TaskScheduler'] = None
+_local = threading.local()
+
+
+class Priority(enum.IntEnum):
+    """Classes de priorité (valeur basse = plus prioritaire)."""
+
+    LIVE = 0
+    METRICS = 1
+    REOPTIMIZATION = 2
+
+
+class _Job:
+    """Tâche périodique et ses statistiques d'échéance."""
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        interval: float,
+        priority: Priority,
+        deadline: float,
+        next_due: float,
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.priority = priority
+        self.deadline = deadline
+        self.next_due = next_due
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.missed_deadlines = 0
+        self.skipped = 0
+        self.last_latency_s = 0.0
+        self.max_latency_s = 0.0
+        self.last_duration_s = 0.0
+        self.max_duration_s = 0.0
+        self.last_started: Optional[str] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'priority': self.priority.name,
+            'interval_s': self.interval,
+            'deadline_s': self.deadline,
+            'running': self.running,
+            'runs': self.runs,
+            'failures': self.failures,
+            'missed_deadlines': self.missed_deadlines,
+            'skipped': self.skipped,
+            'last_latency_s': round(self.last_latency_s, 3),
+            'max_latency_s': round(self.max_latency_s, 3),
+            'last_duration_s': round(self.last_duration_s, 3),
+            'max_duration_s': round(self.max_duration_s, 3),
+            'last_started': self.last_started,
+        }
+
+
+class _Lane:
+    """File à priorités servie par des threads persistants."""
+
+    def __init__(self, scheduler: 'TaskScheduler', name: str, workers: int) -> None:
+        self.name = name
+        self._scheduler = scheduler
+        self._queue: 'queue.PriorityQueue[Tuple[int, int, Optional[_Job], float]]' = queue.PriorityQueue()
+        self._threads = [
+            threading.Thread(target=self._work, name=f'{name}-{i}', daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, job: _Job, due: float, seq: int) -> None:
+        self._queue.put((int(job.priority), seq, job, due))
+
+    def stop(self, seq: int) -> None:
+        for _ in self._threads:
+            # Sentinelle après les tâches déjà en file
+            self._queue.put((len(Priority), seq, None, 0.0))
+
+    def join(self, timeout: Optional[float]) -> None:
+        end = None if timeout is None else time.monotonic() + timeout
+        for t in self._threads:
+            t.join(None if end is None else max(0.0, end - time.monotonic()))
+
+    def _work(self) -> None:
+        while True:
+            _, _, job, due = self._queue.get()
+            if job is None:
+                return
+            self._scheduler._run_job(job, due)
+
+
+def _mark_foreground() -> None:
+    _local.foreground = True
+
+
+class TaskScheduler:
+    """Planificateur périodique à priorités, files et pools persistants.
+
+    Parameters
+    ----------
+    foreground_workers : int
+        Threads de la file de premier plan (live, métriques).
+    background_workers : int
+        Threads de la file de ré-optimisation.
+    on_error : callable, optional
+        ``on_error(exc, job_name)`` appelé si une tâche lève une exception.
+    max_pause : float
+        Suspension maximale (s) d'une tâche de fond dans
+        ``yield_to_foreground`` (pas de famine si le premier plan déborde).
+    clock : callable
+        Horloge monotone (tests).
+    """
+
+    def __init__(
+        self,
+        foreground_workers: int = 2,
+        background_workers: int = 1,
+        on_error: Optional[Callable[[Exception, str], Any]] = None,
+        max_pause: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._on_error = on_error
+        self._max_pause = max_pause
+        self._lock = threading.Lock()
+        self._foreground_idle = threading.Condition(self._lock)
+        self._foreground_active = 0
+        self._jobs: List[_Job] = []
+        self._seq = itertools.count()
+        self._fanout: Dict[str, Tuple[ThreadPoolExecutor, int]] = {}
+        self._closed = False
+        self._lanes = {
+            'foreground': _Lane(self, 'sched-fg', foreground_workers),
+            'background': _Lane(self, 'sched-bg', background_workers),
+        }
+
+    # ── Enregistrement ─────────────────────────────────────────────────────
+
+    def every(
+        self,
+        seconds: float,
+        fn: Callable[[], Any],
+        *,
+        name: Optional[str] = None,
+        priority: Priority = Priority.LIVE,
+        deadline: Optional[float] = None,
+        run_now: bool = False,
+    ) -> _Job:
+        """Planifie ``fn`` toutes les ``seconds`` secondes.
+
+        Parameters
+        ----------
+        seconds : float
+            Période.
+        fn : callable
+            Tâche sans argument.
+        name : str, optional
+            Nom de la tâche (statistiques) ; défaut ``fn.__name__``.
+        priority : Priority
+            Classe de priorité ; ``REOPTIMIZATION`` s'exécute dans la file de fond.
+        deadline : float, optional
+            Délai (s) après l'instant dû au-delà duquel la fin d'exécution
+            compte comme échéance manquée ; défaut : la période.
+        run_now : bool
+            Premier déclenchement immédiat (sinon après une période).
+        """
+        if seconds <= 0:
+            raise ValueError("seconds doit être > 0")
+        job = _Job(
+            name or getattr(fn, '__name__', 'job'), fn, float(seconds), Priority(priority),
+            float(deadline if deadline is not None else seconds),
+            self._clock() + (0.0 if run_now else float(seconds)),
+        )
+        with self._lock:
+            self._jobs.append(job)
+        return job
+
+    @property
+    def jobs(self) -> List[_Job]:
+        with self._lock:
+            return list(self._jobs)
+
+    def cancel(self, job: _Job) -> None:
+        with self._lock:
+            if job in self._jobs:
+                self._jobs.remove(job)
+
+    # ── Déclenchement ──────────────────────────────────────────────────────
+
+    def run_pending(self) -> int:
+        """Confie les tâches dues à leur file (non bloquant).
+
+        Une tâche encore en cours à son échéance suivante n'est pas empilée :
+        le déclenchement est compté dans ``skipped``.
+
+        Returns
+        -------
+        int
+            Nombre de tâches soumises.
+        """
+        now = self._clock()
+        submitted: List[Tuple[_Job, float]] = []
+        with self._lock:
+            if self._closed:
+                return 0
+            for job in sorted(self._jobs, key=lambda j: (j.priority, j.next_due)):
+                if job.next_due > now:
+                    continue
+                due = job.next_due
+                # Prochaine échéance alignée sur la grille (pas de rattrapage en rafale)
+                periods = int((now - due) // job.interval) + 1
+                job.next_due = due + periods * job.interval
+                if job.running:
+                    job.skipped += periods
+                    logger.warning(
+                        "[SCHEDULER] %s encore en cours — déclenchement sauté", job.name)
+                    continue
+                job.skipped += periods - 1
+                job.running = True
+                submitted.append((job, due))
+        for job, due in submitted:
+            lane = 'background' if job.priority >= Priority.REOPTIMIZATION else 'foreground'
+            self._lanes[lane].submit(job, due, next(self._seq))
+        return len(submitted)
+
+    def _run_job(self, job: _Job, due: float) -> None:
+        foreground = job.priority < Priority.REOPTIMIZATION
+        _local.foreground = foreground
+        started = self._clock()
+        if foreground:
+            with self._lock:
+                self._foreground_active += 1
+        failed = False
+        try:
+            job.last_started = datetime.now(timezone.utc).isoformat()
+            job.fn()
+        except Exception as exc:
+            failed = True
+            logger.error("[SCHEDULER] %s a échoué: %s", job.name, exc)
+            if self._on_error is not None:
+                try:
+                    self._on_error(exc, job.name)
+                except Exception as _cb_err:
+                    logger.debug("[SCHEDULER] on_error a échoué: %s", _cb_err)
+        finally:
+            ended = self._clock()
+            with self._lock:
+                if foreground:
+                    self._foreground_active -= 1
+                    if self._foreground_active == 0:
+                        self._foreground_idle.notify_all()
+                job.running = False
+                job.runs += 1
+                job.failures += failed
+                job.last_latency_s = max(0.0, started - due)
+                job.max_latency_s = max(job.max_latency_s, job.last_latency_s)
+                job.last_duration_s = ended - started
+                job.max_duration_s = max(job.max_duration_s, job.last_duration_s)
+                missed = ended - due > job.deadline
+                job.missed_deadlines += missed
+            if missed:
+                logger.warning(
+                    "[SCHEDULER] %s : échéance manquée (%.1fs après l'instant dû, échéance %.0fs)",
+                    job.name, ended - due, job.deadline,
+                )
+
+    # ── Préemption coopérative ─────────────────────────────────────────────
+
+    def yield_to_foreground(self) -> float:
+        """Suspend l'appelant (travail de fond) tant qu'une tâche de premier plan tourne.
+
+        Sans effet dans un thread de premier plan.
+
+        Returns
+        -------
+        float
+            Durée de suspension (s).
+        """
+        if getattr(_local, 'foreground', False):
+            return 0.0
+        with self._lock:
+            if self._foreground_active == 0:
+                return 0.0
+            t0 = time.monotonic()
+            self._foreground_idle.wait_for(
+                lambda: self._foreground_active == 0 or self._closed, timeout=self._max_pause)
+        return time.monotonic() - t0
+
+    # ── Pools et supervision ───────────────────────────────────────────────
+
+    def executor(self, name: str, max_workers: int, *, foreground: bool = False) -> ThreadPoolExecutor:
+        """Pool d'éventail persistant ``name`` (recréé seulement s'il doit grandir).
+
+        Parameters
+        ----------
+        name : str
+            Nom du pool (préfixe des threads).
+        max_workers : int
+            Nombre de workers requis.
+        foreground : bool
+            Workers marqués premier plan (``yield_to_foreground`` sans effet).
+        """
+        max_workers = max(1, int(max_workers))
+        with self._lock:
+            current = self._fanout.get(name)
+            if current is not None and current[1] >= max_workers:
+                return current[0]
+            pool = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=name,
+                initializer=_mark_foreground if foreground else None,
+            )
+            self._fanout[name] = (pool, max_workers)
+        if current is not None:
+            current[0].shutdown(wait=False)
+        return pool
+
+    def idle_seconds(self) -> Optional[float]:
+        """Secondes avant la prochaine échéance (None sans tâche)."""
+        with self._lock:
+            if not self._jobs:
+                return None
+            return max(0.0, min(j.next_due for j in self._jobs) - self._clock())
+
+    def next_run(self, priority: Optional[Priority] = None) -> Optional[datetime]:
+        """Heure locale de la prochaine échéance (toutes tâches ou une classe)."""
+        with self._lock:
+            dues = [j.next_due for j in self._jobs if priority is None or j.priority == priority]
+            if not dues:
+                return None
+            delay = max(0.0, min(dues) - self._clock())
+        return datetime.now() + timedelta(seconds=delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques d'échéance par tâche et état des files (``metrics.json``)."""
+        with self._lock:
+            jobs = {job.name: job.stats() for job in self._jobs}
+            return {
+                'foreground_active': self._foreground_active,
+                'missed_deadlines': sum(j['missed_deadlines'] for j in jobs.values()),
+                'jobs': jobs,
+            }
+
+    def install(self) -> 'TaskScheduler':
+        """Publie ce planificateur pour ``current_scheduler`` / ``yield_to_foreground``."""
+        global _ACTIVE
+        _ACTIVE = self
+        return self
+
+    def shutdown(self, timeout: Optional[float] = 30.0) -> None:
+        """Arrête les files après les tâches en cours (au plus ``timeout`` s) et les pools."""
+        global _ACTIVE
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            fanout = [pool for pool, _ in self._fanout.values()]
+            self._fanout.clear()
+            self._foreground_idle.notify_all()
+        for lane in self._lanes.values():
+            lane.stop(next(self._seq))
+        end = None if timeout is None else time.monotonic() + timeout
+        for lane in self._lanes.values():
+            lane.join(None if end is None else max(0.0, end - time.monotonic()))
+        for pool in fanout:
+            pool.shutdown(wait=False)
+        if _ACTIVE is self:
+            _ACTIVE = None
+
+
+def current_scheduler() -> Optional[TaskScheduler]:
+    """Planificateur installé (``TaskScheduler.install``), ou None."""
+    return _ACTIVE
+
+
+def yield_to_foreground() -> float:
+    """Point de préemption du travail de fond (sans effet hors planificateur)."""
+    scheduler = _ACTIVE
+    return scheduler.yield_to_foreground() if scheduler is not None else 0.0
@@ -13,6 +13,7 @@ Public API
 - ``check_partial_exits_from_history``
 - ``check_if_order_executed``
 - ``select_best_by_calmar``
+- ``calmar_key``
 """
 
 from __future__ import annotations
@@ -23,6 +24,7 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from backtest_summary import rank_indices, summarize_results
 from bot_config import extract_coin_from_pair, retry_with_backoff
 from constants import (
     PARTIAL_1_PROFIT_PCT,
@@ -400,10 +402,24 @@ def check_if_order_executed(orders: List[Dict[str, Any]], order_type: str) -> bo
     return False
 
 
+def calmar_key(result: Dict[str, Any]) -> float:
+    """Score de classement Calmar : ROI / max(max_drawdown, 0.001)."""
+    roi = (
+        (result['final_wallet'] - result['initial_wallet'])
+        / max(result['initial_wallet'], 1.0)
+    )
+    dd = max(result.get('max_drawdown', 0.001), 0.001)
+    return roi / dd
+
+
 def select_best_by_calmar(pool: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Sélectionne le meilleur résultat de backtest par ratio de Calmar
     (ROI / max_drawdown).  Centralise la logique de sélection (P2-03 / C-07).
 
+    Les résultats arrêtés par anticipation (``status='pruned'``, PERF-05)
+    ne portent que des métriques partielles : ils ne sont retenus que si
+    aucun résultat complet n'est disponible.
+
     Parameters
     ----------
     pool : list[dict]
@@ -415,12 +431,9 @@ def select_best_by_calmar(pool: List[Dict[str, Any]]) -> Dict[str, Any]:
     dict
         Résultat avec le meilleur ratio de Calmar.
     """
-    def _key(x: dict) -> float:
-        roi = (
-            (x['final_wallet'] - x['initial_wallet'])
-            / max(x['initial_wallet'], 1.0)
-        )
-        dd = max(x.get('max_drawdown', 0.001), 0.001)
-        return roi / dd
-
-    return max(pool, key=_key)
+    if not pool:
+        raise ValueError("select_best_by_calmar: pool vide")
+    # PERF-19: classement vectorisé sur le résumé compact (même score que calmar_key)
+    summary = summarize_results(pool)
+    order = rank_indices(summary, completed_only=bool((~summary['pruned']).any()))
+    return pool[int(order[0])]
@@ -0,0 +1,204 @@
+"""
+trade_log.py — Journal de trades structuré (numpy) des backtests.
+
+Le moteur Cython et la boucle Python de ``backtest_runner`` émettent un
+tableau numpy structuré (``TRADE_LOG_DTYPE``) au lieu d'une liste de dicts :
+une ligne par événement (achat, vente partielle, vente finale).  Les
+métriques par trade sont calculées de façon vectorisée sur ce tableau ; le
+DataFrame historique n'est construit qu'à la demande (affichage).
+
+Les codes ``KIND_*`` sont identiques à l'enum ``TRADE_*`` de
+``backtest_engine_standard.pyx``.
+
+Public API
+----------
+- ``TRADE_LOG_DTYPE``, ``KIND_*``, ``REASON_*``
+- ``empty_trade_log``
+- ``trade_log_from_records``
+- ``sell_profits``
+- ``trade_equity_points``
+- ``profit_metrics``
+- ``compute_trade_metrics``
+- ``trades_frame``
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Nature de l'événement (identique à l'enum TRADE_* du moteur Cython)
+KIND_BUY = 0
+KIND_SELL = 1
+KIND_PARTIAL_1 = 2
+KIND_PARTIAL_2 = 3
+
+# Motif de sortie
+REASON_NONE = 0
+REASON_SIGNAL = 1
+REASON_STOP_LOSS = 2
+REASON_TRAILING_STOP = 3
+REASON_TAKE_PROFIT = 4
+
+_KIND_LABELS = {
+    KIND_BUY: 'buy',
+    KIND_SELL: 'sell',
+    KIND_PARTIAL_1: 'partial_sell_1',
+    KIND_PARTIAL_2: 'partial_sell_2',
+}
+_REASON_LABELS = {
+    REASON_NONE: None,
+    REASON_SIGNAL: 'SIGNAL',
+    REASON_STOP_LOSS: 'STOP_LOSS',
+    REASON_TRAILING_STOP: 'TRAILING_STOP',
+    REASON_TAKE_PROFIT: 'TAKE_PROFIT',
+}
+
+TRADE_LOG_DTYPE = np.dtype([
+    ('entry_bar', np.int64),    # bar du signal d'entrée de la position
+    ('exit_bar', np.int64),     # bar du signal de sortie (-1 pour un achat)
+    ('kind', np.int8),          # KIND_*
+    ('reason', np.int8),        # REASON_*
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),  # prix d'exécution de la sortie (NaN pour un achat)
+    ('qty', np.float64),        # quantité achetée / vendue
+    ('pnl', np.float64),        # vente : P&L net aller-retour ; partiel : P&L réalisé de la tranche
+    ('fees', np.float64),       # frais de l'événement (USDC)
+])
+
+
+def empty_trade_log() -> np.ndarray:
+    """Retourne un journal vide."""
+    return np.empty(0, dtype=TRADE_LOG_DTYPE)
+
+
+def trade_log_from_records(records: Iterable[Dict[str, Any]]) -> np.ndarray:
+    """Convertit une liste de dicts de trades (format historique) en journal.
+
+    Utilisé pour les binaires Cython antérieurs qui ne renvoient pas encore
+    ``trade_log``.  Les index de bar et les frais ne sont pas connus (-1 / 0).
+    """
+    rows: List[tuple] = []
+    entry_price = float('nan')
+    for rec in records:
+        kind_label = str(rec.get('type', '')).lower()
+        price = float(rec.get('price', 0.0))
+        if kind_label == 'buy':
+            entry_price = price
+            rows.append((-1, -1, KIND_BUY, REASON_NONE, price, float('nan'),
+                         float(rec.get('qty', 0.0)), 0.0, 0.0))
+        elif kind_label == 'sell':
+            rows.append((-1, -1, KIND_SELL, REASON_NONE, entry_price, price,
+                         0.0, float(rec.get('profit', 0.0)), 0.0))
+        elif kind_label in ('partial_sell_1', 'partial_sell_2'):
+            qty = float(rec.get('qty', 0.0))
+            proceeds = float(rec.get('proceeds', qty * price))
+            kind = KIND_PARTIAL_1 if kind_label.endswith('1') else KIND_PARTIAL_2
+            rows.append((-1, -1, kind, REASON_TAKE_PROFIT, entry_price, price, qty,
+                         proceeds - qty * entry_price, qty * price - proceeds))
+    return np.array(rows, dtype=TRADE_LOG_DTYPE) if rows else empty_trade_log()
+
+
+def sell_profits(trade_log: np.ndarray) -> np.ndarray:
+    """P&L net de chaque aller-retour clôturé (lignes ``KIND_SELL``)."""
+    return np.asarray(trade_log['pnl'][trade_log['kind'] == KIND_SELL], dtype=np.float64)
+
+
+def trade_equity_points(trade_log: np.ndarray, initial_wallet: float) -> np.ndarray:
+    """Equity au niveau trade : capital initial puis après chaque vente."""
+    profits = sell_profits(trade_log)
+    points = np.empty(len(profits) + 1, dtype=np.float64)
+    points[0] = initial_wallet
+    np.cumsum(profits, out=points[1:])
+    points[1:] += initial_wallet
+    return points
+
+
+def _max_loss_streak(profits: np.ndarray) -> int:
+    losses = np.concatenate(([0], (profits < 0).astype(np.int8), [0]))
+    edges = np.diff(losses)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return int((ends - starts).max()) if len(starts) else 0
+
+
+def profit_metrics(profits: np.ndarray) -> Dict[str, Any]:
+    """Métriques vectorisées sur les P&L des aller-retours clôturés.
+
+    Returns
+    -------
+    dict
+        ``profit_factor`` (plafonné à 999), ``max_consecutive_losses``,
+        ``total_trades``, ``winning_trades``.
+    """
+    profits = np.asarray(profits, dtype=np.float64)
+    gross_profit = float(profits[profits > 0].sum())
+    gross_loss = float(-profits[profits < 0].sum())
+    if gross_loss > 0:
+        profit_factor = gross_profit / gross_loss
+    else:
+        profit_factor = 999.0 if gross_profit > 0 else 0.0
+    return {
+        'profit_factor': round(min(profit_factor, 999.0), 4),
+        'max_consecutive_losses': _max_loss_streak(profits),
+        'total_trades': int(len(profits)),
+        'winning_trades': int((profits > 0).sum()),
+    }
+
+
+def compute_trade_metrics(trade_log: np.ndarray) -> Dict[str, Any]:
+    """``profit_metrics`` appliqué aux ventes du journal."""
+    return profit_metrics(sell_profits(trade_log))
+
+
+def trades_frame(
+    trade_log: np.ndarray,
+    index: Optional[pd.Index] = None,
+) -> pd.DataFrame:
+    """Construit le DataFrame de trades historique (affichage uniquement).
+
+    Parameters
+    ----------
+    trade_log : np.ndarray
+        Journal ``TRADE_LOG_DTYPE``.
+    index : pd.Index, optional
+        Index du DataFrame backtesté ; ajoute la colonne ``date`` (bar du
+        signal de l'événement).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes ``type`` (``buy``/``sell``/``partial_sell_1``/``partial_sell_2``),
+        ``price``, ``qty``, ``profit``, ``motif``, ``proceeds``, ``profit_pct``
+        (+ ``date``).
+    """
+    if len(trade_log) == 0:
+        return pd.DataFrame()
+    kind = trade_log['kind']
+    is_buy = kind == KIND_BUY
+    is_sell = kind == KIND_SELL
+    is_partial = ~(is_buy | is_sell)
+    exit_price = trade_log['exit_price']
+    entry_price = trade_log['entry_price']
+    price = np.where(is_buy, entry_price, exit_price)
+    proceeds = trade_log['qty'] * exit_price - trade_log['fees']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit_pct = (exit_price - entry_price) / entry_price
+    frame = pd.DataFrame({
+        'type': [_KIND_LABELS[int(k)] for k in kind],
+        'price': price,
+        'qty': trade_log['qty'],
+        'profit': np.where(is_sell, trade_log['pnl'], np.nan),
+        'motif': [_REASON_LABELS[int(r)] if s else None
+                  for r, s in zip(trade_log['reason'], is_sell)],
+        'proceeds': np.where(is_partial, proceeds, np.nan),
+        'profit_pct': np.where(is_partial, profit_pct, np.nan),
+    })
+    if index is not None:
+        bars = np.where(is_buy, trade_log['entry_bar'], trade_log['exit_bar'])
+        valid = (bars >= 0) & (bars < len(index))
+        dates = pd.Series(index.take(np.clip(bars, 0, max(len(index) - 1, 0))))
+        frame.insert(0, 'date', dates.where(valid))
+    return frame
@@ -15,6 +15,13 @@ References
 - Lopez de Prado (2018): "Advances in Financial Machine Learning", Ch. 12 (Walk-Forward)
 """
 
+import dataclasses
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 from typing import List, Dict, Tuple, Optional, Any, Callable, TYPE_CHECKING
@@ -22,7 +29,14 @@ if TYPE_CHECKING:
     import optuna
 import logging
 
-from backtest_runner import BasicSlippageModel  # P2-02: slippage stochastique OOS
+from cost_model import OOS_COST_MODEL  # PERF-23: coûts OOS évalués dans le moteur
+from backtest_abort import abort_criteria_from_config  # PERF-05: arrêt anticipé
+from backtest_inputs import BacktestInputs, backtest_inputs  # PERF-24: tableaux partagés
+from backtest_memo import current_engine_version, memoize_backtest  # PERF-07: mémoïsation persistante
+from monte_carlo import run_monte_carlo  # PERF-13: robustesse Monte Carlo OOS
+from spans import span, timed  # PERF-18: durées des étapes du cycle
+from task_scheduler import yield_to_foreground  # PERF-20: préemption coopérative
+from trade_log import profit_metrics, sell_profits  # PERF-03: journal numpy
 
 logger = logging.getLogger("walk_forward")
 
@@ -119,6 +133,7 @@ def compute_risk_metrics(
     periods_per_year: int = 8766,
     risk_free_rate: float = RISK_FREE_RATE,  # P2-03: default surchargé en prod
     n_bars_total: Optional[int] = None,  # total bars when equity is trade-level
+    trade_log: Optional[np.ndarray] = None,  # PERF-03: journal numpy (prioritaire sur trades_df)
 ) -> Dict[str, Any]:
     """
     Compute institutional risk-adjusted performance metrics from a bar-level
@@ -130,6 +145,9 @@ def compute_risk_metrics(
         Portfolio value at each bar.
     trades_df : DataFrame, optional
         Trade log with columns ``type`` and ``profit`` (sell rows).
+    trade_log : np.ndarray, optional
+        Structured ``trade_log.TRADE_LOG_DTYPE`` array; when given it is used
+        instead of ``trades_df`` (no DataFrame filtering).
     periods_per_year : int
         Number of bars per year (for annualization).
     risk_free_rate : float
@@ -144,6 +162,15 @@ def compute_risk_metrics(
     """
     metrics = default_risk_metrics()
 
+    # Profits des ventes (aller-retours clôturés) — None si aucun journal fourni
+    _profs: Optional[np.ndarray] = None
+    if trade_log is not None:
+        _profs = sell_profits(trade_log)
+    elif trades_df is not None and not trades_df.empty and 'profit' in trades_df.columns:
+        # Bug #2 fix: case-insensitive (Cython émet 'SELL', Python émet 'sell')
+        _sell_rows = trades_df[trades_df['type'].str.lower() == 'sell']
+        _profs = np.asarray(_sell_rows['profit'].values, dtype=np.float64)
+
     equity = np.asarray(equity_curve, dtype=np.float64)
     if len(equity) < 2 or equity[0] <= 0:
         return metrics
@@ -180,22 +207,11 @@ def compute_risk_metrics(
         _t_years = max(n_bars_total / periods_per_year, 1e-6)
         _effective_ppy = max((_n_orig_bars - 1) / _t_years, 1.0)
         _years = _t_years  # ← fix: use actual data span for Calmar/annual_return
-    elif (
-        trades_df is not None
-        and not trades_df.empty
-        and 'profit' in trades_df.columns
-    ):
-        _sell_rows = trades_df[trades_df['type'].str.lower() == 'sell']
-        _n_sell = len(_sell_rows)
+    elif _profs is not None:
+        _n_sell = len(_profs)
         if _n_sell >= 2 and (_n_orig_bars / max(_n_sell, 1)) > 20:
             # Case B: bar-level diluted — rebuild trade-point equity from profits
-            _profs = np.asarray(_sell_rows['profit'].values, dtype=np.float64)
-            _cur = float(equity[0])
-            _pts = [_cur]
-            for _p in _profs:
-                _cur += float(_p)
-                _pts.append(_cur)
-            equity = np.asarray(_pts, dtype=np.float64)
+            equity = np.concatenate(([equity[0]], equity[0] + np.cumsum(_profs)))
             returns = np.diff(equity) / equity[:-1]
             returns = returns[np.isfinite(returns)]
             if len(returns) < 2:
@@ -257,26 +273,11 @@ def compute_risk_metrics(
     profit_factor = 0.0
     max_consec_losses = 0
 
-    if trades_df is not None and not trades_df.empty and 'profit' in trades_df.columns:
-        # Bug #2 fix: case-insensitive (Cython émet 'SELL', Python émet 'sell')
-        sell_trades = trades_df[trades_df['type'].str.lower() == 'sell']
-        if not sell_trades.empty:
-            profits = np.asarray(sell_trades['profit'].values, dtype=np.float64)
-            gross_profit = float(np.sum(profits[profits > 0]))
-            gross_loss = float(abs(np.sum(profits[profits < 0])))
-            if gross_loss > 0:
-                profit_factor = gross_profit / gross_loss
-            elif gross_profit > 0:
-                profit_factor = 999.0  # cap instead of inf
-
-            # Max consecutive losses
-            streak = 0
-            for p in profits:
-                if p < 0:
-                    streak += 1
-                    max_consec_losses = max(max_consec_losses, streak)
-                else:
-                    streak = 0
+    if _profs is not None and len(_profs) > 0:
+        # PERF-03: profit factor (plafonné à 999) et série de pertes vectorisés
+        _trade_metrics = profit_metrics(_profs)
+        profit_factor = _trade_metrics['profit_factor']
+        max_consec_losses = _trade_metrics['max_consecutive_losses']
 
     metrics['sharpe_ratio'] = round(float(sharpe), 4)
     metrics['sortino_ratio'] = round(float(sortino), 4)
@@ -293,19 +294,114 @@ def compute_risk_metrics(
     return metrics
 
 
+def _longest_true_run(mask: np.ndarray) -> int:
+    """Longest run of consecutive True values (vectorised)."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    if len(starts) == 0:
+        return 0
+    return int((np.flatnonzero(edges == -1) - starts).max())
+
+
+def compute_bar_risk_metrics(
+    equity_curve: np.ndarray,
+    periods_per_year: int = 8766,
+    risk_free_rate: float = RISK_FREE_RATE,
+    initial_equity: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Risk metrics from a bar-level, marked-to-market equity curve (PERF-04).
+
+    Unlike ``compute_risk_metrics`` no trade-level annualization correction
+    is applied: every bar (in or out of position) is a real observation.
+
+    Parameters
+    ----------
+    equity_curve : array-like
+        End-of-bar equity, one value per bar (``equity_out`` of
+        ``backtest_from_dataframe``).
+    periods_per_year : int
+        Number of bars per year.
+    risk_free_rate : float
+        Annual risk-free rate.
+    initial_equity : float, optional
+        Equity before the first bar; prepended as the return base.
+
+    Returns
+    -------
+    dict
+        sharpe_ratio, sortino_ratio, calmar_ratio, total_return_pct,
+        annual_return_pct, annual_volatility, max_drawdown,
+        max_underwater_bars, underwater_pct.
+    """
+    metrics = {k: v for k, v in _DEFAULT_METRICS.items()
+               if k not in ('profit_factor', 'max_consecutive_losses')}
+    metrics['max_underwater_bars'] = 0
+    metrics['underwater_pct'] = 0.0
+
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    if initial_equity is not None:
+        equity = np.concatenate(([initial_equity], equity))
+    if len(equity) < 3 or equity[0] <= 0 or not np.all(np.isfinite(equity)):
+        return metrics
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(equity) / equity[:-1]
+    returns = returns[np.isfinite(returns)]
+    if len(returns) < 2:
+        return metrics
+
+    years = max((len(equity) - 1) / periods_per_year, 1e-6)
+    total_return = (equity[-1] / equity[0]) - 1.0
+    if total_return > -1.0:
+        with np.errstate(over='ignore'):
+            annual_return = (1.0 + total_return) ** (1.0 / years) - 1.0
+        if not np.isfinite(annual_return):
+            annual_return = total_return / max(years, 1.0)
+    else:
+        annual_return = -1.0
+
+    ann = np.sqrt(periods_per_year)
+    rf_per_bar = (1.0 + risk_free_rate) ** (1.0 / periods_per_year) - 1.0
+    excess = returns - rf_per_bar
+    excess_mean = float(np.mean(excess))
+    excess_std = float(np.std(excess, ddof=1))
+    sharpe = excess_mean / excess_std * ann if excess_std > 1e-12 else 0.0
+    downside = excess[excess < 0]
+    downside_std = float(np.std(downside, ddof=1)) if len(downside) > 1 else excess_std
+    sortino = excess_mean / downside_std * ann if downside_std > 1e-12 else 0.0
+
+    cummax = np.maximum.accumulate(equity)
+    drawdowns = (cummax - equity) / cummax
+    max_dd = float(drawdowns.max())
+    calmar = annual_return / max_dd if max_dd > 1e-12 else 0.0
+    underwater = equity < cummax
+
+    metrics['sharpe_ratio'] = round(float(sharpe), 4)
+    metrics['sortino_ratio'] = round(float(sortino), 4)
+    metrics['calmar_ratio'] = round(float(calmar), 4)
+    metrics['total_return_pct'] = round(float(total_return * 100), 4)
+    metrics['annual_return_pct'] = round(float(annual_return * 100), 4)
+    metrics['annual_volatility'] = round(float(np.std(returns, ddof=1) * ann * 100), 4)
+    metrics['max_drawdown'] = round(max_dd, 6)
+    metrics['max_underwater_bars'] = _longest_true_run(underwater)
+    metrics['underwater_pct'] = round(float(underwater.mean() * 100), 4)
+    return metrics
+
+
 # ──────────────────────────────────────────────────────────────
 # Walk-Forward Fold Splitting  (P1.1)
 # ──────────────────────────────────────────────────────────────
-def split_walk_forward_folds(
-    df: pd.DataFrame,
+def split_walk_forward_ranges(
+    n_bars: int,
     n_folds: int = 4,
     initial_train_pct: float = 0.40,
     min_train_bars: int = 500,
     min_test_bars: int = 200,
     timeframe: Optional[str] = None,
-) -> List[Tuple[pd.DataFrame, pd.DataFrame]]:
+) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
     """
-    Split a DataFrame into anchored (expanding-window) walk-forward folds.
+    Anchored (expanding-window) walk-forward folds as bar index ranges (PERF-10).
 
     Layout example for 10 000 bars, ``n_folds=4``, ``initial_train_pct=0.40``::
 
@@ -314,10 +410,14 @@ def split_walk_forward_folds(
         Fold 3: Train [0 : 7000]  Test [7000 : 8500]
         Fold 4: Train [0 : 8500]  Test [8500 : 10000]
 
+    The ranges index a single shared DataFrame and are passed as
+    ``bar_range`` to ``backtest_from_dataframe``: no fold is copied, and the
+    bars before an OOS window warm up its indicators.
+
     Parameters
     ----------
-    df : DataFrame
-        Full dataset with indicators already computed.
+    n_bars : int
+        Length of the full dataset.
     n_folds : int
         Number of folds (≈ quarterly for 5-year data).
     initial_train_pct : float
@@ -327,9 +427,10 @@ def split_walk_forward_folds(
 
     Returns
     -------
-    list of (train_df, test_df) tuples
+    list of ((train_start, train_end), (test_start, test_end)) tuples
+        Half-open ``[start, end)`` bar ranges.
     """
-    n = len(df)
+    n = n_bars
 
     # Per-timeframe overrides: charts journaliers accumulent lentement des barres.
     # Réduire min_train et plafonner initial_train_pct permet d'obtenir ≥ 2 folds
@@ -375,7 +476,7 @@ def split_walk_forward_folds(
 
     test_window = max(test_pool // n_folds, min_test_bars)
 
-    folds: List[Tuple[pd.DataFrame, pd.DataFrame]] = []
+    ranges: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
     for fold_idx in range(n_folds):
         test_start = initial_train_end + fold_idx * test_window
         test_end = min(test_start + test_window, n)
@@ -385,19 +486,50 @@ def split_walk_forward_folds(
         if test_start >= n:
             break
 
-        train_df = df.iloc[:test_start].copy()
-        test_df = df.iloc[test_start:test_end].copy()
-
-        folds.append((train_df, test_df))
+        ranges.append(((0, test_start), (test_start, test_end)))
         logger.info(
             f"WF Fold {fold_idx + 1}/{n_folds}: "
-            f"train[0:{test_start}] ({len(train_df)} bars) | "
-            f"test[{test_start}:{test_end}] ({len(test_df)} bars)"
+            f"train[0:{test_start}] ({test_start} bars) | "
+            f"test[{test_start}:{test_end}] ({test_end - test_start} bars)"
         )
 
-    if not folds:
+    if not ranges:
         logger.warning("No valid walk-forward folds could be created")
-    return folds
+    return ranges
+
+
+def split_walk_forward_folds(
+    df: pd.DataFrame,
+    n_folds: int = 4,
+    initial_train_pct: float = 0.40,
+    min_train_bars: int = 500,
+    min_test_bars: int = 200,
+    timeframe: Optional[str] = None,
+) -> List[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Split a DataFrame into anchored (expanding-window) walk-forward folds.
+
+    Materialised copies of ``split_walk_forward_ranges``; the walk-forward
+    runners use the ranges directly (PERF-10).
+
+    Parameters
+    ----------
+    df : DataFrame
+        Full dataset with indicators already computed.
+    n_folds, initial_train_pct, min_train_bars, min_test_bars, timeframe
+        See ``split_walk_forward_ranges``.
+
+    Returns
+    -------
+    list of (train_df, test_df) tuples
+    """
+    return [
+        (df.iloc[train_start:train_end].copy(), df.iloc[test_start:test_end].copy())
+        for (train_start, train_end), (test_start, test_end) in split_walk_forward_ranges(
+            len(df), n_folds=n_folds, initial_train_pct=initial_train_pct,
+            min_train_bars=min_train_bars, min_test_bars=min_test_bars, timeframe=timeframe,
+        )
+    ]
 
 
 # ──────────────────────────────────────────────────────────────
@@ -419,9 +551,36 @@ def validate_oos_result(sharpe: float, win_rate: float) -> bool:
     return sharpe > sharpe_min and win_rate > wr_min
 
 
+def validate_oos_results(sharpe: np.ndarray, win_rate: np.ndarray) -> np.ndarray:
+    """Vectorised ``validate_oos_result``: boolean mask of results passing the gates (PERF-19)."""
+    sharpe_min, wr_min = _get_oos_thresholds()
+    return (np.asarray(sharpe) > sharpe_min) & (np.asarray(win_rate) > wr_min)
+
+
 # ──────────────────────────────────────────────────────────────
 # Walk-Forward Validation Engine  (P1.1)
 # ──────────────────────────────────────────────────────────────
+def _task_seed(base_seed: int, *key: Any) -> int:
+    """Graine stable d'une tâche WF (indépendante de ``PYTHONHASHSEED``)."""
+    digest = hashlib.blake2b(repr((base_seed,) + key).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') & 0x7FFFFFFF
+
+
+def _run_wf_tasks(
+    backtest_fn: Callable, tasks: List[Dict[str, Any]], max_workers: int,
+) -> List[Dict[str, Any]]:
+    """Exécute les backtests WF ; résultats dans l'ordre de ``tasks``."""
+    def _run(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        yield_to_foreground()  # PERF-20: cède la main au cycle live
+        return backtest_fn(**kwargs)
+
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [_run(kwargs) for kwargs in tasks]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        return list(executor.map(_run, tasks))
+
+
+@timed('walk_forward')
 def run_walk_forward_validation(
     base_dataframes: Dict[str, pd.DataFrame],
     full_sample_results: List[Dict[str, Any]],
@@ -432,6 +591,8 @@ def run_walk_forward_validation(
     top_n: int = 15,
     n_folds: int = 4,
     initial_train_pct: float = 0.40,
+    random_seed: int = 42,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Run anchored walk-forward validation for the top-N full-sample configs.
@@ -442,7 +603,12 @@ def run_walk_forward_validation(
     2. For each top-N config, split its timeframe's data into ``n_folds``
        anchored folds.
     3. For each fold, run the config on both train (IS) and test (OOS).
-    4. Average OOS Sharpe and Win Rate across folds.
+       The (config × fold × phase) backtests run on a thread pool; each OOS
+       task gets its own cost-model seed (counter-based draws inside the
+       engine, PERF-23), so results do not depend on the worker count or
+       completion order.
+    4. Average OOS Sharpe and Win Rate across folds; Monte Carlo confidence
+       intervals on the pooled OOS trades (``monte_carlo`` key, PERF-13).
     5. Select the config with the best average OOS Sharpe that passes
        the quality gates.
 
@@ -455,7 +621,9 @@ def run_walk_forward_validation(
     scenarios : list of dict
         Scenario definitions (same as used in run_all_backtests).
     backtest_fn : callable
-        ``backtest_from_dataframe(df, ema1, ema2, ..., sizing_mode, periods_per_year)``.
+        ``backtest_from_dataframe(df, ema1, ema2, ..., sizing_mode, periods_per_year)``;
+        ``df`` is the timeframe's ``BacktestInputs``, built once and shared
+        by every task (PERF-24: EMAs computed on first use).
     initial_capital : float
         Starting capital for P&L calculations.
     sizing_mode : str
@@ -466,6 +634,10 @@ def run_walk_forward_validation(
         Number of WF folds.
     initial_train_pct : float
         Initial training fraction (expanding window starts here).
+    random_seed : int
+        Base seed of the per-task OOS cost models (P2-02, PERF-23).
+    max_workers : int, optional
+        Backtest threads; default ``config.max_workers``, 1 = serial.
 
     Returns
     -------
@@ -481,8 +653,16 @@ def run_walk_forward_validation(
     # a second filter, but pre-selecting by Sharpe reduces the risk of the best OOS
     # config being eliminated before WF testing.
     # Cap at top-2 per timeframe to ensure 1h/4h/1d diversity.
+    # PERF-05: les configurations arrêtées par un critère absolu (drawdown, equity,
+    # nombre de trades) sont exclues.  Celles arrêtées par la borne de classement
+    # Calmar (abort_reason='unreachable') restent classées sur les bars simulés :
+    # ne pas battre le meilleur Calmar ne dit rien de leur Sharpe.
     _tf_buckets: Dict[str, List] = {}
-    for _r in sorted(full_sample_results, key=lambda x: x.get('sharpe_ratio', x.get('final_wallet', 0.0)), reverse=True):
+    _rankable = [
+        r for r in full_sample_results
+        if r.get('status') != 'pruned' or r.get('abort_reason') == 'unreachable'
+    ]
+    for _r in sorted(_rankable, key=lambda x: x.get('sharpe_ratio', x.get('final_wallet', 0.0)), reverse=True):
         _tf = _r.get('timeframe', '')
         if len(_tf_buckets.get(_tf, [])) < 2:
             _tf_buckets.setdefault(_tf, []).append(_r)
@@ -493,6 +673,10 @@ def run_walk_forward_validation(
         logger.warning("No full-sample results to validate")
         return {'best_wf_config': None, 'all_wf_results': [], 'any_passed': False}
 
+    # PERF-07: folds IS et OOS relus depuis la base de mémoïsation (le
+    # tirage counter-based du CostModel OOS est déterministe, PERF-23)
+    backtest_fn = memoize_backtest(backtest_fn)
+
     # Build scenario params lookup
     scenario_params_map = {s['name']: s['params'] for s in scenarios}
 
@@ -502,8 +686,27 @@ def run_walk_forward_validation(
     try:
         from bot_config import config as _bot_cfg
         _oos_decay_min = getattr(_bot_cfg, 'oos_decay_min', OOS_DECAY_MIN)
+        # PERF-04: métriques sur l'equity bar-à-bar écrite par le moteur
+        _bar_equity = bool(getattr(_bot_cfg, 'wf_bar_equity_metrics', False))
+        if max_workers is None:
+            max_workers = int(getattr(_bot_cfg, 'max_workers', 1) or 1)
+        # PERF-13: chemins Monte Carlo sur les trades OOS de chaque config
+        _mc_paths = int(getattr(_bot_cfg, 'monte_carlo_paths', 1000))
+        _mc_skip_prob = float(getattr(_bot_cfg, 'monte_carlo_skip_prob', 0.05))
+        _mc_fee_shock = float(getattr(_bot_cfg, 'monte_carlo_fee_shock', 0.5))
     except Exception:
         _oos_decay_min = OOS_DECAY_MIN
+        _bar_equity = False
+        _mc_paths, _mc_skip_prob, _mc_fee_shock = 1000, 0.05, 0.5
+    if max_workers is None:
+        max_workers = 1
+
+    # PERF-11: tâches (config × fold × phase) planifiées ici, exécutées en
+    # parallèle puis agrégées dans l'ordre de planification.
+    plans: List[Tuple[Dict[str, Any], List[Tuple[Tuple[int, int], Tuple[int, int]]], int]] = []
+    tasks: List[Dict[str, Any]] = []
+    # PERF-24: un jeu de tableaux par timeframe, partagé par toutes les tâches
+    inputs_by_tf: Dict[str, BacktestInputs] = {}
 
     for cfg in top_configs:
         tf = cfg['timeframe']
@@ -516,11 +719,10 @@ def run_walk_forward_validation(
 
         ppy = timeframe_to_periods_per_year(tf)
 
-        # Pre-compute EMA columns on full data (avoids warm-up artifacts in slices)
-        for period in (ema1, ema2):
-            col = f'ema_{period}'
-            if col not in full_df.columns:
-                full_df[col] = full_df['close'].ewm(span=period, adjust=False).mean()
+        # EMA calculées sur tout l'historique (pas d'artefact de warm-up dans
+        # les fenêtres), à la demande par BacktestInputs.ema
+        if tf not in inputs_by_tf:
+            inputs_by_tf[tf] = backtest_inputs(full_df)
 
         # ML-06: Adaptive initial_train_pct based on ATR percentile (last 30 days).
         # In high-volatility regimes (ATR >= 80th percentile), shorten the initial IS
@@ -545,9 +747,9 @@ def run_walk_forward_validation(
             except Exception as _ml06_err:
                 logger.debug("[ML-06] ATR adaptive initial_train_pct fallback: %s", _ml06_err)
 
-        # Split into folds
-        folds = split_walk_forward_folds(
-            full_df, n_folds=n_folds, initial_train_pct=_adaptive_train_pct, timeframe=tf,
+        # Split into folds (PERF-10: plages de bars sur full_df, sans copie)
+        folds = split_walk_forward_ranges(
+            len(full_df), n_folds=n_folds, initial_train_pct=_adaptive_train_pct, timeframe=tf,
         )
         if not folds:
             log_message = f"No WF folds for {tf}; skipping config {scenario_name} EMA({ema1},{ema2})"
@@ -568,36 +770,48 @@ def run_walk_forward_validation(
             continue
 
         s_params = scenario_params_map.get(scenario_name, {})
+        common = dict(
+            df=inputs_by_tf[tf], ema1_period=ema1, ema2_period=ema2,
+            sma_long=s_params.get('sma_long'),
+            adx_period=s_params.get('adx_period'),
+            trix_length=s_params.get('trix_length'),
+            trix_signal=s_params.get('trix_signal'),
+            sizing_mode=sizing_mode,
+            periods_per_year=ppy,
+        )
+        plans.append((cfg, folds, len(tasks)))
+        for fold_idx, (train_range, test_range) in enumerate(folds):
+            # ---- In-Sample (train) ----
+            tasks.append(dict(
+                common, bar_range=train_range,
+                **({'equity_out': np.empty(train_range[1] - train_range[0])} if _bar_equity else {}),
+            ))
+            # ---- Out-of-Sample (test) ----
+            # P2-02 / PERF-23: coûts stochastiques OOS uniquement, graine propre à la tâche
+            tasks.append(dict(
+                common, bar_range=test_range,
+                cost_model=dataclasses.replace(OOS_COST_MODEL, seed=_task_seed(
+                    random_seed, tf, ema1, ema2, scenario_name, fold_idx,
+                )),
+                **({'equity_out': np.empty(test_range[1] - test_range[0])} if _bar_equity else {}),
+            ))
+
+    results = _run_wf_tasks(backtest_fn, tasks, max_workers)
+
+    for cfg, folds, first in plans:
+        tf = cfg['timeframe']
+        ema1, ema2 = cfg['ema_periods']
+        scenario_name = cfg['scenario']
         oos_sharpes: List[float] = []
         oos_win_rates: List[float] = []
+        oos_trade_logs: List[np.ndarray] = []
         fold_details: List[Dict[str, Any]] = []
 
-        # P2-02: modèle de slippage stochastique activé uniquement en OOS
-        _oos_slippage = BasicSlippageModel()
-
-        for fold_idx, (train_df, test_df) in enumerate(folds):
-            # ---- In-Sample (train) ----
-            is_result = backtest_fn(
-                df=train_df, ema1_period=ema1, ema2_period=ema2,
-                sma_long=s_params.get('sma_long'),
-                adx_period=s_params.get('adx_period'),
-                trix_length=s_params.get('trix_length'),
-                trix_signal=s_params.get('trix_signal'),
-                sizing_mode=sizing_mode,
-                periods_per_year=ppy,
-            )
-
-            # ---- Out-of-Sample (test) ----
-            oos_result = backtest_fn(
-                df=test_df, ema1_period=ema1, ema2_period=ema2,
-                sma_long=s_params.get('sma_long'),
-                adx_period=s_params.get('adx_period'),
-                trix_length=s_params.get('trix_length'),
-                trix_signal=s_params.get('trix_signal'),
-                sizing_mode=sizing_mode,
-                periods_per_year=ppy,
-                slippage_model=_oos_slippage,  # P2-02: slippage stochastique OOS uniquement
-            )
+        for fold_idx, (train_range, test_range) in enumerate(folds):
+            is_result = results[first + 2 * fold_idx]
+            oos_result = results[first + 2 * fold_idx + 1]
+            if oos_result.get('trade_log') is not None:
+                oos_trade_logs.append(oos_result['trade_log'])
 
             oos_s = oos_result.get('sharpe_ratio', 0.0)
             oos_wr = oos_result.get('win_rate', 0.0)
@@ -606,8 +820,8 @@ def run_walk_forward_validation(
 
             fold_details.append({
                 'fold': fold_idx + 1,
-                'train_bars': len(train_df),
-                'test_bars': len(test_df),
+                'train_bars': train_range[1] - train_range[0],
+                'test_bars': test_range[1] - test_range[0],
                 'is_sharpe': is_result.get('sharpe_ratio', 0.0),
                 'is_sortino': is_result.get('sortino_ratio', 0.0),
                 'is_win_rate': is_result.get('win_rate', 0.0),
@@ -616,6 +830,7 @@ def run_walk_forward_validation(
                 'oos_sortino': oos_result.get('sortino_ratio', 0.0),
                 'oos_win_rate': oos_wr,
                 'oos_profit': oos_result.get('final_wallet', initial_capital) - initial_capital,
+                'oos_max_underwater_bars': oos_result.get('max_underwater_bars', 0),
                 'oos_passed': validate_oos_result(oos_s, oos_wr),
             })
 
@@ -638,6 +853,20 @@ def run_walk_forward_validation(
 
         pass_rate = float(np.mean([f['oos_passed'] for f in fold_details])) if fold_details else 0.0
 
+        # PERF-13: intervalles de confiance sur les aller-retours OOS de tous les folds
+        # (bootstrap + chocs de slippage/frais + ordres manqués, une seule passe numpy)
+        monte_carlo = None
+        if _mc_paths > 0 and oos_trade_logs:
+            with span('monte_carlo'):
+                monte_carlo = run_monte_carlo(
+                    oos_trade_logs, initial_wallet=initial_capital, n_paths=_mc_paths,
+                    skip_prob=_mc_skip_prob, fee_shock=_mc_fee_shock,
+                    n_bars_total=sum(test[1] - test[0] for _, test in folds),
+                    periods_per_year=timeframe_to_periods_per_year(tf),
+                    risk_free_rate=_get_risk_free_rate(),
+                    seed=_task_seed(random_seed, tf, ema1, ema2, scenario_name, 'monte_carlo'),
+                )
+
         wf_results.append({
             'timeframe': tf,
             'ema_periods': (ema1, ema2),
@@ -648,6 +877,7 @@ def run_walk_forward_validation(
             'passed_oos_gates': passed,
             'pass_rate': round(pass_rate, 2),
             'folds': fold_details,
+            'monte_carlo': monte_carlo,
         })
 
         logger.info(
@@ -656,6 +886,14 @@ def run_walk_forward_validation(
             f"OOS Sharpe={avg_oos_sharpe:.2f}, OOS WR={avg_oos_wr:.1f}% "
             f"{'PASS' if passed else 'FAIL'}"
         )
+        if monte_carlo is not None:
+            logger.info(
+                "  [MC] %s EMA(%s,%s) %s: %d chemins × %d trades — Sharpe IC [%.2f, %.2f], "
+                "DD max P95=%.1f%%, robustesse=%.0f%%",
+                scenario_name, ema1, ema2, tf, monte_carlo['n_paths'], monte_carlo['n_trades'],
+                monte_carlo['sharpe_ratio']['low'], monte_carlo['sharpe_ratio']['high'],
+                monte_carlo['max_drawdown']['high'] * 100, monte_carlo['robustness_score'] * 100,
+            )
 
     # 2. Select best WF-validated config
     passed_configs = [c for c in wf_results if c['passed_oos_gates']]
@@ -683,6 +921,75 @@ def run_walk_forward_validation(
 # ──────────────────────────────────────────────────────────────
 # ML-07: Optuna Bayesian WF Optimisation
 # ──────────────────────────────────────────────────────────────
+# Espace de recherche EMA de l'étude Optuna
+_EMA_MIN, _EMA1_MAX, _EMA_MAX, _EMA_GAP = 5, 50, 120, 5
+
+
+def _study_version(
+    frames: Dict[str, BacktestInputs],
+    scenario_params: Dict[str, Any],
+    sizing_mode: str,
+    n_folds: int,
+    initial_train_pct: float,
+) -> str:
+    """Empreinte des données, du moteur et de l'espace de recherche d'une étude."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(json.dumps(
+        [sorted(scenario_params.items()), sizing_mode, n_folds, initial_train_pct,
+         current_engine_version()],
+        sort_keys=True, default=str,
+    ).encode())
+    for tf in sorted(frames):
+        h.update(tf.encode())
+        h.update(frames[tf].prefix_fingerprint(len(frames[tf])).encode())
+    return h.hexdigest()
+
+
+def _study_journal_path(storage_dir: str, pair: str) -> str:
+    return os.path.join(storage_dir, re.sub(r'[^A-Za-z0-9_-]', '_', pair) + '.journal')
+
+
+def _open_study_journal(
+    optuna: Any, path: str, study_name: str, n_warm: int,
+) -> Tuple[Any, List[Dict[str, Any]]]:
+    """Journal Optuna d'une paire et paramètres à rejouer (PERF-12).
+
+    Le journal ne garde que l'étude de la version courante : si elle n'y est
+    pas, les ``n_warm`` meilleurs essais des études présentes sont relus puis
+    le fichier est recréé (taille bornée, relecture rapide).
+    """
+    from optuna.storages import JournalStorage
+    from optuna.storages.journal import JournalFileBackend
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    warm: List[Any] = []
+    if os.path.exists(path):
+        storage = JournalStorage(JournalFileBackend(path))
+        names = [summary.study_name for summary in storage.get_all_studies()]
+        if study_name in names:
+            return storage, []
+        for name in names:
+            warm.extend(
+                t for t in optuna.load_study(study_name=name, storage=storage).get_trials(
+                    deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,),
+                )
+                if t.value is not None and np.isfinite(t.value)
+            )
+        os.remove(path)
+    warm.sort(key=lambda t: t.value, reverse=True)
+    return JournalStorage(JournalFileBackend(path)), [dict(t.params) for t in warm[:n_warm]]
+
+
+def _make_pruner(optuna: Any, name: str, n_steps: int) -> Any:
+    """Élagueur sur le Sharpe IS moyen rapporté après chaque fold (PERF-12)."""
+    if name == 'hyperband':
+        return optuna.pruners.HyperbandPruner(min_resource=1, max_resource=max(1, n_steps))
+    if name == 'median':
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    return optuna.pruners.NopPruner()
+
+
+@timed('optuna')
 def run_walk_forward_optuna(
     base_dataframes: Dict[str, pd.DataFrame],
     scenarios: List[Dict[str, Any]],
@@ -693,6 +1000,8 @@ def run_walk_forward_optuna(
     initial_train_pct: float = 0.40,
     n_trials: int = 100,
     random_seed: int = 42,
+    pair: str = '',
+    n_jobs: Optional[int] = None,
 ) -> Dict[str, Any]:
     """Bayesian walk-forward optimisation via Optuna (ML-07).
 
@@ -702,6 +1011,15 @@ def run_walk_forward_optuna(
     data never seen during the study).  Best params are then audited on OOS
     folds with the same quality gates as ``run_walk_forward_validation``.
 
+    PERF-12: with ``pair`` set and ``config.optuna_persistent``, the study is
+    kept in a per-pair journal file.  A run on unchanged data resumes it
+    (only the missing trials are evaluated); on new data the best trials of
+    the previous study are replayed first (warm start).  Trials run on
+    ``n_jobs`` threads over one ``BacktestInputs`` per timeframe (each EMA is
+    computed lazily on first use and shared between trials), and
+    the running mean of the fold IS Sharpes is reported to a median or
+    hyperband pruner.
+
     Parameters
     ----------
     base_dataframes : dict
@@ -722,7 +1040,12 @@ def run_walk_forward_optuna(
     n_trials : int
         Number of Optuna trials (default 100; use smaller for tests).
     random_seed : int
-        TPE sampler seed for reproducibility.
+        TPE sampler seed for reproducibility (trials are only reproducible
+        with ``n_jobs=1``).
+    pair : str
+        Pair name keying the persistent study ('' = in-memory study).
+    n_jobs : int, optional
+        Parallel trials; default ``config.optuna_n_jobs`` (0 = ``max_workers``).
 
     Returns
     -------
@@ -749,6 +1072,9 @@ def run_walk_forward_optuna(
 
     _EMPTY: Dict[str, Any] = {'best_wf_config': None, 'all_wf_results': [], 'any_passed': False, 'method': 'optuna'}
 
+    # PERF-07: un essai déjà évalué sur les mêmes folds est relu depuis la base
+    backtest_fn = memoize_backtest(backtest_fn)
+
     scenario_params_map = {s['name']: s['params'] for s in scenarios}
     scenario_names = [s['name'] for s in scenarios]
     tf_list = [tf for tf, df in base_dataframes.items() if df is not None and not df.empty and len(df) >= 50]
@@ -757,10 +1083,12 @@ def run_walk_forward_optuna(
         return _EMPTY
 
     # Pre-build IS/OOS folds per timeframe (OOS never touched during study)
-    folds_by_tf: Dict[str, List[Tuple[pd.DataFrame, pd.DataFrame]]] = {}
+    # PERF-10: plages de bars sur le DataFrame partagé
+    folds_by_tf: Dict[str, List[Tuple[Tuple[int, int], Tuple[int, int]]]] = {}
     for tf in tf_list:
-        folds = split_walk_forward_folds(
-            base_dataframes[tf], n_folds=n_folds, initial_train_pct=initial_train_pct, timeframe=tf,
+        folds = split_walk_forward_ranges(
+            len(base_dataframes[tf]), n_folds=n_folds, initial_train_pct=initial_train_pct,
+            timeframe=tf,
         )
         if folds:
             folds_by_tf[tf] = folds
@@ -768,66 +1096,130 @@ def run_walk_forward_optuna(
     if not folds_by_tf:
         return _EMPTY
 
+    # PERF-12 / PERF-24: un jeu de tableaux par timeframe ; chaque EMA tirée
+    # par un essai est calculée au premier accès puis partagée entre essais.
+    study_frames = {tf: backtest_inputs(base_dataframes[tf]) for tf in folds_by_tf}
+
     # Load OOS thresholds
     oos_sharpe_min, oos_win_rate_min = _get_oos_thresholds()
+    _persistent = False
+    _storage_dir = ''
+    _pruner_name = 'median'
+    _warm_start_trials = 0
     try:
         from bot_config import config as _bot_cfg
         _oos_decay_min = getattr(_bot_cfg, 'oos_decay_min', OOS_DECAY_MIN)
+        # PERF-05: essais arrêtés dès qu'un fold IS atteint un critère d'abandon
+        _abort = (
+            abort_criteria_from_config(_bot_cfg)
+            if getattr(_bot_cfg, 'backtest_early_abort', False) else None
+        )
+        # PERF-12: étude persistante, essais parallèles, élagage
+        _persistent = bool(getattr(_bot_cfg, 'optuna_persistent', False))
+        _storage_dir = getattr(_bot_cfg, 'optuna_storage_dir', '') or os.path.join(
+            getattr(_bot_cfg, 'cache_dir', 'cache'), 'optuna'
+        )
+        _pruner_name = getattr(_bot_cfg, 'optuna_pruner', 'median')
+        _warm_start_trials = int(getattr(_bot_cfg, 'optuna_warm_start_trials', 0))
+        if n_jobs is None:
+            n_jobs = int(getattr(_bot_cfg, 'optuna_n_jobs', 0) or 0) or int(
+                getattr(_bot_cfg, 'max_workers', 1) or 1
+            )
     except Exception:
         _oos_decay_min = OOS_DECAY_MIN
+        _abort = None
+    _abort_kwargs = {'abort': _abort} if _abort is not None and _abort.enabled else {}
+    n_jobs = max(1, n_jobs or 1)
 
     def _objective(trial: 'optuna.Trial') -> float:
+        yield_to_foreground()  # PERF-20: cède la main au cycle live
         tf = trial.suggest_categorical('tf', list(folds_by_tf.keys()))
-        ema1 = trial.suggest_int('ema1', 5, 50)
-        ema2 = trial.suggest_int('ema2', ema1 + 5, 120)
+        ema1 = trial.suggest_int('ema1', _EMA_MIN, _EMA1_MAX)
+        ema2 = trial.suggest_int('ema2', ema1 + _EMA_GAP, _EMA_MAX)
         scenario_name = trial.suggest_categorical('scenario', scenario_names)
 
-        full_df = base_dataframes[tf]
+        full_df = study_frames[tf]
         ppy = timeframe_to_periods_per_year(tf)
         s_params = scenario_params_map.get(scenario_name, {})
 
-        # Ensure EMA columns exist on full_df (mutates in-place — safe, pandas copy-on-write)
-        for period in (ema1, ema2):
-            col = f'ema_{period}'
-            if col not in full_df.columns:
-                full_df[col] = full_df['close'].ewm(span=period, adjust=False).mean()
-
         is_sharpes: List[float] = []
-        for train_df, _oos_df in folds_by_tf[tf]:
-            # Ensure EMA on IS slice without mutating shared df
-            train_slice = train_df
-            for period in (ema1, ema2):
-                col = f'ema_{period}'
-                if col not in train_slice.columns:
-                    train_slice = train_slice.copy()
-                    train_slice[col] = train_slice['close'].ewm(span=period, adjust=False).mean()
+        for fold_idx, (train_range, _oos_range) in enumerate(folds_by_tf[tf]):
             try:
                 res = backtest_fn(
-                    df=train_slice, ema1_period=ema1, ema2_period=ema2,
+                    df=full_df, bar_range=train_range, ema1_period=ema1, ema2_period=ema2,
                     sma_long=s_params.get('sma_long'),
                     adx_period=s_params.get('adx_period'),
                     trix_length=s_params.get('trix_length'),
                     trix_signal=s_params.get('trix_signal'),
                     sizing_mode=sizing_mode,
                     periods_per_year=ppy,
+                    **_abort_kwargs,
                 )
                 sr = res.get('sharpe_ratio', 0.0)
                 if isinstance(sr, (int, float)) and sr == sr:  # not NaN
                     is_sharpes.append(float(sr))
             except Exception as _e:
                 logger.debug("[ML-07] trial %d IS fold failed: %s", trial.number, _e)
+                continue
+            if res.get('status') == 'pruned':
+                raise optuna.TrialPruned(
+                    f"IS fold arrêté ({res.get('abort_reason')})"
+                )
+            # PERF-12: score intermédiaire = Sharpe IS moyen des folds évalués
+            if is_sharpes:
+                trial.report(float(sum(is_sharpes) / len(is_sharpes)), fold_idx)
+                if trial.should_prune():
+                    raise optuna.TrialPruned(f"élagué au fold {fold_idx + 1}")
 
         if not is_sharpes:
             return float('-inf')
         return float(sum(is_sharpes) / len(is_sharpes))
 
+    # PERF-12: étude persistée par paire, identifiée par la version des données
+    storage: Any = None
+    warm_params: List[Dict[str, Any]] = []
+    study_name = 'wf-optuna'
+    if pair and _persistent:
+        study_name = 'wf-' + _study_version(
+            study_frames, scenario_params_map, sizing_mode, n_folds, initial_train_pct,
+        )
+        try:
+            storage, warm_params = _open_study_journal(
+                optuna, _study_journal_path(_storage_dir, pair), study_name, _warm_start_trials,
+            )
+        except Exception as _st_err:
+            logger.warning("[ML-07] Journal Optuna indisponible (%s) — étude en mémoire", _st_err)
+            storage, warm_params = None, []
+
     study = optuna.create_study(
+        study_name=study_name,
+        storage=storage,
+        load_if_exists=storage is not None,
         direction='maximize',
         sampler=optuna.samplers.TPESampler(seed=random_seed),
+        pruner=_make_pruner(optuna, _pruner_name, max(len(f) for f in folds_by_tf.values())),
+    )
+    for params in warm_params:
+        if (
+            params.get('tf') in folds_by_tf and params.get('scenario') in scenario_names
+            and _EMA_MIN <= params.get('ema1', 0) <= _EMA1_MAX
+            and params['ema1'] + _EMA_GAP <= params.get('ema2', 0) <= _EMA_MAX
+        ):
+            study.enqueue_trial(params, skip_if_exists=True)
+    _done = len(study.get_trials(
+        deepcopy=False,
+        states=(optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED),
+    ))
+    if _done:
+        logger.info("[ML-07] Étude %s reprise : %d essais déjà évalués", study_name, _done)
+    study.optimize(
+        _objective, n_trials=max(0, n_trials - _done), n_jobs=n_jobs, show_progress_bar=False,
     )
-    study.optimize(_objective, n_trials=n_trials, show_progress_bar=False)
 
-    if study.best_trial is None or study.best_value == float('-inf'):
+    _completed_trials = study.get_trials(
+        deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)
+    )
+    if not _completed_trials or study.best_value == float('-inf'):
         logger.warning("[ML-07] Optuna study found no valid trial")
         return _EMPTY
 
@@ -843,39 +1235,24 @@ def run_walk_forward_optuna(
     )
 
     # OOS audit with best params (data never seen during study)
-    full_df = base_dataframes[best_tf]
+    full_df = study_frames[best_tf]
     ppy = timeframe_to_periods_per_year(best_tf)
     s_params = scenario_params_map.get(best_scenario, {})
 
-    for period in (best_ema1, best_ema2):
-        col = f'ema_{period}'
-        if col not in full_df.columns:
-            full_df[col] = full_df['close'].ewm(span=period, adjust=False).mean()
-
     oos_sharpes: List[float] = []
     oos_win_rates: List[float] = []
     fold_details: List[Dict[str, Any]] = []
 
-    for fold_idx, (train_df, test_df) in enumerate(folds_by_tf[best_tf]):
-        train_slice = train_df
-        test_slice = test_df
-        for period in (best_ema1, best_ema2):
-            col = f'ema_{period}'
-            if col not in train_slice.columns:
-                train_slice = train_slice.copy()
-                train_slice[col] = train_slice['close'].ewm(span=period, adjust=False).mean()
-            if col not in test_slice.columns:
-                test_slice = test_slice.copy()
-                test_slice[col] = test_slice['close'].ewm(span=period, adjust=False).mean()
+    for fold_idx, (train_range, test_range) in enumerate(folds_by_tf[best_tf]):
         try:
             is_res = backtest_fn(
-                df=train_slice, ema1_period=best_ema1, ema2_period=best_ema2,
+                df=full_df, bar_range=train_range, ema1_period=best_ema1, ema2_period=best_ema2,
                 sma_long=s_params.get('sma_long'), adx_period=s_params.get('adx_period'),
                 trix_length=s_params.get('trix_length'), trix_signal=s_params.get('trix_signal'),
                 sizing_mode=sizing_mode, periods_per_year=ppy,
             )
             oos_res = backtest_fn(
-                df=test_slice, ema1_period=best_ema1, ema2_period=best_ema2,
+                df=full_df, bar_range=test_range, ema1_period=best_ema1, ema2_period=best_ema2,
                 sma_long=s_params.get('sma_long'), adx_period=s_params.get('adx_period'),
                 trix_length=s_params.get('trix_length'), trix_signal=s_params.get('trix_signal'),
                 sizing_mode=sizing_mode, periods_per_year=ppy,
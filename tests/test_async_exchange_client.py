@@ -0,0 +1,195 @@
+"""Tests du client Binance asynchrone contre un serveur d'échange local (async_exchange_client, PERF-25)."""
+import asyncio
+import hashlib
+import hmac
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+import exchange_client  # noqa: E402
+from async_exchange_client import AsyncBinanceClient, SyncExchangeBridge  # noqa: E402
+from binance.exceptions import BinanceAPIException  # noqa: E402
+
+_KEY = 'test_api_key'
+_SECRET = 'test_secret_key_for_hmac'
+
+
+class _MockExchange:
+    """Serveur aiohttp imitant les routes Binance utilisées, dans un thread dédié."""
+
+    def __init__(self) -> None:
+        self.clock_skew_errors = 0  # réponses -1021 restantes
+        self.drops = 0  # connexions coupées restantes
+        self.delay = 0.0
+        self.peers = []
+        self.time_calls = 0
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+
+    def _serve(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_get('/api/v3/ping', self._ping)
+        app.router.add_get('/api/v3/time', self._time)
+        app.router.add_get('/api/v3/exchangeInfo', self._exchange_info)
+        app.router.add_get('/api/v3/ticker/price', self._ticker)
+        app.router.add_get('/api/v3/account', self._account)
+        app.router.add_post('/api/v3/order', self._order)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        self._loop.run_until_complete(site.start())
+        server = site._server
+        assert isinstance(server, asyncio.Server)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.port}'
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+    @staticmethod
+    def _error(status: int, code: int, msg: str) -> web.Response:
+        return web.json_response({'code': code, 'msg': msg}, status=status)
+
+    def _check_signature(self, request: web.Request):
+        if request.headers.get('X-MBX-APIKEY') != _KEY:
+            return self._error(401, -2014, 'API-key format invalid.')
+        query, _, signature = request.query_string.rpartition('&signature=')
+        expected = hmac.new(_SECRET.encode(), query.encode(), hashlib.sha256).hexdigest()
+        if signature != expected or 'timestamp' not in request.query:
+            return self._error(400, -1022, 'Signature for this request is not valid.')
+        if self.clock_skew_errors:
+            self.clock_skew_errors -= 1
+            return self._error(400, -1021, 'Timestamp for this request is outside of the recvWindow.')
+        return None
+
+    async def _ping(self, request):
+        self.peers.append(request.transport.get_extra_info('peername')[1])
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return web.json_response({})
+
+    async def _time(self, request):
+        self.time_calls += 1
+        return web.json_response({'serverTime': int(time.time() * 1000)})
+
+    async def _exchange_info(self, request):
+        symbol = request.query.get('symbol')
+        if symbol and symbol != 'BTCUSDC':
+            return self._error(400, -1121, 'Invalid symbol.')
+        return web.json_response({'symbols': [{'symbol': 'BTCUSDC', 'status': 'TRADING'}]})
+
+    async def _ticker(self, request):
+        if self.drops:
+            self.drops -= 1
+            request.transport.close()
+            await asyncio.sleep(0.1)
+        return web.json_response({'symbol': request.query.get('symbol'), 'price': '65000.00'})
+
+    async def _account(self, request):
+        error = self._check_signature(request)
+        if error is not None:
+            return error
+        return web.json_response({'balances': [{'asset': 'USDC', 'free': '100.0', 'locked': '0.0'}]})
+
+    async def _order(self, request):
+        error = self._check_signature(request)
+        if error is not None:
+            return error
+        if float(request.query['quoteOrderQty']) > 100:
+            return self._error(400, -2010, 'Account has insufficient balance for requested action.')
+        return web.json_response({'symbol': request.query['symbol'], 'side': request.query['side'],
+                                  'type': request.query['type'], 'status': 'FILLED'})
+
+
+@pytest.fixture
+def exchange():
+    server = _MockExchange()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(autouse=True)
+def _reset_circuit():
+    exchange_client._circuit_state.update(failure_count=0, open_until=0.0)
+    yield
+    exchange_client._circuit_state.update(failure_count=0, open_until=0.0)
+
+
+def _bridge(exchange, secret=_SECRET, **kwargs):
+    kwargs.setdefault('backoff', lambda attempt: 0.01)
+    client = AsyncBinanceClient(_KEY, secret, base_url=exchange.url, resync_delay=0.01, **kwargs)
+    return SyncExchangeBridge(client, call_timeout=10)
+
+
+def test_signed_requests_and_error_mapping(exchange):
+    with _bridge(exchange) as bridge:
+        assert bridge.get_account()['balances'][0]['asset'] == 'USDC'
+        order = bridge.order_market_buy(symbol='BTCUSDC', quoteOrderQty=50)
+        assert (order['side'], order['type'], order['status']) == ('BUY', 'MARKET', 'FILLED')
+        with pytest.raises(BinanceAPIException) as exc:
+            bridge.order_market_buy(symbol='BTCUSDC', quoteOrderQty=500)
+        assert exc.value.code == -2010 and exc.value.status_code == 400
+        assert bridge.get_symbol_info('BTCUSDC')['status'] == 'TRADING'
+        assert bridge.get_symbol_info('NOPEUSDC') is None
+    with _bridge(exchange, secret='wrong') as bridge:
+        with pytest.raises(BinanceAPIException) as exc:
+            bridge.get_account()
+        assert exc.value.code == -1022
+
+
+def test_clock_skew_resyncs_and_retries(exchange):
+    with _bridge(exchange) as bridge:
+        bridge.get_account()
+        calls = exchange.time_calls
+        exchange.clock_skew_errors = 1
+        assert bridge.get_account()['balances']
+        assert exchange.time_calls > calls
+
+
+def test_network_error_retried_then_counted_by_circuit(exchange):
+    with _bridge(exchange) as bridge:
+        exchange.drops = 1
+        assert bridge.get_symbol_ticker(symbol='BTCUSDC')['price'] == '65000.00'
+        exchange.drops = 100  # aiohttp relance aussi une connexion keep-alive coupée
+        with pytest.raises(aiohttp.ClientError):
+            bridge.get_symbol_ticker(symbol='BTCUSDC')
+        assert exchange_client._circuit_state['failure_count'] == 1
+
+
+def test_pooled_keepalive_and_concurrent_calls(exchange):
+    with _bridge(exchange) as bridge:
+        for _ in range(5):
+            bridge.ping()
+        assert len(set(exchange.peers)) == 1  # connexion réutilisée (keep-alive)
+        exchange.delay = 0.2
+        start = time.perf_counter()
+        results = bridge.gather(*(bridge.client.ping() for _ in range(10)))
+        assert results == [{}] * 10
+        assert time.perf_counter() - start < 1.0  # 10 × 0.2 s en séquentiel
+
+
+def test_bridge_implements_exchange_port():
+    port_methods = {name for name in vars(exchange_client.ExchangePort) if not name.startswith('_')}
+    assert port_methods
+    for name in port_methods:
+        assert callable(getattr(SyncExchangeBridge, name))
+        assert asyncio.iscoroutinefunction(getattr(AsyncBinanceClient, name))
@@ -0,0 +1,213 @@
+"""Tests de l'arrêt anticipé des backtests (backtest_abort, PERF-05)."""
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+
+class TestAbortCriteria:
+    def test_growth_bound_is_suffix_product_of_gains(self):
+        from backtest_abort import growth_upper_bound
+        close = np.array([100.0, 110.0, 99.0, 120.0])
+        bound = growth_upper_bound(close)
+        np.testing.assert_allclose(bound, [1.1 * 120 / 99, 120 / 99, 120 / 99, 1.0])
+
+    def test_growth_bound_uses_open_gaps(self):
+        from backtest_abort import growth_upper_bound
+        close = np.array([100.0, 100.0])
+        open_ = np.array([100.0, 90.0])
+        # gap baissier puis remontée intrabar : 1 × 100/90
+        assert growth_upper_bound(close, open_)[0] == pytest.approx(100 / 90)
+        assert growth_upper_bound(np.array([100.0, np.nan, 100.0]))[0] == math.inf
+
+    def test_check_abort_codes(self):
+        from backtest_abort import (
+            ABORT_EQUITY_FLOOR, ABORT_MAX_DRAWDOWN, ABORT_MIN_TRADES, ABORT_NONE,
+            ABORT_UNREACHABLE, AbortCriteria, check_abort,
+        )
+        assert not AbortCriteria().enabled
+        assert check_abort(AbortCriteria(max_drawdown=0.2), 5, 900.0, 0.25, 1, 1000.0) \
+            == ABORT_MAX_DRAWDOWN
+        assert check_abort(AbortCriteria(equity_floor=950.0), 5, 900.0, 0.1, 1, 1000.0) \
+            == ABORT_EQUITY_FLOOR
+        crit = AbortCriteria(min_trades=2, min_trades_bar=10)
+        assert check_abort(crit, 9, 1000.0, 0.0, 0, 1000.0) == ABORT_NONE
+        assert check_abort(crit, 10, 1000.0, 0.0, 1, 1000.0) == ABORT_MIN_TRADES
+        crit = AbortCriteria(min_score=0.0)
+        assert check_abort(crit, 5, 900.0, 0.1, 1, 1000.0, growth=1.05) == ABORT_UNREACHABLE
+        assert check_abort(crit, 5, 900.0, 0.1, 1, 1000.0, growth=1.2) == ABORT_NONE
+        # la borne de score n'est évaluée qu'hors position
+        assert check_abort(crit, 5, 900.0, 0.1, 1, 1000.0, growth=1.05, in_position=True) \
+            == ABORT_NONE
+
+    def test_leaderboard_ignores_pruned(self):
+        from backtest_abort import AbortCriteria, Leaderboard
+        board = Leaderboard()
+        assert board.criteria(AbortCriteria()).min_score is None
+        board.offer({'initial_wallet': 1000.0, 'final_wallet': 1100.0, 'max_drawdown': 0.05})
+        board.offer({'initial_wallet': 1000.0, 'final_wallet': 5000.0, 'max_drawdown': 0.05,
+                     'status': 'pruned'})
+        assert board.best_score == pytest.approx(2.0)
+
+    def test_select_best_by_calmar_skips_pruned(self):
+        from trade_helpers import select_best_by_calmar
+        done = {'initial_wallet': 1000.0, 'final_wallet': 1050.0, 'max_drawdown': 0.1}
+        pruned = {'initial_wallet': 1000.0, 'final_wallet': 1500.0, 'max_drawdown': 0.1,
+                  'status': 'pruned'}
+        assert select_best_by_calmar([pruned, done]) is done
+        assert select_best_by_calmar([pruned]) is pruned
+
+
+class TestBacktestAbort:
+    def _run(self, python_only, monkeypatch, trend='up', **kwargs):
+        import backtest_runner
+        if python_only:
+            monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+        df = _make_ohlcv(500, trend=trend)
+        return backtest_runner.backtest_from_dataframe(
+            df, ema1_period=kwargs.pop('ema1', 12), ema2_period=kwargs.pop('ema2', 22),
+            sizing_mode='baseline', partial_enabled=False, **kwargs,
+        )
+
+    @pytest.mark.parametrize('python_only', [True, False])
+    def test_min_trades_prunes_at_bar(self, monkeypatch, python_only):
+        from backtest_abort import AbortCriteria
+        buf = np.empty(500)
+        result = self._run(
+            python_only, monkeypatch,
+            abort=AbortCriteria(min_trades=1000, min_trades_bar=50), equity_out=buf,
+        )
+        if result.get('status') is None:
+            pytest.skip("backtest_engine_standard (PERF-05) non compilé")
+        assert result['status'] == 'pruned'
+        assert result['abort_reason'] == 'min_trades'
+        assert result['bars_run'] == 51
+        assert np.all(np.isfinite(buf[:51]))
+        assert np.all(np.isnan(buf[51:]))
+
+    def test_completed_run_reports_status(self, monkeypatch):
+        result = self._run(True, monkeypatch)
+        assert result['status'] == 'completed'
+        assert result['abort_reason'] is None
+        assert result['bars_run'] == 500
+
+    def test_cython_matches_python(self, monkeypatch):
+        """Le moteur compilé s'arrête au même bar que la boucle Python.
+
+        Le critère ``max_drawdown`` n'est pas comparé : chaque moteur utilise
+        son propre drawdown inline (mesures historiquement différentes).
+        """
+        import backtest_runner
+        from backtest_abort import AbortCriteria
+        from backtest_runner import config
+        if backtest_runner._CYTHON_API_LEVEL < 3:
+            pytest.skip("backtest_engine_standard (PERF-05) non compilé")
+        for crit in (
+            AbortCriteria(min_score=0.0),
+            AbortCriteria(equity_floor=config.initial_wallet * 0.99),
+            AbortCriteria(min_trades=3, min_trades_bar=200),
+        ):
+            cy = self._run(False, monkeypatch, trend='down', abort=crit)
+            with monkeypatch.context() as m:
+                py = self._run(True, m, trend='down', abort=crit)
+            assert (cy['status'], cy['abort_reason'], cy['bars_run']) == \
+                (py['status'], py['abort_reason'], py['bars_run'])
+            assert cy['final_wallet'] == pytest.approx(py['final_wallet'], rel=1e-9)
+
+    @pytest.mark.parametrize('trend', ['up', 'down', 'flat'])
+    def test_score_bound_never_prunes_a_winner(self, monkeypatch, trend):
+        """Une configuration arrêtée n'aurait pas atteint la borne de classement."""
+        from backtest_abort import AbortCriteria
+        from backtest_runner import config
+        from trade_helpers import calmar_key
+        for ema1, ema2 in ((5, 15), (12, 22), (20, 40)):
+            full = self._run(True, monkeypatch, trend=trend, ema1=ema1, ema2=ema2)
+            full['initial_wallet'] = config.initial_wallet
+            score = calmar_key(full)
+            for min_score, must_prune in ((score - 1e-6, False), (0.0, None)):
+                res = self._run(True, monkeypatch, trend=trend, ema1=ema1, ema2=ema2,
+                                abort=AbortCriteria(min_score=min_score))
+                if must_prune is False:
+                    assert res['status'] == 'completed'
+                if res['status'] == 'pruned':
+                    assert full['calmar_ratio'] <= 0
+                    assert score < min_score
+
+
+class _ConfigOverride:
+    """Vue de ``config`` avec quelques attributs remplacés (config gelée)."""
+
+    def __init__(self, base, **overrides):
+        self._base = base
+        self.__dict__.update(overrides)
+
+    def __getattr__(self, name):
+        return getattr(self._base, name)
+
+
+class TestRunAllBacktestsAbort:
+    def test_abort_waves_cover_tasks(self):
+        from backtest_runner import _abort_waves
+        assert _abort_waves(0, 4) == []
+        assert _abort_waves(13, 2) == [(0, 2), (2, 6), (6, 13)]
+
+    def test_score_bound_does_not_depend_on_completion_order(self, monkeypatch):
+        """Borne figée par vague : mêmes critères par tâche quel que soit l'ordre des threads."""
+        import random
+        import time
+        import backtest_runner
+        monkeypatch.setattr(backtest_runner, 'config', _ConfigOverride(
+            backtest_runner.config, backtest_early_abort=True, max_workers=4,
+            backtest_executor='thread', backtest_keep_trade_logs=-1,
+        ))
+        df = _make_ohlcv(300)
+        df['rsi'] = 50.0
+
+        def _run(seed):
+            rng = random.Random(seed)
+            seen = {}
+
+            def fake_run_single(task):
+                tf, e1, e2, scenario, _df, _pair, _sizing, _stoch, abort = task
+                time.sleep(rng.uniform(0.0, 0.01))
+                seen[(e1, e2, scenario['name'])] = abort.min_score
+                return {'timeframe': tf, 'ema_periods': (e1, e2), 'scenario': scenario['name'],
+                        'initial_wallet': 1000.0, 'final_wallet': 1000.0 + 7 * e1 + len(scenario['name']),
+                        'max_drawdown': 0.1, 'trade_log': None}
+
+            monkeypatch.setattr(backtest_runner, 'run_single_backtest_optimized', fake_run_single)
+            backtest_runner.run_all_backtests(
+                'TESTUSDC', '01 Jan 2024', ['4h'], prepare_base_dataframe_fn=lambda *a, **kw: df,
+            )
+            return seen
+
+        first = _run(1)
+        assert len(first) > 4 and list(first.values()).count(None) == 4
+        assert _run(2) == first
+
+
+class TestGridSearchAbort:
+    def test_pruned_runs_are_not_valid(self):
+        from backtest_orchestrator import run_stoch_threshold_grid_search
+        seen = []
+
+        def backtest_fn(df, ema1_period, ema2_period, **kwargs):
+            seen.append(kwargs.get('abort'))
+            return {'calmar_ratio': 5.0, 'status': 'pruned'}
+
+        out = run_stoch_threshold_grid_search(
+            is_results=[{'timeframe': '4h', 'ema_periods': (12, 22), 'scenario': 'StochRSI',
+                         'calmar_ratio': 1.0}],
+            base_dataframes={'4h': _make_ohlcv(100)},
+            backtest_fn=backtest_fn,
+            scenario_default_params={'StochRSI': {}},
+            n_top=1,
+        )
+        assert seen and all(a is not None and a.min_score == 0.0 for a in seen)
+        assert out is None or out['n_valid'] == 0
@@ -0,0 +1,92 @@
+"""Tests PERF-02 : boucle Cython exécutée sans le GIL (buffer C de trades)."""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'bin'))
+
+
+@pytest.fixture
+def engine():
+    try:
+        import backtest_engine_standard as be
+        return be
+    except ImportError:
+        pytest.skip("backtest_engine_standard non compilé")
+
+
+def _arrays(n=3000, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = close * (1 + rng.normal(0, 0.002, n))
+    high = np.maximum(close, open_) * 1.003
+    low = np.minimum(close, open_) * 0.997
+    alpha1, alpha2 = 2 / 13, 2 / 27
+    ema1 = np.empty(n)
+    ema2 = np.empty(n)
+    ema1[0] = ema2[0] = close[0]
+    for i in range(1, n):
+        ema1[i] = alpha1 * close[i] + (1 - alpha1) * ema1[i - 1]
+        ema2[i] = alpha2 * close[i] + (1 - alpha2) * ema2[i - 1]
+    stoch = rng.uniform(0, 1, n)
+    atr = np.abs(rng.normal(1.0, 0.3, n))
+    return close, high, low, ema1, ema2, stoch, atr, open_
+
+
+class TestNogilEngine:
+    def test_concurrent_threads_match_serial(self, engine):
+        """Des appels concurrents (threads) donnent les mêmes résultats qu'en série."""
+        c, h, lo, e1, e2, s, a, o = _arrays()
+
+        def run(k):
+            return engine.backtest_from_dataframe_fast(
+                c, h, lo, e1, e2, s, a, open_prices=o, partial_enabled=True,
+                stoch_threshold_sell=0.3 + 0.05 * k,
+            )
+
+        serial = [run(k) for k in range(6)]
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            threaded = list(pool.map(run, range(6)))
+        for a_res, b_res in zip(serial, threaded):
+            assert a_res['final_wallet'] == b_res['final_wallet']
+            assert a_res['trades'] == b_res['trades']
+
+    def test_trade_records_keep_legacy_format(self, engine):
+        """Les dicts construits après la boucle gardent les clés historiques."""
+        c, h, lo, e1, e2, s, a, o = _arrays()
+        result = engine.backtest_from_dataframe_fast(
+            c, h, lo, e1, e2, s, a, open_prices=o, partial_enabled=True, min_notional=1.0,
+        )
+        expected = {
+            'BUY': {'type', 'price'},
+            'SELL': {'type', 'price', 'profit'},
+            'partial_sell_1': {'type', 'price', 'qty', 'proceeds', 'profit_pct'},
+            'partial_sell_2': {'type', 'price', 'qty', 'proceeds', 'profit_pct'},
+        }
+        assert result['trades']
+        for trade in result['trades']:
+            assert set(trade) == expected[trade['type']]
+        sells = sum(1 for t in result['trades'] if t['type'] == 'SELL')
+        assert sells == result['total_trades']
+
+    def test_read_only_inputs_accepted(self, engine):
+        """Les memoryviews const acceptent des tableaux en lecture seule."""
+        arrays = _arrays(500)
+        for arr in arrays:
+            arr.flags.writeable = False
+        c, h, lo, e1, e2, s, a, o = arrays
+        result = engine.backtest_from_dataframe_fast(c, h, lo, e1, e2, s, a, open_prices=o)
+        assert 'final_wallet' in result
+
+    def test_many_trades_grow_buffer(self, engine):
+        """Le buffer C s'agrandit au-delà de sa capacité initiale."""
+        c, h, lo, e1, e2, s, a, o = _arrays(20000, seed=3)
+        result = engine.backtest_from_dataframe_fast(
+            c, h, lo, e1, e2, s, a, open_prices=o,
+            stoch_threshold_buy=1.0, stoch_threshold_buy_min=-1.0, stoch_threshold_sell=-1.0,
+        )
+        assert len(result['trades']) > 64
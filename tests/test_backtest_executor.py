@@ -0,0 +1,134 @@
+"""Tests du pool de processus de backtests (backtest_executor, PERF-01)."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+
+@pytest.fixture
+def pool():
+    import backtest_executor
+    backtest_executor.shutdown_process_pool()
+    yield backtest_executor.get_process_pool(max_workers=2)
+    backtest_executor.shutdown_process_pool()
+
+
+def _attached_blocks():
+    """Blocs encore attachés par le worker (exécuté dans le pool)."""
+    import backtest_executor
+    return sorted(backtest_executor._worker_frames)
+
+
+SCENARIOS = [
+    {'name': 'StochRSI', 'params': {'stoch_period': 14}},
+    {'name': 'StochRSI_SMA', 'params': {'stoch_period': 14, 'sma_long': 50}},
+    {'name': 'StochRSI_TRIX', 'params': {'stoch_period': 14, 'trix_length': 7, 'trix_signal': 15}},
+]
+
+
+class TestSharedFrames:
+    def test_publish_roundtrip_in_worker(self, pool):
+        """Le DataFrame reconstruit par un worker est identique à l'original."""
+        from backtest_executor import _attach_frame, publish_frames, release_frames
+        df = _make_ohlcv(300)
+        specs, blocks = publish_frames({'4h': df})
+        try:
+            back = pool.submit(_attach_frame, specs['4h']).result(timeout=60)
+        finally:
+            release_frames(blocks)
+        assert list(back.columns) == list(df.columns)
+        assert back.index.equals(df.index)
+        np.testing.assert_array_equal(back.to_numpy(), df.to_numpy(dtype=np.float64))
+
+    def test_non_numeric_columns_are_skipped(self):
+        from backtest_executor import publish_frames, release_frames
+        df = _make_ohlcv(60)
+        df['label'] = 'x'
+        specs, blocks = publish_frames({'k': df})
+        release_frames(blocks)
+        assert 'label' not in specs['k'].columns
+        assert specs['k'].n_rows == 60
+
+
+class TestProcessExecution:
+    def _tasks(self):
+        df_a = _make_ohlcv(400, trend='up')
+        df_b = _make_ohlcv(400, trend='flat')
+        tasks = []
+        for tf, df in (('1h', df_a), ('4h', df_b)):
+            for ema1, ema2 in ((12, 22), (20, 40)):
+                for scenario in SCENARIOS:
+                    tasks.append((tf, ema1, ema2, scenario, df, 'TESTUSDC', 'risk'))
+        return tasks
+
+    def test_results_match_serial_and_keep_task_order(self, pool):
+        """Mêmes résultats qu'en série, dans l'ordre des tâches."""
+        from backtest_executor import run_backtest_tasks_in_processes
+        from backtest_runner import run_single_backtest_optimized
+        tasks = self._tasks()
+        seen = []
+        results = run_backtest_tasks_in_processes(tasks, chunksize=3, on_result=seen.append)
+        assert len(results) == len(tasks) == len(seen)
+        for task, res in zip(tasks, results):
+            serial = run_single_backtest_optimized(task)
+            assert (res['timeframe'], res['ema_periods'], res['scenario']) == (
+                task[0], (task[1], task[2]), task[3]['name']
+            )
+            assert res['final_wallet'] == pytest.approx(serial['final_wallet'])
+            assert res['sharpe_ratio'] == pytest.approx(serial['sharpe_ratio'])
+            for field in serial['trade_log'].dtype.names:
+                np.testing.assert_array_equal(res['trade_log'][field], serial['trade_log'][field])
+
+    def test_stoch_thresholds_are_shipped_with_tasks(self, pool):
+        """Les seuils StochRSI modifiés dans le parent après le fork sont appliqués dans les workers."""
+        from backtest_executor import run_backtest_tasks_in_processes
+        from bot_config import config
+        task = self._tasks()[0]
+        [before] = run_backtest_tasks_in_processes([task])
+        assert len(before['trade_log']) > 0
+        # Workers déjà démarrés : seule la transmission dans la tâche peut leur
+        # faire voir ces seuils (aucune entrée possible)
+        saved = (config.stoch_rsi_buy_min, config.stoch_rsi_buy_max, config.stoch_rsi_sell_exit)
+        config.update_stoch_thresholds(0.0, 0.0, 0.5)
+        try:
+            [after] = run_backtest_tasks_in_processes([task])
+        finally:
+            config.update_stoch_thresholds(*saved)
+        assert len(after['trade_log']) == 0
+        assert after['final_wallet'] == pytest.approx(after['initial_wallet'])
+
+    def test_worker_closes_released_blocks(self):
+        """Les blocs d'un cycle terminé sont détachés du worker à la tâche suivante."""
+        import backtest_executor
+        from backtest_executor import run_backtest_tasks_in_processes
+        backtest_executor.shutdown_process_pool()
+        pool = backtest_executor.get_process_pool(max_workers=1)
+        try:
+            for _ in range(3):
+                run_backtest_tasks_in_processes(self._tasks()[::6])
+            # Seuls les deux blocs du dernier cycle (un par timeframe) restent attachés
+            assert len(pool.submit(_attached_blocks).result(timeout=60)) == 2
+            assert backtest_executor._live_blocks == set()
+        finally:
+            backtest_executor.shutdown_process_pool()
+
+    def test_empty_task_list(self):
+        from backtest_executor import run_backtest_tasks_in_processes
+        assert run_backtest_tasks_in_processes([]) == []
+
+
+class TestRunSingleBacktestStochOverride:
+    def test_eight_tuple_applies_overrides(self):
+        """Le 8e élément (seuils StochRSI) est transmis à backtest_from_dataframe."""
+        from backtest_runner import run_single_backtest_optimized
+        df = _make_ohlcv(400)
+        base = ('4h', 12, 22, SCENARIOS[0], df, 'TESTUSDC', 'risk')
+        blocked = run_single_backtest_optimized(base + ((0.0, 0.0, 0.5),))
+        assert len(blocked['trade_log']) == 0
+        assert blocked['final_wallet'] == pytest.approx(blocked['initial_wallet'])
+        assert run_single_backtest_optimized(base)['trade_log'].dtype.names is not None
@@ -0,0 +1,95 @@
+"""Tests des tableaux d'entrée partagés des moteurs de backtest (backtest_inputs, PERF-24)."""
+import os
+import sys
+import threading
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+import backtest_inputs  # noqa: E402
+from backtest_inputs import BacktestInputs  # noqa: E402
+from backtest_memo import frame_fingerprint  # noqa: E402
+from test_backtest import _make_ohlcv  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    backtest_inputs.clear_inputs_cache()
+    yield
+    backtest_inputs.clear_inputs_cache()
+
+
+def test_arrays_are_read_only_and_frame_untouched():
+    df = _make_ohlcv(300).drop(columns=['ema_12', 'ema_22'])
+    before = df.copy()
+    inputs = BacktestInputs(df)
+    close = inputs.column('close')
+    with pytest.raises(ValueError):
+        close[0] = 0.0
+    with pytest.raises(ValueError):
+        inputs.ema(12)[0] = 0.0
+    np.testing.assert_array_equal(
+        inputs.ema(12), df['close'].ewm(span=12, adjust=False).mean().to_numpy()
+    )
+    assert inputs.get('adx') is None and len(inputs) == 300
+    pd.testing.assert_frame_equal(df, before)
+    # Copie par défaut : une modification du DataFrame n'atteint pas les tableaux
+    df.loc[df.index[0], 'close'] = -1.0
+    assert close[0] == before['close'].iloc[0]
+
+
+def test_derived_indicators_computed_once():
+    inputs = BacktestInputs(_make_ohlcv(400))
+    results = []
+    barrier = threading.Barrier(4)
+
+    def _read():
+        barrier.wait()
+        results.append(inputs.adx(14))
+
+    threads = [threading.Thread(target=_read) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(r is results[0] for r in results)
+    assert inputs.trix_histo(7, 15) is inputs.trix_histo(7, 15)
+    assert inputs.sma(50) is not inputs.sma(60)
+
+
+def test_factory_cache_and_fingerprints():
+    df = _make_ohlcv(500)
+    inputs = backtest_inputs.backtest_inputs(df)
+    assert backtest_inputs.backtest_inputs(df.copy()) is inputs
+    assert backtest_inputs.backtest_inputs(inputs) is inputs
+    changed = df.copy()
+    changed.loc[changed.index[-1], 'close'] = float(df['close'].iloc[-1]) + 1.0
+    assert backtest_inputs.backtest_inputs(changed) is not inputs
+    columns = ('ema_12', 'ema_22', 'ema_30')
+    for end in (1, 250, 500):
+        assert inputs.prefix_fingerprint(end, columns) == frame_fingerprint(df.iloc[:end], columns)
+
+
+@pytest.mark.parametrize('scenario', [
+    {}, {'sma_long': 200}, {'adx_period': 14}, {'trix_length': 7, 'trix_signal': 15},
+])
+def test_backtest_same_result_from_frame_and_inputs(scenario):
+    import backtest_runner
+    df = _make_ohlcv(1200, trend='up').drop(columns=['ema_22'])
+    columns = list(df.columns)
+    kw: Dict[str, Any] = dict(sizing_mode='risk', build_trades_frame=True, **scenario)
+    ref = backtest_runner.backtest_from_dataframe(df.copy(), 12, 22, **kw)
+    inputs = backtest_inputs.backtest_inputs(df)
+    res = backtest_runner.backtest_from_dataframe(inputs, 12, 22, **kw)
+    assert res['final_wallet'] == ref['final_wallet']
+    assert res['trade_log'].tobytes() == ref['trade_log'].tobytes()
+    pd.testing.assert_frame_equal(res['trades'], ref['trades'])
+    # La fenêtre est simulée sur des vues, sans ajout de colonne au DataFrame
+    window = backtest_runner.backtest_from_dataframe(df, 12, 22, bar_range=(300, 900), **kw)
+    cold = backtest_runner.backtest_from_dataframe(inputs, 12, 22, bar_range=(300, 900), **kw)
+    assert window['trade_log'].tobytes() == cold['trade_log'].tobytes()
+    assert list(df.columns) == columns
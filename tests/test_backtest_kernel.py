@@ -0,0 +1,169 @@
+"""Tests de la boucle de backtest sur tableaux (backtest_kernel, PERF-09)."""
+import os
+import sys
+from typing import Any, Dict, Optional, TypedDict, Unpack
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from cost_model import CostModel  # noqa: E402
+from test_backtest import _make_ohlcv  # noqa: E402
+
+_SCENARIOS: list[Dict[str, Any]] = [
+    {}, {'sma_long': 50}, {'adx_period': 14}, {'trix_length': 9, 'trix_signal': 21},
+]
+
+
+class KernelParams(TypedDict, total=False):
+    """Arguments nommés de ``run_backtest_kernel`` utilisés par les tests."""
+
+    open_: np.ndarray
+    volume: Optional[np.ndarray]
+    initial_wallet: float
+    taker_fee: float
+    slippage_buy: float
+    slippage_sell: float
+    atr_multiplier: float
+    atr_stop_multiplier: float
+    adx_threshold: float
+    sizing_mode: str
+    risk_per_trade: float
+    partial_enabled: bool
+    partial_threshold_1: float
+    partial_threshold_2: float
+    partial_pct_1: float
+    partial_pct_2: float
+    min_notional: float
+    breakeven_enabled: bool
+    breakeven_trigger_pct: float
+    cooldown_candles: int
+    stoch_buy_max: float
+    stoch_buy_min: float
+    stoch_sell_exit: float
+    target_volatility_pct: float
+    cost_model: CostModel
+
+
+def kernel_params(**overrides: Unpack[KernelParams]) -> KernelParams:
+    """Paramètres de référence de ``run_backtest_kernel`` (sizing ``risk``, partiels actifs)."""
+    params = KernelParams(
+        initial_wallet=10000.0, taker_fee=0.001, slippage_buy=0.0005, slippage_sell=0.0005,
+        atr_multiplier=5.5, atr_stop_multiplier=3.0, adx_threshold=25.0, sizing_mode='risk',
+        risk_per_trade=0.05, partial_enabled=True, partial_threshold_1=0.02,
+        partial_threshold_2=0.04, partial_pct_1=0.5, partial_pct_2=0.3, min_notional=5.0,
+        breakeven_enabled=True, breakeven_trigger_pct=0.015, cooldown_candles=0,
+        stoch_buy_max=0.8, stoch_buy_min=0.05, stoch_sell_exit=0.4,
+    )
+    params.update(overrides)
+    return params
+
+
+def _python_loop(monkeypatch):
+    import backtest_runner
+    monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+    return backtest_runner
+
+
+def _same(a, b):
+    assert a['final_wallet'] == pytest.approx(b['final_wallet'], rel=1e-9)
+    assert len(a['trade_log']) == len(b['trade_log'])
+    for field in ('kind', 'reason', 'entry_bar', 'exit_bar'):
+        np.testing.assert_array_equal(a['trade_log'][field], b['trade_log'][field])
+
+
+class TestKernelParity:
+    @pytest.mark.parametrize('trend', ['up', 'down', 'flat'])
+    @pytest.mark.parametrize('scenario', _SCENARIOS)
+    def test_matches_cython_engine(self, monkeypatch, trend, scenario):
+        """Même journal de trades que le moteur Cython (tous les modes de sizing)."""
+        import backtest_runner
+        if backtest_runner._CYTHON_API_LEVEL < 1:
+            pytest.skip("backtest_engine_standard non compilé")
+        df = _make_ohlcv(500, trend=trend)
+        for sizing_mode in backtest_runner._CYTHON_SIZING_MODES:
+            kw: Dict[str, Any] = dict(sizing_mode=sizing_mode, build_trades_frame=False, **scenario)
+            ref = backtest_runner.backtest_from_dataframe(df, 12, 22, **kw)
+            monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+            res = backtest_runner.backtest_from_dataframe(df, 12, 22, **kw)
+            monkeypatch.undo()
+            _same(res, ref)
+
+    def test_pure_python_matches_compiled(self, monkeypatch):
+        """Sans numba, la même fonction donne un résultat identique."""
+        import backtest_kernel
+        if not backtest_kernel.NUMBA_AVAILABLE:
+            pytest.skip("numba non installé")
+        backtest_runner = _python_loop(monkeypatch)
+        df = _make_ohlcv(400, trend='up')
+        kw: Dict[str, Any] = dict(sizing_mode='risk', sma_long=50, build_trades_frame=False)
+        compiled = backtest_runner.backtest_from_dataframe(df, 12, 22, **kw)
+        monkeypatch.setattr(backtest_kernel, '_run_bars', backtest_kernel._run_bars.py_func)
+        interpreted = backtest_runner.backtest_from_dataframe(df, 12, 22, **kw)
+        assert interpreted['final_wallet'] == compiled['final_wallet']
+        assert interpreted['trade_log'].tobytes() == compiled['trade_log'].tobytes()
+        assert interpreted['max_drawdown'] == compiled['max_drawdown']
+
+
+class TestRunBacktestKernel:
+    @staticmethod
+    def _arrays(df):
+        close = df['close'].to_numpy(dtype=np.float64)
+        ema1 = df['close'].ewm(span=12, adjust=False).mean().to_numpy()
+        ema2 = df['close'].ewm(span=22, adjust=False).mean().to_numpy()
+        return close, ema1, ema2, df['stoch_rsi'].to_numpy(), df['atr'].to_numpy()
+
+    def test_checkpoint_resume_is_exact(self):
+        from backtest_kernel import run_backtest_kernel
+        df = _make_ohlcv(400, trend='up')
+        arrays = self._arrays(df)
+        opens = df['open'].to_numpy()
+        full = run_backtest_kernel(*arrays, **kernel_params(open_=opens))
+        head = run_backtest_kernel(
+            *(a[:250] for a in arrays), checkpoint_bar=249, **kernel_params(open_=opens[:250])
+        )
+        resumed = run_backtest_kernel(*arrays, resume=head['checkpoint'],
+                                      **kernel_params(open_=opens))
+        assert resumed['state'] == full['state']
+        assert resumed['trade_log'].tobytes() == full['trade_log'].tobytes()
+        np.testing.assert_array_equal(resumed['equity_curve'], full['equity_curve'])
+
+    def test_cooldown_delays_reentry(self):
+        from backtest_kernel import run_backtest_kernel
+        df = _make_ohlcv(600, trend='flat')
+        arrays = self._arrays(df)
+        free = run_backtest_kernel(*arrays, **kernel_params())
+        cool = run_backtest_kernel(*arrays, **kernel_params(cooldown_candles=50))
+        assert len(cool['trade_log']) <= len(free['trade_log'])
+
+    def test_unit_slippage_factors_are_neutral(self):
+        from backtest_kernel import run_backtest_kernel
+        df = _make_ohlcv(300, trend='up')
+        arrays = self._arrays(df)
+        ones = np.ones(len(df))
+        ref = run_backtest_kernel(*arrays, **kernel_params())
+        res = run_backtest_kernel(*arrays, slippage_factors=(ones, ones), **kernel_params())
+        assert res['state']['usd'] == pytest.approx(ref['state']['usd'], rel=1e-12)
+        assert len(res['trade_log']) == len(ref['trade_log'])
+
+    @pytest.mark.parametrize('sizing_mode', ['fixed_notional', 'volatility_parity'])
+    def test_sizing_matches_position_sizing(self, sizing_mode):
+        """Première entrée : formules de ``position_sizing`` plafonnées à 98 % du cash."""
+        from backtest_kernel import run_backtest_kernel
+        from position_sizing import (
+            compute_position_size_fixed_notional, compute_position_size_volatility_parity,
+        )
+        df = _make_ohlcv(400, trend='up')
+        arrays = self._arrays(df)
+        params = kernel_params(sizing_mode=sizing_mode, slippage_buy=0.0, target_volatility_pct=0.01)
+        res = run_backtest_kernel(*arrays, **params)
+        buy = res['trade_log'][0]
+        price, atr = buy['entry_price'], arrays[4][buy['entry_bar']]
+        if sizing_mode == 'fixed_notional':
+            expected = compute_position_size_fixed_notional(10000.0, None, price)
+        else:
+            expected = compute_position_size_volatility_parity(10000.0, atr, price, 0.01)
+        expected = min(expected, 10000.0 * 0.98 / price)
+        assert buy['qty'] == pytest.approx(expected * (1 - 0.001), rel=1e-12)
+        assert buy['qty'] < 10000.0 * 0.98 / price * (1 - 0.001)
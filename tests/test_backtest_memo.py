@@ -0,0 +1,225 @@
+"""Tests de la mémoïsation persistante des backtests (backtest_memo, PERF-07)."""
+import os
+import sys
+import time
+import types
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+
+def _counting_backtest(calls):
+    from backtest_runner import backtest_from_dataframe
+
+    def backtest_fn(**kwargs):
+        calls.append(kwargs)
+        return backtest_from_dataframe(**kwargs)
+    return backtest_fn
+
+
+def _patched_config(monkeypatch, **overrides):
+    """Remplace la configuration vue par backtest_memo (Config est gelée, P0-01)."""
+    import backtest_memo
+    fields = {name: getattr(backtest_memo.config, name) for name in backtest_memo._CONFIG_FIELDS}
+    fields.update(overrides)
+    monkeypatch.setattr(backtest_memo, 'config', types.SimpleNamespace(**fields))
+
+
+@pytest.fixture
+def memo(tmp_path):
+    from backtest_memo import BacktestMemo
+    store = BacktestMemo(str(tmp_path / 'memo.sqlite'))
+    yield store
+    store.close()
+
+
+class TestFingerprint:
+    def test_data_change_changes_fingerprint(self):
+        from backtest_memo import frame_fingerprint
+        df = _make_ohlcv(200)
+        ref = frame_fingerprint(df)
+        assert frame_fingerprint(df.copy()) == ref
+        changed = df.copy()
+        changed.loc[changed.index[-1], 'close'] = changed['close'].iloc[-1] * 1.001
+        assert frame_fingerprint(changed) != ref
+        assert frame_fingerprint(df.iloc[1:]) != ref
+
+    def test_engine_version_follows_config(self, monkeypatch):
+        from backtest_memo import current_engine_version
+        from backtest_runner import config
+        ref = current_engine_version()
+        _patched_config(monkeypatch)
+        assert current_engine_version() == ref
+        _patched_config(monkeypatch, backtest_taker_fee=config.backtest_taker_fee * 2)
+        assert current_engine_version() != ref
+
+
+class TestMemoizeBacktest:
+    def test_hit_skips_engine(self, memo):
+        from backtest_memo import memoize_backtest
+        calls = []
+        fn = memoize_backtest(_counting_backtest(calls), pair='BTCUSDC', timeframe='4h', memo=memo)
+        df = _make_ohlcv(300, trend='up')
+        first = fn(df=df, ema1_period=12, ema2_period=22, sizing_mode='baseline')
+        second = fn(df=df.copy(), ema1_period=12, ema2_period=22, sizing_mode='baseline')
+        assert len(calls) == 1
+        assert (memo.hits, memo.misses) == (1, 1)
+        assert second['final_wallet'] == first['final_wallet']
+        assert second['trade_log'].tobytes() == first['trade_log'].tobytes()
+
+        # paramètres ou données différents → nouveau backtest
+        fn(df=df, ema1_period=12, ema2_period=30, sizing_mode='baseline')
+        fn(df=_make_ohlcv(301, trend='up'), ema1_period=12, ema2_period=22, sizing_mode='baseline')
+        assert len(calls) == 3
+
+    def test_config_change_invalidates(self, memo, monkeypatch):
+        from backtest_memo import memoize_backtest
+        from backtest_runner import config
+        calls = []
+        fn = memoize_backtest(_counting_backtest(calls), memo=memo)
+        df = _make_ohlcv(200)
+        fn(df=df, ema1_period=12, ema2_period=22)
+        _patched_config(monkeypatch, slippage_buy=config.slippage_buy + 0.001)
+        fn(df=df, ema1_period=12, ema2_period=22)
+        assert len(calls) == 2
+
+    def test_equity_out_restored(self, memo):
+        from backtest_memo import memoize_backtest
+        calls = []
+        fn = memoize_backtest(_counting_backtest(calls), memo=memo)
+        df = _make_ohlcv(250, trend='up')
+        ref, buf = np.empty(250), np.empty(250)
+        fn(df=df, ema1_period=12, ema2_period=22, equity_out=ref)
+        fn(df=df, ema1_period=12, ema2_period=22, equity_out=buf)
+        assert len(calls) == 1
+        np.testing.assert_array_equal(buf, ref)
+
+    def test_stochastic_slippage_bypasses(self, memo):
+        from backtest_memo import memoize_backtest
+        from backtest_runner import BasicSlippageModel
+        calls = []
+        fn = memoize_backtest(_counting_backtest(calls), memo=memo)
+        df = _make_ohlcv(200)
+        for _ in range(2):
+            fn(df=df, ema1_period=12, ema2_period=22, slippage_model=BasicSlippageModel())
+        assert len(calls) == 2
+        assert len(memo) == 0
+
+    def test_completed_run_serves_abort_calls(self, memo):
+        from backtest_abort import AbortCriteria
+        from backtest_memo import memoize_backtest
+        calls = []
+        fn = memoize_backtest(_counting_backtest(calls), memo=memo)
+        df = _make_ohlcv(200, trend='up')
+        fn(df=df, ema1_period=12, ema2_period=22)
+        res = fn(df=df, ema1_period=12, ema2_period=22, abort=AbortCriteria(min_score=0.0))
+        assert len(calls) == 1
+        assert res['status'] == 'completed'
+
+    def test_persists_and_expires(self, tmp_path):
+        from backtest_memo import BacktestMemo, memoize_backtest
+        path = str(tmp_path / 'memo.sqlite')
+        calls = []
+        df = _make_ohlcv(200)
+        store = BacktestMemo(path)
+        memoize_backtest(_counting_backtest(calls), memo=store)(df=df, ema1_period=12, ema2_period=22)
+        store.close()
+
+        store = BacktestMemo(path)
+        memoize_backtest(_counting_backtest(calls), memo=store)(df=df, ema1_period=12, ema2_period=22)
+        assert len(calls) == 1
+        with store._conn:
+            store._conn.execute('UPDATE backtest_memo SET created_at = ?', (time.time() - 10 * 86400,))
+        store.close()
+
+        store = BacktestMemo(path, max_age_days=7)
+        assert len(store) == 0
+        store.close()
+
+    def test_disabled_returns_function(self, monkeypatch):
+        import backtest_memo
+        _patched_config(monkeypatch, backtest_memo_enabled=False)
+
+        def fn(**kwargs):
+            return {}
+        assert backtest_memo.memoize_backtest(fn) is fn
+
+
+class TestIncrementalBacktest:
+    """Reprise depuis un checkpoint (PERF-08) : résultat identique à un run complet."""
+
+    @staticmethod
+    def _same(a, b):
+        assert a['final_wallet'] == b['final_wallet']
+        assert a['trade_log'].tobytes() == b['trade_log'].tobytes()
+        assert a['max_drawdown'] == b['max_drawdown']
+        assert a.get('sharpe_ratio') == b.get('sharpe_ratio')
+
+    @pytest.mark.parametrize('python_only', [True, False])
+    @pytest.mark.parametrize('n_old', [150, 333])
+    def test_resume_matches_full_run(self, monkeypatch, python_only, n_old):
+        import backtest_runner
+        if python_only:
+            monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+        elif backtest_runner._CYTHON_API_LEVEL < 5:
+            pytest.skip("backtest_engine_standard (PERF-08) non compilé")
+        df = _make_ohlcv(500, trend='up')
+        kw: Dict[str, Any] = dict(ema1_period=12, ema2_period=22, sizing_mode='risk',
+                                  sma_long=50, build_trades_frame=False)
+        full = backtest_runner.backtest_from_dataframe(df, **kw)
+        old = backtest_runner.backtest_from_dataframe(
+            df.iloc[:n_old].copy(), checkpoint_bar=n_old - 1, **kw
+        )
+        checkpoint = old['checkpoint']
+        assert checkpoint['bar'] == n_old - 1
+        assert checkpoint['engine'] == ('python' if python_only else 'cython')
+        resumed = backtest_runner.backtest_from_dataframe(df, resume=checkpoint, **kw)
+        self._same(resumed, full)
+
+    def test_resume_rejects_abort(self):
+        from backtest_abort import AbortCriteria
+        from backtest_runner import backtest_from_dataframe
+        df = _make_ohlcv(200)
+        old = backtest_from_dataframe(df, 12, 22, checkpoint_bar=100)
+        with pytest.raises(ValueError):
+            backtest_from_dataframe(df, 12, 22, resume=old['checkpoint'],
+                                    abort=AbortCriteria(min_trades=1, min_trades_bar=10))
+
+    def test_memo_resumes_on_new_bars(self, memo):
+        from backtest_memo import memoize_backtest
+        calls = []
+        fn = memoize_backtest(_counting_backtest(calls), memo=memo, incremental=True)
+        df = _make_ohlcv(400, trend='up')
+        kw = dict(ema1_period=12, ema2_period=22, sizing_mode='baseline')
+        fn(df=df.iloc[:300].copy(), **kw)
+        res = fn(df=df, **kw)
+        assert calls[0]['checkpoint_bar'] == 299 and 'resume' not in calls[0]
+        assert calls[1]['resume']['bar'] == 299
+        self._same(res, _counting_backtest([])(df=df, **kw))
+        assert 'checkpoint' not in res
+
+        # historique réécrit → pas de reprise
+        altered = df.copy()
+        altered.loc[altered.index[10], 'close'] = altered['close'].iloc[10] * 1.01
+        fn(df=altered, **kw)
+        assert 'resume' not in calls[2]
+
+    def test_memo_checkpoints_per_window_start(self, memo):
+        """Fenêtres de débuts différents : checkpoints séparés, pas d'écrasement mutuel."""
+        from backtest_memo import memoize_backtest
+        calls = []
+        fn = memoize_backtest(_counting_backtest(calls), memo=memo, incremental=True)
+        df = _make_ohlcv(500, trend='up')
+        kw = dict(ema1_period=12, ema2_period=22, sizing_mode='baseline')
+        fn(df=df.iloc[:300].copy(), **kw)
+        fn(df=df.iloc[24:300].copy(), **kw)  # début glissant : pas de reprise possible
+        assert 'resume' not in calls[1]
+        fn(df=df.iloc[:400].copy(), **kw)
+        fn(df=df.iloc[24:400].copy(), **kw)
+        assert calls[2]['resume']['bar'] == 299
+        assert calls[3]['resume']['bar'] == 275
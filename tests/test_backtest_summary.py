@@ -0,0 +1,95 @@
+"""Tests du résumé compact des résultats de backtest (backtest_summary, PERF-19)."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from backtest_summary import (  # noqa: E402
+    calmar_scores, compact_results, rank_indices, summarize_results,
+)
+from trade_helpers import calmar_key, select_best_by_calmar  # noqa: E402
+
+
+def _results(n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    out = []
+    for i in range(n):
+        out.append({
+            'timeframe': ('1h', '4h', '1d')[i % 3],
+            'ema_periods': (10 + i, 40 + i),
+            'scenario': 'StochRSI_ADX' if i % 2 else 'StochRSI',
+            'initial_wallet': 10000.0,
+            'final_wallet': float(10000.0 * (1.0 + rng.normal(0.05, 0.2))),
+            'max_drawdown': float(rng.choice([0.0, rng.uniform(0.01, 0.5)])),
+            'win_rate': float(rng.uniform(20.0, 70.0)),
+            'sharpe_ratio': float(rng.normal(0.5, 1.0)),
+            'calmar_ratio': float(round(rng.normal(0.5, 1.0), 1)),  # ex-aequo
+            'trade_log': np.zeros(int(rng.integers(0, 50))),
+            'status': 'pruned' if i % 7 == 0 else 'completed',
+        })
+    return out
+
+
+def test_summary_rows_match_results():
+    results = _results()
+    summary = summarize_results(results)
+    assert len(summary) == len(results)
+    assert summary['scenario'][1] == 'StochRSI_ADX' and summary['ema2'][3] == 43
+    assert list(summary['n_trades']) == [len(r['trade_log']) for r in results]
+    assert list(summary['pruned']) == [r['status'] == 'pruned' for r in results]
+    np.testing.assert_array_equal(calmar_scores(summary), [calmar_key(r) for r in results])
+
+
+@pytest.mark.parametrize('key', ['calmar_ratio', 'sharpe_ratio'])
+def test_rank_matches_stable_sorted(key):
+    results = _results()
+    expected = sorted(range(len(results)), key=lambda i: results[i][key], reverse=True)
+    assert rank_indices(summarize_results(results), key).tolist() == expected
+
+
+def test_select_best_by_calmar_matches_max():
+    for seed in range(5):
+        results = _results(seed=seed)
+        completed = [r for r in results if r['status'] != 'pruned']
+        assert select_best_by_calmar(results) is max(completed, key=calmar_key)
+    pruned_only = [dict(r, status='pruned') for r in _results(5)]
+    assert select_best_by_calmar(pruned_only) is max(pruned_only, key=calmar_key)
+    with pytest.raises(ValueError):
+        select_best_by_calmar([])
+
+
+def test_oos_gate_mask_matches_scalar_gate():
+    from walk_forward import validate_oos_result, validate_oos_results
+    summary = summarize_results(_results())
+    expected = [validate_oos_result(s, w) for s, w in zip(summary['sharpe_ratio'], summary['win_rate'])]
+    assert validate_oos_results(summary['sharpe_ratio'], summary['win_rate']).tolist() == expected
+
+
+def test_compact_keeps_top_k_trade_logs():
+    results = _results()
+    lengths = [len(r['trade_log']) for r in results]
+    best = select_best_by_calmar(results)
+    assert compact_results(results, keep=3) is results
+    kept = [r for r in results if 'trade_log' in r]
+    assert len(kept) == 3 and best in kept
+    assert all(r['status'] != 'pruned' for r in kept)
+    assert [r['n_trades'] for r in results] == lengths
+    # Idempotent : les comptes survivent à une seconde compaction
+    compact_results(results, keep=0)
+    assert [r['n_trades'] for r in results] == lengths
+    assert not any('trade_log' in r for r in results)
+
+
+def test_compact_negative_keep_is_noop():
+    results = _results(5)
+    compact_results(results, keep=-1)
+    assert all('trade_log' in r and 'n_trades' not in r for r in results)
+
+
+def test_trade_count_display_uses_n_trades():
+    from display_ui import _fmt_trade_count
+    assert _fmt_trade_count({'n_trades': 25}) == '25'
+    assert _fmt_trade_count({'trade_log': np.zeros(12)}) == '12'
@@ -0,0 +1,93 @@
+"""Tests de l'equity bar-à-bar (equity_out, compute_bar_risk_metrics, PERF-04)."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+
+class TestComputeBarRiskMetrics:
+    def test_underwater_duration(self):
+        from walk_forward import compute_bar_risk_metrics
+        equity = np.array([100, 101, 99, 98, 100, 102, 101, 103, 100, 100, 100], dtype=float)
+        m = compute_bar_risk_metrics(equity, periods_per_year=365)
+        # 101 → (99, 98, 100) : 3 barres ; 103 → (100, 100, 100) : 3 barres
+        assert m['max_underwater_bars'] == 3
+        assert m['underwater_pct'] == pytest.approx(7 / 11 * 100, rel=1e-4)
+        assert m['max_drawdown'] == pytest.approx((101 - 98) / 101, rel=1e-5)
+
+    def test_monotonic_curve_never_underwater(self):
+        from walk_forward import compute_bar_risk_metrics
+        equity = 1000 * np.cumprod(np.full(500, 1.001))
+        m = compute_bar_risk_metrics(equity, periods_per_year=8766)
+        assert m['max_underwater_bars'] == 0
+        assert m['max_drawdown'] == 0.0
+        assert m['calmar_ratio'] == 0.0
+
+    def test_sharpe_matches_manual_formula(self):
+        from walk_forward import compute_bar_risk_metrics
+        rng = np.random.default_rng(1)
+        equity = 1000 * np.cumprod(1 + rng.normal(0.0005, 0.01, 2000))
+        m = compute_bar_risk_metrics(equity, periods_per_year=2190, risk_free_rate=0.0)
+        r = np.diff(equity) / equity[:-1]
+        expected = r.mean() / r.std(ddof=1) * np.sqrt(2190)
+        assert m['sharpe_ratio'] == pytest.approx(expected, abs=1e-3)
+
+    def test_initial_equity_is_prepended(self):
+        from walk_forward import compute_bar_risk_metrics
+        m = compute_bar_risk_metrics(np.array([90.0, 95.0, 100.0]), initial_equity=100.0)
+        assert m['total_return_pct'] == 0.0
+        assert m['max_drawdown'] == pytest.approx(0.10)
+
+    def test_degenerate_curves(self):
+        from walk_forward import compute_bar_risk_metrics
+        assert compute_bar_risk_metrics(np.array([1.0]))['sharpe_ratio'] == 0.0
+        assert compute_bar_risk_metrics(np.array([1.0, np.nan, 2.0]))['max_drawdown'] == 0.0
+
+
+class TestEquityOutBuffer:
+    def _run(self, monkeypatch, python_only, buf=None, **kwargs):
+        import backtest_runner
+        if python_only:
+            monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+        df = _make_ohlcv(500, trend='up')
+        return df, backtest_runner.backtest_from_dataframe(
+            df, ema1_period=12, ema2_period=22, sizing_mode='baseline',
+            equity_out=buf, **kwargs,
+        )
+
+    def test_python_fallback_fills_buffer(self, monkeypatch):
+        from backtest_runner import config
+        buf = np.full(500, np.nan)
+        _, result = self._run(monkeypatch, True, buf)
+        assert np.all(np.isfinite(buf))
+        assert buf[-1] == pytest.approx(result['final_wallet'])
+        assert buf[0] == pytest.approx(config.initial_wallet)
+        assert 'max_underwater_bars' in result
+        # drawdown unifié >= drawdown de la courbe bar-à-bar
+        cummax = np.maximum.accumulate(np.concatenate(([config.initial_wallet], buf)))
+        bar_dd = float(np.max((cummax[1:] - buf) / cummax[1:]))
+        assert result['max_drawdown'] >= bar_dd - 1e-6
+
+    def test_buffer_is_optional(self, monkeypatch):
+        _, result = self._run(monkeypatch, True)
+        assert 'max_underwater_bars' not in result
+
+    def test_wrong_buffer_rejected(self, monkeypatch):
+        with pytest.raises(ValueError):
+            self._run(monkeypatch, True, np.empty(10))
+
+    def test_cython_matches_python(self, monkeypatch):
+        """Le buffer rempli par le moteur compilé est identique à la boucle Python."""
+        import backtest_runner
+        if backtest_runner._CYTHON_API_LEVEL < 2:
+            pytest.skip("backtest_engine_standard (PERF-04) non compilé")
+        cy_buf = np.empty(500)
+        self._run(monkeypatch, False, cy_buf, partial_enabled=False)
+        py_buf = np.empty(500)
+        self._run(monkeypatch, True, py_buf, partial_enabled=False)
+        np.testing.assert_allclose(cy_buf, py_buf, rtol=1e-9)
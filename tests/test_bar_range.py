@@ -0,0 +1,139 @@
+"""Tests des folds walk-forward en plages de bars (bar_range, PERF-10)."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+
+def _same(a, b):
+    assert a['final_wallet'] == pytest.approx(b['final_wallet'], rel=1e-12)
+    assert a['trade_log'].tobytes() == b['trade_log'].tobytes()
+    assert a['bars_run'] == b['bars_run']
+
+
+@pytest.fixture(params=['cython', 'python'])
+def runner(request, monkeypatch):
+    import backtest_runner
+    if request.param == 'python':
+        monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+    elif not backtest_runner.CYTHON_BACKTEST_AVAILABLE:
+        pytest.skip("backtest_engine_standard non compilé")
+    return backtest_runner
+
+
+class TestBarRange:
+    def test_window_matches_slice(self, runner):
+        """Sans indicateur recalculé (ni scénario, ni MTF), fenêtre = copie du fold."""
+        df = _make_ohlcv(800, trend='up').reset_index(drop=True)
+        kw = dict(sizing_mode='risk', build_trades_frame=False)
+        window = runner.backtest_from_dataframe(df, 12, 22, bar_range=(300, 700), **kw)
+        copy = runner.backtest_from_dataframe(df.iloc[300:700].copy(), 12, 22, **kw)
+        _same(window, copy)
+        assert window['bars_run'] == 400
+
+    def test_full_range_is_identity(self, runner):
+        df = _make_ohlcv(500, trend='flat')
+        kw = dict(sma_long=50, adx_period=14, build_trades_frame=False)
+        _same(
+            runner.backtest_from_dataframe(df, 12, 22, bar_range=(0, len(df)), **kw),
+            runner.backtest_from_dataframe(df, 12, 22, **kw),
+        )
+
+    def test_indicators_warm_up_before_window(self, runner):
+        """Le SMA longue est préchauffé par les bars antérieurs à la fenêtre."""
+        df = _make_ohlcv(600, trend='up')
+        kw = dict(sma_long=200, build_trades_frame=False)
+        window = runner.backtest_from_dataframe(df, 12, 22, bar_range=(400, 600), **kw)
+        cold = runner.backtest_from_dataframe(df.iloc[400:].copy(), 12, 22, **kw)
+        assert len(cold['trade_log']) == 0
+        assert len(window['trade_log']) > 0
+        assert window['trade_log']['entry_bar'].max() < 200
+
+    def test_equity_out_is_window_sized(self, runner):
+        df = _make_ohlcv(500, trend='up')
+        buf = np.empty(200)
+        runner.backtest_from_dataframe(df, 12, 22, bar_range=(300, 500), equity_out=buf)
+        assert np.isfinite(buf).all()
+        with pytest.raises(ValueError):
+            runner.backtest_from_dataframe(df, 12, 22, bar_range=(300, 500),
+                                           equity_out=np.empty(500))
+
+    def test_invalid_range(self):
+        from backtest_runner import backtest_from_dataframe
+        df = _make_ohlcv(200)
+        for bar_range in ((100, 100), (-1, 50), (0, 201)):
+            with pytest.raises(ValueError):
+                backtest_from_dataframe(df, 12, 22, bar_range=bar_range)
+
+    def test_threshold_grid_window(self, runner):
+        grid = [(0.05, 0.80, 0.40), (0.10, 0.85, 0.50)]
+        df = _make_ohlcv(600, trend='flat')
+        batch = runner.backtest_threshold_grid(df, 12, 22, grid, sma_long=50, bar_range=(200, 600))
+        for res, (bmin, bmax, sell) in zip(batch, grid):
+            single = runner.backtest_from_dataframe(
+                df, 12, 22, sma_long=50, bar_range=(200, 600), build_trades_frame=False,
+                stoch_buy_min_override=bmin, stoch_buy_max_override=bmax,
+                stoch_sell_exit_override=sell,
+            )
+            assert res['final_wallet'] == pytest.approx(single['final_wallet'], rel=1e-12)
+
+
+class TestWalkForwardRanges:
+    def test_ranges_match_fold_copies(self):
+        from walk_forward import split_walk_forward_folds, split_walk_forward_ranges
+        df = _make_ohlcv(3000)
+        ranges = split_walk_forward_ranges(len(df), n_folds=4, initial_train_pct=0.4)
+        folds = split_walk_forward_folds(df, n_folds=4, initial_train_pct=0.4)
+        assert len(ranges) == len(folds) == 4
+        for ((a, b), (c, d)), (train_df, test_df) in zip(ranges, folds):
+            assert a == 0 and b == c
+            assert train_df.index.equals(df.index[a:b])
+            assert test_df.index.equals(df.index[c:d])
+
+    def test_validation_passes_ranges_not_copies(self):
+        from walk_forward import run_walk_forward_validation
+        df = _make_ohlcv(2000)
+        calls = []
+
+        def backtest_fn(df, ema1_period, ema2_period, bar_range=None, **kwargs):
+            calls.append((id(df), bar_range))
+            return {'final_wallet': 10000.0, 'sharpe_ratio': 1.0, 'win_rate': 50.0}
+
+        run_walk_forward_validation(
+            base_dataframes={'1h': df},
+            full_sample_results=[{'timeframe': '1h', 'ema_periods': (12, 22),
+                                  'scenario': 'StochRSI', 'sharpe_ratio': 1.0}],
+            scenarios=[{'name': 'StochRSI', 'params': {}}],
+            backtest_fn=backtest_fn, n_folds=3,
+        )
+        # PERF-24: un même BacktestInputs (sans copie du DataFrame) pour toutes les tâches
+        from backtest_inputs import backtest_inputs
+        assert calls and {frame for frame, _ in calls} == {id(backtest_inputs(df))}
+        assert all(bar_range is not None for _, bar_range in calls)
+
+
+class TestMemoBarRange:
+    def test_rows_after_window_do_not_invalidate(self, tmp_path):
+        from backtest_memo import BacktestMemo, memoize_backtest
+        from backtest_runner import backtest_from_dataframe
+        calls = []
+
+        def backtest_fn(**kwargs):
+            calls.append(kwargs)
+            return backtest_from_dataframe(**kwargs)
+
+        store = BacktestMemo(str(tmp_path / 'memo.sqlite'))
+        fn = memoize_backtest(backtest_fn, memo=store, incremental=True)
+        df = _make_ohlcv(700, trend='up')
+        kw = dict(ema1_period=12, ema2_period=22, bar_range=(0, 400))
+        first = fn(df=df.iloc[:600].copy(), **kw)
+        assert 'checkpoint_bar' not in calls[0]
+        second = fn(df=df, **kw)
+        assert len(calls) == 1
+        assert second['final_wallet'] == first['final_wallet']
+        store.close()
@@ -0,0 +1,155 @@
+"""Tests des coûts d'exécution évalués dans le moteur (cost_model, PERF-23)."""
+import dataclasses
+import os
+import sys
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from cost_model import FILL_BUY, FILL_SELL, OOS_COST_MODEL, CostModel, counter_uniform  # noqa: E402
+from test_backtest import _make_ohlcv  # noqa: E402
+from test_backtest_kernel import KernelParams, kernel_params  # noqa: E402
+
+_FULL = CostModel(
+    fixed_slippage=0.0002, atr_slippage=0.05, participation_impact=0.1,
+    random_slippage_min=0.0001, random_slippage_max=0.0005, seed=7,
+)
+
+
+def _kernel_inputs(df):
+    close = df['close'].to_numpy(dtype=np.float64)
+    ema1 = df['close'].ewm(span=12, adjust=False).mean().to_numpy()
+    ema2 = df['close'].ewm(span=22, adjust=False).mean().to_numpy()
+    arrays = (close, ema1, ema2, df['stoch_rsi'].to_numpy(), df['atr'].to_numpy())
+    params = kernel_params(
+        open_=df['open'].to_numpy(), volume=df['volume'].to_numpy(dtype=np.float64),
+    )
+    return arrays, params
+
+
+def _with_cost(params: KernelParams, cost_model: CostModel) -> KernelParams:
+    out = params.copy()
+    out['cost_model'] = cost_model
+    return out
+
+
+def test_counter_uniform_is_keyed_and_uniform():
+    draws = np.array([counter_uniform(42, bar, trade, side)
+                      for bar in range(200) for trade in range(10) for side in (FILL_BUY, FILL_SELL)])
+    assert draws.min() >= 0.0 and draws.max() < 1.0
+    assert len(np.unique(draws)) == len(draws)
+    assert abs(draws.mean() - 0.5) < 0.02
+    assert counter_uniform(42, 5, 1, FILL_BUY) == counter_uniform(42, 5, 1, FILL_BUY)
+    assert counter_uniform(42, 5, 1, FILL_BUY) != counter_uniform(43, 5, 1, FILL_BUY)
+
+
+def test_invalid_cost_model():
+    with pytest.raises(ValueError):
+        CostModel(random_slippage_min=0.0003, random_slippage_max=0.0001)
+    with pytest.raises(ValueError):
+        CostModel(fixed_slippage=-0.001)
+
+
+def test_kernel_applies_fill_costs():
+    from backtest_kernel import run_backtest_kernel
+    df = _make_ohlcv(400, trend='up')
+    arrays, params = _kernel_inputs(df)
+    ref = run_backtest_kernel(*arrays, **params)['trade_log']
+    cost = CostModel(fixed_slippage=0.001)
+    log = run_backtest_kernel(*arrays, **_with_cost(params, cost))['trade_log']
+    buy = log[0]
+    assert buy['entry_bar'] == ref[0]['entry_bar']
+    expected = df['open'].to_numpy()[buy['entry_bar'] + 1] * 1.0005 * 1.001
+    assert buy['entry_price'] == pytest.approx(expected, rel=1e-12)
+    sell = log[log['kind'] == 1][0]
+    assert sell['exit_price'] < ref[ref['kind'] == 1][0]['exit_price']
+    # Coûts nuls : résultat identique au moteur sans modèle
+    zero = run_backtest_kernel(*arrays, **_with_cost(params, CostModel()))['trade_log']
+    assert zero.tobytes() == ref.tobytes()
+
+
+def test_kernel_random_costs_survive_resume():
+    from backtest_kernel import run_backtest_kernel
+    df = _make_ohlcv(400, trend='flat')
+    arrays, params = _kernel_inputs(df)
+    full = run_backtest_kernel(*arrays, **_with_cost(params, _FULL))
+    head = run_backtest_kernel(*arrays, checkpoint_bar=250, **_with_cost(params, _FULL))
+    resumed = run_backtest_kernel(*arrays, resume=head['checkpoint'], **_with_cost(params, _FULL))
+    assert resumed['trade_log'].tobytes() == full['trade_log'].tobytes()
+    other = run_backtest_kernel(*arrays, **_with_cost(params, dataclasses.replace(_FULL, seed=8)))
+    assert other['trade_log'].tobytes() != full['trade_log'].tobytes()
+    no_volume = params.copy()
+    no_volume['volume'] = None
+    with pytest.raises(ValueError):
+        run_backtest_kernel(*arrays, **_with_cost(no_volume, _FULL))
+
+
+def test_pure_python_matches_compiled():
+    import backtest_kernel
+    if not backtest_kernel.NUMBA_AVAILABLE:
+        pytest.skip("numba non installé")
+    df = _make_ohlcv(400, trend='up')
+    arrays, params = _kernel_inputs(df)
+    compiled = backtest_kernel.run_backtest_kernel(*arrays, **_with_cost(params, _FULL))
+    patched = {name: getattr(backtest_kernel, name).py_func
+               for name in ('_run_bars', '_entry_coin', '_fill_cost', '_counter_uniform')}
+    saved = {name: getattr(backtest_kernel, name) for name in patched}
+    try:
+        for name, fn in patched.items():
+            setattr(backtest_kernel, name, fn)
+        interpreted = backtest_kernel.run_backtest_kernel(*arrays, **_with_cost(params, _FULL))
+    finally:
+        for name, fn in saved.items():
+            setattr(backtest_kernel, name, fn)
+    assert interpreted['trade_log'].tobytes() == compiled['trade_log'].tobytes()
+
+
+@pytest.mark.parametrize('trend', ['up', 'flat'])
+def test_cython_engine_matches_kernel(monkeypatch, trend):
+    import backtest_runner
+    if backtest_runner._CYTHON_API_LEVEL < 7:
+        pytest.skip("backtest_engine_standard (ENGINE_API_LEVEL >= 7) non compilé")
+    df = _make_ohlcv(500, trend=trend)
+    kw: Dict[str, Any] = dict(sizing_mode='risk', build_trades_frame=False, cost_model=_FULL)
+    ref = backtest_runner.backtest_from_dataframe(df, 12, 22, **kw)
+    monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+    res = backtest_runner.backtest_from_dataframe(df, 12, 22, **kw)
+    assert res['final_wallet'] == pytest.approx(ref['final_wallet'], rel=1e-9)
+    for field in ('kind', 'reason', 'entry_bar', 'exit_bar'):
+        np.testing.assert_array_equal(res['trade_log'][field], ref['trade_log'][field])
+    np.testing.assert_allclose(res['trade_log']['entry_price'], ref['trade_log']['entry_price'],
+                               rtol=1e-12)
+
+
+def test_fee_rate_override():
+    from backtest_runner import backtest_from_dataframe
+    df = _make_ohlcv(400, trend='up')
+    base = backtest_from_dataframe(df, 12, 22, sizing_mode='baseline', build_trades_frame=False)
+    free = backtest_from_dataframe(df, 12, 22, sizing_mode='baseline', build_trades_frame=False,
+                                   cost_model=CostModel(fee_rate=0.0))
+    assert free['trade_log']['fees'].sum() == 0.0
+    assert base['trade_log']['fees'].sum() > 0.0
+
+
+@pytest.mark.parametrize('trend', ['up', 'flat'])
+def test_oos_cost_matches_basic_slippage_magnitude(trend):
+    """OOS_COST_MODEL reste dans la plage de coûts de BasicSlippageModel (1-5 bps par fill)."""
+    from backtest_runner import BasicSlippageModel, backtest_from_dataframe
+    df = _make_ohlcv(600, trend=trend)
+    kw: Dict[str, Any] = dict(sizing_mode='risk', build_trades_frame=False)
+    ref = backtest_from_dataframe(df, 12, 22, cost_model=CostModel(), **kw)['trade_log']
+    oos = backtest_from_dataframe(df, 12, 22, cost_model=OOS_COST_MODEL, **kw)['trade_log']
+    old = backtest_from_dataframe(df, 12, 22, slippage_model=BasicSlippageModel(seed=0), **kw)['trade_log']
+    ref_buys, oos_buys, old_buys = (log[log['kind'] == 0] for log in (ref, oos, old))
+    if len(ref_buys) == 0:
+        pytest.skip("aucun achat sur ces données")
+    np.testing.assert_array_equal(oos_buys['entry_bar'], ref_buys['entry_bar'])
+    np.testing.assert_array_equal(old_buys['entry_bar'], ref_buys['entry_bar'])
+    oos_cost = oos_buys['entry_price'] / ref_buys['entry_price'] - 1.0
+    old_cost = old_buys['entry_price'] / ref_buys['entry_price'] - 1.0
+    for cost in (oos_cost, old_cost):
+        assert cost.min() >= 0.0001 - 1e-12 and cost.max() <= 0.0005 + 1e-12
+    assert abs(oos_cost.mean() - old_cost.mean()) < 0.0002
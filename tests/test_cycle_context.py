@@ -0,0 +1,144 @@
+"""Tests du cache de préparation limité au cycle (cycle_context, PERF-15)."""
+import os
+import sys
+import threading
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+from cycle_context import CycleContext, current_cycle, cycle_scope  # noqa: E402
+from indicators_engine import prepare_base_dataframe  # noqa: E402
+
+
+class _Fetcher:
+    """Données brutes fixes ; compte les appels."""
+
+    def __init__(self, df):
+        self.df = df
+        self.calls = 0
+
+    def __call__(self, pair, timeframe, start_date):
+        self.calls += 1
+        return self.df[['open', 'high', 'low', 'close', 'volume']].copy()
+
+
+@pytest.fixture
+def fetcher():
+    return _Fetcher(_make_ohlcv(400, trend='up'))
+
+
+def _prepare(fetch, pair='BTCUSDC', tf='1h') -> pd.DataFrame:
+    df = prepare_base_dataframe(pair, tf, '01 January 2024', 14, fetch_data_fn=fetch)
+    assert df is not None
+    return df
+
+
+class TestPrepareInCycle:
+    def test_consumers_share_one_preparation(self, fetcher):
+        reference = _prepare(fetcher)
+        with cycle_scope(label='test') as cycle:
+            first = _prepare(fetcher)
+            second = _prepare(fetcher)
+            assert cycle.misses == 1 and cycle.hits == 1
+        assert first.equals(reference) and second.equals(reference)
+
+    def test_returned_frames_are_independent(self, fetcher):
+        with cycle_scope():
+            first = _prepare(fetcher)
+            first['ema_12'] = 0.0
+            first.loc[first.index[0], 'close'] = -1.0
+            second = _prepare(fetcher)
+        assert 'ema_12' not in second.columns
+        assert second['close'].iloc[0] > 0
+
+    def test_new_data_and_other_keys_miss(self, fetcher):
+        with cycle_scope() as cycle:
+            _prepare(fetcher)
+            _prepare(fetcher, tf='4h')
+            _prepare(fetcher, pair='ETHUSDC')
+            fetcher.df = _make_ohlcv(401, trend='up')
+            _prepare(fetcher)
+            assert cycle.misses == 4 and cycle.hits == 0
+
+    def test_without_cycle_nothing_is_cached(self, fetcher):
+        assert current_cycle() is None
+        assert _prepare(fetcher).equals(_prepare(fetcher))
+
+
+class TestCycleScope:
+    def test_released_at_end_of_cycle(self, fetcher):
+        with cycle_scope() as cycle:
+            _prepare(fetcher)
+            assert len(cycle) == 1
+        assert len(cycle) == 0
+        assert current_cycle() is None
+
+    def test_nested_scope_reuses_outer_cycle(self):
+        with cycle_scope() as outer:
+            with cycle_scope() as inner:
+                assert inner is outer
+            outer.prepared_frame(('k',), lambda: None)
+            assert len(outer) == 1
+        assert len(outer) == 0
+
+    def test_context_propagates_to_worker_threads(self):
+        builds = []
+        ctx = CycleContext()
+
+        def worker():
+            with cycle_scope(ctx) as cycle:
+                cycle.prepared_frame(('k',), lambda: builds.append(1) or _make_ohlcv(60))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(builds) == 1
+        assert ctx.hits == 3
+        # Le propriétaire libère le contexte, pas les workers
+        assert len(ctx) == 1
+
+
+def test_orchestrator_runs_inside_cycle():
+    import backtest_orchestrator
+    seen = []
+
+    @backtest_orchestrator._cycle_scoped
+    def cycle_fn():
+        seen.append(current_cycle())
+
+    cycle_fn()
+    assert isinstance(seen[0], CycleContext)
+    assert current_cycle() is None
+
+
+def test_backtest_and_display_runs_inside_cycle():
+    import types
+
+    import backtest_orchestrator
+    seen = []
+
+    def run_all_backtests(pair, start_date, timeframes, sizing_mode):
+        seen.append(current_cycle())
+        return []
+
+    deps = types.SimpleNamespace(
+        config=types.SimpleNamespace(backtest_days=30),
+        timeframes=['1h'],
+        detect_market_changes_fn=lambda pair, timeframes, start_date: seen.append(current_cycle()),
+        display_market_changes_fn=lambda changes, pair, console: None,
+        bot_state={},
+        bot_state_lock=threading.RLock(),
+        make_default_pair_state_fn=dict,
+        run_all_backtests_fn=run_all_backtests,
+    )
+    backtest_orchestrator._backtest_and_display_results(
+        'BTCUSDC', 'BTCUSDC', '01 January 2024', ['1h'], 'risk', deps)
+    assert len(seen) == 2
+    assert isinstance(seen[0], CycleContext) and seen[1] is seen[0]
+    assert current_cycle() is None
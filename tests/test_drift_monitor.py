@@ -0,0 +1,121 @@
+"""Tests de la ré-optimisation déclenchée par la dérive (drift_monitor, PERF-21)."""
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+import MULTI_SYMBOLS as ms  # noqa: E402
+import backtest_orchestrator  # noqa: E402
+from bot_config import Config  # noqa: E402
+from drift_monitor import (  # noqa: E402
+    DRIFT_BASELINE_KEY, DriftThresholds, assess_drift, atr_pct, live_outcomes, make_baseline,
+)
+
+_PARAMS = {'timeframe': '4h', 'ema1_period': 26, 'ema2_period': 50, 'scenario': 'StochRSI',
+           'sma_long': None, 'adx_period': None, 'trix_length': None, 'trix_signal': None}
+_NOW = 1_700_000_000.0
+
+
+def _baseline(**overrides):
+    base = make_baseline(_PARAMS, expected_sharpe=1.5, expected_win_rate=55.0, atr=0.02, now=_NOW)
+    base.update(overrides)
+    return base
+
+
+def _assess(baseline, **kwargs):
+    kwargs.setdefault('now', _NOW + 3600.0)
+    return assess_drift(baseline, _PARAMS, DriftThresholds(), **kwargs)
+
+
+def test_no_drift_keeps_config():
+    report = _assess(_baseline(), recent_sharpe=1.2, live=(4, 50.0), atr=0.024,
+                     market_changes={'ema_crosses': [{'timeframe': '1h', 'type': ' BULLISH CROSS'}]})
+    assert not report.reoptimize
+    assert report.metrics['recent_sharpe'] == 1.2 and report.metrics['live_win_rate'] == 50.0
+
+
+def test_staleness_reasons():
+    assert _assess(None).reasons == ('no_baseline',)
+    assert _assess(_baseline(), oos_blocked=True).reasons == ('oos_blocked',)
+    moved = dict(_baseline(), params=dict(_baseline()['params'], ema1_period=12))
+    assert _assess(moved).reasons == ('params_changed',)
+    assert _assess(_baseline(), now=_NOW + 168 * 3600.0).reasons == ('max_age',)
+
+
+def test_drift_signals():
+    report = _assess(
+        _baseline(), recent_sharpe=0.2, live=(5, 20.0), atr=0.035,
+        market_changes={'ema_crosses': [{'timeframe': '4h', 'type': ' BEARISH CROSS'}]},
+    )
+    assert report.reasons == ('recent_sharpe', 'live_win_rate', 'ema_cross', 'atr_shift')
+    # ATR en forte baisse, live trop peu fourni pour être jugé
+    report = _assess(_baseline(), recent_sharpe=float('nan'), live=(2, 0.0), atr=0.01)
+    assert report.reasons == ('atr_shift',) and 'recent_sharpe' not in report.metrics
+
+
+def test_live_outcomes_and_atr():
+    def rec(pair, side, pnl, ts):
+        return {'pair': pair, 'side': side, 'pnl': pnl,
+                'ts': datetime.fromtimestamp(ts, timezone.utc).isoformat()}
+    records = [
+        rec('SOLUSDC', 'sell', 5.0, _NOW - 10),     # avant la validation
+        rec('SOLUSDC', 'sell', 5.0, _NOW + 10),
+        rec('SOLUSDC', 'sell', -2.0, _NOW + 20),
+        rec('SOLUSDC', 'buy', None, _NOW + 30),
+        rec('PEPEUSDC', 'sell', 1.0, _NOW + 40),
+    ]
+    assert live_outcomes(records, 'SOLUSDC', _NOW) == (2, 50.0)
+    df = pd.DataFrame({'close': np.full(10, 100.0), 'atr': np.r_[np.full(5, 1.0), np.full(5, 3.0)]})
+    assert atr_pct(df, 5) == 0.03 and atr_pct(pd.DataFrame(), 5) is None
+
+
+def _scheduled_env(monkeypatch, baseline, recent_sharpe):
+    cfg = Config()
+    monkeypatch.setattr(ms, 'config', cfg)
+    monkeypatch.setattr(ms, 'console', MagicMock())
+    monkeypatch.setattr(ms, 'bot_state', {'SOLUSDT': {DRIFT_BASELINE_KEY: baseline}})
+    monkeypatch.setattr(ms._runtime, 'last_backtest_time', {})
+    monkeypatch.setattr(ms._runtime, 'live_best_params', {})
+    monkeypatch.setattr(ms, 'timeframes', ['4h'])
+    frame = pd.DataFrame({'close': np.full(600, 100.0), 'atr': np.full(600, 2.0)})
+    monkeypatch.setattr(ms, 'prepare_base_dataframe', lambda *a, **kw: frame)
+    monkeypatch.setattr(ms, 'detect_market_changes', lambda *a, **kw: {'ema_crosses': []})
+    ranges = []
+
+    def _backtest(**kw):
+        ranges.append(kw.get('bar_range'))
+        return {'sharpe_ratio': recent_sharpe}
+    monkeypatch.setattr(ms, 'backtest_from_dataframe', _backtest)
+    monkeypatch.setattr(backtest_orchestrator, 'read_live_outcomes', lambda *a: (0, 0.0))
+    full_runs = []
+    monkeypatch.setattr(ms, 'run_all_backtests', lambda *a, **kw: full_runs.append(1) or None)
+    monkeypatch.setattr(ms, 'send_trading_alert_email', lambda **kw: None)
+    monkeypatch.setattr(ms, 'execute_real_trades', lambda *a, **kw: None)
+    # L'état reste en mémoire : aucun bot_state.json / WAL / journal écrit
+    monkeypatch.setattr(ms, 'save_bot_state', lambda force=False: None)
+    return full_runs, ranges
+
+
+def test_scheduled_cycle_skips_full_reoptimisation_without_drift(monkeypatch):
+    baseline = make_baseline(_PARAMS, expected_sharpe=1.5, expected_win_rate=55.0, atr=0.02)
+    full_runs, ranges = _scheduled_env(monkeypatch, baseline, recent_sharpe=1.1)
+    ms.execute_scheduled_trading('SOLUSDC', '4h', dict(_PARAMS), 'SOLUSDT', 'baseline')
+    assert full_runs == [] and ranges == [(100, 600)]
+    assert time.time() - ms._runtime.last_backtest_time['SOLUSDT'] < 60
+    assert ms._runtime.live_best_params['SOLUSDT'] == _PARAMS
+    assert ms.bot_state['SOLUSDT'][DRIFT_BASELINE_KEY] == baseline
+
+
+def test_scheduled_cycle_reoptimises_on_drift(monkeypatch):
+    baseline = make_baseline(_PARAMS, expected_sharpe=1.5, expected_win_rate=55.0, atr=0.02)
+    full_runs, _ = _scheduled_env(monkeypatch, baseline, recent_sharpe=-0.5)
+    ms.execute_scheduled_trading('SOLUSDC', '4h', dict(_PARAMS), 'SOLUSDT', 'baseline')
+    assert full_runs == [1]
+    # Sans résultat de backtest, la référence en mémoire n'est pas remplacée
+    assert ms.bot_state['SOLUSDT'][DRIFT_BASELINE_KEY] == baseline
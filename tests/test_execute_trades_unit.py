@@ -179,6 +179,20 @@ class TestConcurrence:
         assert len(calls) == 0  # inner n'a pas été appelé
         lock.release()
 
+    def test_lock_wait_runs_once_pair_is_released(self, monkeypatch):
+        """Avec lock_wait, le cycle attend la fin de l'exécution en cours (PERF-20)."""
+        lock = threading.Lock()
+        lock.acquire()
+        monkeypatch.setattr(ms, '_pair_execution_locks', {'TRX/USDC': lock})
+
+        calls = []
+        monkeypatch.setattr(ms, '_execute_real_trades_inner', lambda *a, **kw: calls.append(1))
+
+        threading.Timer(0.1, lock.release).start()
+        ms.execute_real_trades('TRXUSDC', '1h', _make_best_params(), 'TRX/USDC', lock_wait=5.0)
+        assert len(calls) == 1
+        assert not lock.locked()
+
     def test_different_pair_not_blocked(self, monkeypatch):
         """Des paires différentes ne se bloquent pas mutuellement."""
         lock = threading.Lock()
@@ -0,0 +1,93 @@
+"""Tests de la détection des changements de marché sur la fin d'historique (PERF-16)."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from indicators_engine import prepare_base_dataframe  # noqa: E402
+from market_analysis import (  # noqa: E402
+    detect_market_changes, tail_indicator_frame, tail_window,
+)
+
+
+def _random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    spread = np.abs(rng.normal(0.0, 0.004, n)) * close
+    return pd.DataFrame({
+        'open': close, 'high': close + spread, 'low': close - spread, 'close': close,
+        'volume': rng.uniform(100.0, 1000.0, n),
+    }, index=pd.date_range('2020-01-01', periods=n, freq='h'))
+
+
+def _fetch(df):
+    return lambda pair, tf, start_date: df.copy()
+
+
+def _prepare(df):
+    return lambda pair, tf, start_date, stoch_period=14: prepare_base_dataframe(
+        pair, tf, start_date, stoch_period, fetch_data_fn=_fetch(df))
+
+
+def _prepared(df) -> pd.DataFrame:
+    full = _prepare(df)('X', '1h', '')
+    assert full is not None
+    return full
+
+
+def _flags(changes):
+    return {key: changes[key] for key in ('ema_crosses', 'stoch_extremes', 'price_records')}
+
+
+def test_tail_values_match_full_history():
+    df = _random_walk(5000)
+    full = _prepared(df)
+    tail = tail_indicator_frame(df)
+    assert tail is not None
+    assert len(tail) < tail_window() <= 1000
+    for col in ('ema_26', 'ema_50', 'rsi', 'stoch_rsi'):
+        np.testing.assert_allclose(tail[col].iloc[-2:], full[col].iloc[-2:], rtol=1e-9)
+
+
+def test_tail_frame_does_not_modify_input():
+    df = _random_walk(2000)
+    columns = list(df.columns)
+    tail_indicator_frame(df)
+    assert list(df.columns) == columns
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_same_flags_as_full_preparation(seed):
+    df = _random_walk(3000, seed=seed)
+    full = _prepared(df)
+    # Tronquer juste après le dernier croisement EMA : un croisement est détecté
+    above = (full['ema_26'] > full['ema_50']).to_numpy()
+    last_cross = int(np.flatnonzero(above[1:] != above[:-1])[-1]) + 1
+    df = df.loc[:full.index[last_cross]]
+    timeframes = ['1h', '4h']
+    reference = detect_market_changes('X', timeframes, '', _prepare(df))
+    tail_only = detect_market_changes('X', timeframes, '', fetch_data_fn=_fetch(df))
+    assert reference['ema_crosses']
+    for key, ref_events in _flags(reference).items():
+        got = _flags(tail_only)[key]
+        assert [e['type'] for e in got] == [e['type'] for e in ref_events]
+        for a, b in zip(got, ref_events):
+            for field, value in b.items():
+                if isinstance(value, float):
+                    assert a[field] == pytest.approx(value, rel=1e-9)
+
+
+def test_short_history_matches_exactly():
+    df = _random_walk(120, seed=5)
+    reference = detect_market_changes('X', ['1h'], '', _prepare(df))
+    tail_only = detect_market_changes('X', ['1h'], '', fetch_data_fn=_fetch(df))
+    assert _flags(tail_only) == _flags(reference)
+
+
+def test_requires_a_data_source():
+    with pytest.raises(ValueError):
+        detect_market_changes('X', ['1h'], '')
@@ -0,0 +1,134 @@
+"""Tests de la robustesse Monte Carlo vectorisée (monte_carlo, PERF-13)."""
+import os
+import sys
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+from monte_carlo import run_monte_carlo, trade_returns  # noqa: E402
+from trade_log import (  # noqa: E402
+    KIND_BUY, KIND_PARTIAL_1, KIND_SELL, REASON_NONE, REASON_SIGNAL, REASON_TAKE_PROFIT,
+    TRADE_LOG_DTYPE, sell_profits, trade_log_from_records,
+)
+
+_NO_SHOCK: Dict[str, Any] = dict(slippage_range=(0.0, 0.0), fee_shock=0.0, skip_prob=0.0)
+
+
+def _log(pnls, notional=5000.0, fee=5.0):
+    """Journal synthétique : un achat puis une vente par P&L."""
+    rows = []
+    for k, pnl in enumerate(pnls):
+        rows.append((2 * k, -1, KIND_BUY, REASON_NONE, 100.0, np.nan, notional / 100.0, 0.0, fee))
+        rows.append((2 * k, 2 * k + 1, KIND_SELL, REASON_SIGNAL, 100.0, 101.0, notional / 100.0,
+                     pnl, fee))
+    return np.array(rows, dtype=TRADE_LOG_DTYPE)
+
+
+class TestTradeReturns:
+    def test_returns_recompose_final_wallet(self):
+        log = _log([200.0, -150.0, 300.0, -50.0])
+        parts = trade_returns(log, 10000.0)
+        assert 10000.0 * np.prod(1.0 + parts['returns']) == pytest.approx(
+            10000.0 + sell_profits(log).sum(), rel=1e-12)
+        np.testing.assert_allclose(parts['exposure'][:2], [5000.0 / 10000.0, 5000.0 / 10200.0])
+        np.testing.assert_allclose(parts['fees'][0], 10.0 / 10000.0)
+
+    def test_partial_sell_fees_belong_to_round_trip(self):
+        rows = [
+            (0, -1, KIND_BUY, REASON_NONE, 100.0, np.nan, 50.0, 0.0, 5.0),
+            (0, 3, KIND_PARTIAL_1, REASON_TAKE_PROFIT, 100.0, 104.0, 25.0, 98.0, 2.0),
+            (0, 6, KIND_SELL, REASON_SIGNAL, 100.0, 102.0, 25.0, 130.0, 3.0),
+        ]
+        parts = trade_returns(np.array(rows, dtype=TRADE_LOG_DTYPE), 10000.0)
+        assert len(parts['returns']) == 1
+        assert parts['fees'][0] == pytest.approx(10.0 / 10000.0)
+
+    def test_legacy_records(self):
+        log = trade_log_from_records([
+            {'type': 'buy', 'price': 100.0, 'qty': 10.0},
+            {'type': 'sell', 'price': 110.0, 'profit': 90.0},
+        ])
+        parts = trade_returns(log, 1000.0)
+        assert parts['returns'][0] == pytest.approx(0.09)
+        assert parts['exposure'][0] == pytest.approx(1.0)
+
+
+def _run(trade_logs, **kwargs: Any) -> Dict[str, Any]:
+    """``run_monte_carlo`` sur au moins deux trades (résultat non None)."""
+    res = run_monte_carlo(trade_logs, **kwargs)
+    assert res is not None
+    return res
+
+
+class TestRunMonteCarlo:
+    def test_identical_trades_have_degenerate_intervals(self):
+        # +1 % de l'equity à chaque trade : tous les chemins sont identiques
+        log = _log(100.0 * 1.01 ** np.arange(10))
+        res = _run(log, n_paths=500, seed=1, **_NO_SHOCK)
+        for key in ('low', 'median', 'high'):
+            assert res['total_return_pct'][key] == pytest.approx((1.01 ** 10 - 1) * 100, abs=1e-4)
+            assert res['max_drawdown'][key] == 0.0
+        assert res['prob_profit'] == 1.0 and res['robustness_score'] == 1.0
+
+    def test_seed_is_reproducible(self):
+        log = _log(np.random.default_rng(0).normal(20.0, 150.0, 60))
+        assert run_monte_carlo(log, seed=7) == run_monte_carlo(log, seed=7)
+        assert run_monte_carlo(log, seed=7) != run_monte_carlo(log, seed=8)
+
+    def test_shocks_reduce_returns(self):
+        log = _log(np.random.default_rng(1).normal(40.0, 120.0, 80))
+        clean = _run(log, n_paths=2000, seed=3, **_NO_SHOCK)
+        shocked = _run(log, n_paths=2000, seed=3, slippage_range=(0.002, 0.004),
+                       fee_shock=2.0, skip_prob=0.0)
+        assert shocked['total_return_pct']['median'] < clean['total_return_pct']['median']
+        assert clean['total_return_pct']['low'] <= clean['total_return_pct']['median'] \
+            <= clean['total_return_pct']['high']
+
+    def test_drawdown_limit_lowers_robustness(self):
+        log = _log(np.random.default_rng(2).normal(30.0, 400.0, 50))
+        loose = _run(log, seed=4)
+        strict = _run(log, seed=4, max_drawdown_limit=0.02)
+        assert strict['robustness_score'] <= loose['robustness_score'] == loose['prob_profit']
+
+    def test_fold_logs_are_pooled(self):
+        a, b = _log([100.0, -50.0, 80.0]), _log([-20.0, 60.0])
+        res = _run([a, b], n_paths=100, seed=5)
+        assert res['n_trades'] == 5
+
+    def test_too_few_trades(self):
+        assert run_monte_carlo(_log([100.0]), seed=0) is None
+        assert run_monte_carlo(np.empty(0, dtype=TRADE_LOG_DTYPE), seed=0) is None
+
+    def test_on_backtest_trade_log(self):
+        from backtest_runner import backtest_from_dataframe
+        res = backtest_from_dataframe(_make_ohlcv(1500, trend='up'), 12, 22,
+                                      build_trades_frame=False)
+        mc = run_monte_carlo(res['trade_log'], n_paths=2000, n_bars_total=1500,
+                             periods_per_year=8766, seed=11)
+        if mc is None:
+            pytest.skip("moins de deux trades clôturés")
+        assert mc['n_trades'] == len(sell_profits(res['trade_log']))
+        assert 0.0 <= mc['max_drawdown']['low'] <= mc['max_drawdown']['high'] <= 1.0
+        assert mc['sharpe_ratio']['low'] <= mc['sharpe_ratio']['high']
+
+
+def test_walk_forward_reports_monte_carlo():
+    from backtest_runner import backtest_from_dataframe
+    from walk_forward import run_walk_forward_validation
+    res = run_walk_forward_validation(
+        base_dataframes={'4h': _make_ohlcv(2000, trend='up')},
+        full_sample_results=[{'timeframe': '4h', 'ema_periods': (12, 22),
+                              'scenario': 'StochRSI', 'sharpe_ratio': 1.0}],
+        scenarios=[{'name': 'StochRSI', 'params': {}}],
+        backtest_fn=backtest_from_dataframe, n_folds=3, max_workers=1,
+    )
+    wf = res['all_wf_results'][0]
+    assert 'monte_carlo' in wf
+    if wf['monte_carlo'] is not None:
+        assert wf['monte_carlo']['n_trades'] >= 2
+        assert set(wf['monte_carlo']['sharpe_ratio']) == {'low', 'median', 'high', 'mean'}
@@ -417,8 +417,12 @@ class TestISIndicatorIsolation:
         captured_is_dfs = []
 
         def fake_run_single(task):
-            tf, e1, e2, scenario, is_df_arg, bp, sm = task
-            captured_is_dfs.append(is_df_arg.copy())
+            tf, e1, e2, scenario, is_inputs, bp, sm = task
+            # PERF-24: les tâches reçoivent le BacktestInputs de la tranche IS
+            captured_is_dfs.append(pd.DataFrame(
+                {col: is_inputs.column(col) for col in ('ema_26', 'stoch_rsi')},
+                index=is_inputs.index,
+            ))
             return {
                 'scenario': scenario['name'], 'timeframe': tf,
                 'ema_periods': [e1, e2],
@@ -441,5 +445,7 @@ class TestISIndicatorIsolation:
             # IS should NOT contain corrupted OOS values
             assert (captured_df['ema_26'] != 999999.0).all(), \
                 "IS slice should have recomputed EMA, not OOS-corrupted values"
-            assert (captured_df['rsi'] != 999.0).all(), \
-                "IS slice should have recomputed RSI, not OOS-corrupted values"
+            assert captured_df.index[-1] < df.index[is_end], \
+                "IS slice should not contain OOS rows"
+            assert captured_df['stoch_rsi'].dropna().between(0.0, 1.0).all(), \
+                "IS slice should have recomputed StochRSI, not OOS-corrupted values"
@@ -0,0 +1,130 @@
+"""Tests du backtest de portefeuille multi-paires (portfolio_backtest)."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+from portfolio_backtest import run_portfolio_backtest  # noqa: E402
+from trade_log import KIND_BUY  # noqa: E402
+
+_PARAMS = {'ema1_period': 12, 'ema2_period': 22}
+
+
+def _same_pairs(frames):
+    return {pair: dict(_PARAMS) for pair in frames}
+
+
+class TestSinglePairParity:
+    @pytest.mark.parametrize('scenario', [{}, {'sma_long': 50}, {'adx_period': 14}])
+    @pytest.mark.parametrize('sizing_mode', ['baseline', 'risk'])
+    def test_matches_backtest_from_dataframe(self, monkeypatch, scenario, sizing_mode):
+        """Une paire, une place : même journal et même wallet que le backtest par paire."""
+        import backtest_runner
+        monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+        df = _make_ohlcv(600, trend='up')
+        ref = backtest_runner.backtest_from_dataframe(
+            df, 12, 22, sizing_mode=sizing_mode, build_trades_frame=False, **scenario,
+        )
+        res = run_portfolio_backtest(
+            {'BTCUSDC': df}, {'BTCUSDC': dict(_PARAMS, **scenario)},
+            max_concurrent_long=1, sizing_mode=sizing_mode,
+        )
+        assert res['trade_logs']['BTCUSDC'].tobytes() == ref['trade_log'].tobytes()
+        assert res['final_wallet'] == pytest.approx(ref['final_wallet'], rel=1e-12)
+
+    def test_pure_python_matches_compiled(self):
+        import portfolio_backtest
+        if not portfolio_backtest.NUMBA_AVAILABLE:
+            pytest.skip("numba non installé")
+        frames = {'A': _make_ohlcv(500, trend='up'), 'B': _make_ohlcv(500, trend='flat')}
+        compiled = run_portfolio_backtest(frames, _same_pairs(frames), max_concurrent_long=1)
+        original = portfolio_backtest._run_portfolio
+        portfolio_backtest._run_portfolio = original.py_func
+        try:
+            interpreted = run_portfolio_backtest(frames, _same_pairs(frames), max_concurrent_long=1)
+        finally:
+            portfolio_backtest._run_portfolio = original
+        assert interpreted['final_wallet'] == compiled['final_wallet']
+        for pair in frames:
+            assert interpreted['trade_logs'][pair].tobytes() == compiled['trade_logs'][pair].tobytes()
+
+
+class TestCapitalContention:
+    def test_concurrency_cap_blocks_signals(self):
+        frames = {f'P{k}': _make_ohlcv(800, trend=t) for k, t in enumerate(['up', 'flat', 'down'])}
+        capped = run_portfolio_backtest(frames, _same_pairs(frames), max_concurrent_long=1)
+        free = run_portfolio_backtest(frames, _same_pairs(frames), max_concurrent_long=3)
+        assert capped['max_open_positions'] == 1
+        assert sum(capped['blocked_signals'].values()) > 0
+        assert free['max_open_positions'] > 1
+        assert sum(free['blocked_signals'].values()) == 0
+
+    def test_simultaneous_signals_follow_priority(self):
+        df = _make_ohlcv(600, trend='up')
+        frames = {'AAAUSDC': df, 'BBBUSDC': df.copy()}
+        default = run_portfolio_backtest(frames, _same_pairs(frames), max_concurrent_long=1)
+        flipped = run_portfolio_backtest(frames, _same_pairs(frames), max_concurrent_long=1,
+                                         priority=['BBBUSDC', 'AAAUSDC'])
+        log_a, log_b = default['trade_logs']['AAAUSDC'], default['trade_logs']['BBBUSDC']
+        # Premier signal commun : la paire prioritaire est servie, l'autre bloquée
+        assert log_a[0]['kind'] == KIND_BUY
+        assert len(log_b) == 0 or log_b[0]['entry_bar'] > log_a[0]['entry_bar']
+        assert default['blocked_signals']['BBBUSDC'] > 0
+        # Données identiques : inverser la priorité échange les journaux
+        assert flipped['trade_logs']['BBBUSDC'].tobytes() == log_a.tobytes()
+        assert flipped['trade_logs']['AAAUSDC'].tobytes() == log_b.tobytes()
+        assert flipped['final_wallet'] == default['final_wallet']
+
+    def test_cash_is_split_across_free_slots(self):
+        df = _make_ohlcv(600, trend='up')
+        frames = {'A': df, 'B': df.copy()}
+        res = run_portfolio_backtest(frames, _same_pairs(frames), max_concurrent_long=2,
+                                     sizing_mode='baseline', initial_wallet=10000.0)
+        first = {p: log[log['kind'] == KIND_BUY][0] for p, log in res['trade_logs'].items()}
+        assert first['A']['entry_bar'] == first['B']['entry_bar']
+        cost = {p: row['qty'] * row['entry_price'] + row['fees'] for p, row in first.items()}
+        # A : 98 % de la moitié du cash ; B : 98 % du reste (plus de la moitié)
+        assert cost['A'] == pytest.approx(10000.0 / 2 * 0.98, rel=1e-9)
+        assert cost['B'] > cost['A']
+        assert cost['A'] + cost['B'] < 10000.0
+
+
+class TestTimelineAndSizing:
+    def test_unified_timeline(self):
+        long_df = _make_ohlcv(800, trend='up')
+        short_df = long_df.iloc[300:].copy()
+        res = run_portfolio_backtest({'A': long_df, 'B': short_df},
+                                     {'A': dict(_PARAMS), 'B': dict(_PARAMS)})
+        assert res['equity_curve'].index.equals(long_df.index)
+        assert np.isfinite(res['equity_curve'].to_numpy()).all()
+        log_b = res['trade_logs']['B']
+        assert len(log_b) == 0 or log_b['entry_bar'].min() >= 300
+
+    def test_volatility_parity_sizing(self):
+        from position_sizing import compute_position_size_volatility_parity
+        from bot_config import config
+        df = _make_ohlcv(600, trend='up')
+        res = run_portfolio_backtest({'A': df}, {'A': dict(_PARAMS, sizing_mode='volatility_parity')},
+                                     max_concurrent_long=1, initial_wallet=10000.0)
+        buy = res['trade_logs']['A'][0]
+        assert buy['kind'] == KIND_BUY
+        gross = compute_position_size_volatility_parity(
+            10000.0, float(df['atr'].iloc[buy['entry_bar']]), float(buy['entry_price']),
+            config.target_volatility_pct,
+        )
+        expected = min(gross, 10000.0 * config.position_size_cushion / buy['entry_price'])
+        assert buy['qty'] == pytest.approx(expected * (1 - config.backtest_taker_fee), rel=1e-9)
+
+    def test_invalid_arguments(self):
+        df = _make_ohlcv(300)
+        with pytest.raises(ValueError):
+            run_portfolio_backtest({'A': df}, {})
+        with pytest.raises(ValueError):
+            run_portfolio_backtest({'A': df}, {'A': dict(_PARAMS)}, max_concurrent_long=0)
+        with pytest.raises(ValueError):
+            run_portfolio_backtest({'A': df}, {'A': dict(_PARAMS, sizing_mode='kelly')})
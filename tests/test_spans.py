@@ -0,0 +1,144 @@
+"""Tests du chronométrage hiérarchique des étapes de cycle (spans, PERF-18)."""
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+import spans  # noqa: E402
+from spans import cycle_span, span, stage_timings, timed  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _clean_spans():
+    spans.set_enabled(True)
+    spans.reset()
+    yield
+    spans.set_enabled(True)
+    spans.reset()
+
+
+def test_nested_paths_and_aggregates():
+    with span('outer'):
+        for _ in range(3):
+            with span('inner'):
+                time.sleep(0.001)
+    totals = stage_timings()['totals']
+    assert set(totals) == {'outer', 'outer/inner'}
+    assert totals['outer/inner']['count'] == 3
+    assert totals['outer']['total_s'] >= totals['outer/inner']['total_s'] >= 0.003
+    assert totals['outer/inner']['max_s'] <= totals['outer/inner']['total_s']
+
+
+def test_timed_decorator_and_exceptions():
+    @timed('work')
+    def work(fail=False):
+        with span('step'):
+            if fail:
+                raise RuntimeError('boom')
+        return 42
+
+    assert work() == 42 and work.__name__ == 'work'
+    with pytest.raises(RuntimeError):
+        work(fail=True)
+    totals = stage_timings()['totals']
+    assert totals['work']['count'] == 2 and totals['work/step']['count'] == 2
+    # La pile est dépilée même après une exception
+    with span('after'):
+        pass
+    assert 'after' in stage_timings()['totals']
+
+
+def test_cycle_summary_and_worker_threads():
+    def worker():
+        with span('fetch'):
+            pass
+
+    @cycle_span('live_cycle')
+    def cycle():
+        with span('prepare'):
+            pass
+        # Un worker sans parent dans son thread est rattaché au cycle actif
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        with cycle_span('nested'):
+            pass
+
+    cycle()
+    cycle()
+    summary = stage_timings()['cycles']['live_cycle']
+    assert set(summary['stages']) == {'live_cycle/prepare', 'live_cycle/fetch', 'live_cycle/nested'}
+    # Résumé du dernier cycle uniquement, cumul dans les totaux
+    assert summary['stages']['live_cycle/fetch']['count'] == 2
+    assert stage_timings()['totals']['live_cycle/fetch']['count'] == 4
+    assert stage_timings()['totals']['live_cycle']['count'] == 2
+    assert summary['seconds'] >= summary['stages']['live_cycle/prepare']['total_s']
+    # Hors cycle, un span reste à la racine
+    with span('idle'):
+        pass
+    assert 'idle' in stage_timings()['totals']
+
+
+def test_concurrent_cycles_and_bind():
+    from concurrent.futures import ThreadPoolExecutor
+    pool = ThreadPoolExecutor(max_workers=2)
+    release = threading.Event()
+    started = threading.Event()
+
+    def background():
+        with cycle_span('scheduled_cycle'):
+            started.set()
+            release.wait(5)
+
+    def worker():
+        with span('pair'):
+            pass
+
+    bg = threading.Thread(target=background)
+    bg.start()
+    started.wait(5)
+    with cycle_span('live_cycle'):
+        # Deux cycles actifs : sans bind, un worker reste à la racine
+        pool.submit(worker).result()
+        pool.submit(spans.bind(worker)).result()
+    release.set()
+    bg.join()
+    pool.shutdown()
+    totals = stage_timings()['totals']
+    assert totals['pair']['count'] == 1 and totals['live_cycle/pair']['count'] == 1
+    assert set(stage_timings()['cycles']) == {'live_cycle', 'scheduled_cycle'}
+
+
+def test_disabled_is_noop():
+    spans.set_enabled(False)
+    assert span('a') is span('b')
+
+    @timed('fn')
+    def fn():
+        return 'ok'
+
+    with cycle_span('scheduled_cycle'):
+        with span('a'):
+            assert fn() == 'ok'
+    timings = stage_timings()
+    assert timings == {'enabled': False, 'cycles': {}, 'totals': {}}
+
+
+def test_write_metrics_includes_stage_timings(tmp_path, monkeypatch):
+    import metrics as _m
+    monkeypatch.setattr(_m, '_METRICS_DIR', str(tmp_path))
+    monkeypatch.setattr(_m, '_METRICS_FILE', str(tmp_path / 'metrics.json'))
+    with cycle_span('scheduled_cycle'):
+        with span('backtests'):
+            pass
+    assert _m.write_metrics({}, object(), pairs=[], stage_timings=stage_timings())
+    data = json.loads((tmp_path / 'metrics.json').read_text(encoding='utf-8'))
+    stages = data['stage_timings']['cycles']['scheduled_cycle']['stages']
+    assert stages['scheduled_cycle/backtests']['count'] == 1
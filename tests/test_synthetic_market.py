@@ -0,0 +1,124 @@
+"""Tests du marché synthétique et du benchmark de bout en bout (synthetic_market, cycle_benchmark)."""
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from synthetic_market import (  # noqa: E402
+    generate_market, generate_ohlcv, resample_ohlcv, timeframe_delta, to_klines,
+)
+
+
+class TestGenerateOhlcv:
+    def test_seed_is_reproducible(self):
+        pd.testing.assert_frame_equal(generate_ohlcv(500, seed=3), generate_ohlcv(500, seed=3))
+        assert not generate_ohlcv(500, seed=3).equals(generate_ohlcv(500, seed=4))
+
+    def test_candles_are_consistent(self):
+        df = generate_ohlcv(5000, '4h', seed=1)
+        assert (df['high'] >= df[['open', 'close']].max(axis=1)).all()
+        assert (df['low'] <= df[['open', 'close']].min(axis=1)).all()
+        assert (df['low'] > 0).all() and (df['volume'] > 0).all()
+        assert (df.index.to_series().diff().dropna() == pd.Timedelta(hours=4)).all()
+
+    def test_regimes_clustering_and_gaps(self):
+        df = generate_ohlcv(20000, seed=2, gap_prob=0.01, with_regimes=True)
+        assert set(df['regime']) == {'bull', 'bear', 'range'}
+        # Régimes persistants : peu de changements
+        assert (df['regime'] != df['regime'].shift()).sum() < 200
+        # Grappes de volatilité : |rendement| autocorrélé
+        r = np.abs(np.diff(np.log(df['close'].to_numpy())))
+        assert np.corrcoef(r[1:], r[:-1])[0, 1] > 0.05
+        gaps = (df['open'] / df['close'].shift()).iloc[1:]
+        assert 100 < int((gaps != 1.0).sum()) < 300
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            generate_ohlcv(0)
+        with pytest.raises(ValueError):
+            generate_ohlcv(10, garch=(0.5, 0.6))
+        with pytest.raises(ValueError):
+            timeframe_delta('1x')
+
+
+class TestMarket:
+    def test_pairs_and_aggregated_timeframes(self):
+        market = generate_market(3, history_days=30, timeframes=('1h', '4h', '1d'), seed=0)
+        assert list(market) == ['SYN00USDC', 'SYN01USDC', 'SYN02USDC']
+        frames = market['SYN01USDC']
+        assert len(frames['1h']) == 30 * 24 and len(frames['1d']) == 30
+        pd.testing.assert_frame_equal(frames['4h'], resample_ohlcv(frames['1h'], '4h'))
+        assert frames['1d']['high'].iloc[0] == frames['1h']['high'].iloc[:24].max()
+        assert market['SYN00USDC']['1h']['close'].iloc[-1] != frames['1h']['close'].iloc[-1]
+
+    def test_klines_roundtrip(self):
+        df = generate_ohlcv(10, '1h', seed=0)
+        klines = to_klines(df, '1h')
+        assert pd.Timestamp(klines[0][0], unit='ms') == df.index[0]
+        assert klines[0][6] - klines[0][0] == 3600 * 1000 - 1
+        assert float(klines[-1][4]) == pytest.approx(df['close'].iloc[-1], rel=1e-8)
+
+
+class TestCycleBenchmark:
+    def test_synthetic_exchange(self):
+        from cycle_benchmark import SyntheticExchange
+        market = generate_market(1, history_days=10, timeframes=('1h',), seed=0)
+        exchange = SyntheticExchange(market)
+        df = market['SYN00USDC']['1h']
+        assert len(exchange.get_historical_klines('SYN00USDC', '1h', '3 hours ago')) == 4
+        start = df.index[100].strftime('%d %B %Y %H:%M')
+        assert len(exchange.get_historical_klines('SYN00USDC', '1h', start)) == len(df) - 100
+        assert float(exchange.get_symbol_ticker(symbol='SYN00USDC')['price']) == pytest.approx(
+            df['close'].iloc[-1])
+        assert exchange.calls['get_historical_klines'] == 2
+
+    def test_run_write_and_compare(self, tmp_path):
+        from cycle_benchmark import compare_results, run_benchmark, write_results
+        import cache_manager
+        cache_dir = cache_manager._effective_cache_dir
+        res = run_benchmark(
+            n_pairs=1, history_days=120, timeframes=('4h',),
+            stages=('data_load', 'prepare', 'run_all_backtests', 'live_cycle'), live_iterations=2,
+        )
+        assert {'data_load_cold', 'data_load_warm', 'prepare', 'run_all_backtests',
+                'live_cycle'} == set(res['stages'])
+        assert res['stages']['live_cycle']['calls'] == 2
+        assert cache_manager._effective_cache_dir == cache_dir
+        path = tmp_path / 'bench.json'
+        write_results(res, str(path))
+        baseline = json.loads(path.read_text(encoding='utf-8'))
+        assert compare_results(res, baseline) == []
+        slower = json.loads(json.dumps(res))
+        slower['stages']['run_all_backtests']['seconds'] = baseline['stages']['run_all_backtests']['seconds'] * 2 + 1
+        regressions = compare_results(slower, baseline, min_seconds=0.0)
+        assert [r['stage'] for r in regressions] == ['run_all_backtests']
+
+    def test_live_environment_runs_real_cycle_in_isolation(self, tmp_path):
+        from backtest_orchestrator import _execute_live_trading_only
+        from cycle_benchmark import SyntheticExchange, _live_environment, _temporary_cache_dir
+        import MULTI_SYMBOLS as ms
+        import exchange_client
+        start = (pd.Timestamp.now().floor('h') - pd.Timedelta(days=120)).strftime('%Y-%m-%d %H:%M')
+        exchange = SyntheticExchange(generate_market(1, 120, ('4h',), seed=0, start=start))
+        state, config = ms.bot_state, exchange_client._config
+        with _temporary_cache_dir(), _live_environment(exchange, str(tmp_path)) as live:
+            live._runtime.live_best_params['SYN00USDC'] = {
+                'timeframe': '4h', 'ema1_period': 26, 'ema2_period': 50, 'scenario': 'StochRSI',
+            }
+            _execute_live_trading_only('SYN00USDC', 'SYN00USDC', 'risk', live._make_backtest_deps())
+            assert exchange_client._config.bot_mode == 'DEMO'
+            assert 'SYN00USDC' in live.bot_state
+        # Cycle complet : données, historique d'ordres et soldes
+        assert {'get_historical_klines', 'get_all_orders', 'get_account'} <= set(exchange.calls)
+        assert ms.bot_state is state and exchange_client._config is config
+        assert 'SYN00USDC' not in ms._runtime.live_best_params
+
+    def test_unknown_stage(self):
+        from cycle_benchmark import run_benchmark
+        with pytest.raises(ValueError):
+            run_benchmark(stages=('compile',))
@@ -0,0 +1,197 @@
+"""Tests du planificateur à priorités (task_scheduler, PERF-20)."""
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+import task_scheduler  # noqa: E402
+from task_scheduler import Priority, TaskScheduler, yield_to_foreground  # noqa: E402
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def make_scheduler(clock):
+    created = []
+
+    def _make(**kwargs):
+        kwargs.setdefault('clock', clock)
+        sched = TaskScheduler(**kwargs)
+        created.append(sched)
+        return sched
+    yield _make
+    for sched in created:
+        sched.shutdown(timeout=5)
+
+
+def _wait_for(predicate, timeout=5.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_due_jobs_run_in_priority_order(make_scheduler, clock):
+    sched = make_scheduler(foreground_workers=1)
+    order = []
+    gate = threading.Event()
+    # Occupe l'unique worker pour que les deux tâches attendent en file
+    sched.every(10, lambda: gate.wait(5), name='blocker', priority=Priority.LIVE)
+    clock.now += 10
+    assert sched.run_pending() == 1
+    assert _wait_for(lambda: sched.stats()['foreground_active'] == 1)
+    sched.every(5, lambda: order.append('metrics'), name='metrics', priority=Priority.METRICS)
+    sched.every(5, lambda: order.append('live'), name='live', priority=Priority.LIVE)
+    clock.now += 5
+    assert sched.run_pending() == 2
+    gate.set()
+    assert _wait_for(lambda: len(order) == 2)
+    assert order == ['live', 'metrics']
+
+
+def test_background_does_not_block_live(make_scheduler, clock):
+    sched = make_scheduler()
+    release = threading.Event()
+    live_runs = []
+    sched.every(60, lambda: release.wait(5), name='reopt', priority=Priority.REOPTIMIZATION)
+    sched.every(2, lambda: live_runs.append(1), name='live', priority=Priority.LIVE)
+    clock.now += 60
+    sched.run_pending()
+    assert _wait_for(lambda: len(live_runs) == 1)
+    # Ré-optimisation encore en cours : le déclenchement suivant est sauté, pas empilé
+    clock.now += 60
+    sched.run_pending()
+    assert _wait_for(lambda: len(live_runs) == 2)
+    release.set()
+    assert _wait_for(lambda: sched.stats()['jobs']['reopt']['runs'] == 1)
+    stats = sched.stats()['jobs']
+    assert stats['reopt']['skipped'] == 1
+    # Chaque déclenchement du live couvre 30 périodes manquées (pas de rafale)
+    assert stats['live']['runs'] == 2 and stats['live']['skipped'] == 2 * 29
+
+
+def test_deadline_and_latency_tracking(make_scheduler, clock):
+    sched = make_scheduler()
+
+    def slow():
+        clock.now += 8
+
+    job = sched.every(10, slow, name='slow', priority=Priority.LIVE, deadline=5)
+    clock.now += 13
+    sched.run_pending()
+    assert _wait_for(lambda: sched.stats()['jobs']['slow']['runs'] == 1)
+    stats = sched.stats()['jobs']['slow']
+    assert stats['missed_deadlines'] == 1
+    assert stats['last_latency_s'] == pytest.approx(3.0)
+    assert stats['last_duration_s'] == pytest.approx(8.0)
+    # Échéance suivante alignée sur la grille (1010 + 10), déjà dépassée
+    assert job.next_due == 1020.0 and sched.idle_seconds() == 0.0
+    sched.cancel(job)
+    sched.every(10, lambda: None, name='fast', priority=Priority.METRICS)
+    clock.now += 10
+    sched.run_pending()
+    assert _wait_for(lambda: sched.stats()['jobs']['fast']['runs'] == 1)
+    assert sched.stats()['jobs']['fast']['missed_deadlines'] == 0
+    assert sched.stats()['missed_deadlines'] == 0
+
+
+def test_failures_reported(make_scheduler, clock):
+    errors = []
+    sched = make_scheduler(on_error=lambda exc, name: errors.append((name, str(exc))))
+
+    def boom():
+        raise RuntimeError('api down')
+
+    sched.every(1, boom, name='boom', priority=Priority.LIVE, run_now=True)
+    sched.run_pending()
+    assert _wait_for(lambda: errors)
+    assert errors == [('boom', 'api down')]
+    assert _wait_for(lambda: sched.stats()['jobs']['boom']['failures'] == 1)
+
+
+def test_background_yields_to_foreground(make_scheduler, clock):
+    sched = make_scheduler(max_pause=5.0).install()
+    assert task_scheduler.current_scheduler() is sched
+    live_started = threading.Event()
+    live_release = threading.Event()
+    events = []
+
+    def live():
+        live_started.set()
+        # Sans effet dans un thread de premier plan
+        assert yield_to_foreground() == 0.0
+        live_release.wait(5)
+        events.append('live_done')
+
+    def reopt():
+        live_started.wait(5)
+        yield_to_foreground()
+        events.append('reopt_resumed')
+
+    sched.every(10, live, name='live', priority=Priority.LIVE)
+    sched.every(10, reopt, name='reopt', priority=Priority.REOPTIMIZATION)
+    clock.now += 10
+    sched.run_pending()
+    assert live_started.wait(5)
+    time.sleep(0.05)
+    assert events == []
+    live_release.set()
+    assert _wait_for(lambda: len(events) == 2)
+    assert events == ['live_done', 'reopt_resumed']
+    sched.shutdown()
+    assert task_scheduler.current_scheduler() is None
+    assert yield_to_foreground() == 0.0
+
+
+def test_fanout_pools_are_persistent(make_scheduler):
+    sched = make_scheduler()
+    pool = sched.executor('live', 2, foreground=True)
+    assert sched.executor('live', 1) is pool
+    assert pool.submit(lambda: yield_to_foreground()).result() == 0.0
+    bigger = sched.executor('live', 4)
+    assert bigger is not pool and sched.executor('live', 3) is bigger
+
+
+def test_invalid_period(make_scheduler):
+    with pytest.raises(ValueError):
+        make_scheduler().every(0, lambda: None)
+
+
+def test_pair_rescheduling_is_unique_per_pair(make_scheduler, monkeypatch):
+    import types
+    import backtest_orchestrator
+    calls = []
+    monkeypatch.setattr(
+        backtest_orchestrator, '_backtest_and_display_results',
+        lambda bp, rp, start_date, tfs, sm, deps: calls.append((bp, rp, tfs, sm)),
+    )
+    sched = make_scheduler()
+    deps: Any = types.SimpleNamespace(
+        scheduler=sched, timeframes=['1h', '4h'],
+        config=types.SimpleNamespace(schedule_interval_minutes=2, backtest_days=30),
+    )
+    for pair in ('BTCUSDT', 'BTCUSDT', 'ETHUSDT'):
+        backtest_orchestrator._reschedule_pair(pair, pair.replace('USDT', 'USDC'), 'risk', deps)
+    jobs = sorted(sched.jobs, key=lambda j: j.name)
+    assert [j.name for j in jobs] == ['backtest_and_display:BTCUSDT', 'backtest_and_display:ETHUSDT']
+    assert all(j.interval == 120 and j.priority == Priority.REOPTIMIZATION for j in jobs)
+    jobs[0].fn()
+    assert calls == [('BTCUSDT', 'BTCUSDC', ['1h', '4h'], 'risk')]
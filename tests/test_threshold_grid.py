@@ -0,0 +1,100 @@
+"""Tests de la grille de seuils StochRSI évaluée par lot (backtest_threshold_grid, PERF-06)."""
+import os
+import sys
+from typing import Any, Dict
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+_GRID = [(0.02, 0.70, 0.30), (0.05, 0.80, 0.40), (0.10, 0.85, 0.50), (0.15, 0.75, 0.30)]
+
+
+def _single_runs(df, **kwargs):
+    from backtest_runner import backtest_from_dataframe
+    return [
+        backtest_from_dataframe(
+            df, 12, 22, stoch_buy_min_override=bmin, stoch_buy_max_override=bmax,
+            stoch_sell_exit_override=sell, build_trades_frame=False, **kwargs,
+        )
+        for bmin, bmax, sell in _GRID
+    ]
+
+
+def _assert_same(batch, singles):
+    assert len(batch) == len(singles)
+    for b, s in zip(batch, singles):
+        assert b['final_wallet'] == pytest.approx(s['final_wallet'], rel=1e-12)
+        assert b.get('calmar_ratio') == s.get('calmar_ratio')
+        assert b['status'] == s['status']
+        np.testing.assert_array_equal(b['trade_log']['exit_bar'], s['trade_log']['exit_bar'])
+
+
+class TestBacktestThresholdGrid:
+    @pytest.mark.parametrize('scenario', [{}, {'sma_long': 50}, {'adx_period': 14}])
+    def test_batch_matches_single_runs(self, scenario):
+        """Une passe par lot = un backtest_from_dataframe par combinaison."""
+        import backtest_runner
+        if backtest_runner._CYTHON_API_LEVEL < 4:
+            pytest.skip("backtest_engine_standard (PERF-06) non compilé")
+        df = _make_ohlcv(600, trend='flat')
+        batch = backtest_runner.backtest_threshold_grid(
+            df, 12, 22, _GRID, sizing_mode='baseline', **scenario
+        )
+        _assert_same(batch, _single_runs(df, sizing_mode='baseline', **scenario))
+
+    def test_python_fallback(self, monkeypatch):
+        import backtest_runner
+        monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+        df = _make_ohlcv(300, trend='up')
+        batch = backtest_runner.backtest_threshold_grid(df, 12, 22, _GRID, sizing_mode='baseline')
+        _assert_same(batch, _single_runs(df, sizing_mode='baseline'))
+
+    def test_empty_grid(self):
+        from backtest_runner import backtest_threshold_grid
+        assert backtest_threshold_grid(_make_ohlcv(100), 12, 22, []) == []
+
+
+class TestGridSearchBatch:
+    def test_batched_search_matches_serial(self):
+        """Même combinaison retenue avec ou sans évaluation par lot."""
+        from backtest_orchestrator import run_stoch_threshold_grid_search
+        from backtest_runner import backtest_from_dataframe, backtest_threshold_grid
+        is_results = [
+            {'timeframe': '4h', 'ema_periods': (12, 22), 'scenario': 'StochRSI', 'calmar_ratio': 2.0},
+            {'timeframe': '1h', 'ema_periods': (8, 30), 'scenario': 'StochRSI', 'calmar_ratio': 1.0},
+        ]
+        dfs = {'4h': _make_ohlcv(400, trend='up'), '1h': _make_ohlcv(400, trend='flat')}
+        common: Dict[str, Any] = dict(
+            is_results=is_results, base_dataframes=dfs, backtest_fn=backtest_from_dataframe,
+            scenario_default_params={'StochRSI': {}}, sizing_mode='baseline', n_top=2,
+        )
+        serial = run_stoch_threshold_grid_search(**common)
+        batched = run_stoch_threshold_grid_search(**common, batch_fn=backtest_threshold_grid)
+        assert serial == batched
+
+    def test_search_shares_inputs_without_touching_frames(self):
+        """Un BacktestInputs par timeframe ; aucune colonne EMA ajoutée aux DataFrames."""
+        import backtest_inputs
+        from backtest_orchestrator import run_stoch_threshold_grid_search
+        df = _make_ohlcv(400, trend='up').drop(columns=['ema_12', 'ema_22'])
+        columns = list(df.columns)
+        seen = []
+
+        def batch_fn(df, ema1_period, ema2_period, thresholds, **kwargs):
+            seen.append(df)
+            return [None] * len(thresholds)
+
+        run_stoch_threshold_grid_search(
+            is_results=[
+                {'timeframe': '4h', 'ema_periods': (12, 22), 'scenario': 'StochRSI', 'calmar_ratio': 2.0},
+                {'timeframe': '4h', 'ema_periods': (8, 30), 'scenario': 'StochRSI', 'calmar_ratio': 1.0},
+            ],
+            base_dataframes={'4h': df}, backtest_fn=lambda **kw: None,
+            scenario_default_params={'StochRSI': {}}, n_top=2, batch_fn=batch_fn,
+        )
+        assert list(df.columns) == columns
+        assert len(seen) == 2 and seen[0] is seen[1] is backtest_inputs.backtest_inputs(df)
@@ -0,0 +1,141 @@
+"""Tests du journal de trades numpy structuré (trade_log, PERF-03)."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+
+def _log(rows):
+    from trade_log import TRADE_LOG_DTYPE
+    return np.array(rows, dtype=TRADE_LOG_DTYPE)
+
+
+@pytest.fixture
+def sample_log():
+    from trade_log import (
+        KIND_BUY, KIND_PARTIAL_1, KIND_SELL, REASON_NONE, REASON_SIGNAL,
+        REASON_STOP_LOSS, REASON_TAKE_PROFIT,
+    )
+    nan = float('nan')
+    return _log([
+        (2, -1, KIND_BUY, REASON_NONE, 100.0, nan, 9.9, 0.0, 1.0),
+        (2, 5, KIND_PARTIAL_1, REASON_TAKE_PROFIT, 100.0, 110.0, 3.0, 29.67, 0.33),
+        (2, 8, KIND_SELL, REASON_SIGNAL, 100.0, 120.0, 6.9, 150.0, 0.8),
+        (10, -1, KIND_BUY, REASON_NONE, 120.0, nan, 8.0, 0.0, 1.0),
+        (10, 12, KIND_SELL, REASON_STOP_LOSS, 120.0, 110.0, 8.0, -90.0, 0.9),
+        (14, -1, KIND_BUY, REASON_NONE, 110.0, nan, 8.0, 0.0, 1.0),
+        (14, 15, KIND_SELL, REASON_STOP_LOSS, 110.0, 105.0, 8.0, -45.0, 0.8),
+    ])
+
+
+class TestTradeMetrics:
+    def test_profit_factor_and_loss_streak(self, sample_log):
+        from trade_log import compute_trade_metrics
+        m = compute_trade_metrics(sample_log)
+        assert m['total_trades'] == 3
+        assert m['winning_trades'] == 1
+        assert m['profit_factor'] == pytest.approx(round(150.0 / 135.0, 4))
+        assert m['max_consecutive_losses'] == 2
+
+    def test_no_loss_caps_profit_factor(self):
+        from trade_log import profit_metrics
+        assert profit_metrics(np.array([5.0, 1.0]))['profit_factor'] == 999.0
+        assert profit_metrics(np.array([]))['profit_factor'] == 0.0
+
+    def test_equity_points(self, sample_log):
+        from trade_log import trade_equity_points
+        np.testing.assert_allclose(
+            trade_equity_points(sample_log, 1000.0), [1000.0, 1150.0, 1060.0, 1015.0]
+        )
+
+    def test_risk_metrics_match_dataframe_path(self, sample_log):
+        """compute_risk_metrics donne le même résultat avec trade_log ou trades_df."""
+        from trade_log import trades_frame
+        from walk_forward import compute_risk_metrics
+        rng = np.random.default_rng(0)
+        equity = 1000 + np.cumsum(rng.normal(0, 1, 400))
+        via_log = compute_risk_metrics(equity, trade_log=sample_log, periods_per_year=2190)
+        via_df = compute_risk_metrics(
+            equity, trades_df=trades_frame(sample_log), periods_per_year=2190
+        )
+        assert via_log == via_df
+        assert via_log['max_consecutive_losses'] == 2
+
+
+class TestTradesFrame:
+    def test_legacy_columns_and_dates(self, sample_log):
+        from trade_log import trades_frame
+        index = pd.date_range('2024-01-01', periods=20, freq='4h')
+        frame = trades_frame(sample_log, index)
+        assert frame['type'].tolist()[:3] == ['buy', 'partial_sell_1', 'sell']
+        assert frame['date'].iloc[0] == index[2]
+        assert frame['date'].iloc[2] == index[8]
+        assert frame['motif'].iloc[4] == 'STOP_LOSS'
+        assert frame['price'].iloc[0] == 100.0
+        assert frame['proceeds'].iloc[1] == pytest.approx(3.0 * 110.0 - 0.33)
+        assert frame['profit_pct'].iloc[1] == pytest.approx(0.10)
+
+    def test_empty_log(self):
+        from trade_log import empty_trade_log, trades_frame
+        assert trades_frame(empty_trade_log()).empty
+
+    def test_from_legacy_records(self):
+        from trade_log import KIND_SELL, compute_trade_metrics, trade_log_from_records
+        log = trade_log_from_records([
+            {'type': 'BUY', 'price': 10.0},
+            {'type': 'SELL', 'price': 11.0, 'profit': 4.0},
+            {'type': 'BUY', 'price': 12.0},
+            {'type': 'SELL', 'price': 11.0, 'profit': -2.0},
+        ])
+        assert (log['kind'] == KIND_SELL).sum() == 2
+        assert log['entry_price'][3] == 12.0
+        assert compute_trade_metrics(log)['profit_factor'] == 2.0
+
+
+class TestBacktestTradeLog:
+    def _run(self, **kwargs):
+        import backtest_runner
+        df = _make_ohlcv(500, trend='up')
+        return backtest_runner.backtest_from_dataframe(
+            df, ema1_period=12, ema2_period=22, sizing_mode='baseline', **kwargs
+        )
+
+    def test_python_fallback_emits_trade_log(self, monkeypatch):
+        import backtest_runner
+        from trade_log import TRADE_LOG_DTYPE, compute_trade_metrics
+        monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+        result = self._run()
+        log = result['trade_log']
+        assert log.dtype == TRADE_LOG_DTYPE
+        assert len(log) == len(result['trades'])
+        m = compute_trade_metrics(log)
+        if m['total_trades']:
+            assert result['win_rate'] == pytest.approx(
+                m['winning_trades'] / m['total_trades'] * 100
+            )
+        assert result['profit_factor'] == m['profit_factor']
+
+    def test_trades_frame_is_optional(self):
+        result = self._run(build_trades_frame=False)
+        assert 'trades' not in result
+        assert 'trade_log' in result
+
+    def test_cython_and_python_logs_agree(self, monkeypatch):
+        """Le journal du moteur compilé est identique à celui de la boucle Python."""
+        import backtest_runner
+        if not backtest_runner._CYTHON_TRADE_LOG:
+            pytest.skip("backtest_engine_standard (PERF-03) non compilé")
+        cy = self._run(partial_enabled=False)['trade_log']
+        monkeypatch.setattr(backtest_runner, 'CYTHON_BACKTEST_AVAILABLE', False)
+        py = self._run(partial_enabled=False)['trade_log']
+        assert len(cy) == len(py)
+        for field in ('entry_bar', 'exit_bar', 'kind', 'reason'):
+            np.testing.assert_array_equal(cy[field], py[field])
+        for field in ('entry_price', 'exit_price', 'qty', 'pnl', 'fees'):
+            np.testing.assert_allclose(cy[field], py[field], rtol=1e-9)
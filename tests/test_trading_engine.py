@@ -1258,6 +1258,24 @@ class TestExecuteScheduledTrading:
 
         assert exec_calls == []
 
+    def test_live_only_waits_for_pair_lock(self, monkeypatch):
+        """PERF-20: le cycle live attend le verrou de paire au lieu de sauter les stops."""
+        cfg = _make_config()
+        monkeypatch.setattr(ms, 'config', cfg)
+        monkeypatch.setattr(ms, 'console', MagicMock())
+        monkeypatch.setattr(ms, 'bot_state', {})
+        monkeypatch.setattr(ms, 'save_bot_state', lambda *a, **kw: None)
+        monkeypatch.setattr(ms._runtime, 'live_best_params', {'SOLUSDT': _make_best_params()})
+        monkeypatch.setattr(ms._runtime, 'last_scheduled_trade_time', {})
+
+        exec_calls = []
+        monkeypatch.setattr(ms, 'execute_real_trades', lambda *a, **kw: exec_calls.append((a, kw)))
+
+        ms.execute_live_trading_only('SOLUSDC', 'SOLUSDT', 'baseline')
+
+        assert len(exec_calls) == 1
+        assert exec_calls[0][1]['lock_wait'] > 0
+
 
 # ===================================================================
 #  SECTION 6: Additional _execute_real_trades_inner coverage
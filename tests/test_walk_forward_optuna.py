@@ -0,0 +1,151 @@
+"""Tests de l'étude Optuna walk-forward persistante (run_walk_forward_optuna, PERF-12)."""
+import os
+import sys
+import threading
+import types
+from typing import Any, Dict
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+optuna = pytest.importorskip('optuna')
+
+_SCENARIOS = [{'name': 'StochRSI', 'params': {}}, {'name': 'StochRSI_SMA', 'params': {'sma_long': 200}}]
+
+
+@pytest.fixture
+def optuna_config(monkeypatch, tmp_path):
+    """Configuration vue par walk_forward (Config est gelée, P0-01)."""
+    import bot_config
+    import backtest_runner  # noqa: F401 — importé (via backtest_memo) avec la vraie configuration
+    cfg = types.SimpleNamespace(
+        oos_decay_min=0.0, oos_sharpe_min=0.0, oos_win_rate_min=0.0,
+        backtest_early_abort=False, max_workers=1,
+        optuna_persistent=True, optuna_storage_dir=str(tmp_path / 'optuna'),
+        optuna_n_jobs=1, optuna_pruner='median', optuna_warm_start_trials=3,
+    )
+    monkeypatch.setattr(bot_config, 'config', cfg)
+    return cfg
+
+
+class _FakeBacktest:
+    """Sharpe déterministe fonction des paramètres ; compte les appels IS."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, df, ema1_period, ema2_period, bar_range=None, **kwargs):
+        with self._lock:
+            self.calls.append((ema1_period, ema2_period, bar_range))
+        sharpe = 2.0 - abs(ema1_period - 20) / 10 - abs(ema2_period - 60) / 40
+        return {'final_wallet': 10000.0 + 100 * sharpe, 'sharpe_ratio': sharpe, 'win_rate': 55.0}
+
+
+def _run(backtest_fn, frames, **kwargs):
+    from walk_forward import run_walk_forward_optuna
+    params: Dict[str, Any] = dict(n_folds=3, n_trials=12, pair='BTCUSDC')
+    params.update(kwargs)
+    return run_walk_forward_optuna(
+        base_dataframes=frames, scenarios=_SCENARIOS, backtest_fn=backtest_fn, **params,
+    )
+
+
+def _journal_studies(cfg):
+    from optuna.storages import JournalStorage
+    from optuna.storages.journal import JournalFileBackend
+    storage = JournalStorage(JournalFileBackend(os.path.join(cfg.optuna_storage_dir, 'BTCUSDC.journal')))
+    return [
+        optuna.load_study(study_name=s.study_name, storage=storage)
+        for s in storage.get_all_studies()
+    ]
+
+
+class TestPersistentStudy:
+    def test_unchanged_data_resumes_study(self, optuna_config):
+        frames = {'4h': _make_ohlcv(1500, trend='up')}
+        first_fn, second_fn = _FakeBacktest(), _FakeBacktest()
+        first = _run(first_fn, frames)
+        second = _run(second_fn, frames)
+        assert first['best_wf_config']['ema_periods'] == second['best_wf_config']['ema_periods']
+        # Aucun nouvel essai : seul l'audit OOS du meilleur (IS + OOS par fold) est rejoué
+        assert len(second_fn.calls) == 2 * 3
+        studies = _journal_studies(optuna_config)
+        assert len(studies) == 1 and len(studies[0].trials) == 12
+
+    def test_new_data_warm_starts_from_best_trials(self, optuna_config):
+        _run(_FakeBacktest(), {'4h': _make_ohlcv(1500, trend='up')})
+        previous = _journal_studies(optuna_config)[0]
+        best = sorted(
+            (t for t in previous.trials if t.value is not None),
+            key=lambda t: t.value, reverse=True,
+        )[:3]
+
+        _run(_FakeBacktest(), {'4h': _make_ohlcv(1600, trend='up')})
+        studies = _journal_studies(optuna_config)
+        assert len(studies) == 1  # journal recréé : seule l'étude courante est gardée
+        assert studies[0].study_name != previous.study_name
+        replayed = [t.params for t in studies[0].trials[:3]]
+        assert replayed == [t.params for t in best]
+
+    def test_in_memory_without_pair(self, optuna_config):
+        _run(_FakeBacktest(), {'4h': _make_ohlcv(1500, trend='up')}, pair='')
+        assert not os.path.exists(optuna_config.optuna_storage_dir)
+
+
+class TestStudyExecution:
+    def test_frames_are_not_mutated(self, optuna_config):
+        df = _make_ohlcv(1500, trend='up')
+        columns = list(df.columns)
+        _run(_FakeBacktest(), {'4h': df}, n_jobs=3)
+        assert list(df.columns) == columns
+
+    def test_trials_share_lazy_ema_inputs(self, optuna_config):
+        from backtest_inputs import BacktestInputs
+        frames = []
+
+        def backtest_fn(df, ema1_period, ema2_period, bar_range=None, **kwargs):
+            frames.append(df)
+            df.ema(ema1_period)
+            df.ema(ema2_period)
+            return {'final_wallet': 10000.0, 'sharpe_ratio': 1.0, 'win_rate': 55.0}
+
+        df = _make_ohlcv(1500, trend='up')
+        _run(backtest_fn, {'4h': df}, pair='')
+        assert frames and len({id(frame) for frame in frames}) == 1
+        assert isinstance(frames[0], BacktestInputs)
+        # Aucune colonne EMA ajoutée : les périodes tirées sont calculées à la demande
+        ema_columns = {col for col in df.columns if col.startswith('ema_')}
+        assert {col for col in frames[0].columns if col.startswith('ema_')} == ema_columns
+
+    def test_parallel_trials_and_fold_reports(self, optuna_config):
+        fn = _FakeBacktest()
+        res = _run(fn, {'4h': _make_ohlcv(1500, trend='up')}, n_jobs=3, pair='')
+        assert res['method'] == 'optuna'
+        assert len({(e1, e2) for e1, e2, _ in fn.calls}) > 1
+
+    def test_median_pruner_stops_bad_trials(self, optuna_config):
+        from walk_forward import run_walk_forward_optuna
+
+        def backtest_fn(df, ema1_period, ema2_period, bar_range=None, **kwargs):
+            # Premier fold très discriminant : les mauvais essais sont élagués tôt
+            sharpe = 3.0 if ema1_period < 15 else -3.0
+            return {'final_wallet': 10000.0, 'sharpe_ratio': sharpe, 'win_rate': 55.0}
+
+        run_walk_forward_optuna(
+            base_dataframes={'4h': _make_ohlcv(1500, trend='up')}, scenarios=_SCENARIOS,
+            backtest_fn=backtest_fn, n_folds=3, n_trials=30, pair='BTCUSDC', n_jobs=1,
+        )
+        states = [t.state for t in _journal_studies(optuna_config)[0].trials]
+        assert optuna.trial.TrialState.PRUNED in states
+
+
+@pytest.mark.parametrize('name, cls', [
+    ('median', 'MedianPruner'), ('hyperband', 'HyperbandPruner'), ('none', 'NopPruner'),
+])
+def test_make_pruner(name, cls):
+    from walk_forward import _make_pruner
+    assert type(_make_pruner(optuna, name, 4)).__name__ == cls
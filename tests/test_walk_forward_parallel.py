@@ -0,0 +1,105 @@
+"""Tests de l'exécution parallèle des folds walk-forward (run_walk_forward_validation)."""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code', 'src'))
+
+from test_backtest import _make_ohlcv  # noqa: E402
+
+_CONFIGS = [
+    {'timeframe': '4h', 'ema_periods': (12, 22), 'scenario': 'StochRSI', 'sharpe_ratio': 1.2},
+    {'timeframe': '4h', 'ema_periods': (14, 26), 'scenario': 'StochRSI_SMA', 'sharpe_ratio': 1.0},
+    {'timeframe': '1h', 'ema_periods': (26, 50), 'scenario': 'StochRSI', 'sharpe_ratio': 0.9},
+]
+_SCENARIOS = [
+    {'name': 'StochRSI', 'params': {}},
+    {'name': 'StochRSI_SMA', 'params': {'sma_long': 200}},
+]
+
+
+def _frames():
+    return {'4h': _make_ohlcv(2000, trend='up'), '1h': _make_ohlcv(2000, trend='flat')}
+
+
+def _run(backtest_fn, **kwargs):
+    from walk_forward import run_walk_forward_validation
+    return run_walk_forward_validation(
+        base_dataframes=_frames(), full_sample_results=_CONFIGS, scenarios=_SCENARIOS,
+        backtest_fn=backtest_fn, n_folds=3, **kwargs,
+    )
+
+
+class TestParallelWalkForward:
+    def test_parallel_matches_serial(self, monkeypatch):
+        """Mêmes résultats (slippage OOS compris) quel que soit le nombre de workers."""
+        import backtest_memo
+        from backtest_runner import backtest_from_dataframe
+        monkeypatch.setattr(backtest_memo, 'get_backtest_memo', lambda: None)
+        serial = _run(backtest_from_dataframe, max_workers=1)
+        parallel = _run(backtest_from_dataframe, max_workers=4)
+        assert serial['all_wf_results']
+        assert parallel == serial
+
+    def test_seed_changes_oos_slippage(self):
+        seen = []
+        lock = threading.Lock()
+
+        def backtest_fn(df, ema1_period, ema2_period, cost_model=None, **kwargs):
+            if cost_model is not None:
+                with lock:
+                    seen.append(cost_model.seed)
+            return {'final_wallet': 10000.0, 'sharpe_ratio': 1.0, 'win_rate': 50.0}
+
+        draws = []
+        for seed in (1, 1, 2):
+            seen.clear()
+            _run(backtest_fn, random_seed=seed, max_workers=3)
+            draws.append(sorted(seen))
+        assert draws[0] == draws[1]
+        assert draws[0] != draws[2]
+        assert len(set(draws[0])) == len(draws[0])  # une graine par tâche OOS
+
+    def test_tasks_run_on_worker_threads(self):
+        threads = set()
+        lock = threading.Lock()
+
+        def backtest_fn(df, ema1_period, ema2_period, **kwargs):
+            with lock:
+                threads.add(threading.get_ident())
+            return {'final_wallet': 10000.0, 'sharpe_ratio': 1.0, 'win_rate': 50.0}
+
+        _run(backtest_fn, max_workers=4)
+        assert threading.get_ident() not in threads
+        _run(backtest_fn, max_workers=1)
+        assert threading.get_ident() in threads
+
+
+def test_score_bound_pruned_configs_stay_ranked():
+    """Arrêt sur la borne Calmar : config toujours candidate au classement Sharpe."""
+    from walk_forward import run_walk_forward_validation
+    validated = []
+
+    def backtest_fn(df, ema1_period, ema2_period, **kwargs):
+        validated.append((ema1_period, ema2_period))
+        return {'final_wallet': 10000.0, 'sharpe_ratio': 1.0, 'win_rate': 50.0}
+
+    results = [
+        dict(_CONFIGS[0], status='pruned', abort_reason='unreachable'),
+        dict(_CONFIGS[1], status='pruned', abort_reason='max_drawdown'),
+    ]
+    run_walk_forward_validation(
+        base_dataframes=_frames(), full_sample_results=results, scenarios=_SCENARIOS,
+        backtest_fn=backtest_fn, n_folds=3, max_workers=1,
+    )
+    assert set(validated) == {(12, 22)}
+
+
+@pytest.mark.parametrize('key', [('4h', 12, 22, 'StochRSI', 0), ('1h', 26, 50, 'StochRSI', 2)])
+def test_task_seed_is_stable(key):
+    from walk_forward import _task_seed
+    assert _task_seed(42, *key) == _task_seed(42, *key)
+    assert 0 <= _task_seed(42, *key) < 2 ** 31
+    assert _task_seed(42, *key) != _task_seed(43, *key)